@@ -0,0 +1,358 @@
+"""Latency of the data stores behind the agents' tools, on synthetic data.
+
+Scenarios:
+    stats_build        load a squad's per-match rows into `SquadStats`
+    stats_top_season   top-5 scorers of one season (aggregate cube)
+    stats_top_per90    per-90 ranking within one competition
+    stats_totals       one player's season totals
+    stats_form         one player's last 10 matches with rolling mean
+    scout_build        standardize and index the scouting database
+    scout_cosine       top-10 cosine neighbours of one player over all players
+    scout_mahalanobis  same under the Mahalanobis distance
+    scout_filtered     cosine top-10 among forwards under 25 worth at most 30 M€
+    scout_mmap_open    open the same index from a memory-mapped dataset (build command)
+    scout_mmap_cosine  scout_cosine on the memory-mapped index
+    scout_mmap_lookup  resolve a player name by binary search on the mapped names
+    injury_build       merge the injury history into the interval index
+    injury_out_on      players out on one match day
+    injury_days_lost   days lost per player over one season
+    injury_recurrences same injury again within a year of the return
+    injury_add         merge one new report into the index
+    load_ingest        a full season of GPS sessions of the squad into `TrainingLoad`
+    load_season        ACWR, monotony and strain of every player over every day
+    load_day_risk      every player's workload and risk flags on one day
+    load_append_day    merge one new training day (re-accumulates from that day)
+    events_parse       stream the events of one match file
+    events_serial      fold a season of match files in this process
+    events_pool        fold the same files in a process pool
+    events_top         top-5 players by progressive passes over the season
+    events_team        one team's season totals with xG conceded
+    entity_build       index player and club names (keys, prefixes, trigram postings)
+    entity_exact       resolve a full surname
+    entity_prefix      resolve a truncated name ("lewa")
+    entity_fuzzy       resolve a misspelled name by trigram similarity
+    entity_message     find every player and club mentioned in a user question
+
+Usage:
+    uv run python benchmarks/bench_data.py
+    uv run python benchmarks/bench_data.py --queries 5000 --json after.json --compare before.json
+    uv run python benchmarks/bench_data.py --scouted 500000 --injuries 100000 --matches 380
+    uv run python benchmarks/bench_data.py --names 500000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from bench_workflow import Result, print_report
+
+from football_club.data.columnar import open_scouting_index, save_scouting_index
+from football_club.data.entities import EntityIndex, scouting_entities, squad_entities
+from football_club.data.events import MatchEventStore, fold_file, fold_files, iter_events
+from football_club.data.injuries import InjuryStore
+from football_club.data.scouting import FEATURES, POSITIONS, ScoutingIndex
+from football_club.data.stats import METRICS, SquadStats
+from football_club.data.training_load import TrainingLoad
+
+COMPETITIONS = ["LaLiga", "Champions", "Copa del Rey", "Supercopa"]
+
+
+def synthetic_squad(
+    players: int = 30, seasons: int = 6, matches: int = 60, seed: int = 7
+) -> tuple[Any, ...]:
+    """`SquadStats` columns of ``players`` over ``seasons`` seasons (~18 players per match)."""
+    rng = np.random.default_rng(seed)
+    first = np.datetime64("2019-08-15", "D")
+    match_dates = np.concatenate(
+        [
+            first + (np.arange(0, 4 * matches, 4) + 365 * s).astype("timedelta64[D]")
+            for s in range(seasons)
+        ]
+    )
+    match_competitions = rng.integers(0, len(COMPETITIONS), len(match_dates))
+    played = rng.random((len(match_dates), players)) < 0.6
+    match_idx, player_idx = np.nonzero(played)
+    rows = len(match_idx)
+    values = rng.poisson(1.5, (rows, len(METRICS))).astype(np.float32)
+    values[:, 0] = rng.integers(10, 91, rows)
+    return (
+        [f"Jugador {i}" for i in range(players)],
+        player_idx,
+        match_dates[match_idx],
+        COMPETITIONS,
+        match_competitions[match_idx],
+        values,
+    )
+
+
+def synthetic_scouting(players: int, seed: int = 7) -> tuple[Any, ...]:
+    """`ScoutingIndex` columns of ``players`` players in 20 leagues."""
+    rng = np.random.default_rng(seed)
+    leagues = [f"Liga {i}" for i in range(20)]
+    return (
+        [f"Jugador {i}" for i in range(players)],
+        [f"Club {i % 2000}" for i in range(players)],
+        leagues,
+        rng.integers(0, len(leagues), players),
+        rng.integers(0, len(POSITIONS), players),
+        rng.uniform(16, 38, players),
+        rng.lognormal(1.5, 1.2, players),
+        rng.uniform(0, 3400, players),
+        rng.gamma(2.0, 0.5, (players, len(FEATURES))),
+    )
+
+
+# Name syllables: realistic trigram overlap between names (many near-duplicates)
+SYLLABLES = "ba ra lo men di ez son ki ta vo mar tin gon za les ro dri guez pe na ska wi no el"
+
+
+def synthetic_names(players: int, seed: int = 7) -> tuple[list[str], list[str]]:
+    """``players`` two-word player names and their clubs (one club per 50 players)."""
+    rng = np.random.default_rng(seed)
+    syllables = np.array(SYLLABLES.split())
+
+    def word(parts: int) -> str:
+        return "".join(rng.choice(syllables, parts)).capitalize()
+
+    clubs = [f"Club {word(3)}" for _ in range(players // 50 + 1)]
+    names = [f"{word(rng.integers(2, 4))} {word(rng.integers(2, 5))}" for _ in range(players)]
+    return names, [clubs[i % len(clubs)] for i in range(players)]
+
+
+def synthetic_injuries(injuries: int, players: int = 500, seed: int = 7) -> list[dict[str, str]]:
+    """Injury reports of ``players`` players over ten seasons, open in the last month."""
+    rng = np.random.default_rng(seed)
+    starts = np.datetime64("2015-07-01", "D") + rng.integers(0, 3650, injuries).astype(
+        "timedelta64[D]"
+    )
+    ends = starts + rng.gamma(1.5, 15, injuries).astype("timedelta64[D]") + np.timedelta64(1, "D")
+    open_since = np.datetime64("2025-06-01", "D")
+    kinds = ["Rotura fibrilar", "Esguince de tobillo", "Rodilla", "Sobrecarga", "Pubalgia"]
+    return [
+        {
+            "player": f"Jugador {p}",
+            "injury": kinds[k],
+            "start": str(start),
+            "end": "" if start >= open_since else str(end),
+        }
+        for p, k, start, end in zip(
+            rng.integers(0, players, injuries),
+            rng.integers(0, len(kinds), injuries),
+            starts,
+            ends,
+            strict=True,
+        )
+    ]
+
+
+def synthetic_sessions(players: int = 30, days: int = 330, seed: int = 7) -> list[dict[str, Any]]:
+    """GPS rows of ``players`` over ``days`` days: ~6 sessions a week, some doubles."""
+    rng = np.random.default_rng(seed)
+    first = np.datetime64("2024-07-01", "D")
+    sessions = rng.random((days, players)) < 0.85
+    doubles = rng.random((days, players)) < 0.1
+    day_idx, player_idx = np.nonzero(sessions)
+    day_idx = np.concatenate([day_idx, np.nonzero(doubles)[0]])
+    player_idx = np.concatenate([player_idx, np.nonzero(doubles)[1]])
+    dates = first + day_idx.astype("timedelta64[D]")
+    loads = rng.gamma(4.0, 100, len(dates))
+    return [
+        {
+            "player": f"Jugador {p}",
+            "date": str(date),
+            "load": load,
+            "duration": load / 6,
+            "distance": load * 15,
+            "hsr": load * 1.2,
+        }
+        for p, date, load in zip(player_idx, dates, loads, strict=True)
+    ]
+
+
+def write_event_feeds(directory: Path, matches: int, events: int = 3500, seed: int = 7) -> None:
+    """One StatsBomb-style JSON array file per match, 20 teams of 16 players."""
+    rng = np.random.default_rng(seed)
+    kinds = ["Pass"] * 6 + ["Carry"] * 4 + ["Ball Recovery", "Dribble", "Shot"]
+    for m in range(matches):
+        home, away = rng.choice(20, 2, replace=False)
+        feed = []
+        for kind, team, player, x, y, dx in zip(
+            rng.choice(kinds, events),
+            rng.choice([home, away], events),
+            rng.integers(0, 16, events),
+            rng.uniform(0, 120, events),
+            rng.uniform(0, 80, events),
+            rng.normal(5, 15, events),
+            strict=True,
+        ):
+            event: dict[str, Any] = {
+                "type": {"name": str(kind)},
+                "team": {"name": f"Equipo {team}"},
+                "player": {"name": f"Jugador {team}-{player}"},
+                "location": [round(x, 1), round(y, 1)],
+            }
+            end = [round(min(max(x + dx, 0), 120), 1), round(y, 1)]
+            if kind == "Pass":
+                event["pass"] = {"end_location": end}
+            elif kind == "Carry":
+                event["carry"] = {"end_location": end}
+            elif kind == "Shot":
+                event["shot"] = {"statsbomb_xg": round(float(rng.beta(1, 9)), 3)}
+            feed.append(event)
+        (directory / f"{m}.json").write_text(json.dumps(feed))
+
+
+def _timed(fn: Callable[[], Any], repeats: int) -> list[float]:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def run(
+    queries: int, scouted: int, injuries: int, matches: int, names: int = 150_000
+) -> dict[str, dict[str, Any]]:
+    columns = synthetic_squad()
+    stats = SquadStats(*columns)
+    results = [
+        Result("stats_build", _timed(lambda: SquadStats(*columns), 20), {"rows": len(stats)}),
+        Result("stats_top_season", _timed(lambda: stats.top("goals", season="2022/23"), queries)),
+        Result(
+            "stats_top_per90",
+            _timed(lambda: stats.top("xg", competition="LaLiga", per90=True), queries),
+        ),
+        Result(
+            "stats_totals", _timed(lambda: stats.totals("Jugador 7", season="2022/23"), queries)
+        ),
+        Result("stats_form", _timed(lambda: stats.form("Jugador 7", "goals"), queries)),
+    ]
+
+    print(f"Indexing {scouted} scouted players...", file=sys.stderr)
+    columns = synthetic_scouting(scouted)
+    index = ScoutingIndex(*columns)
+    filters = {"position": "delantero", "max_age": 25, "max_value": 30}
+    results += [
+        Result("scout_build", _timed(lambda: ScoutingIndex(*columns), 3), {"players": scouted}),
+        Result("scout_cosine", _timed(lambda: index.similar("Jugador 42"), queries)),
+        Result(
+            "scout_mahalanobis",
+            _timed(lambda: index.similar("Jugador 42", distance="mahalanobis"), queries),
+        ),
+        Result("scout_filtered", _timed(lambda: index.similar("Jugador 42", **filters), queries)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = save_scouting_index(index, Path(tmp) / "scouting")
+        mapped = open_scouting_index(dataset)
+        results += [
+            Result("scout_mmap_open", _timed(lambda: open_scouting_index(dataset), 20)),
+            Result("scout_mmap_cosine", _timed(lambda: mapped.similar("Jugador 42"), queries)),
+            Result(
+                "scout_mmap_lookup",
+                _timed(lambda: mapped.players.resolve("jugador 4242"), queries),
+            ),
+        ]
+
+    print(f"Indexing {names} player names...", file=sys.stderr)
+    players, clubs = synthetic_names(names)
+    entities = squad_entities(["Robert Lewandowski", "Frenkie de Jong"])
+    entities += scouting_entities(players, clubs)
+    entity_index = EntityIndex(entities)
+    question = "¿Cuántos goles lleva lewandoski esta temporada comparado con frenky?"
+    results += [
+        Result("entity_build", _timed(lambda: EntityIndex(entities), 3), {"names": len(entities)}),
+        Result("entity_exact", _timed(lambda: entity_index.exact("lewandowski"), queries)),
+        Result("entity_prefix", _timed(lambda: entity_index.prefix("lewa"), queries)),
+        Result("entity_fuzzy", _timed(lambda: entity_index.fuzzy("lewandoski"), queries)),
+        Result("entity_message", _timed(lambda: entity_index.resolve(question), queries)),
+    ]
+
+    reports = synthetic_injuries(injuries)
+    store = InjuryStore()
+    store.add(reports)
+    report = {"player": "Jugador 7", "injury": "Sobrecarga", "start": "2024-03-02", "end": ""}
+    results += [
+        Result(
+            "injury_build",
+            _timed(lambda: InjuryStore().add(reports), 5),
+            {"injuries": injuries},
+        ),
+        Result("injury_out_on", _timed(lambda: store.out_on("2025-06-15"), queries)),
+        Result("injury_days_lost", _timed(lambda: store.days_lost(2023, "2024-07-01"), queries)),
+        Result("injury_recurrences", _timed(store.recurrences, queries // 10 or 1)),
+        Result("injury_add", _timed(lambda: store.add([report]), queries // 10 or 1)),
+    ]
+
+    sessions = synthetic_sessions()
+    load = TrainingLoad()
+    load.add(sessions)
+    last_day = [row for row in sessions if row["date"] == load.last_date]
+    results += [
+        Result(
+            "load_ingest",
+            _timed(lambda: TrainingLoad().add(sessions), 10),
+            {"sessions": len(sessions)},
+        ),
+        Result("load_season", _timed(load.indicators, queries // 10 or 1)),
+        Result("load_day_risk", _timed(lambda: load.workload(load.last_date), queries)),
+        Result("load_append_day", _timed(lambda: load.add(last_day), queries // 10 or 1)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Writing {matches} match event feeds...", file=sys.stderr)
+        feeds = Path(tmp)
+        write_event_feeds(feeds, matches)
+        paths = sorted(feeds.iterdir())
+        events = MatchEventStore(feeds)
+        events.refresh()
+        size = sum(path.stat().st_size for path in paths) / 1e6
+        team = events.table().teams.names[0]
+        results += [
+            Result("events_parse", _timed(lambda: sum(1 for _ in iter_events(paths[0])), 5)),
+            Result(
+                "events_serial",
+                _timed(lambda: [fold_file(path) for path in paths], 1),
+                {"matches": matches, "mb": round(size, 1)},
+            ),
+            Result("events_pool", _timed(lambda: fold_files(paths), 1)),
+            Result("events_top", _timed(lambda: events.top("progressive_passes"), queries)),
+            Result("events_team", _timed(lambda: events.team(team), queries)),
+        ]
+    return {result.name: result.to_dict() for result in results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--queries", type=int, default=2000, help="Consultas por escenario")
+    parser.add_argument(
+        "--scouted", type=int, default=300_000, help="Jugadores de la base de scouting"
+    )
+    parser.add_argument(
+        "--injuries", type=int, default=20_000, help="Lesiones del historial médico"
+    )
+    parser.add_argument("--matches", type=int, default=38, help="Ficheros de eventos de partido")
+    parser.add_argument(
+        "--names", type=int, default=150_000, help="Nombres de jugadores del índice de entidades"
+    )
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    parser.add_argument("--compare", type=Path, help="JSON de una ejecución anterior")
+    args = parser.parse_args(argv)
+
+    report = run(args.queries, args.scouted, args.injuries, args.matches, args.names)
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.json:
+        payload = {**report, "_meta": {"argv": sys.argv[1:]}}
+        args.json.write_text(json.dumps(payload, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
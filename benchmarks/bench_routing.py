@@ -0,0 +1,223 @@
+"""Routing accuracy and latency per model tier on a labeled query set.
+
+Every query in ``routing_queries.jsonl`` is held out from the fast router's
+seed corpus and labeled with the agent that should answer it
+(``orchestrator`` marks greetings and farewells the orchestrator answers
+itself). Each LLM tier runs the production orchestrator prompt with the
+transfer tools bound and is scored on its first tool call.
+
+Tiers:
+    fast_router     local lexicon + Naive Bayes, no LLM; an abstention is only
+                    correct for orchestrator queries
+    <model>         one orchestrator call per query on that Groq model
+    tiered_<model>  fast router first, <model> only when it abstains (the
+                    production routing path)
+
+Rate-limiter waits are excluded from latency. Costs use Groq list prices.
+
+Usage:
+    uv run python benchmarks/bench_routing.py            # needs GROQ_API_KEY
+    uv run python benchmarks/bench_routing.py --offline  # FakeChatModel, no network
+    uv run python benchmarks/bench_routing.py --models llama-3.1-8b-instant --json after.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from bench_workflow import Result, print_report
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable
+
+from football_club.agents.context import estimate_tokens
+from football_club.agents.llm import LLMClientRegistry
+from football_club.agents.orchestrator import ORCHESTRATOR_SYSTEM_PROMPT
+from football_club.agents.tools import (
+    HANDOFF_TOOL_PREFIX,
+    transfer_to_analyst,
+    transfer_to_medical,
+    transfer_to_scout,
+)
+from football_club.config import Config
+from football_club.graph.router import FastRouter
+from football_club.metrics import estimate_cost
+from football_club.ratelimit import RateLimiter, get_rate_limiter
+from football_club.state import AGENT_ORCHESTRATOR
+from football_club.testing import FakeChatModel
+
+QUERIES_PATH = Path(__file__).with_name("routing_queries.jsonl")
+
+DEFAULT_MODELS = "llama-3.1-8b-instant,llama-3.3-70b-versatile"
+
+ROUTING_TOOLS = [transfer_to_scout, transfer_to_analyst, transfer_to_medical]
+
+
+@dataclass
+class Prediction:
+    """Routing decision for one query (``agent=None``: the fast router abstained)."""
+
+    agent: str | None
+    latency_ms: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    error: bool = False
+
+
+def load_queries(path: Path = QUERIES_PATH) -> list[tuple[str, str]]:
+    rows = [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    return [(row["question"], row["agent"]) for row in rows]
+
+
+def route_fast(router: FastRouter, question: str) -> Prediction:
+    started = time.perf_counter()
+    decision = router.classify(question)
+    return Prediction(decision.agent, (time.perf_counter() - started) * 1000)
+
+
+def route_llm(
+    llm: Runnable[LanguageModelInput, AIMessage],
+    question: str,
+    limiter: RateLimiter | None,
+) -> Prediction:
+    messages = [SystemMessage(content=ORCHESTRATOR_SYSTEM_PROMPT), HumanMessage(content=question)]
+    if limiter is not None:
+        limiter.acquire(estimate_tokens(messages))
+    started = time.perf_counter()
+    try:
+        reply = llm.invoke(messages)
+    except Exception as e:
+        # e.g. a malformed tool call rejected by the provider: counted as a miss
+        latency_ms = (time.perf_counter() - started) * 1000
+        if limiter is not None:
+            limiter.release(latency_ms / 1000, success=False)
+        print(f"  error: {type(e).__name__}: {e}", file=sys.stderr)
+        return Prediction(None, latency_ms, error=True)
+    latency_ms = (time.perf_counter() - started) * 1000
+    if limiter is not None:
+        limiter.release(latency_ms / 1000)
+    agent = (
+        reply.tool_calls[0]["name"].removeprefix(HANDOFF_TOOL_PREFIX)
+        if reply.tool_calls
+        else AGENT_ORCHESTRATOR
+    )
+    usage = reply.usage_metadata
+    return Prediction(
+        agent,
+        latency_ms,
+        usage["input_tokens"] if usage else 0,
+        usage["output_tokens"] if usage else 0,
+    )
+
+
+def score(
+    name: str,
+    queries: Sequence[tuple[str, str]],
+    predictions: Sequence[Prediction],
+    model: str | None = None,
+) -> Result:
+    """Accuracy, misroutes and cost of ``predictions`` against the labels."""
+    confusion: Counter[str] = Counter()
+    correct = 0
+    for (_, expected), prediction in zip(queries, predictions, strict=True):
+        if prediction.error:
+            confusion[f"{expected}->error"] += 1
+        elif (prediction.agent or AGENT_ORCHESTRATOR) == expected:
+            correct += 1
+        else:
+            confusion[f"{expected}->{prediction.agent or 'abstained'}"] += 1
+    prompt = sum(p.prompt_tokens for p in predictions)
+    completion = sum(p.completion_tokens for p in predictions)
+    extra: dict[str, Any] = {
+        "accuracy": round(correct / len(queries), 3),
+        "llm_calls": sum(1 for p in predictions if p.prompt_tokens or p.error),
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "cost_usd": round(estimate_cost(model or "", prompt, completion), 6),
+        "errors": sum(p.error for p in predictions),
+        "misroutes": dict(confusion.most_common()),
+    }
+    return Result(name, [p.latency_ms for p in predictions], extra)
+
+
+def run(
+    models: dict[str, Runnable[LanguageModelInput, AIMessage]],
+    limiter: RateLimiter | None,
+    queries: Sequence[tuple[str, str]],
+) -> dict[str, dict[str, Any]]:
+    router = FastRouter(Config().fast_router_threshold)
+    fast = [route_fast(router, question) for question, _ in queries]
+    results = [score("fast_router", queries, fast)]
+    results[0].extra["decided"] = sum(p.agent is not None for p in fast)
+
+    for name, llm in models.items():
+        print(f"Routing {len(queries)} queries with {name}...", file=sys.stderr)
+        predictions = [route_llm(llm, question, limiter) for question, _ in queries]
+        results.append(score(name, queries, predictions, name))
+        tiered = [
+            p_fast
+            if p_fast.agent is not None
+            else Prediction(
+                p_llm.agent,
+                p_fast.latency_ms + p_llm.latency_ms,
+                p_llm.prompt_tokens,
+                p_llm.completion_tokens,
+                p_llm.error,
+            )
+            for p_fast, p_llm in zip(fast, predictions, strict=True)
+        ]
+        results.append(score(f"tiered_{name}", queries, tiered, name))
+    return {result.name: result.to_dict() for result in results}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--models", default=DEFAULT_MODELS, help="Modelos Groq a comparar (separados por comas)"
+    )
+    parser.add_argument("--offline", action="store_true", help="Usar FakeChatModel (sin red)")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Latencia simulada (s) con --offline"
+    )
+    parser.add_argument("--queries", type=Path, default=QUERIES_PATH, help="Consultas etiquetadas")
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    parser.add_argument("--compare", type=Path, help="JSON de una ejecución anterior")
+    args = parser.parse_args(argv)
+
+    queries = load_queries(args.queries)
+    config = Config()
+    registry: LLMClientRegistry | None = None
+    limiter: RateLimiter | None = None
+    if args.offline:
+        models = {"fake": FakeChatModel(latency_s=args.latency).bind_tools(ROUTING_TOOLS)}
+    else:
+        registry = LLMClientRegistry(config)
+        # Same tier settings as production, only the model changes
+        models = {
+            name: registry.chat_model(AGENT_ORCHESTRATOR, model=name).bind_tools(ROUTING_TOOLS)
+            for name in filter(None, (m.strip() for m in args.models.split(",")))
+        }
+        limiter = get_rate_limiter(config) if config.rate_limit_enabled else None
+        registry.prewarm(1, background=False)
+
+    try:
+        report = run(models, limiter, queries)
+    finally:
+        if registry is not None:
+            registry.close()
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.json:
+        payload = {**report, "_meta": {"argv": sys.argv[1:], "queries": len(queries)}}
+        args.json.write_text(json.dumps(payload, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""Startup-time benchmarks: how long until the CLI, workflow and first turn are ready.
+
+Every sample runs in a fresh interpreter, so module imports are measured the
+way a short-lived batch job or a CLI invocation pays them.
+
+Scenarios:
+    cli_version          `football-club --version` (must not import LangChain)
+    import_workflow      `import football_club.graph`
+    create_workflow_*    create_workflow() with real ChatGroq clients (no calls
+                         are made), lazy (default) vs eager agent construction
+    first_turn_*         create_workflow() + one offline turn (FakeChatModel)
+
+Usage:
+    uv run python benchmarks/bench_startup.py
+    uv run python benchmarks/bench_startup.py --runs 10 --json after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from bench_workflow import Result, print_report
+
+CREATE_WORKFLOW = """
+import time
+started = time.perf_counter()
+from football_club.config import Config
+from football_club.graph import create_workflow
+imported = time.perf_counter()
+create_workflow(Config(llm_cache_enabled=False, checkpoint_backend="memory", lazy_agents={lazy}))
+print((imported - started) * 1000, (time.perf_counter() - imported) * 1000)
+"""
+
+FIRST_TURN = """
+import time
+started = time.perf_counter()
+from langchain_core.messages import HumanMessage
+from football_club.config import Config
+from football_club.graph import create_workflow
+from football_club.testing import FakeModels
+config = Config(llm_cache_enabled=False, checkpoint_backend="memory", lazy_agents={lazy})
+workflow = create_workflow(config, llm_factory=FakeModels())
+ready = time.perf_counter()
+workflow.invoke(
+    {{"messages": [HumanMessage(content="¿Cuándo vuelve Pedri de su lesión?")]}},
+    {{"configurable": {{"thread_id": "t1"}}}},
+)
+print((ready - started) * 1000, (time.perf_counter() - ready) * 1000)
+"""
+
+
+def _run(args: list[str]) -> tuple[float, str]:
+    """Run a fresh interpreter; return its wall time (ms) and stdout."""
+    # ChatGroq only needs a key to be constructed; no request is ever sent
+    env = {**os.environ, "GROQ_API_KEY": os.getenv("GROQ_API_KEY") or "bench", "LOG_LEVEL": "ERROR"}
+    started = time.perf_counter()
+    done = subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+    return (time.perf_counter() - started) * 1000, done.stdout
+
+
+def bench_command(name: str, args: list[str], runs: int) -> Result:
+    return Result(name, [_run(args)[0] for _ in range(runs)])
+
+
+def bench_script(name: str, script: str, runs: int, phases: tuple[str, str]) -> Result:
+    samples: list[float] = []
+    inner: list[list[float]] = [[], []]
+    for _ in range(runs):
+        wall_ms, stdout = _run(["-c", script])
+        samples.append(wall_ms)
+        for i, value in enumerate(stdout.split()[-2:]):
+            inner[i].append(float(value))
+    extra = {
+        f"{phase}_p50_ms": round(sorted(values)[len(values) // 2], 3)
+        for phase, values in zip(phases, inner, strict=True)
+    }
+    return Result(name, samples, extra)
+
+
+def run(runs: int) -> dict[str, dict[str, Any]]:
+    results = [
+        bench_command("cli_version", ["-m", "football_club", "--version"], runs),
+        bench_command("import_workflow", ["-c", "import football_club.graph"], runs),
+    ]
+    for mode, lazy in (("lazy", True), ("eager", False)):
+        results.append(
+            bench_script(
+                f"create_workflow_{mode}",
+                CREATE_WORKFLOW.format(lazy=lazy),
+                runs,
+                ("import", "create"),
+            )
+        )
+        results.append(
+            bench_script(
+                f"first_turn_{mode}", FIRST_TURN.format(lazy=lazy), runs, ("ready", "turn")
+            )
+        )
+
+    report = {result.name: result.to_dict() for result in results}
+    report["derived"] = {
+        "lazy_create_saving_p50_ms": round(
+            report["create_workflow_eager"]["create_p50_ms"]
+            - report["create_workflow_lazy"]["create_p50_ms"],
+            3,
+        ),
+    }
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Procesos por escenario")
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    parser.add_argument("--compare", type=Path, help="JSON de una ejecución anterior")
+    args = parser.parse_args(argv)
+
+    report = run(args.runs)
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.json:
+        payload = {**report, "_meta": {"argv": sys.argv[1:]}}
+        args.json.write_text(json.dumps(payload, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
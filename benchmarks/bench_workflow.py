@@ -0,0 +1,254 @@
+"""Offline latency and memory benchmarks for the multi-agent workflow.
+
+Runs the real compiled graph with `FakeChatModel` agents (no API key, no
+network), so the numbers isolate our own overhead: routing, handoffs,
+subgraph invocation, checkpointing and state growth.
+
+Scenarios:
+    direct_turn        fast router → domain agent, fresh thread per turn
+    orchestrator_turn  orchestrator → handoff → domain agent (router disabled)
+    checkpoint_memory  turns in one thread with the in-memory checkpointer
+    checkpoint_sqlite  same with the SQLite checkpointer
+    long_conversation  N turns in one thread: latency drift and memory growth
+    many_threads       one turn in each of N threads (a new thread per "limpiar"):
+                       memory held with the in-memory vs the session checkpointer,
+                       and the latency of resuming a spilled thread
+
+Usage:
+    uv run python benchmarks/bench_workflow.py
+    uv run python benchmarks/bench_workflow.py --turns 200 --json after.json --compare before.json
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import HumanMessage
+
+from football_club.config import Config
+from football_club.graph import create_workflow
+from football_club.session_store import find_session_saver
+from football_club.testing import FakeModels
+
+QUESTIONS = [
+    "¿Cuándo vuelve Pedri de su lesión?",
+    "¿Cómo está el rendimiento del equipo en la liga?",
+    "¿Qué extremo deberíamos fichar de otro equipo?",
+    "¿Qué tal va la recuperación muscular de Gavi?",
+    "¿Cuántos goles lleva Lewandowski esta temporada?",
+]
+
+
+@dataclass
+class Result:
+    """Timings of one scenario (milliseconds per turn)."""
+
+    name: str
+    samples_ms: list[float] = field(repr=False)
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def mean_ms(self) -> float:
+        return statistics.fmean(self.samples_ms)
+
+    @property
+    def p50_ms(self) -> float:
+        return statistics.median(self.samples_ms)
+
+    @property
+    def p95_ms(self) -> float:
+        ordered = sorted(self.samples_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "mean_ms": round(self.mean_ms, 3),
+            "p50_ms": round(self.p50_ms, 3),
+            "p95_ms": round(self.p95_ms, 3),
+            "turns": len(self.samples_ms),
+            **self.extra,
+        }
+
+
+def _config(**overrides: Any) -> Config:
+    settings: dict[str, Any] = {
+        "llm_cache_enabled": False,
+        "checkpoint_backend": "memory",
+        "fast_router_enabled": True,
+    }
+    settings.update(overrides)
+    return Config(**settings)
+
+
+def _timed_turns(workflow: Any, turns: int, thread_id: Callable[[int], str]) -> list[float]:
+    samples = []
+    for i in range(turns):
+        config = {"configurable": {"thread_id": thread_id(i)}}
+        message = {"messages": [HumanMessage(content=QUESTIONS[i % len(QUESTIONS)])]}
+        started = time.perf_counter()
+        workflow.invoke(message, config)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _fresh_thread(_: int) -> str:
+    return str(uuid.uuid4())
+
+
+def bench_direct_turn(turns: int, latency_s: float) -> Result:
+    models = FakeModels(latency_s=latency_s)
+    workflow = create_workflow(_config(), llm_factory=models)
+    _timed_turns(workflow, 3, _fresh_thread)  # warm-up
+    samples = _timed_turns(workflow, turns, _fresh_thread)
+    return Result("direct_turn", samples, {"llm_calls": sum(models.calls().values())})
+
+
+def bench_orchestrator_turn(turns: int, latency_s: float) -> Result:
+    models = FakeModels(latency_s=latency_s)
+    workflow = create_workflow(_config(fast_router_enabled=False), llm_factory=models)
+    _timed_turns(workflow, 3, _fresh_thread)
+    samples = _timed_turns(workflow, turns, _fresh_thread)
+    return Result("orchestrator_turn", samples, {"llm_calls": sum(models.calls().values())})
+
+
+def bench_checkpointer(backend: str, turns: int, latency_s: float, tmp: Path) -> Result:
+    config = _config(
+        checkpoint_backend=backend, checkpoint_path=str(tmp / f"{uuid.uuid4().hex}.sqlite")
+    )
+    workflow = create_workflow(config, llm_factory=FakeModels(latency_s=latency_s))
+    thread = str(uuid.uuid4())
+    samples = _timed_turns(workflow, turns, lambda _: thread)
+    return Result(f"checkpoint_{backend}", samples)
+
+
+def bench_long_conversation(turns: int, latency_s: float, backend: str, tmp: Path) -> Result:
+    config = _config(
+        checkpoint_backend=backend, checkpoint_path=str(tmp / f"{uuid.uuid4().hex}.sqlite")
+    )
+    workflow = create_workflow(config, llm_factory=FakeModels(latency_s=latency_s))
+    thread = str(uuid.uuid4())
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    samples = _timed_turns(workflow, turns, lambda _: thread)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    window = max(1, turns // 10)
+    state = workflow.get_state({"configurable": {"thread_id": thread}}).values
+    extra: dict[str, Any] = {
+        "first_turns_ms": round(statistics.fmean(samples[:window]), 3),
+        "last_turns_ms": round(statistics.fmean(samples[-window:]), 3),
+        "memory_growth_kb": round((current - baseline) / 1024, 1),
+        "memory_per_turn_kb": round((current - baseline) / 1024 / turns, 2),
+        "memory_peak_kb": round((peak - baseline) / 1024, 1),
+        "messages": len(state["messages"]),
+    }
+    if backend == "sqlite":
+        extra["db_kb"] = round(Path(config.checkpoint_path).stat().st_size / 1024, 1)
+    return Result(f"long_conversation_{backend}", samples, extra)
+
+
+def bench_many_threads(threads: int, latency_s: float, backend: str, tmp: Path) -> Result:
+    config = _config(
+        checkpoint_backend=backend,
+        session_spill_path=str(tmp / f"{uuid.uuid4().hex}.sqlite"),
+        session_max_threads=64,
+    )
+    workflow = create_workflow(config, llm_factory=FakeModels(latency_s=latency_s))
+    ids = [str(uuid.uuid4()) for _ in range(threads)]
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    samples = _timed_turns(workflow, threads, ids.__getitem__)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Second turn in the oldest threads (rehydrated from disk with the session store)
+    resumed = _timed_turns(workflow, min(threads, 50), ids.__getitem__)
+
+    extra: dict[str, Any] = {
+        "memory_held_kb": round((current - baseline) / 1024, 1),
+        "memory_per_thread_kb": round((current - baseline) / 1024 / threads, 2),
+        "resume_p50_ms": round(statistics.median(resumed), 3),
+    }
+    if (store := find_session_saver(workflow.checkpointer)) is not None:
+        usage = store.usage()
+        extra["threads_in_memory"] = usage.threads_in_memory
+        extra["spilled_kb"] = round(usage.bytes_on_disk / 1024, 1)
+    return Result(f"many_threads_{backend}", samples, extra)
+
+
+def run(
+    turns: int, long_turns: int, latency_s: float, threads: int = 1000
+) -> dict[str, dict[str, Any]]:
+    results: list[Result] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        results.append(bench_direct_turn(turns, latency_s))
+        results.append(bench_orchestrator_turn(turns, latency_s))
+        results.append(bench_checkpointer("memory", turns, latency_s, tmp))
+        results.append(bench_checkpointer("sqlite", turns, latency_s, tmp))
+        results.append(bench_long_conversation(long_turns, latency_s, "memory", tmp))
+        results.append(bench_long_conversation(long_turns, latency_s, "sqlite", tmp))
+        results.append(bench_many_threads(threads, latency_s, "memory", tmp))
+        results.append(bench_many_threads(threads, latency_s, "session", tmp))
+
+    report = {result.name: result.to_dict() for result in results}
+    handoff = report["orchestrator_turn"]["p50_ms"] - report["direct_turn"]["p50_ms"]
+    report["derived"] = {
+        "handoff_cost_p50_ms": round(handoff, 3),
+        "sqlite_overhead_p50_ms": round(
+            report["checkpoint_sqlite"]["p50_ms"] - report["checkpoint_memory"]["p50_ms"], 3
+        ),
+    }
+    return report
+
+
+def print_report(report: dict[str, dict[str, Any]], baseline: dict[str, Any] | None) -> None:
+    for name, values in report.items():
+        print(f"\n{name}")
+        for key, value in values.items():
+            line = f"  {key:<22} {value}"
+            before = (baseline or {}).get(name, {}).get(key)
+            if isinstance(value, int | float) and isinstance(before, int | float) and before:
+                line += f"   (antes {before}, {100 * (value - before) / before:+.1f}%)"
+            print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--turns", type=int, default=50, help="Turnos por escenario")
+    parser.add_argument(
+        "--long-turns", type=int, default=100, help="Turnos de la conversación larga"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Latencia simulada por llamada LLM (s)"
+    )
+    parser.add_argument(
+        "--threads", type=int, default=1000, help="Conversaciones del escenario many_threads"
+    )
+    parser.add_argument("--json", type=Path, help="Guardar resultados en JSON")
+    parser.add_argument("--compare", type=Path, help="JSON de una ejecución anterior")
+    args = parser.parse_args(argv)
+
+    report = run(args.turns, args.long_turns, args.latency, args.threads)
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.json:
+        payload = {**report, "_meta": {"argv": sys.argv[1:]}}
+        args.json.write_text(json.dumps(payload, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,26 @@
 """Analyst agent for team performance and statistics analysis.
 
-Uses `create_agent` from langchain.agents with ChatGroq.
-Can only transfer back to orchestrator via `transfer_to_orchestrator`.
+Uses `create_agent` from langchain.agents with a pooled ChatGroq.
+Transfers back to orchestrator via `transfer_to_orchestrator`, or directly to
+a sibling domain agent with LATERAL_HANDOFFS.
 """
 
-import os
 from typing import Any
 
 from langchain.agents import create_agent
-from langchain_groq import ChatGroq
+from langchain_core.language_models import BaseChatModel
 from langgraph.graph.state import CompiledStateGraph
 
-from football_club.agents.tools import transfer_to_orchestrator
+from football_club.agents.context import EntityNoteMiddleware, create_context_middleware
+from football_club.agents.data_tools import analyst_data_tools, with_data_instruction
+from football_club.agents.llm import create_rate_limit_middleware, get_llm_registry
+from football_club.agents.tools import (
+    ForceAnswerMiddleware,
+    domain_handoff_tools,
+    domain_system_prompt,
+)
+from football_club.config import Config
+from football_club.state import AGENT_ANALYST
 
 ANALYST_SYSTEM_PROMPT = """Eres el analista técnico del F.C. Barcelona.
 
@@ -32,16 +41,37 @@ Responde en español, tono profesional y analítico.
 """
 
 
-def create_analyst_agent() -> CompiledStateGraph[Any, Any, Any, Any]:
-    """Create the analyst agent with transfer_to_orchestrator tool.
+def create_analyst_agent(
+    config: Config | None = None,
+    llm: BaseChatModel | None = None,
+) -> CompiledStateGraph[Any, Any, Any, Any]:
+    """Create the analyst agent with its handoff, squad statistics and match event tools.
+
+    Args:
+        config: Application configuration (context budget, Groq client, rate limits)
+        llm: Chat model to use instead of ChatGroq (e.g. an offline fake)
 
     Returns:
         Compiled agent ready for invocation.
     """
-    model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-    llm = ChatGroq(model=model, temperature=0)
+    config = config or Config()
+    data_tools = analyst_data_tools(config)
+    middleware = [
+        ForceAnswerMiddleware(),
+        EntityNoteMiddleware(),
+        *create_context_middleware(config, AGENT_ANALYST),
+    ]
+    if llm is None:
+        llm = get_llm_registry(config).chat_model(AGENT_ANALYST)
+        # Groq account limits apply to the pooled Groq clients only
+        middleware.extend(create_rate_limit_middleware(config))
     return create_agent(
         model=llm,
-        tools=[transfer_to_orchestrator],
-        system_prompt=ANALYST_SYSTEM_PROMPT,
+        tools=[*domain_handoff_tools(AGENT_ANALYST, config.lateral_handoffs), *data_tools],
+        system_prompt=domain_system_prompt(
+            with_data_instruction(ANALYST_SYSTEM_PROMPT, data_tools),
+            AGENT_ANALYST,
+            config.lateral_handoffs,
+        ),
+        middleware=middleware,
     )
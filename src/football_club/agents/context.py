@@ -0,0 +1,315 @@
+"""Per-agent context budget for model calls.
+
+Every agent call used to send the whole, ever-growing conversation to Groq,
+including the AIMessage/ToolMessage pair that each handoff re-emits. The
+`ContextWindowMiddleware` rewrites only the messages sent to the model (the
+checkpointed history stays complete):
+
+1. Handoff pairs (``transfer_to_*`` calls and their acks) from previous
+   turns are dropped; the ones of the current turn are kept so the agent
+   knows how the question reached it
+2. The last ``keep_turns`` turns (a user message and everything after it)
+   are sent verbatim, fewer if they do not fit in ``max_tokens``
+3. Older turns are folded into a short extractive summary appended to the
+   system prompt, newest lines first to survive the summary budget
+
+Token counts are estimated locally (~4 characters per token), no tokenizer
+or extra LLM call is involved.
+
+`EntityNoteMiddleware` adds the players and clubs resolved in the current
+question (see `football_club.data.entities`) to the system prompt, so the
+agent calls its tools with full names instead of asking who "Lewa" is.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from langchain.agents.middleware import AgentMiddleware, ModelRequest, ModelResponse
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage, SystemMessage, ToolMessage
+
+from football_club.agents.tools import HANDOFF_TOOL_PREFIX
+from football_club.config import Config
+from football_club.state import ResolvedEntity, message_entities
+
+logger = logging.getLogger("football_club")
+
+SUMMARY_HEADER = "## Resumen de la conversación anterior:"
+ENTITIES_HEADER = "## Jugadores y clubes de la pregunta:"
+ENTITIES_FOOTER = (
+    "Usa estos nombres completos con las herramientas; no pidas aclaración sobre ellos."
+)
+
+# Rough per-message overhead of the chat format (role, separators)
+_MESSAGE_OVERHEAD_TOKENS = 4
+_CHARS_PER_TOKEN = 4
+_SUMMARY_QUESTION_CHARS = 160
+_SUMMARY_ANSWER_CHARS = 240
+
+
+def estimate_tokens(messages: Sequence[AnyMessage]) -> int:
+    """Cheap token estimate for a list of messages."""
+    chars = 0
+    for msg in messages:
+        chars += len(msg.text)
+        if isinstance(msg, AIMessage):
+            chars += sum(len(tc["name"]) + len(str(tc["args"])) for tc in msg.tool_calls)
+    return chars // _CHARS_PER_TOKEN + _MESSAGE_OVERHEAD_TOKENS * len(messages)
+
+
+def _is_handoff_call(msg: AnyMessage) -> bool:
+    return (
+        isinstance(msg, AIMessage)
+        and bool(msg.tool_calls)
+        and all(tc["name"].startswith(HANDOFF_TOOL_PREFIX) for tc in msg.tool_calls)
+    )
+
+
+def drop_handoff_pairs(messages: Sequence[AnyMessage]) -> list[AnyMessage]:
+    """Remove handoff tool calls and the ToolMessages that acknowledge them."""
+    handoff_ids = {
+        tc["id"]
+        for msg in messages
+        if isinstance(msg, AIMessage) and _is_handoff_call(msg)
+        for tc in msg.tool_calls
+    }
+    return [
+        msg
+        for msg in messages
+        if not _is_handoff_call(msg)
+        and not (isinstance(msg, ToolMessage) and msg.tool_call_id in handoff_ids)
+    ]
+
+
+def split_turns(messages: Sequence[AnyMessage]) -> list[list[AnyMessage]]:
+    """Group messages into turns, each starting at a user message."""
+    turns: list[list[AnyMessage]] = []
+    for msg in messages:
+        if isinstance(msg, HumanMessage) or not turns:
+            turns.append([])
+        turns[-1].append(msg)
+    return turns
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+def summarize_turns(turns: Sequence[Sequence[AnyMessage]], max_tokens: int) -> str:
+    """Build an extractive summary (question → answer) of older turns.
+
+    Lines are added newest first and the oldest ones are dropped once
+    ``max_tokens`` is reached.
+    """
+    lines: list[str] = []
+    budget = max_tokens * _CHARS_PER_TOKEN - len(SUMMARY_HEADER)
+    for turn in reversed(turns):
+        question = next((m.text for m in turn if isinstance(m, HumanMessage)), "")
+        answer = next(
+            (
+                m.text
+                for m in reversed(turn)
+                if isinstance(m, AIMessage) and not m.tool_calls and m.text
+            ),
+            "",
+        )
+        if not question and not answer:
+            continue
+        line = f"- Usuario: {_clip(question, _SUMMARY_QUESTION_CHARS)}"
+        if answer:
+            line += f" → {_clip(answer, _SUMMARY_ANSWER_CHARS)}"
+        budget -= len(line) + 1
+        if budget < 0:
+            break
+        lines.append(line)
+    if not lines:
+        return ""
+    return "\n".join([SUMMARY_HEADER, *reversed(lines)])
+
+
+@dataclass(frozen=True)
+class CompactedContext:
+    """Result of fitting a history into a context budget."""
+
+    messages: list[AnyMessage]
+    summary: str
+    tokens_before: int
+    tokens_after: int
+    summarized_turns: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.tokens_before - self.tokens_after, 0)
+
+
+def compact_history(
+    messages: Sequence[AnyMessage],
+    max_tokens: int,
+    keep_turns: int,
+    max_summary_tokens: int,
+) -> CompactedContext:
+    """Fit ``messages`` into ``max_tokens`` (see module docstring)."""
+    tokens_before = estimate_tokens(messages)
+    turns = split_turns(messages)
+    if not turns:
+        return CompactedContext(list(messages), "", tokens_before, tokens_before, 0)
+
+    *previous, current = turns
+    previous = [turn for turn in (drop_handoff_pairs(t) for t in previous) if turn]
+    keep = min(max(keep_turns - 1, 0), len(previous))
+    folded, kept = previous[: len(previous) - keep], previous[len(previous) - keep :]
+    # Shed verbatim turns (oldest first) until the window fits the budget
+    while kept and estimate_tokens([m for t in (*kept, current) for m in t]) > max_tokens:
+        folded.append(kept.pop(0))
+
+    window = [m for t in (*kept, current) for m in t]
+    summary = summarize_turns(folded, max_summary_tokens) if folded else ""
+    tokens_after = estimate_tokens(window) + len(summary) // _CHARS_PER_TOKEN
+    return CompactedContext(window, summary, tokens_before, tokens_after, len(folded))
+
+
+@dataclass
+class ContextStats:
+    """Running totals of one agent's context compaction."""
+
+    calls: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+class ContextWindowMiddleware(AgentMiddleware):
+    """Apply a context budget to every model call of one agent.
+
+    Args:
+        agent_name: Agent the budget belongs to (used in logs)
+        max_tokens: Budget for the verbatim window sent to the model
+        keep_turns: Turns kept verbatim, the current one included
+        max_summary_tokens: Budget for the summary of older turns
+    """
+
+    def __init__(
+        self,
+        agent_name: str,
+        max_tokens: int = 4000,
+        keep_turns: int = 4,
+        max_summary_tokens: int = 400,
+    ) -> None:
+        super().__init__()
+        self.agent_name = agent_name
+        self.max_tokens = max_tokens
+        self.keep_turns = keep_turns
+        self.max_summary_tokens = max_summary_tokens
+        self.stats = ContextStats()
+
+    @property
+    def name(self) -> str:
+        return f"ContextWindow[{self.agent_name}]"
+
+    def _compact(self, request: ModelRequest) -> ModelRequest:
+        result = compact_history(
+            request.messages, self.max_tokens, self.keep_turns, self.max_summary_tokens
+        )
+        self.stats.calls += 1
+        self.stats.tokens_before += result.tokens_before
+        self.stats.tokens_after += result.tokens_after
+        if result.tokens_saved:
+            logger.debug(
+                "Context for %s: %d → %d tokens (saved %d, %d turns summarized)",
+                self.agent_name,
+                result.tokens_before,
+                result.tokens_after,
+                result.tokens_saved,
+                result.summarized_turns,
+            )
+        if not result.summary:
+            return request.override(messages=result.messages)
+        base = request.system_message.text if request.system_message else ""
+        system = SystemMessage(content=f"{base}\n\n{result.summary}".strip())
+        return request.override(messages=result.messages, system_message=system)
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> Any:
+        return handler(self._compact(request))
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> Any:
+        return await handler(self._compact(request))
+
+
+def _entity_label(entity: ResolvedEntity) -> str:
+    if entity["kind"] == "club":
+        return "nuestro club" if entity["ours"] else "club externo"
+    if entity["ours"]:
+        return "jugador de nuestra plantilla"
+    return f"jugador externo, {entity['club']}" if entity["club"] else "jugador externo"
+
+
+def entity_note(entities: Sequence[ResolvedEntity]) -> str:
+    """System prompt section listing the resolved ``entities`` (empty if none)."""
+    if not entities:
+        return ""
+    lines = [
+        f"- «{entity['mention']}» → {entity['name']} ({_entity_label(entity)})"
+        for entity in entities
+    ]
+    return "\n".join([ENTITIES_HEADER, *lines, ENTITIES_FOOTER])
+
+
+class EntityNoteMiddleware(AgentMiddleware):
+    """Append the entities resolved in the current question to the system prompt."""
+
+    def _annotate(self, request: ModelRequest) -> ModelRequest:
+        question = next(
+            (m for m in reversed(request.messages) if isinstance(m, HumanMessage)), None
+        )
+        note = entity_note(message_entities(question)) if question is not None else ""
+        if not note:
+            return request
+        base = request.system_message.text if request.system_message else ""
+        return request.override(system_message=SystemMessage(content=f"{base}\n\n{note}".strip()))
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> Any:
+        return handler(self._annotate(request))
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> Any:
+        return await handler(self._annotate(request))
+
+
+def create_context_middleware(config: Config, agent_name: str) -> list[AgentMiddleware]:
+    """Build the context budget middleware for ``agent_name`` (empty if disabled)."""
+    # Imported here: the LLM registry module imports this one for token estimates
+    from football_club.agents.llm import parse_agent_settings
+
+    if not config.context_enabled:
+        return []
+    budgets = parse_agent_settings(config.context_agent_budgets, int)
+    return [
+        ContextWindowMiddleware(
+            agent_name,
+            max_tokens=budgets.get(agent_name, config.context_max_tokens),
+            keep_turns=config.context_keep_turns,
+            max_summary_tokens=config.context_summary_tokens,
+        )
+    ]
@@ -0,0 +1,508 @@
+"""Data tools bound to the domain agents.
+
+Each factory turns a store from `football_club.data` into LangChain tools
+that return short Spanish text the model can quote. Query errors (unknown
+player, ambiguous name, bad season...) are returned as text so the model
+can correct itself instead of failing the turn. The `*_data_tools(config)`
+helpers return no tools when the store's path is not configured; NumPy
+and the stores are only imported when one is.
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from langchain.tools import BaseTool, tool
+
+from football_club.config import Config
+
+if TYPE_CHECKING:
+    from football_club.data.events import MatchEventStore
+    from football_club.data.injuries import Fixture, Injury, InjuryStore
+    from football_club.data.scouting import ScoutedPlayer, ScoutingIndex
+    from football_club.data.stats import SquadStats
+    from football_club.data.training_load import TrainingLoad, Workload
+
+DATA_TOOLS_INSTRUCTION = (
+    "## DATOS:\n"
+    "Tienes herramientas de datos del club. Úsalas para cualquier cifra concreta y cita sus "
+    "resultados; no inventes números. Si una herramienta devuelve un error, corrige los "
+    "argumentos o dilo al usuario."
+)
+
+
+def with_data_instruction(prompt: str, tools: list[BaseTool]) -> str:
+    """Append `DATA_TOOLS_INSTRUCTION` to ``prompt`` when the agent has data tools."""
+    return f"{prompt}\n{DATA_TOOLS_INSTRUCTION}\n" if tools else prompt
+
+
+def _number(value: float) -> str:
+    return f"{value:.0f}" if float(value).is_integer() else f"{value:.2f}"
+
+
+# --- Analyst: squad statistics ---
+
+
+def create_stats_tools(stats: "SquadStats") -> list[BaseTool]:
+    """Query tools over our squad's per-match statistics."""
+    from football_club.data.stats import METRICS, season_label
+
+    metrics = ", ".join(METRICS)
+
+    @tool
+    def squad_top_players(
+        metric: str,
+        n: int = 5,
+        season: str = "",
+        competition: str = "",
+        per90: bool = False,
+    ) -> str:
+        """Ranking de jugadores de NUESTRA plantilla por una métrica.
+
+        metric: goals, assists, xg, passes... (ver squad_player_stats). season: "2024/25"
+        (vacío = todas). competition: p. ej. "LaLiga" (vacío = todas). per90: ranking por
+        90 minutos (mínimo 270 minutos jugados).
+        """
+        try:
+            ranking = stats.top(metric, n, season or None, competition or None, per90)
+        except ValueError as e:
+            return str(e)
+        if not ranking:
+            return "Sin datos para esa selección."
+        unit = " por 90'" if per90 else ""
+        return "\n".join(
+            f"{i}. {player}: {_number(value)}{unit} ({minutes:.0f} min)"
+            for i, (player, value, minutes) in enumerate(ranking, 1)
+        )
+
+    @tool
+    def squad_player_stats(player: str, season: str = "", competition: str = "") -> str:
+        """Totales y valores por 90 minutos de un jugador de NUESTRA plantilla.
+
+        season: "2024/25" (vacío = todas). competition: p. ej. "Champions" (vacío = todas).
+        """
+        try:
+            totals = stats.totals(player, season or None, competition or None)
+        except ValueError as e:
+            return str(e)
+        lines = [f"{totals.player}: {totals.matches} partidos, {totals.minutes:.0f} minutos"]
+        lines.extend(
+            f"- {label}: {_number(totals.values[metric])} ({totals.per90(metric):.2f} por 90')"
+            for metric, label in METRICS.items()
+            if metric != "minutes" and totals.values[metric]
+        )
+        return "\n".join(lines)
+
+    @tool
+    def squad_compare_players(players: list[str], season: str = "", competition: str = "") -> str:
+        """Compara varios jugadores de NUESTRA plantilla (valores por 90 minutos)."""
+        try:
+            rows = stats.compare(players, season or None, competition or None)
+        except ValueError as e:
+            return str(e)
+        shown = [m for m in METRICS if m != "minutes" and any(r.values[m] for r in rows)]
+        header = "jugador | partidos | minutos | " + " | ".join(shown)
+        lines = [
+            f"{r.player} | {r.matches} | {r.minutes:.0f} | "
+            + " | ".join(f"{r.per90(m):.2f}" for m in shown)
+            for r in rows
+        ]
+        return "\n".join([header, *lines])
+
+    @tool
+    def squad_player_form(player: str, metric: str = "goals", window: int = 5) -> str:
+        """Forma reciente de un jugador: últimos 10 partidos con la media móvil de la métrica."""
+        try:
+            points = stats.form(player, metric, window)
+        except ValueError as e:
+            return str(e)
+        if not points:
+            return f"Sin partidos de {player}."
+        return "\n".join(
+            f"{p.date} ({p.competition}): {_number(p.value)} · media {window} partidos "
+            f"{p.rolling:.2f}"
+            for p in points
+        )
+
+    squad_top_players.description += f" Métricas: {metrics}."
+    seasons = ", ".join(season_label(int(s)) for s in stats.seasons)
+    squad_player_stats.description += f" Temporadas con datos: {seasons}."
+    return [squad_top_players, squad_player_stats, squad_compare_players, squad_player_form]
+
+
+def create_event_tools(events: "MatchEventStore") -> list[BaseTool]:
+    """Query tools over the aggregates of the ingested match event feeds.
+
+    Every query first ingests new or modified event files.
+    """
+    from football_club.data.events import EVENT_METRICS
+
+    metrics = ", ".join(EVENT_METRICS)
+
+    @tool
+    def match_events_top_players(
+        metric: str, n: int = 5, team: str = "", per_match: bool = False
+    ) -> str:
+        """Ranking de jugadores por una métrica de los eventos de partido (cualquier equipo).
+
+        team: p. ej. "FC Barcelona" (vacío = todos). per_match: media por partido.
+        """
+        events.refresh()
+        try:
+            ranking = events.top(metric, n, team or None, per_match)
+        except ValueError as e:
+            return str(e)
+        if not ranking:
+            return "Sin datos de eventos para esa selección."
+        unit = " por partido" if per_match else ""
+        return "\n".join(
+            f"{i}. {player}: {_number(value)}{unit} ({matches} partidos)"
+            for i, (player, value, matches) in enumerate(ranking, 1)
+        )
+
+    @tool
+    def match_events_player(player: str, last_matches: int = 0) -> str:
+        """Totales de un jugador según los eventos de partido (pases, progresivos, xG...).
+
+        last_matches: solo los últimos N partidos (0 = todos).
+        """
+        events.refresh()
+        try:
+            totals = events.player(player, last_matches)
+        except ValueError as e:
+            return str(e)
+        lines = [f"{totals.name}: {totals.matches} partidos con eventos"]
+        lines.extend(
+            f"- {label}: {_number(totals.values[metric])} "
+            f"({totals.per_match(metric):.2f} por partido)"
+            for metric, label in EVENT_METRICS.items()
+            if totals.values[metric]
+        )
+        return "\n".join(lines)
+
+    @tool
+    def match_events_team(team: str) -> str:
+        """Medias por partido de un equipo según los eventos, con el xG a favor y en contra."""
+        events.refresh()
+        try:
+            totals, conceded = events.team(team)
+        except ValueError as e:
+            return str(e)
+        lines = [
+            f"{totals.name}: {totals.matches} partidos · xG a favor {totals.values['xg']:.2f}, "
+            f"en contra {conceded:.2f}"
+        ]
+        lines.extend(
+            f"- {label}: {totals.per_match(metric):.2f} por partido"
+            for metric, label in EVENT_METRICS.items()
+            if totals.values[metric]
+        )
+        return "\n".join(lines)
+
+    @tool
+    def match_events_form(player: str, metric: str = "xg", window: int = 5) -> str:
+        """Forma reciente según los eventos: últimos 10 partidos con la media móvil."""
+        events.refresh()
+        try:
+            points = events.form(player, metric, window)
+        except ValueError as e:
+            return str(e)
+        return "\n".join(
+            f"{date or match}: {_number(value)} · media {window} partidos {rolling:.2f}"
+            for date, match, value, rolling in points
+        )
+
+    match_events_top_players.description += f" Métricas: {metrics}."
+    return [match_events_top_players, match_events_player, match_events_team, match_events_form]
+
+
+def analyst_data_tools(config: Config) -> list[BaseTool]:
+    """Squad statistics tools when SQUAD_STATS_PATH is set, event tools when MATCH_EVENTS_PATH is."""
+    tools: list[BaseTool] = []
+    if config.squad_stats_path:
+        from football_club.data.stats import load_squad_stats
+
+        tools += create_stats_tools(load_squad_stats(config.squad_stats_path))
+    if config.match_events_path:
+        from football_club.data.events import load_match_events
+
+        events = load_match_events(config.match_events_path, config.match_events_workers)
+        tools += create_event_tools(events)
+    return tools
+
+
+# --- Scout: player similarity ---
+
+
+def _scouted(player: "ScoutedPlayer") -> str:
+    from football_club.data.scouting import POSITION_LABELS
+
+    return (
+        f"{player.player} ({player.club}, {player.league}) · "
+        f"{POSITION_LABELS[player.position]}, {player.age:.0f} años, "
+        f"{player.market_value:.1f} M€, {player.minutes:.0f} min"
+    )
+
+
+def create_scouting_tools(index: "ScoutingIndex") -> list[BaseTool]:
+    """Similarity search tools over the scouting database."""
+    from football_club.data.scouting import FEATURES
+
+    @tool
+    def scout_similar_players(
+        player: str,
+        k: int = 10,
+        position: str = "",
+        max_age: float = 0,
+        league: str = "",
+        max_value: float = 0,
+        distance: str = "cosine",
+    ) -> str:
+        """Jugadores con un perfil estadístico parecido al de un jugador de referencia.
+
+        position: portero, defensa, centrocampista o delantero (vacío = cualquiera).
+        max_age: edad máxima (0 = sin límite). league: p. ej. "Serie A" (vacío = todas).
+        max_value: valor de mercado máximo en millones de euros (0 = sin límite).
+        distance: "cosine" (perfil) o "mahalanobis" (perfil y volumen).
+        """
+        try:
+            found = index.similar(
+                player,
+                k,
+                distance,
+                position=position or None,
+                max_age=max_age or None,
+                league=league or None,
+                max_value=max_value or None,
+            )
+        except ValueError as e:
+            return str(e)
+        if not found:
+            return "Ningún jugador cumple esos filtros."
+        return "\n".join(
+            f"{i}. {_scouted(p)} · similitud {p.score:.2f}" for i, p in enumerate(found, 1)
+        )
+
+    @tool
+    def scout_player_profile(player: str) -> str:
+        """Ficha de un jugador de la base de datos de scouting con sus métricas por 90 minutos."""
+        try:
+            profile = index.profile(player)
+            features = index.features(player)
+        except ValueError as e:
+            return str(e)
+        lines = [_scouted(profile)]
+        lines.extend(f"- {FEATURES[key]}: {value:.2f}" for key, value in features.items())
+        return "\n".join(lines)
+
+    return [scout_similar_players, scout_player_profile]
+
+
+def scout_data_tools(config: Config) -> list[BaseTool]:
+    """Scouting similarity tools when SCOUTING_INDEX_PATH is set."""
+    if not config.scouting_index_path:
+        return []
+    from football_club.data.scouting import load_scouting_index
+
+    return create_scouting_tools(load_scouting_index(config.scouting_index_path))
+
+
+# --- Medical: injury history ---
+
+
+def _injury(injury: "Injury") -> str:
+    back = f"vuelve el {injury.end}" if injury.end else "sin fecha de alta"
+    return f"{injury.player}: {injury.injury} (desde el {injury.start}, {back})"
+
+
+def create_injury_tools(store: "InjuryStore", fixtures: "Sequence[Fixture]" = ()) -> list[BaseTool]:
+    """Availability and injury history tools over the injury store.
+
+    Every query first merges the reports appended to the store's CSV since
+    the previous one.
+    """
+    from football_club.data.injuries import current_season, find_fixture
+    from football_club.data.stats import parse_season, season_label
+
+    @tool
+    def medical_availability(date: str = "", match: str = "") -> str:
+        """Jugadores disponibles y bajas de NUESTRA plantilla en una fecha o partido.
+
+        date: AAAA-MM-DD (vacío = hoy). match: rival del partido, p. ej. "Real Madrid"
+        (usa el próximo partido contra ese rival; tiene prioridad sobre date).
+        """
+        store.refresh()
+        try:
+            header = ""
+            if match:
+                if not fixtures:
+                    return "No hay calendario de partidos configurado; indica la fecha."
+                fixture = find_fixture(fixtures, match)
+                date = fixture.date
+                header = f"Partido contra {fixture.opponent} ({fixture.competition}), {date}\n"
+            out = store.out_on(date or None)
+            available = store.available_on(date or None)
+        except ValueError as e:
+            return str(e)
+        lines = [f"{header}Disponibles ({len(available)}): {', '.join(available) or '-'}"]
+        lines.append(f"Bajas ({len(out)}):")
+        lines.extend(f"- {_injury(injury)}" for injury in out)
+        return "\n".join(lines)
+
+    @tool
+    def medical_injury_history(player: str) -> str:
+        """Historial de lesiones de un jugador de NUESTRA plantilla."""
+        store.refresh()
+        try:
+            injuries = store.history(player)
+        except ValueError as e:
+            return str(e)
+        if not injuries:
+            return f"Sin lesiones registradas de {player}."
+        return "\n".join(f"- {_injury(injury)}" for injury in injuries)
+
+    @tool
+    def medical_days_lost(season: str = "") -> str:
+        """Días de baja por jugador en una temporada, de más a menos.
+
+        season: "2024/25" (vacío = la actual). Las bajas abiertas cuentan hasta hoy.
+        """
+        store.refresh()
+        try:
+            year = parse_season(season) if season else current_season()
+        except ValueError as e:
+            return str(e)
+        days = store.days_lost(year)
+        if not days:
+            return f"Sin días de baja en la temporada {season_label(year)}."
+        return "\n".join(f"{i}. {player}: {lost} días" for i, (player, lost) in enumerate(days, 1))
+
+    @tool
+    def medical_recurrences(player: str = "", window_days: int = 365) -> str:
+        """Recaídas: la misma lesión repetida en los window_days días siguientes al alta.
+
+        player: jugador de NUESTRA plantilla (vacío = todos).
+        """
+        store.refresh()
+        try:
+            found = store.recurrences(player or None, window_days)
+        except ValueError as e:
+            return str(e)
+        if not found:
+            return "Sin recaídas registradas."
+        return "\n".join(
+            f"- {r.player}: {r.injury} el {r.start}, {r.gap_days} días después del alta "
+            f"del {r.previous_end}"
+            for r in found
+        )
+
+    @tool
+    def medical_record_injury(
+        player: str, injury: str, start: str, expected_return: str = ""
+    ) -> str:
+        """Registra un parte médico nuevo o actualiza uno existente (mismo jugador y fecha).
+
+        start y expected_return: AAAA-MM-DD (expected_return vacío = sin fecha de alta).
+        Úsala solo cuando el usuario pida registrar o actualizar un parte.
+        """
+        try:
+            recorded = store.record(player, injury, start, expected_return or None)
+        except ValueError as e:
+            return str(e)
+        return f"Parte registrado. {_injury(recorded)}"
+
+    return [
+        medical_availability,
+        medical_injury_history,
+        medical_days_lost,
+        medical_recurrences,
+        medical_record_injury,
+    ]
+
+
+def _workload(w: "Workload") -> str:
+    if not w.ready:
+        return f"{w.player}: menos de 28 días de datos (carga aguda {w.acute:.0f} UA/día)"
+    acwr = "-" if w.acwr != w.acwr else f"{w.acwr:.2f}"
+    monotony = "-" if w.monotony != w.monotony else f"{w.monotony:.2f}"
+    return (
+        f"{w.player}: ACWR {acwr} (aguda {w.acute:.0f}, crónica {w.chronic:.0f} UA/día), "
+        f"monotonía {monotony}, strain {w.strain:.0f}"
+    )
+
+
+def create_training_load_tools(load: "TrainingLoad") -> list[BaseTool]:
+    """Workload and injury-risk tools over the GPS training load store.
+
+    Every query first merges new or rewritten exports.
+    """
+    from football_club.data.training_load import LOAD_METRICS
+
+    @tool
+    def medical_load_risk(date: str = "") -> str:
+        """Alertas de riesgo por carga de entrenamiento (ACWR, monotonía) de NUESTRA plantilla.
+
+        date: AAAA-MM-DD (vacío = hoy). ACWR = carga aguda (7 días) / crónica (28 días).
+        """
+        load.refresh()
+        try:
+            workloads = load.workload(date or None)
+        except ValueError as e:
+            return str(e)
+        flagged = [w for w in workloads if w.flags]
+        lines = [f"{_workload(w)} → {'; '.join(w.flags)}" for w in flagged]
+        if not lines:
+            lines.append(f"Sin alertas de carga ({len(workloads)} jugadores).")
+        pending = [w.player for w in workloads if not w.ready]
+        if pending:
+            lines.append(f"Sin historial suficiente (28 días): {', '.join(pending)}")
+        return "\n".join(lines)
+
+    @tool
+    def medical_player_load(player: str, date: str = "") -> str:
+        """Carga de entrenamiento de un jugador: indicadores y totales de los últimos 7 días.
+
+        date: AAAA-MM-DD (vacío = hoy).
+        """
+        load.refresh()
+        try:
+            code = load.players.resolve(player)
+            workload = load.workload(date or None)[code]
+            days = load.daily(player, date or None)
+        except ValueError as e:
+            return str(e)
+        lines = [_workload(workload)]
+        if workload.flags:
+            lines.append(f"Alertas: {'; '.join(workload.flags)}")
+        for day, values in days:
+            shown = [
+                f"{LOAD_METRICS[metric]} {_number(value)}"
+                for metric, value in values.items()
+                if value
+            ]
+            lines.append(f"- {day}: {', '.join(shown) or 'descanso'}")
+        return "\n".join(lines)
+
+    return [medical_load_risk, medical_player_load]
+
+
+def medical_data_tools(config: Config) -> list[BaseTool]:
+    """Injury tools when INJURIES_PATH is set, training load tools when TRAINING_LOAD_PATH is.
+
+    The squad from SQUAD_STATS_PATH, if any, is listed as available when not injured.
+    """
+    tools: list[BaseTool] = []
+    if config.injuries_path:
+        from football_club.data.injuries import load_fixtures, load_injury_store
+
+        squad: tuple[str, ...] = ()
+        if config.squad_stats_path:
+            from football_club.data.stats import load_squad_stats
+
+            squad = tuple(load_squad_stats(config.squad_stats_path).players.names)
+        fixtures = load_fixtures(config.fixtures_path) if config.fixtures_path else []
+        tools += create_injury_tools(load_injury_store(config.injuries_path, squad), fixtures)
+    if config.training_load_path:
+        from football_club.data.training_load import load_training_load
+
+        tools += create_training_load_tools(load_training_load(config.training_load_path))
+    return tools
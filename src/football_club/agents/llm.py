@@ -0,0 +1,421 @@
+"""Shared, pooled Groq clients for all agents.
+
+Each ChatGroq normally creates its own Groq SDK client, i.e. its own httpx
+connection pool and TLS sessions, so four agents under concurrency open
+four times the connections they need and repeat the handshakes. The
+`LLMClientRegistry` owns ONE sync and ONE async httpx client (keep-alive
+pool sized by GROQ_POOL_*) and hands out ChatGroq instances that all share
+them. It also resolves per-agent tiers (model, completion cap and timeout:
+GROQ_AGENT_MODELS, GROQ_AGENT_MAX_TOKENS, GROQ_AGENT_TIMEOUTS), so routing
+runs on a small fast model while answers keep GROQ_MODEL, and can pre-open
+connections so the first turn does not pay the handshake.
+
+`RateLimitMiddleware` routes every Groq call of every agent through the
+process-wide `football_club.ratelimit.RateLimiter` and retries 429s, 5xx
+and connection errors with jittered backoff (the SDK's own retries are
+turned off so they do not multiply). The budget is reserved by a request
+hook on the shared pools, when a call actually goes out to Groq, so
+answers served from the response cache neither wait nor spend RPM/TPM.
+
+The async pool is bound to the event loop that first uses it (the batch or
+server loop); one process runs one such loop.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Any, TypeVar
+
+import httpx
+from langchain.agents.middleware import AgentMiddleware, ModelRequest, ModelResponse
+from langchain_core.messages import AIMessage
+from langchain_groq import ChatGroq
+
+from football_club.agents.context import estimate_tokens
+from football_club.config import Config
+from football_club.metrics import current_turn
+from football_club.ratelimit import (
+    ProviderCall,
+    RateLimiter,
+    areserve_provider_call,
+    get_rate_limiter,
+    provider_call,
+    reserve_provider_call,
+    retry_delay,
+)
+
+logger = logging.getLogger("football_club")
+
+DEFAULT_GROQ_API_BASE = "https://api.groq.com"
+
+# Cheap authenticated endpoint used to open pooled connections ahead of time
+_PREWARM_PATH = "/openai/v1/models"
+
+# HTTP statuses worth retrying: rate limited, overloaded or transient server errors
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+T = TypeVar("T")
+
+
+def parse_agent_settings(spec: str, convert: Callable[[str], T]) -> dict[str, T]:
+    """Parse ``"orchestrator=llama-3.1-8b-instant,medical=..."`` into a value per agent."""
+    values: dict[str, T] = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        agent, sep, value = item.partition("=")
+        if not sep or not value.strip():
+            raise ValueError(f"Invalid agent setting {item!r}, expected agent=value")
+        try:
+            values[agent.strip()] = convert(value.strip())
+        except ValueError as e:
+            raise ValueError(f"Invalid agent setting {item!r}: {e}") from e
+    return values
+
+
+@dataclass(frozen=True)
+class AgentModelSettings:
+    """Model tier of one agent."""
+
+    model: str
+    max_tokens: int | None
+    timeout_s: float
+
+
+def _reserve_on_send(request: httpx.Request) -> None:
+    reserve_provider_call()
+
+
+async def _areserve_on_send(request: httpx.Request) -> None:
+    await areserve_provider_call()
+
+
+class LLMClientRegistry:
+    """Hand out ChatGroq models that share one keep-alive connection pool.
+
+    Args:
+        config: Pool size, timeouts, retries and per-agent model tiers
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.api_base = os.getenv("GROQ_API_BASE") or DEFAULT_GROQ_API_BASE
+        self.agent_models = parse_agent_settings(config.groq_agent_models, str)
+        self.agent_max_tokens = parse_agent_settings(config.groq_agent_max_tokens, int)
+        self.agent_timeouts = parse_agent_settings(config.groq_agent_timeouts, float)
+        self._limits = httpx.Limits(
+            max_connections=config.groq_pool_size,
+            max_keepalive_connections=config.groq_pool_keepalive,
+            keepalive_expiry=config.groq_keepalive_expiry,
+        )
+        self._timeout = httpx.Timeout(config.groq_timeout, connect=config.groq_connect_timeout)
+        self._lock = threading.Lock()
+        self._http_client: httpx.Client | None = None
+        self._async_http_client: httpx.AsyncClient | None = None
+
+    @property
+    def http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(
+                    limits=self._limits,
+                    timeout=self._timeout,
+                    event_hooks={"request": [_reserve_on_send]},
+                )
+            return self._http_client
+
+    @property
+    def async_http_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_http_client is None:
+                self._async_http_client = httpx.AsyncClient(
+                    limits=self._limits,
+                    timeout=self._timeout,
+                    event_hooks={"request": [_areserve_on_send]},
+                )
+            return self._async_http_client
+
+    def model_for(self, agent: str) -> str:
+        """Groq model of ``agent``: its override, else GROQ_MODEL."""
+        return self.agent_models.get(agent, self.config.groq_model)
+
+    def settings_for(self, agent: str) -> AgentModelSettings:
+        """Model, completion cap (None = provider default) and timeout of ``agent``."""
+        max_tokens = self.agent_max_tokens.get(agent, self.config.groq_max_tokens)
+        return AgentModelSettings(
+            model=self.model_for(agent),
+            max_tokens=max_tokens or None,
+            timeout_s=self.agent_timeouts.get(agent, self.config.groq_timeout),
+        )
+
+    def chat_model(self, agent: str, **kwargs: Any) -> ChatGroq:
+        """ChatGroq for ``agent`` on the shared pools (kwargs override defaults)."""
+        tier = self.settings_for(agent)
+        settings: dict[str, Any] = {
+            "model": tier.model,
+            "temperature": 0,
+            "max_tokens": tier.max_tokens,
+            # With the rate limiter on, RateLimitMiddleware owns the retries
+            "max_retries": 0 if self.config.rate_limit_enabled else self.config.groq_max_retries,
+            "request_timeout": tier.timeout_s,
+            "http_client": self.http_client,
+            "http_async_client": self.async_http_client,
+        }
+        if self.config.groq_api_key:
+            settings["api_key"] = self.config.groq_api_key
+        return ChatGroq(**{**settings, **kwargs})
+
+    # --- Pre-warming ---
+
+    def _prewarm_headers(self) -> dict[str, str]:
+        api_key = self.config.groq_api_key or os.getenv("GROQ_API_KEY", "")
+        return {"Authorization": f"Bearer {api_key}"}
+
+    def _open_connection(self) -> None:
+        try:
+            self.http_client.get(self.api_base + _PREWARM_PATH, headers=self._prewarm_headers())
+        except httpx.HTTPError as e:
+            logger.debug(f"Groq pre-warm failed: {e}")
+
+    def prewarm(self, connections: int | None = None, background: bool = True) -> None:
+        """Open ``connections`` pooled sync connections (in a daemon thread by default)."""
+        count = self.config.groq_prewarm if connections is None else connections
+        if count <= 0:
+            return
+
+        def run() -> None:
+            with ThreadPoolExecutor(max_workers=count) as pool:
+                for _ in range(count):
+                    pool.submit(self._open_connection)
+            logger.debug(f"Groq pool pre-warmed with {count} connection(s)")
+
+        if background:
+            threading.Thread(target=run, name="groq-prewarm", daemon=True).start()
+        else:
+            run()
+
+    async def aprewarm(self, connections: int | None = None) -> None:
+        """Open ``connections`` pooled async connections on the running loop."""
+        count = self.config.groq_prewarm if connections is None else connections
+        if count <= 0:
+            return
+        client = self.async_http_client
+        headers = self._prewarm_headers()
+
+        async def open_one() -> None:
+            try:
+                await client.get(self.api_base + _PREWARM_PATH, headers=headers)
+            except httpx.HTTPError as e:
+                logger.debug(f"Groq pre-warm failed: {e}")
+
+        await asyncio.gather(*(open_one() for _ in range(count)))
+        logger.debug(f"Groq async pool pre-warmed with {count} connection(s)")
+
+    def close(self) -> None:
+        """Close the sync pool (the async pool closes with its event loop)."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+
+
+def _retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for 408/429/5xx responses and connection errors or timeouts."""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    import groq
+
+    return isinstance(error, groq.APIConnectionError | httpx.TransportError)
+
+
+def _used_tokens(response: ModelResponse) -> int:
+    return sum(
+        m.usage_metadata["total_tokens"]
+        for m in response.result
+        if isinstance(m, AIMessage) and m.usage_metadata
+    )
+
+
+class RateLimitMiddleware(AgentMiddleware):
+    """Throttle and retry an agent's model calls through the shared limiter.
+
+    Args:
+        limiter: Process-wide limiter (RPM/TPM buckets, adaptive concurrency)
+        max_retries: Retries on 429/5xx/connection errors before giving up
+        backoff_base_s: First backoff delay, doubled per attempt
+        backoff_max_s: Backoff (and retry-after) cap
+        completion_tokens: Completion tokens reserved per call until usage is known
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        max_retries: int = 5,
+        backoff_base_s: float = 0.5,
+        backoff_max_s: float = 30.0,
+        completion_tokens: int = 300,
+    ) -> None:
+        super().__init__()
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.completion_tokens = completion_tokens
+
+    def _estimate(self, request: ModelRequest) -> int:
+        system = [request.system_message] if request.system_message else []
+        # A capped model (e.g. the routing tier) never completes more than its cap
+        cap = getattr(request.model, "max_tokens", None)
+        completion = min(self.completion_tokens, cap) if cap else self.completion_tokens
+        return estimate_tokens([*system, *request.messages]) + completion
+
+    def _backoff(self, error: Exception, attempt: int) -> float | None:
+        """Seconds to wait before retrying ``error``, or None to re-raise it."""
+        if not is_retryable(error):
+            return None
+        if attempt >= self.max_retries:
+            self.limiter.record_failure()
+            return None
+        retry_after = _retry_after(error)
+        status = getattr(error, "status_code", None)
+        self.limiter.throttle(retry_after, rate_limited=status == 429)
+        turn = current_turn()
+        if turn is not None:
+            turn.llm_retries += 1
+        # A retry-after pauses the shared limiter, so acquire() already waits it out
+        delay = (
+            0.0
+            if retry_after
+            else retry_delay(attempt, None, self.backoff_base_s, self.backoff_max_s)
+        )
+        logger.warning(
+            f"Groq call failed ({status or type(error).__name__}), retrying in "
+            f"{retry_after or delay:.1f}s (attempt {attempt + 1}/{self.max_retries})"
+        )
+        return delay
+
+    def _finish(self, call: ProviderCall, response: ModelResponse | None) -> None:
+        """Free what the attempt reserved at the provider (nothing on a cache hit)."""
+        if call.started is None:
+            return
+        turn = current_turn()
+        if turn is not None and call.waited:
+            turn.throttle_ms += call.waited * 1000
+        self.limiter.release(time.perf_counter() - call.started, success=response is not None)
+        if response is not None:
+            self.limiter.settle(call.tokens, _used_tokens(response))
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> Any:
+        tokens = self._estimate(request)
+        attempt = 0
+        while True:
+            with provider_call(self.limiter, tokens) as call:
+                try:
+                    response = handler(request)
+                except Exception as e:
+                    self._finish(call, None)
+                    delay = self._backoff(e, attempt)
+                    if delay is None:
+                        raise
+                else:
+                    self._finish(call, response)
+                    return response
+            time.sleep(delay)
+            attempt += 1
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> Any:
+        tokens = self._estimate(request)
+        attempt = 0
+        while True:
+            with provider_call(self.limiter, tokens) as call:
+                try:
+                    response = await handler(request)
+                except Exception as e:
+                    self._finish(call, None)
+                    delay = self._backoff(e, attempt)
+                    if delay is None:
+                        raise
+                else:
+                    self._finish(call, response)
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def create_rate_limit_middleware(config: Config) -> list[AgentMiddleware]:
+    """Middleware binding an agent's Groq calls to the shared limiter (empty if disabled)."""
+    if not config.rate_limit_enabled:
+        return []
+    return [
+        RateLimitMiddleware(
+            get_rate_limiter(config),
+            max_retries=config.groq_max_retries,
+            backoff_base_s=config.rate_limit_backoff_base,
+            backoff_max_s=config.rate_limit_backoff_max,
+            completion_tokens=config.rate_limit_completion_tokens,
+        )
+    ]
+
+
+_registry: LLMClientRegistry | None = None
+_registry_lock = threading.Lock()
+
+# Settings a registry is built from (the account limits belong to the rate limiter)
+REGISTRY_SETTINGS = (
+    *(f.name for f in fields(Config) if f.name.startswith("groq_")),
+    "rate_limit_enabled",
+)
+
+
+def get_llm_registry(config: Config | None = None) -> LLMClientRegistry:
+    """Process-wide registry, created from ``config`` on first use.
+
+    Raises:
+        ValueError: ``config`` differs from the one the registry was built
+            with (its models and pools are shared: `reset_llm_registry` first)
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMClientRegistry(config or Config())
+        elif config is not None and (
+            changed := _registry.config.differing(config, REGISTRY_SETTINGS)
+        ):
+            raise ValueError(
+                f"The Groq client registry was built with other settings ({', '.join(changed)}); "
+                "call reset_llm_registry() before using a new configuration"
+            )
+        return _registry
+
+
+def reset_llm_registry() -> None:
+    """Close and forget the process-wide registry (tests, config reloads)."""
+    global _registry
+    with _registry_lock:
+        if _registry is not None:
+            _registry.close()
+        _registry = None
@@ -1,22 +1,27 @@
 """Orchestrator triage agent for the football club multi-agent system.
 
 Uses `create_agent` with handoff tools to route conversations to the
-appropriate domain agent. This is the default active agent and the hub
-in the hub-and-spoke handoff architecture.
+appropriate domain agent (or to several at once for compound questions).
+This is the default active agent and the hub in the hub-and-spoke handoff
+architecture.
 """
 
-import os
 from typing import Any
 
 from langchain.agents import create_agent
-from langchain_groq import ChatGroq
+from langchain_core.language_models import BaseChatModel
 from langgraph.graph.state import CompiledStateGraph
 
+from football_club.agents.context import EntityNoteMiddleware, create_context_middleware
+from football_club.agents.llm import create_rate_limit_middleware, get_llm_registry
 from football_club.agents.tools import (
+    ForceAnswerMiddleware,
     transfer_to_analyst,
     transfer_to_medical,
     transfer_to_scout,
 )
+from football_club.config import Config
+from football_club.state import AGENT_ORCHESTRATOR
 
 ORCHESTRATOR_SYSTEM_PROMPT = """Eres el orquestador del F.C. Barcelona. Tu ÚNICA función es:
 1. Detectar el dominio de la pregunta del usuario
@@ -33,24 +38,43 @@ ORCHESTRATOR_SYSTEM_PROMPT = """Eres el orquestador del F.C. Barcelona. Tu ÚNIC
 - Solo responde tú directamente si es un saludo simple ("hola", "ey") o despedida.
 - Si el usuario dice "sí", "claro", "dale", "ok" después de que le mencionaste un agente, TRANSFIERE INMEDIATAMENTE.
 - Ante la duda, TRANSFIERE. Es mejor transferir de más que de menos.
+- Si la pregunta abarca VARIOS dominios (p. ej. el rendimiento de un jugador Y su lesión), llama a
+  TODAS las herramientas de transferencia necesarias a la vez, en la misma respuesta: los agentes
+  responden en paralelo y sus respuestas se combinan.
 
 Responde SIEMPRE en español y sé muy breve (máximo 1-2 frases) solo para saludos.
 """
 
 
-def create_orchestrator_agent() -> CompiledStateGraph[Any, Any, Any, Any]:
+def create_orchestrator_agent(
+    config: Config | None = None,
+    llm: BaseChatModel | None = None,
+) -> CompiledStateGraph[Any, Any, Any, Any]:
     """Create the orchestrator triage agent with handoff tools.
 
     The orchestrator is the default active agent and the only one that
     can transfer to domain agents (scout, analyst, medical).
 
+    Args:
+        config: Application configuration (context budget, Groq client, rate limits)
+        llm: Chat model to use instead of ChatGroq (e.g. an offline fake)
+
     Returns:
         Compiled agent ready for invocation.
     """
-    model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
-    llm = ChatGroq(model=model, temperature=0)
+    config = config or Config()
+    middleware = [
+        ForceAnswerMiddleware(),
+        EntityNoteMiddleware(),
+        *create_context_middleware(config, AGENT_ORCHESTRATOR),
+    ]
+    if llm is None:
+        llm = get_llm_registry(config).chat_model(AGENT_ORCHESTRATOR)
+        # Groq account limits apply to the pooled Groq clients only
+        middleware.extend(create_rate_limit_middleware(config))
     return create_agent(
         model=llm,
         tools=[transfer_to_scout, transfer_to_analyst, transfer_to_medical],
         system_prompt=ORCHESTRATOR_SYSTEM_PROMPT,
+        middleware=middleware,
     )
@@ -2,12 +2,18 @@
 
 Follows the official LangChain Handoffs pattern with hierarchical constraint:
 - Orchestrator can transfer to any domain agent (scout, analyst, medical)
-- Domain agents can ONLY transfer back to orchestrator
-- Domain agents NEVER transfer directly to each other
+- Domain agents transfer back to orchestrator; with LATERAL_HANDOFFS they may
+  also transfer directly to a sibling when the target domain is unambiguous,
+  saving the orchestrator hop (see `domain_handoff_tools`)
+- Several transfers in one message fan out to those agents in parallel
 """
 
-from langchain.messages import AIMessage, ToolMessage
-from langchain.tools import ToolRuntime, tool
+from collections.abc import Awaitable, Callable
+from typing import Any, NotRequired
+
+from langchain.agents.middleware import AgentMiddleware, AgentState, ModelRequest, ModelResponse
+from langchain.messages import AIMessage, SystemMessage, ToolMessage
+from langchain.tools import BaseTool, ToolRuntime, tool
 from langgraph.types import Command
 
 from football_club.state import (
@@ -17,6 +23,23 @@ from football_club.state import (
     AGENT_SCOUT,
 )
 
+# Acknowledgement recorded as the ToolMessage of each transfer
+TRANSFER_MESSAGES = {
+    AGENT_SCOUT: "Transferido al agente Scout",
+    AGENT_ANALYST: "Transferido al agente Analista",
+    AGENT_MEDICAL: "Transferido al agente Médico",
+    AGENT_ORCHESTRATOR: "Transferido de vuelta al orquestador",
+}
+
+
+# Name prefix of every handoff tool (``transfer_to_<agent>``)
+HANDOFF_TOOL_PREFIX = "transfer_to_"
+
+# Domain agents the orchestrator can transfer to, by transfer tool name
+_DOMAIN_TRANSFERS = {
+    f"{HANDOFF_TOOL_PREFIX}{agent}": agent for agent in (AGENT_SCOUT, AGENT_ANALYST, AGENT_MEDICAL)
+}
+
 
 def _build_handoff_command(
     runtime: ToolRuntime,
@@ -27,18 +50,43 @@ def _build_handoff_command(
 
     Extracts the last AIMessage (containing the tool call) and pairs it
     with a ToolMessage acknowledgement, following LangChain docs pattern.
+    No ``goto``: the parent graph's after-agent edge routes to the new
+    ``active_agent`` so the hop guard can cut handoff loops short.
+
+    When that AIMessage transfers to several domain agents at once (a
+    compound question), every call is acknowledged and the agents are
+    set as ``fanout`` instead, so the parent graph runs them in parallel.
+    Each parallel tool call builds the same Command.
     """
     last_ai_message = next(
         msg for msg in reversed(runtime.state["messages"]) if isinstance(msg, AIMessage)
     )
+    transfers = [tc for tc in last_ai_message.tool_calls if tc["name"] in _DOMAIN_TRANSFERS]
+    fanout = list(dict.fromkeys(_DOMAIN_TRANSFERS[tc["name"]] for tc in transfers))
+    if len(fanout) > 1:
+        acks = [
+            ToolMessage(
+                content=TRANSFER_MESSAGES[_DOMAIN_TRANSFERS[tc["name"]]], tool_call_id=tc["id"]
+            )
+            for tc in transfers
+        ]
+        return Command(
+            update={
+                "fanout": fanout,
+                "handoff_path": fanout,
+                "messages": [last_ai_message, *acks],
+            },
+            graph=Command.PARENT,
+        )
+
     tool_msg = ToolMessage(
         content=transfer_message,
         tool_call_id=runtime.tool_call_id,
     )
     return Command(
-        goto=target_agent,
         update={
             "active_agent": target_agent,
+            "handoff_path": [target_agent],
             "messages": [last_ai_message, tool_msg],
         },
         graph=Command.PARENT,
@@ -51,19 +99,19 @@ def _build_handoff_command(
 @tool
 def transfer_to_scout(runtime: ToolRuntime) -> Command:  # type: ignore[type-arg]
     """Transferir al agente Scout (ojeador de jugadores de otros equipos)."""
-    return _build_handoff_command(runtime, AGENT_SCOUT, "Transferido al agente Scout")
+    return _build_handoff_command(runtime, AGENT_SCOUT, TRANSFER_MESSAGES[AGENT_SCOUT])
 
 
 @tool
 def transfer_to_analyst(runtime: ToolRuntime) -> Command:  # type: ignore[type-arg]
     """Transferir al agente Analista (rendimiento y estadísticas del equipo)."""
-    return _build_handoff_command(runtime, AGENT_ANALYST, "Transferido al agente Analista")
+    return _build_handoff_command(runtime, AGENT_ANALYST, TRANSFER_MESSAGES[AGENT_ANALYST])
 
 
 @tool
 def transfer_to_medical(runtime: ToolRuntime) -> Command:  # type: ignore[type-arg]
     """Transferir al agente Médico deportivo (lesiones y recuperación)."""
-    return _build_handoff_command(runtime, AGENT_MEDICAL, "Transferido al agente Médico")
+    return _build_handoff_command(runtime, AGENT_MEDICAL, TRANSFER_MESSAGES[AGENT_MEDICAL])
 
 
 # --- Domain agent tool (can ONLY transfer back to orchestrator) ---
@@ -73,5 +121,116 @@ def transfer_to_medical(runtime: ToolRuntime) -> Command:  # type: ignore[type-a
 def transfer_to_orchestrator(runtime: ToolRuntime) -> Command:  # type: ignore[type-arg]
     """Transferir de vuelta al orquestador cuando la consulta no es de tu dominio."""
     return _build_handoff_command(
-        runtime, AGENT_ORCHESTRATOR, "Transferido de vuelta al orquestador"
+        runtime, AGENT_ORCHESTRATOR, TRANSFER_MESSAGES[AGENT_ORCHESTRATOR]
+    )
+
+
+# --- Lateral handoffs (domain agent → sibling domain agent) ---
+
+_SIBLING_TRANSFERS: dict[str, BaseTool] = {
+    AGENT_SCOUT: transfer_to_scout,
+    AGENT_ANALYST: transfer_to_analyst,
+    AGENT_MEDICAL: transfer_to_medical,
+}
+
+_SIBLING_DOMAINS = {
+    AGENT_SCOUT: "fichajes, scouting o jugadores de otros equipos",
+    AGENT_ANALYST: "estadísticas, rendimiento o táctica",
+    AGENT_MEDICAL: "lesiones, recuperación o estado físico",
+}
+
+
+def domain_handoff_tools(agent: str, lateral: bool = False) -> list[BaseTool]:
+    """Transfer tools of a domain agent.
+
+    Args:
+        agent: The domain agent the tools are bound to
+        lateral: Also bind the transfers to its sibling domain agents
+
+    Returns:
+        ``transfer_to_orchestrator``, followed by the sibling transfers when lateral.
+    """
+    siblings = [t for a, t in _SIBLING_TRANSFERS.items() if lateral and a != agent]
+    return [transfer_to_orchestrator, *siblings]
+
+
+def domain_system_prompt(prompt: str, agent: str, lateral: bool = False) -> str:
+    """Append the lateral handoff rules for ``agent`` to its system prompt."""
+    if not lateral:
+        return prompt
+    rules = "\n".join(
+        f"- Pregunta SOLO sobre {domain} → LLAMA a transfer_to_{sibling}"
+        for sibling, domain in _SIBLING_DOMAINS.items()
+        if sibling != agent
     )
+    return f"""{prompt}
+## TRANSFERENCIAS DIRECTAS (tienen prioridad sobre la regla anterior):
+Si la pregunta es clara y únicamente de otro dominio, transfiere directamente al agente de ese \
+dominio sin pasar por el orquestador:
+{rules}
+Si dudas, si la pregunta abarca varios dominios o es un saludo → LLAMA a transfer_to_orchestrator.
+"""
+
+
+# --- Forced answers (hop guard) ---
+
+FORCE_ANSWER_INSTRUCTION = (
+    "Responde directamente a la pregunta del usuario con la información disponible. "
+    "No puedes transferir la conversación."
+)
+
+
+FANOUT_INSTRUCTION = (
+    "La pregunta abarca varios dominios y otros agentes responden en paralelo sus partes. "
+    "Responde SOLO la parte de tu dominio, sin repetir la pregunta. "
+    "No puedes transferir la conversación."
+)
+
+
+def _tool_name(tool: Any) -> str:
+    return str(tool.get("name", "") if isinstance(tool, dict) else getattr(tool, "name", ""))
+
+
+class ForceAnswerState(AgentState):
+    """Agent state extended with the parent graph's ``force_answer`` and ``fanout``."""
+
+    force_answer: NotRequired[bool]
+    fanout: NotRequired[list[str]]
+
+
+class ForceAnswerMiddleware(AgentMiddleware):
+    """Strip the transfer tools when the hop guard forces an answer.
+
+    A forced agent loses every tool; an agent answering its part of a
+    fan-out only loses the transfer tools. Both flags are part of the parent
+    graph state; declaring them in the middleware's state schema makes them
+    visible inside the agent subgraph.
+    """
+
+    state_schema = ForceAnswerState
+
+    def _apply(self, request: ModelRequest) -> ModelRequest:
+        if request.state.get("force_answer"):
+            instruction, tools = FORCE_ANSWER_INSTRUCTION, []
+        elif request.state.get("fanout"):
+            instruction = FANOUT_INSTRUCTION
+            tools = [t for t in request.tools if not _tool_name(t).startswith(HANDOFF_TOOL_PREFIX)]
+        else:
+            return request
+        base = request.system_message.text if request.system_message else ""
+        system = SystemMessage(content=f"{base}\n\n{instruction}".strip())
+        return request.override(tools=tools, system_message=system)
+
+    def wrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], ModelResponse],
+    ) -> Any:
+        return handler(self._apply(request))
+
+    async def awrap_model_call(
+        self,
+        request: ModelRequest,
+        handler: Callable[[ModelRequest], Awaitable[ModelResponse]],
+    ) -> Any:
+        return await handler(self._apply(request))
@@ -0,0 +1,211 @@
+"""Parallel batch mode over JSONL question files.
+
+Each input line is a JSON object::
+
+    {"id": "q1", "question": "¿Cuándo vuelve Pedri?", "thread_id": "optional"}
+
+(``message`` is accepted as an alias of ``question``; ``id`` defaults to the
+line number). Each output line records the final answer, responding agent,
+handoff path and latency of one item.
+
+- A bounded pool of ``concurrency`` workers drives the shared compiled graph
+  with ``astream``; items that share a ``thread_id`` run one at a time in
+  input order so the conversation stays coherent
+- ``ordered=True`` writes results in input order, otherwise as they finish
+- Output is appended and flushed per item; re-running skips ids that already
+  have a successful result, so an interrupted batch resumes where it stopped
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TextIO
+
+from langchain_core.messages import HumanMessage
+from langgraph.graph.state import CompiledStateGraph
+
+from football_club.streaming import TurnEventParser
+
+logger = logging.getLogger("football_club")
+
+
+@dataclass
+class BatchItem:
+    """One question to run."""
+
+    index: int
+    item_id: str
+    question: str
+    thread_id: str
+
+
+@dataclass
+class BatchSummary:
+    """Counters reported when a batch finishes."""
+
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_s: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list)
+
+    @property
+    def p50_ms(self) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[len(ordered) // 2]
+
+
+def completed_ids(output_path: Path) -> set[str]:
+    """Ids that already have a successful result in ``output_path``."""
+    if not output_path.exists():
+        return set()
+    done = set()
+    with output_path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # partially written line from an interrupted run
+            if isinstance(record, dict) and "error" not in record:
+                done.add(str(record.get("id")))
+    return done
+
+
+def read_items(input_path: Path, shared_thread_id: str | None = None) -> Iterator[BatchItem]:
+    """Parse the input JSONL file lazily, one item per non-empty line."""
+    with input_path.open(encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{input_path}:{line_no}: invalid JSON ({e})") from e
+            question = record.get("question") or record.get("message")
+            if not question:
+                raise ValueError(f"{input_path}:{line_no}: missing 'question'")
+            yield BatchItem(
+                index=line_no,
+                item_id=str(record.get("id", line_no)),
+                question=str(question),
+                thread_id=str(shared_thread_id or record.get("thread_id") or uuid.uuid4()),
+            )
+
+
+async def run_item(
+    workflow: CompiledStateGraph,  # type: ignore[type-arg]
+    item: BatchItem,
+) -> dict[str, Any]:
+    """Run one question through the workflow and build its output record."""
+    config = {"configurable": {"thread_id": item.thread_id}}
+    input_state = {"messages": [HumanMessage(content=item.question)]}
+    parser = TurnEventParser()
+    record: dict[str, Any] = {
+        "id": item.item_id,
+        "question": item.question,
+        "thread_id": item.thread_id,
+    }
+    started = time.perf_counter()
+    try:
+        async for chunk in workflow.astream(  # type: ignore[call-overload]
+            input_state, config=config, stream_mode=["updates"], subgraphs=True
+        ):
+            for _event in parser.feed(chunk):
+                pass
+    except Exception as e:
+        record["error"] = str(e)
+    record.update(
+        {
+            "answer": parser.final_answer,
+            "agent": parser.responding_agent,
+            "path": parser.path,
+            "handoffs": max(len(parser.path) - 1, 0),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    )
+    return record
+
+
+class _OutputWriter:
+    """Write records as they finish or in input order."""
+
+    def __init__(self, out: TextIO, ordered: bool, indexes: list[int]) -> None:
+        self._out = out
+        self._ordered = ordered
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._order = iter(indexes)
+        self._next = next(self._order, None)
+
+    def add(self, index: int, record: dict[str, Any]) -> None:
+        if not self._ordered:
+            self._write(record)
+            return
+        self._pending[index] = record
+        while self._next is not None and self._next in self._pending:
+            self._write(self._pending.pop(self._next))
+            self._next = next(self._order, None)
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self._out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._out.flush()
+
+
+async def run_batch(
+    workflow: CompiledStateGraph,  # type: ignore[type-arg]
+    input_path: Path,
+    output_path: Path,
+    concurrency: int = 4,
+    ordered: bool = False,
+    shared_thread_id: str | None = None,
+) -> BatchSummary:
+    """Run every pending item of ``input_path`` and append results to ``output_path``."""
+    summary = BatchSummary()
+    done = completed_ids(output_path)
+    items = []
+    for item in read_items(input_path, shared_thread_id):
+        summary.total += 1
+        if item.item_id in done:
+            summary.skipped += 1
+        else:
+            items.append(item)
+
+    queue: asyncio.Queue[BatchItem] = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+    thread_locks: dict[str, asyncio.Lock] = {}
+    started = time.perf_counter()
+
+    with output_path.open("a", encoding="utf-8") as out:
+        writer = _OutputWriter(out, ordered, [item.index for item in items])
+
+        async def worker() -> None:
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                # Items are queued in input order, so per-thread locks keep
+                # shared conversations sequential
+                lock = thread_locks.setdefault(item.thread_id, asyncio.Lock())
+                async with lock:
+                    record = await run_item(workflow, item)
+                if "error" in record:
+                    summary.failed += 1
+                    logger.warning(f"Item {item.item_id} failed: {record['error']}")
+                else:
+                    summary.succeeded += 1
+                    summary.latencies_ms.append(record["latency_ms"])
+                writer.add(item.index, record)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+    summary.elapsed_s = time.perf_counter() - started
+    return summary
@@ -0,0 +1,362 @@
+"""LLM response cache shared by all agent chat models.
+
+Every agent runs ChatGroq with ``temperature=0``, so the same model, system
+prompt, tool schema and message history produce the same answer. This module
+plugs a two-tier cache under LangChain's chat model cache hook:
+
+- In-memory LRU with TTL (microsecond hits)
+- Optional on-disk SQLite tier that survives restarts
+
+Keys hash the ``llm_string`` (model name, parameters and bound tool schema)
+together with a normalized message history: message ids, provider metadata
+(timings, token usage) and insignificant whitespace are dropped, tool call
+ids are replaced by their order in the history, and user questions are
+case/punctuation-folded, so the same conversation replayed in another thread
+or session (handoffs included) still hits.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.messages import AIMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from football_club.config import Config
+
+logger = logging.getLogger("football_club")
+
+# Message fields that vary between identical exchanges and must not affect keys
+_VOLATILE_FIELDS = frozenset({"id", "response_metadata", "usage_metadata"})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of cache performance counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    disk_hits: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from either tier."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def _call_id(call_ids: dict[str, str], call_id: Any) -> Any:
+    """Stand-in for a tool call id: its position among the history's calls."""
+    if not isinstance(call_id, str):
+        return call_id
+    return call_ids.setdefault(call_id, f"call_{len(call_ids)}")
+
+
+def _normalize_node(node: Any, call_ids: dict[str, str]) -> Any:
+    """Recursively canonicalize serialized messages.
+
+    Volatile fields are dropped from message kwargs, tool call ids (random
+    per call, and fresh on every cache replay) become positional, text content
+    has its whitespace collapsed, and user questions are case- and
+    punctuation-folded so trivially rephrased FAQs ("¿Plantilla?" /
+    "plantilla") share an entry.
+    """
+    if isinstance(node, list):
+        return [_normalize_node(item, call_ids) for item in node]
+    if not isinstance(node, dict):
+        return node
+    normalized = {key: _normalize_node(value, call_ids) for key, value in node.items()}
+    kwargs = normalized.get("kwargs")
+    if isinstance(kwargs, dict):
+        kwargs = {k: v for k, v in kwargs.items() if k not in _VOLATILE_FIELDS}
+        extra = kwargs.get("additional_kwargs")
+        for calls in (
+            kwargs.get("tool_calls"),
+            isinstance(extra, dict) and extra.get("tool_calls"),
+        ):
+            for call in calls if isinstance(calls, list) else ():
+                if isinstance(call, dict) and "id" in call:
+                    call["id"] = _call_id(call_ids, call["id"])
+        if "tool_call_id" in kwargs:
+            kwargs["tool_call_id"] = _call_id(call_ids, kwargs["tool_call_id"])
+        content = kwargs.get("content")
+        if isinstance(content, str):
+            if kwargs.get("type") == "human":
+                content = " ".join(_WORD_RE.findall(content.casefold()))
+            kwargs["content"] = _WHITESPACE_RE.sub(" ", content).strip()
+        normalized["kwargs"] = kwargs
+    return normalized
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonicalize LangChain's serialized message history for keying."""
+    try:
+        parsed = json.loads(prompt)
+    except ValueError:
+        return _WHITESPACE_RE.sub(" ", prompt).strip()
+    return json.dumps(_normalize_node(parsed, {}), sort_keys=True, ensure_ascii=False)
+
+
+def make_cache_key(prompt: str, llm_string: str) -> str:
+    """Hash model/tool settings and the normalized history into a cache key."""
+    digest = hashlib.sha256()
+    digest.update(llm_string.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(normalize_prompt(prompt).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _fresh_copy(generations: Sequence[Generation]) -> list[Generation]:
+    """Return generations with new message and tool call ids.
+
+    A cached answer can be replayed into the same thread; reusing ids would
+    make `add_messages` overwrite the earlier message instead of appending.
+    """
+    fresh: list[Generation] = []
+    for gen in generations:
+        if isinstance(gen, ChatGeneration) and isinstance(gen.message, AIMessage):
+            msg = gen.message
+            tool_calls = [{**tc, "id": f"call_{uuid.uuid4().hex[:24]}"} for tc in msg.tool_calls]
+            additional_kwargs = {
+                k: v for k, v in msg.additional_kwargs.items() if k != "tool_calls"
+            }
+            gen = gen.model_copy(
+                update={
+                    "message": msg.model_copy(
+                        update={
+                            "id": None,
+                            "tool_calls": tool_calls,
+                            "additional_kwargs": additional_kwargs,
+                        }
+                    )
+                }
+            )
+        fresh.append(gen)
+    return fresh
+
+
+def _dump_generations(generations: Sequence[Generation]) -> str:
+    """Serialize generations to JSON for the disk tier."""
+    rows = []
+    for gen in generations:
+        row: dict[str, Any] = {"text": gen.text, "generation_info": gen.generation_info}
+        if isinstance(gen, ChatGeneration):
+            row["message"] = message_to_dict(gen.message)
+        rows.append(row)
+    return json.dumps(rows, ensure_ascii=False)
+
+
+def _load_generations(raw: str) -> list[Generation]:
+    """Rebuild generations serialized by `_dump_generations`."""
+    generations: list[Generation] = []
+    for row in json.loads(raw):
+        if "message" in row:
+            (message,) = messages_from_dict([row["message"]])
+            generations.append(
+                ChatGeneration(message=message, generation_info=row["generation_info"])
+            )
+        else:
+            generations.append(Generation(text=row["text"], generation_info=row["generation_info"]))
+    return generations
+
+
+class SQLiteCacheTier:
+    """Persistent cache tier backed by a local SQLite file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, now: float) -> str | None:
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] <= now:
+            self.delete(key)
+            return None
+        return str(row[0])
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, expires_at),
+        )
+        self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def purge_expired(self, now: float) -> int:
+        """Delete expired rows, returning how many were removed."""
+        cursor = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self._conn.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        self._conn.execute("DELETE FROM responses")
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResponseCache(BaseCache):
+    """Two-tier (memory LRU + optional SQLite) exact response cache.
+
+    Thread-safe; plug it in per model (``ChatGroq(cache=...)``) or globally
+    with `install_response_cache`.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600.0,
+        disk_path: str | Path | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = str(disk_path) if disk_path else None
+        self._entries: OrderedDict[str, tuple[float, list[Generation]]] = OrderedDict()
+        self._disk = SQLiteCacheTier(disk_path) if disk_path else None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._disk_hits = 0
+        if self._disk is not None:
+            self._disk.purge_expired(time.time())
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Look up a cached response, promoting disk hits to memory."""
+        key = make_cache_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return _fresh_copy(value)
+                del self._entries[key]
+                self._expirations += 1
+
+            if self._disk is not None:
+                raw = self._disk.get(key, now)
+                if raw is not None:
+                    value = _load_generations(raw)
+                    self._store(key, value, now)
+                    self._hits += 1
+                    self._disk_hits += 1
+                    return _fresh_copy(value)
+
+            self._misses += 1
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store a response in memory and, if configured, on disk."""
+        key = make_cache_key(prompt, llm_string)
+        now = time.time()
+        value = list(return_val)
+        with self._lock:
+            self._store(key, value, now)
+            if self._disk is not None:
+                self._disk.set(key, _dump_generations(value), now + self.ttl_seconds)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Drop every entry from both tiers (stats are kept)."""
+        with self._lock:
+            self._entries.clear()
+            if self._disk is not None:
+                self._disk.clear()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of hit/miss/eviction counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                disk_hits=self._disk_hits,
+                size=len(self._entries),
+            )
+
+    def close(self) -> None:
+        """Close the disk tier connection, if any."""
+        if self._disk is not None:
+            self._disk.close()
+
+    def _store(self, key: str, value: list[Generation], now: float) -> None:
+        """Insert into the memory tier, evicting least-recently-used entries."""
+        self._entries[key] = (now + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+
+def install_response_cache(config: Config) -> ResponseCache | None:
+    """Register the response cache as LangChain's global chat model cache.
+
+    An installed cache with the same settings is kept (every workflow built
+    in the process shares it); one with other settings is closed and replaced.
+
+    Returns:
+        The installed cache, or None when caching is disabled
+    """
+    current = get_llm_cache()
+    if isinstance(current, ResponseCache):
+        settings = (config.llm_cache_max_entries, config.llm_cache_ttl_seconds)
+        if (
+            config.llm_cache_enabled
+            and (current.max_entries, current.ttl_seconds) == settings
+            and current.disk_path == (config.llm_cache_path or None)
+        ):
+            return current
+        current.close()
+    if not config.llm_cache_enabled:
+        set_llm_cache(None)
+        return None
+    cache = ResponseCache(
+        max_entries=config.llm_cache_max_entries,
+        ttl_seconds=config.llm_cache_ttl_seconds,
+        disk_path=config.llm_cache_path or None,
+    )
+    set_llm_cache(cache)
+    logger.debug(
+        "LLM response cache enabled (max_entries=%d, ttl=%.0fs, disk=%s)",
+        config.llm_cache_max_entries,
+        config.llm_cache_ttl_seconds,
+        config.llm_cache_path or "off",
+    )
+    return cache
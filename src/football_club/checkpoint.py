@@ -0,0 +1,608 @@
+"""Persistent, compact SQLite checkpointer.
+
+Drop-in replacement for `MemorySaver` that keeps conversations across
+restarts while keeping both disk and memory usage flat:
+
+- Single local SQLite file in WAL mode (concurrent readers, cheap commits)
+- Binary serialization (the saver's msgpack serde) with zlib compression
+  for larger payloads, instead of JSON per step
+- Channel-level deltas: a checkpoint only stores blobs for the channels
+  whose version changed, like `InMemorySaver`
+- List-level deltas: append-only list channels such as ``messages`` store
+  only the appended tail relative to the previous version, with a full
+  snapshot every ``snapshot_every`` versions to bound the replay chain;
+  the last list of at most ``max_cached_lists`` channels is kept in memory
+  to compute the next delta (a cache miss just stores a full snapshot)
+- Retention: every ``prune_every`` checkpoints a thread is pruned down to
+  its last ``keep_last`` root checkpoints (subgraph namespaces included)
+"""
+
+import asyncio
+import logging
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+    writes_sort_key,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+from football_club.config import Config
+from football_club.session_store import SessionSaver
+
+logger = logging.getLogger("football_club")
+
+# Payloads above this size are zlib-compressed
+_COMPRESS_MIN_BYTES = 256
+_ZLIB_PREFIX = "z:"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    base_version TEXT,
+    type TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data BLOB NOT NULL,
+    task_path TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+# Blob kinds
+_FULL = "full"
+_DELTA = "delta"
+_EMPTY = "empty"
+
+
+class SQLiteSaver(BaseCheckpointSaver[str]):
+    """Checkpointer backed by a local SQLite file.
+
+    Args:
+        path: Database file (created with its parent directory if missing)
+        keep_last: Root checkpoints kept per thread by automatic pruning
+            (0 disables automatic pruning)
+        prune_every: Run automatic pruning after this many root checkpoints
+        snapshot_every: Maximum list-delta chain length before a full snapshot
+        max_cached_lists: List channels (across threads) whose last value is
+            kept in memory to compute deltas, least recently used evicted
+        serde: Serializer (defaults to the LangGraph msgpack serializer)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        keep_last: int = 20,
+        prune_every: int = 32,
+        snapshot_every: int = 16,
+        max_cached_lists: int = 256,
+        serde: SerializerProtocol | None = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.max_cached_lists = max_cached_lists
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.keep_last = keep_last
+        self.prune_every = prune_every
+        self.snapshot_every = snapshot_every
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.RLock()
+        # (thread, ns, channel) → (version, list value, delta chain length)
+        self._last_lists: OrderedDict[tuple[str, str, str], tuple[str, list[Any], int]] = (
+            OrderedDict()
+        )
+        self._puts_since_prune: dict[str, int] = {}
+
+    # --- Encoding ---
+
+    def _encode(self, value: Any) -> tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        if len(data) >= _COMPRESS_MIN_BYTES:
+            return _ZLIB_PREFIX + type_, zlib.compress(data)
+        return type_, data
+
+    def _decode(self, type_: str, data: bytes) -> Any:
+        if type_.startswith(_ZLIB_PREFIX):
+            return self.serde.loads_typed((type_.removeprefix(_ZLIB_PREFIX), zlib.decompress(data)))
+        return self.serde.loads_typed((type_, data))
+
+    # --- Blobs ---
+
+    def _store_blob(self, thread_id: str, ns: str, channel: str, version: str, value: Any) -> None:
+        key = (thread_id, ns, channel)
+        kind, base_version, payload = _FULL, None, value
+        if isinstance(value, list):
+            previous = self._last_lists.get(key)
+            if previous is not None:
+                prev_version, prev_value, chain = previous
+                if (
+                    chain < self.snapshot_every
+                    and len(value) >= len(prev_value)
+                    and value[: len(prev_value)] == prev_value
+                ):
+                    kind, base_version = _DELTA, prev_version
+                    payload = value[len(prev_value) :]
+                    self._last_lists[key] = (version, list(value), chain + 1)
+            if kind == _FULL:
+                self._last_lists[key] = (version, list(value), 0)
+            self._last_lists.move_to_end(key)
+            while len(self._last_lists) > self.max_cached_lists:
+                self._last_lists.popitem(last=False)
+        type_, data = self._encode(payload)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (thread_id, ns, channel, version, kind, base_version, type_, data),
+        )
+
+    def _load_blob(self, thread_id: str, ns: str, channel: str, version: str) -> tuple[bool, Any]:
+        """Return (found, value), replaying list deltas back to a full snapshot."""
+        tails: list[list[Any]] = []
+        current: str | None = version
+        while current is not None:
+            row = self._conn.execute(
+                "SELECT kind, base_version, type, data FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, ns, channel, current),
+            ).fetchone()
+            if row is None:
+                return False, None
+            kind, base_version, type_, data = row
+            if kind == _EMPTY:
+                return False, None
+            value = self._decode(type_, data)
+            if kind == _FULL:
+                for tail in reversed(tails):
+                    value = [*value, *tail]
+                return True, value
+            tails.append(value)
+            current = base_version
+        return False, None
+
+    def _load_channel_values(
+        self, thread_id: str, ns: str, versions: ChannelVersions
+    ) -> dict[str, Any]:
+        values: dict[str, Any] = {}
+        for channel, version in versions.items():
+            found, value = self._load_blob(thread_id, ns, channel, str(version))
+            if found:
+                values[channel] = value
+        return values
+
+    # --- Reads ---
+
+    def _row_to_tuple(self, row: sqlite3.Row | tuple[Any, ...]) -> CheckpointTuple:
+        thread_id, ns, checkpoint_id, parent_id, type_, data, meta_type, meta = row
+        checkpoint: Checkpoint = self._decode(type_, data)
+        writes = self._conn.execute(
+            "SELECT task_id, idx, channel, type, data, task_path FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, ns, checkpoint_id),
+        ).fetchall()
+        writes.sort(key=lambda w: writes_sort_key(w[5], w[0], w[1]))
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(
+                    thread_id, ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=self._decode(meta_type, meta),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+            pending_writes=[(w[0], w[2], self._decode(w[3], w[4])) for w in writes],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Fetch a checkpoint (the latest one if no checkpoint_id is given)."""
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        columns = (
+            "thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata"
+        )
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, ns),
+                ).fetchone()
+            return self._row_to_tuple(row) if row else None
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints, newest first."""
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+            "type, checkpoint, metadata_type, metadata FROM checkpoints"
+        )
+        clauses: list[str] = []
+        params: list[Any] = []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            results: list[CheckpointTuple] = []
+            for row in rows:
+                if limit is not None and len(results) >= limit:
+                    break
+                if filter:
+                    metadata = self._decode(row[6], row[7])
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                results.append(self._row_to_tuple(row))
+        yield from results
+
+    # --- Writes ---
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint and the blobs of channels that changed."""
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"]["checkpoint_ns"]
+        stored = checkpoint.copy()
+        values: dict[str, Any] = stored.pop("channel_values")  # type: ignore[misc]
+        with self._lock:
+            for channel, version in new_versions.items():
+                if channel in values:
+                    self._store_blob(thread_id, ns, channel, str(version), values[channel])
+                else:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, NULL, '', x'')",
+                        (thread_id, ns, channel, str(version), _EMPTY),
+                    )
+            type_, data = self._encode(stored)
+            meta_type, meta = self._encode(get_checkpoint_metadata(config, metadata))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    data,
+                    meta_type,
+                    meta,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+            if ns == "":
+                self._maybe_prune(thread_id)
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store intermediate writes linked to a checkpoint."""
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self._encode(value)
+            write_idx = WRITES_IDX_MAP.get(channel, idx)
+            rows.append(
+                (thread_id, ns, checkpoint_id, task_id, write_idx, channel, type_, data, task_path)
+            )
+        # Special writes (errors, interrupts) are replaced; regular ones are kept once
+        special = [row for row in rows if row[4] < 0]
+        regular = [row for row in rows if row[4] >= 0]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", special
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", regular
+            )
+            self._conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint, write and blob of a thread."""
+        with self._lock:
+            for table in ("checkpoints", "blobs", "writes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+            for key in [k for k in self._last_lists if k[0] == thread_id]:
+                del self._last_lists[key]
+            self._puts_since_prune.pop(thread_id, None)
+
+    # --- Retention ---
+
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        """Prune threads: ``keep_latest`` keeps only the newest root checkpoint."""
+        for thread_id in thread_ids:
+            if strategy == "delete":
+                self.delete_thread(thread_id)
+            else:
+                self.prune_thread(thread_id, keep_last=1)
+
+    def prune_thread(self, thread_id: str, keep_last: int) -> int:
+        """Keep the newest ``keep_last`` root checkpoints of a thread.
+
+        Older checkpoints in every namespace (subgraph runs included), their
+        writes, and blobs no longer reachable from a kept checkpoint are
+        deleted.
+
+        Returns:
+            Number of checkpoints deleted
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = '' "
+                "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+                (thread_id, max(keep_last, 1) - 1),
+            ).fetchone()
+            if row is None:
+                return 0
+            cutoff = row[0]
+            deleted = self._conn.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_id < ?",
+                (thread_id, cutoff),
+            ).rowcount
+            self._conn.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_id < ?",
+                (thread_id, cutoff),
+            )
+            self._collect_blobs(thread_id)
+            self._conn.commit()
+            return deleted
+
+    def prune_idle_threads(self, max_idle_seconds: float) -> tuple[str, ...]:
+        """Delete threads whose newest checkpoint is older than ``max_idle_seconds``."""
+        cutoff = time.time() - max_idle_seconds
+        with self._lock:
+            idle = tuple(
+                r[0]
+                for r in self._conn.execute(
+                    "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?",
+                    (cutoff,),
+                ).fetchall()
+            )
+        for thread_id in idle:
+            self.delete_thread(thread_id)
+        return idle
+
+    def _collect_blobs(self, thread_id: str) -> None:
+        """Delete blobs unreachable from the thread's remaining checkpoints."""
+        live: set[tuple[str, str, str]] = set()
+        for ns, type_, data in self._conn.execute(
+            "SELECT checkpoint_ns, type, checkpoint FROM checkpoints WHERE thread_id = ?",
+            (thread_id,),
+        ).fetchall():
+            for channel, version in self._decode(type_, data)["channel_versions"].items():
+                live.add((ns, channel, str(version)))
+
+        # Keep the base versions that live list deltas replay from
+        bases = {
+            (ns, channel, version): base
+            for ns, channel, version, base in self._conn.execute(
+                "SELECT checkpoint_ns, channel, version, base_version FROM blobs "
+                "WHERE thread_id = ? AND kind = ?",
+                (thread_id, _DELTA),
+            ).fetchall()
+        }
+        pending = list(live)
+        while pending:
+            ns, channel, version = pending.pop()
+            base = bases.get((ns, channel, version))
+            if base is not None and (ns, channel, base) not in live:
+                live.add((ns, channel, base))
+                pending.append((ns, channel, base))
+
+        stale = [
+            (thread_id, ns, channel, version)
+            for ns, channel, version in self._conn.execute(
+                "SELECT checkpoint_ns, channel, version FROM blobs WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchall()
+            if (ns, channel, version) not in live
+        ]
+        self._conn.executemany(
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? "
+            "AND channel = ? AND version = ?",
+            stale,
+        )
+        for key in [k for k in self._last_lists if k[0] == thread_id]:
+            if (key[1], key[2], self._last_lists[key][0]) not in live:
+                del self._last_lists[key]
+
+    def _maybe_prune(self, thread_id: str) -> None:
+        if self.keep_last <= 0:
+            return
+        # A thread seen for the first time in this process is pruned right
+        # away, so short-lived processes (CLI runs, batches) stay bounded too
+        count = self._puts_since_prune.get(thread_id, self.prune_every - 1) + 1
+        if count >= self.prune_every:
+            self.prune_thread(thread_id, self.keep_last)
+            count = 0
+        self._puts_since_prune[thread_id] = count
+
+    def get_next_version(self, current: str | None, channel: None) -> str:
+        """Monotonic string versions, compatible with `InMemorySaver`."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- Async API (SQLite calls run in a worker thread) ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def aprune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        await asyncio.to_thread(self.prune, thread_ids, strategy=strategy)
+
+
+def create_checkpointer(config: Config) -> BaseCheckpointSaver[str]:
+    """Build the checkpointer selected by ``CHECKPOINT_BACKEND``."""
+    if config.checkpoint_backend == "memory":
+        return MemorySaver()
+    if config.checkpoint_backend == "session":
+        return SessionSaver(
+            config.session_spill_path,
+            max_threads=config.session_max_threads,
+            max_bytes=int(config.session_max_mb * 1024 * 1024),
+            idle_seconds=config.session_idle_seconds,
+            keep_last=config.checkpoint_keep_last,
+        )
+    if config.checkpoint_backend == "sqlite":
+        saver = SQLiteSaver(config.checkpoint_path, keep_last=config.checkpoint_keep_last)
+        if config.checkpoint_max_idle_days > 0:
+            # Every CLI start, "limpiar" and server session opens a new thread
+            idle = saver.prune_idle_threads(config.checkpoint_max_idle_days * 86400)
+            if idle:
+                logger.info(
+                    f"Deleted {len(idle)} conversations idle for over "
+                    f"{config.checkpoint_max_idle_days:g} days"
+                )
+        return saver
+    raise ValueError(f"Unknown checkpoint backend: {config.checkpoint_backend!r}")
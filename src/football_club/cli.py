@@ -4,37 +4,58 @@ Uses LangGraph streaming to display real-time colored logs of:
 - Agent activity (cyan)
 - Tool usage (yellow)
 - Handoff events (magenta)
+
+Answers are streamed token by token (messages mode) unless --no-stream is given.
+With --profile, each answer is followed by a per-turn timing, token and cost
+breakdown (DIM).
+
+LangChain, LangGraph and Groq are imported inside the commands that use them,
+so --help and --version start instantly.
 """
 
-import os
+import argparse
+import asyncio
 import sys
+import time
 import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
-from langchain_core.messages import AIMessage, HumanMessage
-from langgraph.graph.state import CompiledStateGraph
 
+from football_club import __version__
 from football_club.cli_colors import (
     Colors,
+    format_agent_prefix,
     format_agent_response,
     log_agent_active,
     log_error,
     log_handoff,
+    log_profile,
     log_system,
     log_tool_call,
 )
 from football_club.config import Config
-from football_club.graph import create_workflow
 from football_club.logging import setup_logging
 
+if TYPE_CHECKING:
+    from langchain_core.callbacks import BaseCallbackHandler
+    from langgraph.graph.state import CompiledStateGraph
+
+
+def print_banner(models: dict[str, str]) -> None:
+    """Print welcome banner.
 
-def print_banner() -> None:
-    """Print welcome banner."""
-    model = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+    Args:
+        models: Groq model resolved for each agent (see `LLMClientRegistry.model_for`)
+    """
+    router = models.get("orchestrator", "")
+    answers = ", ".join(dict.fromkeys(m for a, m in models.items() if a != "orchestrator"))
     banner = f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║          FOOTBALL CLUB - Sistema Multi-Agente               ║
-║          Modelo: {model:<42}║
+║          Modelo: {answers:<42}║
+║          Router: {router:<42}║
 ║                                                              ║
 ║  Agentes disponibles:                                        ║
 ║   🔍 Scout      - Ojeador de jugadores externos             ║
@@ -50,79 +71,91 @@ def print_banner() -> None:
 
 
 def _process_stream_events(
-    workflow: CompiledStateGraph,  # type: ignore[type-arg]
+    workflow: "CompiledStateGraph",  # type: ignore[type-arg]
     user_input: str,
     thread_id: str,
+    stream_tokens: bool = True,
+    callbacks: "list[BaseCallbackHandler] | None" = None,
 ) -> None:
     """Stream workflow events and display colored logs in real-time.
 
-    Uses workflow.stream() to capture each node's output as it happens,
-    then parses messages for tool calls and handoff events.
+    Streams node updates (agent, tool and handoff logs) and, when
+    ``stream_tokens`` is set, LLM tokens in messages mode so the answer is
+    printed as it is generated instead of after the node finishes.
     """
-    config = {"configurable": {"thread_id": thread_id}}
-    input_state = {"messages": [HumanMessage(content=user_input)]}
-
-    last_agent: str | None = None
-    final_answer = ""
-    responding_agent = "orchestrator"
+    from langchain_core.messages import HumanMessage
 
-    # Track which agents we've seen to detect handoffs
-    seen_agents: list[str] = []
+    from football_club.state import AGENT_ORCHESTRATOR
+    from football_club.streaming import TurnEventParser
 
-    for event in workflow.stream(input_state, config=config, subgraphs=True):  # type: ignore[arg-type]
-        # event is a tuple (namespace, chunk) when subgraphs=True
-        if isinstance(event, tuple):
-            namespace, chunk = event
-        else:
-            _namespace = ()
-            chunk = event
-
-        if not isinstance(chunk, dict):
-            continue
-
-        for node_name, node_output in chunk.items():
-            if not isinstance(node_output, dict):
+    config = {"configurable": {"thread_id": thread_id}, "callbacks": callbacks or []}
+    input_state = {"messages": [HumanMessage(content=user_input)]}
+    stream_mode = ["updates", "messages"] if stream_tokens else ["updates"]
+
+    parser = TurnEventParser()
+    # Agent whose answer is currently being printed token by token
+    streaming_agent: str | None = None
+
+    for item in workflow.stream(  # type: ignore[call-overload]
+        input_state, config=config, stream_mode=stream_mode, subgraphs=True
+    ):
+        for event in parser.feed(item):
+            if event.kind == "token":
+                if streaming_agent != event.agent:
+                    print(format_agent_prefix(event.agent), end="", flush=True)
+                    streaming_agent = event.agent
+                print(event.text, end="", flush=True)
                 continue
-
-            # Detect agent node execution
-            if node_name in {"orchestrator", "scout", "analyst", "medical"}:
-                if node_name != last_agent:
-                    # Detect handoff: if we've already seen agents, this is a transfer
-                    if seen_agents:
-                        log_handoff(seen_agents[-1], node_name)
-                    else:
-                        log_agent_active(node_name)
-                    seen_agents.append(node_name)
-                    last_agent = node_name
-
-            # Parse messages for tool calls and final response
-            messages = node_output.get("messages", [])
-            for msg in messages:
-                if isinstance(msg, AIMessage):
-                    # Log tool calls
-                    tool_calls = getattr(msg, "tool_calls", None)
-                    if tool_calls:
-                        current_agent = last_agent or "orchestrator"
-                        for tc in tool_calls:
-                            tool_name = tc.get("name", "unknown") if isinstance(tc, dict) else getattr(tc, "name", "unknown")
-                            log_tool_call(current_agent, tool_name)
-                    # Track final response (last AIMessage without tool calls)
-                    elif msg.content and not getattr(msg, "tool_calls", None):
-                        final_answer = str(msg.content)
-                        responding_agent = last_agent or "orchestrator"
-
-    # Print the final response
-    if final_answer:
-        print(format_agent_response(responding_agent, final_answer))
+            if event.kind == "answer":
+                continue
+            if streaming_agent is not None:
+                # A log line interrupts a partial answer: close it first
+                print()
+                streaming_agent = None
+            if event.kind == "agent":
+                log_agent_active(event.agent)
+            elif event.kind == "handoff":
+                log_handoff(event.source or AGENT_ORCHESTRATOR, event.agent)
+            elif event.kind == "tool":
+                log_tool_call(event.agent, event.text)
+
+    if streaming_agent is not None:
+        print()
+    if parser.responding_agent in parser.streamed_agents:
+        return
+    if parser.final_answer:
+        print(format_agent_response(parser.responding_agent, parser.final_answer))
     else:
         print(f"\n  {Colors.DIM}[Sistema]: No se obtuvo respuesta.{Colors.RESET}")
 
 
-def run_chat() -> None:
-    """Run the interactive chat interface."""
-    load_dotenv()
+def run_chat(
+    stream_tokens: bool = True,
+    thread_id: str | None = None,
+    profile: bool = False,
+    config: Config | None = None,
+) -> None:
+    """Run the interactive chat interface.
 
-    if not os.getenv("GROQ_API_KEY"):
+    Args:
+        stream_tokens: Print answers token by token as they are generated
+        thread_id: Resume a saved conversation instead of starting a new one
+        profile: Print a per-turn timing, token and cost breakdown
+        config: Configuration (defaults to one read from the environment)
+    """
+    from football_club.agents.llm import get_llm_registry
+    from football_club.graph import create_workflow
+    from football_club.metrics import MetricsRecorder
+    from football_club.session_store import find_session_saver
+    from football_club.state import (
+        AGENT_ANALYST,
+        AGENT_MEDICAL,
+        AGENT_ORCHESTRATOR,
+        AGENT_SCOUT,
+    )
+
+    config = config or Config()
+    if not config.groq_api_key:
         log_error("GROQ_API_KEY no encontrada.")
         print("Por favor, crea un archivo .env con tu API key:")
         print("  GROQ_API_KEY=tu_api_key_aqui")
@@ -131,13 +164,23 @@ def run_chat() -> None:
         return
 
     log_system("Inicializando sistema multi-agente...")
-    workflow = create_workflow()
+    workflow = create_workflow(config)
+    session_store = find_session_saver(workflow.checkpointer)
+    registry = get_llm_registry(config)
+    # Open pooled Groq connections while the user types the first question
+    registry.prewarm()
     log_system("Sistema listo!")
 
-    print_banner()
+    recorder = None
+    if profile or config.metrics_trace_path or config.metrics_prom_path:
+        recorder = MetricsRecorder(config.metrics_trace_path or None)
+
+    agents = (AGENT_ORCHESTRATOR, AGENT_SCOUT, AGENT_ANALYST, AGENT_MEDICAL)
+    print_banner({agent: registry.model_for(agent) for agent in agents})
 
-    # Thread ID for checkpointer — persists state across turns
-    thread_id = str(uuid.uuid4())
+    # Thread ID for checkpointer — persists state across turns (and restarts)
+    thread_id = thread_id or str(uuid.uuid4())
+    log_system(f"Conversación: {thread_id} (reanúdala con --thread-id)")
 
     while True:
         try:
@@ -148,6 +191,9 @@ def run_chat() -> None:
                 break
 
             if user_input.lower() in ["limpiar", "clear"]:
+                if session_store is not None:
+                    # The old conversation is not resumed in this run: free its memory
+                    session_store.evict(thread_id)
                 thread_id = str(uuid.uuid4())
                 log_system("Nueva conversación iniciada.")
                 continue
@@ -156,7 +202,17 @@ def run_chat() -> None:
                 continue
 
             print()  # Blank line before logs
-            _process_stream_events(workflow, user_input, thread_id)
+            if recorder is None:
+                _process_stream_events(workflow, user_input, thread_id, stream_tokens)
+                continue
+            with recorder.turn(thread_id) as turn:
+                _process_stream_events(
+                    workflow, user_input, thread_id, stream_tokens, recorder.callbacks(turn)
+                )
+            if profile:
+                log_profile(turn)
+            if config.metrics_prom_path:
+                recorder.write_prometheus(config.metrics_prom_path)
 
         except KeyboardInterrupt:
             print(f"\n\n{Colors.BOLD_GREEN}Hasta luego!{Colors.RESET}")
@@ -166,15 +222,152 @@ def run_chat() -> None:
             print("Por favor, intenta de nuevo.")
 
 
-def main() -> int:
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="football-club",
+        description="Sistema multi-agente de gestión de un club de fútbol.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Mostrar la respuesta completa al final en lugar de token a token",
+    )
+    parser.add_argument("--thread-id", help="Reanudar una conversación guardada")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Mostrar tiempos, tokens y coste por nodo tras cada respuesta",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    serve = subparsers.add_parser("serve", help="Servir el sistema por HTTP (SSE)")
+    serve.add_argument("--host", help="Interfaz de escucha (SERVER_HOST)")
+    serve.add_argument("--port", type=int, help="Puerto de escucha (SERVER_PORT)")
+    serve.add_argument(
+        "--max-inflight", type=int, help="Turnos concurrentes máximos (SERVER_MAX_INFLIGHT)"
+    )
+    serve.add_argument(
+        "--max-queue", type=int, help="Turnos en espera antes de responder 503 (SERVER_MAX_QUEUE)"
+    )
+    # Also accepted after "serve"; SUPPRESS keeps a leading --profile from being reset
+    serve.add_argument(
+        "--profile",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="Mostrar tiempos, tokens y coste de cada turno en la consola del servidor",
+    )
+
+    batch = subparsers.add_parser("batch", help="Procesar un fichero JSONL de preguntas")
+    batch.add_argument("input", type=Path, help="Fichero JSONL de entrada")
+    batch.add_argument("output", type=Path, help="Fichero JSONL de resultados (se reanuda)")
+    batch.add_argument("--concurrency", type=int, default=4, help="Preguntas en paralelo")
+    batch.add_argument(
+        "--ordered", action="store_true", help="Escribir resultados en el orden de entrada"
+    )
+    batch.add_argument(
+        "--shared-thread",
+        action="store_true",
+        help="Usar una única conversación (thread_id) para todas las preguntas",
+    )
+
+    build = subparsers.add_parser(
+        "build", help="Convertir un CSV de datos del club en un dataset columnar (mmap)"
+    )
+    build.add_argument("kind", choices=["scouting", "stats"], help="Tipo de datos")
+    build.add_argument("input", type=Path, help="CSV exportado")
+    build.add_argument("output", type=Path, help="Directorio del dataset (se reemplaza)")
+    return parser
+
+
+def run_batch_command(args: argparse.Namespace, config: Config) -> bool:
+    """Run the JSONL batch mode. Returns False if any item failed."""
+    from football_club.batch import run_batch
+    from football_club.graph import create_workflow
+
+    if not config.groq_api_key:
+        log_error("GROQ_API_KEY no encontrada.")
+        return False
+
+    workflow = create_workflow(config)
+    summary = asyncio.run(
+        run_batch(
+            workflow,
+            args.input,
+            args.output,
+            concurrency=args.concurrency,
+            ordered=args.ordered,
+            shared_thread_id=str(uuid.uuid4()) if args.shared_thread else None,
+        )
+    )
+    log_system(
+        f"Batch completado: {summary.succeeded} ok, {summary.failed} errores, "
+        f"{summary.skipped} ya procesadas de {summary.total} "
+        f"en {summary.elapsed_s:.1f}s (p50 {summary.p50_ms:.0f} ms)"
+    )
+    return summary.failed == 0
+
+
+def run_build_command(args: argparse.Namespace) -> None:
+    """Build a memory-mapped dataset from a CSV export."""
+    from football_club.data.columnar import build_dataset
+
+    started = time.perf_counter()
+    path = build_dataset(args.kind, args.input, args.output)
+    size = sum(f.stat().st_size for f in path.iterdir()) / 1e6
+    log_system(
+        f"Dataset {args.kind} escrito en {path} ({size:.1f} MB, "
+        f"{time.perf_counter() - started:.1f}s). Apunta a él la variable de ruta en .env."
+    )
+
+
+def run_serve(args: argparse.Namespace, config: Config) -> None:
+    """Run the HTTP serving mode."""
+    from football_club.server import run_server
+
+    if not config.groq_api_key:
+        log_error("GROQ_API_KEY no encontrada.")
+        return
+
+    host = args.host or config.server_host
+    port = args.port or config.server_port
+    log_system(f"Sirviendo en http://{host}:{port} (Ctrl+C para terminar)")
+    run_server(
+        host,
+        port,
+        max_inflight=args.max_inflight or config.server_max_inflight,
+        max_queue=args.max_queue or config.server_max_queue,
+        config=config,
+        profile=args.profile,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
     """Main entry point for the CLI."""
+    args = build_parser().parse_args(argv)
+    # Before the first Config: its defaults are read from the environment
+    load_dotenv()
     config = Config()
     logger = setup_logging(config.log_level)
 
     logger.info("Football club multi-agent system starting...")
 
     try:
-        run_chat()
+        if args.command == "serve":
+            run_serve(args, config)
+        elif args.command == "batch":
+            if not run_batch_command(args, config):
+                return 1
+        elif args.command == "build":
+            run_build_command(args)
+        else:
+            run_chat(
+                stream_tokens=config.stream_tokens and not args.no_stream,
+                thread_id=args.thread_id,
+                profile=args.profile,
+                config=config,
+            )
     except Exception as e:
         logger.error(f"Error in chat system: {e}")
         return 1
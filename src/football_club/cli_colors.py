@@ -9,6 +9,11 @@ Color scheme:
   ⬜ DIM     — Timestamps and metadata
 """
 
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from football_club.metrics import TurnMetrics
+
 
 class Colors:
     """ANSI escape codes for terminal colors."""
@@ -58,6 +63,13 @@ AGENT_DISPLAY = {
     "medical": "Médico",
 }
 
+# Speculative routing outcomes (profile output)
+SPECULATION_OUTCOMES = {
+    "hit": "acierto, respuesta adelantada",
+    "miss": "fallo, descartada",
+    "failed": "error en la ejecución especulativa",
+}
+
 
 def log_agent_active(agent_name: str) -> None:
     """Log which agent is currently processing (CYAN)."""
@@ -100,8 +112,45 @@ def log_system(message: str) -> None:
     print(f"  {Colors.BOLD_GREEN}✓ {message}{Colors.RESET}", flush=True)
 
 
-def format_agent_response(agent_name: str, content: str) -> str:
-    """Format the final agent response with color."""
+def format_agent_prefix(agent_name: str) -> str:
+    """Format the agent label that precedes a response (streamed or not)."""
     emoji = AGENT_EMOJI.get(agent_name, "🤖")
     display = AGENT_DISPLAY.get(agent_name, agent_name)
-    return f"\n{Colors.BOLD_WHITE}{emoji} [{display}]:{Colors.RESET} {content}"
+    return f"\n{Colors.BOLD_WHITE}{emoji} [{display}]:{Colors.RESET} "
+
+
+def format_agent_response(agent_name: str, content: str) -> str:
+    """Format the final agent response with color."""
+    return f"{format_agent_prefix(agent_name)}{content}"
+
+
+def log_profile(turn: "TurnMetrics") -> None:
+    """Print the per-turn timing, token and cost breakdown (DIM)."""
+    nodes = " · ".join(
+        f"{AGENT_DISPLAY.get(node, node)} {ms:.0f}"
+        + (f" (x{turn.node_runs[node]})" if turn.node_runs[node] > 1 else "")
+        for node, ms in turn.node_ms.items()
+    )
+    lines = [
+        f"⏱  Turno {turn.total_ms:.0f} ms — {nodes} · checkpoint {turn.checkpoint_ms:.0f} "
+        f"({turn.checkpoint_ops} ops) · otros {turn.overhead_ms:.0f}",
+        f"🪙 Tokens {turn.prompt_tokens} entrada / {turn.completion_tokens} salida · "
+        f"cola Groq {turn.queue_ms:.0f} ms · coste ${turn.cost_usd:.5f} · "
+        f"handoffs {turn.handoffs}"
+        + (f" ({turn.lateral_handoffs} directos)" if turn.lateral_handoffs else ""),
+    ]
+    if turn.speculation is not None:
+        lines.append(
+            f"🔮 Especulación: {SPECULATION_OUTCOMES.get(turn.speculation, turn.speculation)}"
+        )
+    if turn.throttle_ms or turn.llm_retries:
+        lines.append(
+            f"🚦 Limitador: {turn.throttle_ms:.0f} ms en espera · {turn.llm_retries} reintentos"
+        )
+    lines.extend(
+        f"   {AGENT_DISPLAY.get(call.agent, call.agent)} [{call.model}]: {call.ms:.0f} ms, "
+        f"{call.prompt_tokens}→{call.completion_tokens} tokens, cola {call.queue_ms:.0f} ms"
+        for call in turn.llm_calls
+    )
+    for line in lines:
+        print(f"  {Colors.DIM}{line}{Colors.RESET}", flush=True)
@@ -1,15 +1,149 @@
 """Configuration management for football-club."""
 
 import os
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+# Defaults are read from the environment when a `Config` is created, not when
+# this module is imported, so variables loaded later from ``.env`` apply
+
+
+def _env(name: str, default: str) -> str:
+    return field(default_factory=lambda: os.getenv(name, default))
+
+
+def _env_int(name: str, default: str) -> int:
+    return field(default_factory=lambda: int(os.getenv(name, default)))
+
+
+def _env_float(name: str, default: str) -> float:
+    return field(default_factory=lambda: float(os.getenv(name, default)))
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return field(default_factory=lambda: os.getenv(name, default).lower() == "true")
 
 
 @dataclass
 class Config:
     """Application configuration."""
 
-    environment: str = os.getenv("ENVIRONMENT", "development")
-    log_level: str = os.getenv("LOG_LEVEL", "INFO")
-    debug: bool = os.getenv("DEBUG", "false").lower() == "true"
-    groq_api_key: str = os.getenv("GROQ_API_KEY", "")
-    groq_model: str = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+    environment: str = _env("ENVIRONMENT", "development")
+    log_level: str = _env("LOG_LEVEL", "INFO")
+    debug: bool = _env_bool("DEBUG", "false")
+    groq_api_key: str = _env("GROQ_API_KEY", "")
+    groq_model: str = _env("GROQ_MODEL", "llama-3.3-70b-versatile")
+    # Per-agent tiers (agent=value, comma-separated): routing needs a small fast
+    # model and a short completion, answers keep GROQ_MODEL
+    groq_agent_models: str = _env("GROQ_AGENT_MODELS", "orchestrator=llama-3.1-8b-instant")
+    groq_agent_max_tokens: str = _env("GROQ_AGENT_MAX_TOKENS", "orchestrator=256")
+    groq_agent_timeouts: str = _env("GROQ_AGENT_TIMEOUTS", "orchestrator=15")
+    # Completion cap of agents without an override (0 = provider default)
+    groq_max_tokens: int = _env_int("GROQ_MAX_TOKENS", "0")
+
+    # Shared Groq connection pool (one keep-alive pool for all agents)
+    groq_pool_size: int = _env_int("GROQ_POOL_SIZE", "20")
+    groq_pool_keepalive: int = _env_int("GROQ_POOL_KEEPALIVE", "10")
+    groq_keepalive_expiry: float = _env_float("GROQ_KEEPALIVE_EXPIRY", "30")
+    groq_timeout: float = _env_float("GROQ_TIMEOUT", "60")
+    groq_connect_timeout: float = _env_float("GROQ_CONNECT_TIMEOUT", "5")
+    # Retries on 429/5xx/connection errors (jittered backoff, honors retry-after)
+    groq_max_retries: int = _env_int("GROQ_MAX_RETRIES", "5")
+    # Connections opened at startup so the first turn skips the TLS handshake (0 = off)
+    groq_prewarm: int = _env_int("GROQ_PREWARM", "2")
+
+    # Process-wide client-side rate limit shared by all agents (Groq account limits)
+    rate_limit_enabled: bool = _env_bool("RATE_LIMIT_ENABLED", "true")
+    groq_rpm: int = _env_int("GROQ_RPM", "30")
+    groq_tpm: int = _env_int("GROQ_TPM", "12000")
+    # Adaptive concurrency: upper bound, and latency (s) above which it backs off (0 = off)
+    rate_limit_max_concurrency: int = _env_int("RATE_LIMIT_MAX_CONCURRENCY", "8")
+    rate_limit_latency_target: float = _env_float("RATE_LIMIT_LATENCY_TARGET", "10")
+    rate_limit_backoff_base: float = _env_float("RATE_LIMIT_BACKOFF_BASE", "0.5")
+    rate_limit_backoff_max: float = _env_float("RATE_LIMIT_BACKOFF_MAX", "30")
+    # Completion tokens reserved per call until the real usage is known
+    rate_limit_completion_tokens: int = _env_int("RATE_LIMIT_COMPLETION_TOKENS", "300")
+
+    # Print answers token by token in the CLI
+    stream_tokens: bool = _env_bool("STREAM_TOKENS", "true")
+
+    # Local fast-path router (skips the orchestrator LLM call when confident)
+    fast_router_enabled: bool = _env_bool("FAST_ROUTER_ENABLED", "true")
+    fast_router_threshold: float = _env_float("FAST_ROUTER_THRESHOLD", "0.75")
+    # Opt-in: run the predicted domain agent alongside the orchestrator and keep its
+    # answer when the orchestrator transfers to it (extra tokens on a miss)
+    speculative_routing: bool = _env_bool("SPECULATIVE_ROUTING", "false")
+    speculation_workers: int = _env_int("SPECULATION_WORKERS", "4")
+    # Opt-in: domain agents may transfer directly to a sibling agent when the
+    # question clearly belongs to it, skipping the orchestrator hop
+    lateral_handoffs: bool = _env_bool("LATERAL_HANDOFFS", "false")
+
+    # Handoff hop budget per turn and how a looping turn is resolved
+    # ("best_agent": best-scoring domain agent answers, "orchestrator": it answers)
+    max_handoff_hops: int = _env_int("MAX_HANDOFF_HOPS", "3")
+    handoff_resolution: str = _env("HANDOFF_RESOLUTION", "best_agent")
+
+    # LLM response cache (in-memory LRU + optional SQLite tier)
+    llm_cache_enabled: bool = _env_bool("LLM_CACHE_ENABLED", "true")
+    llm_cache_max_entries: int = _env_int("LLM_CACHE_MAX_ENTRIES", "1024")
+    llm_cache_ttl_seconds: float = _env_float("LLM_CACHE_TTL_SECONDS", "3600")
+    llm_cache_path: str = _env("LLM_CACHE_PATH", "")
+
+    # Per-agent context budget for model calls (history windowing + summary)
+    context_enabled: bool = _env_bool("CONTEXT_ENABLED", "true")
+    context_max_tokens: int = _env_int("CONTEXT_MAX_TOKENS", "4000")
+    context_keep_turns: int = _env_int("CONTEXT_KEEP_TURNS", "4")
+    context_summary_tokens: int = _env_int("CONTEXT_SUMMARY_TOKENS", "400")
+    # Per-agent overrides of CONTEXT_MAX_TOKENS, e.g. "orchestrator=1500,medical=3000"
+    context_agent_budgets: str = _env("CONTEXT_AGENT_BUDGETS", "orchestrator=1500")
+
+    # Build agent subgraphs (and Groq clients) on first routing instead of at startup
+    lazy_agents: bool = _env_bool("LAZY_AGENTS", "true")
+
+    # Club data stores behind the agents' data tools (empty = tools disabled)
+    # Per-match squad statistics CSV or `football-club build` dataset (analyst)
+    squad_stats_path: str = _env("SQUAD_STATS_PATH", "")
+    # Match event feed (JSON / JSON Lines) or directory of feeds (analyst)
+    match_events_path: str = _env("MATCH_EVENTS_PATH", "")
+    # Processes folding event files (0 = one per CPU)
+    match_events_workers: int = _env_int("MATCH_EVENTS_WORKERS", "0")
+    # Scouting database CSV or `football-club build` dataset, one row per external player (scout)
+    scouting_index_path: str = _env("SCOUTING_INDEX_PATH", "")
+    # Injury history CSV, followed for new reports (medical)
+    injuries_path: str = _env("INJURIES_PATH", "")
+    # Match calendar CSV (date,opponent,competition) for availability by match
+    fixtures_path: str = _env("FIXTURES_PATH", "")
+    # GPS / training load export file or directory of exports (medical)
+    training_load_path: str = _env("TRAINING_LOAD_PATH", "")
+
+    # Resolve player and club names ("Lewa", "de jong") in each message before
+    # routing, over the squad statistics, the scouting index and an alias table
+    entity_resolution_enabled: bool = _env_bool("ENTITY_RESOLUTION_ENABLED", "true")
+    # Alias CSV (alias,name[,kind,ours]): nicknames and names missing from the stores
+    entity_aliases_path: str = _env("ENTITY_ALIASES_PATH", "")
+
+    # Conversation checkpointer: "sqlite" (persistent), "memory" or "session"
+    # (in memory, spilling idle threads to disk)
+    checkpoint_backend: str = _env("CHECKPOINT_BACKEND", "sqlite")
+    checkpoint_path: str = _env("CHECKPOINT_PATH", ".football_club/checkpoints.sqlite")
+    checkpoint_keep_last: int = _env_int("CHECKPOINT_KEEP_LAST", "20")
+    # SQLite conversations untouched this many days are deleted on start (0 = keep all)
+    checkpoint_max_idle_days: float = _env_float("CHECKPOINT_MAX_IDLE_DAYS", "30")
+    session_max_threads: int = _env_int("SESSION_MAX_THREADS", "256")
+    session_max_mb: float = _env_float("SESSION_MAX_MB", "256")
+    session_idle_seconds: float = _env_float("SESSION_IDLE_SECONDS", "900")
+    session_spill_path: str = _env("SESSION_SPILL_PATH", ".football_club/sessions.sqlite")
+
+    # Per-turn metrics: JSON-lines trace and Prometheus text snapshot (empty = off)
+    metrics_trace_path: str = _env("METRICS_TRACE_PATH", "")
+    metrics_prom_path: str = _env("METRICS_PROM_PATH", "")
+
+    # HTTP serving mode (football-club serve)
+    server_host: str = _env("SERVER_HOST", "127.0.0.1")
+    server_port: int = _env_int("SERVER_PORT", "8000")
+    server_max_inflight: int = _env_int("SERVER_MAX_INFLIGHT", "8")
+    server_max_queue: int = _env_int("SERVER_MAX_QUEUE", "64")
+
+    def differing(self, other: "Config", names: Iterable[str]) -> list[str]:
+        """Settings among ``names`` whose value differs in ``other``."""
+        return [name for name in names if getattr(self, name) != getattr(other, name)]
@@ -0,0 +1,5 @@
+"""Local club data stores queried by the agents' tools.
+
+Stores are NumPy-backed and loaded once per process from the paths in
+`Config`; an unset path leaves the agent without the matching tools.
+"""
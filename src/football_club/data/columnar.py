@@ -0,0 +1,311 @@
+"""Memory-mapped columnar datasets for the data stores.
+
+Parsing a large CSV on every start is slow, and every server worker
+process holds its own copy of the result. ``football-club build``
+converts an export once into a directory of NumPy columns that the stores
+open with ``np.load(mmap_mode="r")``. Opening reads only ``meta.json``,
+pages are loaded on first touch, and processes mapping the same files
+share them through the page cache::
+
+    scouting/
+        meta.json          format, kind, row count, small attributes
+        age.npy            one ``.npy`` file per numeric column
+        clubs.codes.npy    dictionary-encoded strings: int32 codes...
+        clubs.dict.*.npy   ...into a string column of distinct values
+        players.data.npy   plain strings: UTF-8 bytes of all values
+        players.offsets.npy  and their int64 offsets
+
+The scouting dataset also stores the index's derived arrays (standardized
+matrix, norms, precision) and a sorted column of normalized player names,
+so opening it computes nothing and name lookups are binary searches.
+Datasets are written to a temporary directory and renamed into place, so
+readers never see a partial build.
+"""
+
+import json
+import shutil
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any, overload
+
+import numpy as np
+import numpy.typing as npt
+
+from football_club.data.scouting import ScoutingIndex
+from football_club.data.stats import NameIndex, SquadStats
+from football_club.graph.router import normalize_text
+
+FORMAT = "football-club-columnar"
+VERSION = 1
+
+KINDS = ("scouting", "stats")
+
+# Strings with fewer distinct values than this share of rows are dictionary-encoded
+_DICTIONARY_RATIO = 0.5
+
+
+class StringColumn(Sequence[str]):
+    """Strings stored as one UTF-8 buffer and offsets, decoded on access."""
+
+    def __init__(self, data: npt.NDArray[np.uint8], offsets: npt.NDArray[np.int64]) -> None:
+        self._data = data
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return bytes(self._data[start:end]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class DictionaryColumn(Sequence[str]):
+    """Strings stored as int32 codes into a column of distinct values."""
+
+    def __init__(self, codes: npt.NDArray[np.int32], values: StringColumn) -> None:
+        self.codes = codes
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self.values[int(code)] for code in self.codes[index]]
+        return self.values[int(self.codes[index])]
+
+
+class MappedNameIndex(NameIndex):
+    """`NameIndex` over a sorted column of normalized names, without an in-memory dict.
+
+    Same matching rules: exact normalized name, else the only name containing
+    the query.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        keys: npt.NDArray[np.bytes_],
+        rows: npt.NDArray[np.int64],
+    ) -> None:
+        self.names = names
+        self._keys = keys
+        self._rows = rows
+
+    def resolve(self, query: str) -> int:
+        key = normalize_text(query).strip().encode("utf-8")
+        # Duplicated names resolve to the last row, as in `NameIndex`
+        right = int(np.searchsorted(self._keys, key, side="right"))
+        if right and self._keys[right - 1] == key:
+            return int(self._rows[right - 1])
+        if not key:
+            raise ValueError(f"No encuentro a {query!r}")
+        hits = np.flatnonzero(np.strings.find(self._keys, key) >= 0)
+        # One candidate per distinct name (the last of each run of duplicates)
+        following = np.minimum(hits + 1, len(self._keys) - 1)
+        last = (hits + 1 == len(self._keys)) | (self._keys[following] != self._keys[hits])
+        distinct = hits[last].tolist()
+        if len(distinct) == 1:
+            return int(self._rows[distinct[0]])
+        if distinct:
+            options = ", ".join(self.names[int(self._rows[i])] for i in distinct[:5])
+            raise ValueError(f"{query!r} es ambiguo: {options}")
+        raise ValueError(f"No encuentro a {query!r}")
+
+
+# --- Writing ---
+
+
+def _write_strings(directory: Path, name: str, values: Sequence[str]) -> dict[str, Any]:
+    distinct: dict[str, int] = {}
+    codes = np.fromiter(
+        (distinct.setdefault(value, len(distinct)) for value in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    if len(distinct) < _DICTIONARY_RATIO * len(values):
+        np.save(directory / f"{name}.codes.npy", codes)
+        _write_plain(directory, f"{name}.dict", list(distinct))
+        return {"type": "dictionary", "values": len(distinct)}
+    _write_plain(directory, name, values)
+    return {"type": "string"}
+
+
+def _write_plain(directory: Path, name: str, values: Sequence[str]) -> None:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    np.save(directory / f"{name}.data.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+    np.save(directory / f"{name}.offsets.npy", offsets)
+
+
+def write_dataset(
+    path: str | Path,
+    kind: str,
+    arrays: Mapping[str, npt.NDArray[Any]],
+    strings: Mapping[str, Sequence[str]],
+    attrs: Mapping[str, Any] | None = None,
+) -> Path:
+    """Write a dataset directory at ``path``, replacing any previous one."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    columns: dict[str, Any] = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        np.save(tmp / f"{name}.npy", array)
+        columns[name] = {"type": "array", "dtype": str(array.dtype), "shape": list(array.shape)}
+    for name, values in strings.items():
+        columns[name] = _write_strings(tmp, name, values)
+    meta = {
+        "format": FORMAT,
+        "version": VERSION,
+        "kind": kind,
+        "columns": columns,
+        "attrs": dict(attrs or {}),
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta, indent=2, ensure_ascii=False))
+    if path.exists():
+        old = path.with_name(f".{path.name}.old")
+        shutil.rmtree(old, ignore_errors=True)
+        path.rename(old)
+        tmp.rename(path)
+        shutil.rmtree(old)
+    else:
+        tmp.rename(path)
+    return path
+
+
+# --- Reading ---
+
+
+class Dataset:
+    """Memory-mapped columns of a dataset directory."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        meta_path = self.path / "meta.json"
+        if not meta_path.exists():
+            raise ValueError(f"{self.path} no es un dataset columnar (falta meta.json)")
+        meta = json.loads(meta_path.read_text())
+        if meta.get("format") != FORMAT or meta.get("version") != VERSION:
+            raise ValueError(f"Formato de dataset no soportado en {self.path}")
+        self.kind: str = meta["kind"]
+        self.columns: dict[str, Any] = meta["columns"]
+        self.attrs: dict[str, Any] = meta["attrs"]
+
+    def _load(self, name: str) -> Any:
+        return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+    def array(self, name: str) -> Any:
+        return self._load(name)
+
+    def strings(self, name: str) -> Sequence[str]:
+        if self.columns[name]["type"] == "dictionary":
+            values = StringColumn(
+                self._load(f"{name}.dict.data"), self._load(f"{name}.dict.offsets")
+            )
+            return DictionaryColumn(self._load(f"{name}.codes"), values)
+        return StringColumn(self._load(f"{name}.data"), self._load(f"{name}.offsets"))
+
+
+def is_dataset(path: str | Path) -> bool:
+    return (Path(path) / "meta.json").is_file()
+
+
+# --- Stores ---
+
+
+def save_squad_stats(stats: SquadStats, path: str | Path) -> Path:
+    """Write ``stats``' base columns; opening re-derives the aggregate cube (milliseconds)."""
+    return write_dataset(
+        path,
+        "stats",
+        {
+            "player": stats.player,
+            "date": stats.date,
+            "competition": stats.competition,
+            "values": stats.values,
+        },
+        {"players": stats.players.names, "competitions": stats.competitions.names},
+    )
+
+
+def open_squad_stats(path: str | Path) -> SquadStats:
+    dataset = _open(path, "stats")
+    return SquadStats(
+        list(dataset.strings("players")),
+        dataset.array("player"),
+        dataset.array("date"),
+        list(dataset.strings("competitions")),
+        dataset.array("competition"),
+        dataset.array("values"),
+    )
+
+
+def save_scouting_index(index: ScoutingIndex, path: str | Path) -> Path:
+    """Write ``index`` with its derived arrays and a sorted normalized-name column."""
+    keys = np.array(
+        [normalize_text(name).encode("utf-8") for name in index.players.names], dtype=np.bytes_
+    )
+    order = np.argsort(keys, kind="stable")
+    arrays = {name: getattr(index, name) for name in ScoutingIndex.ARRAYS}
+    arrays["name_keys"] = keys[order]
+    arrays["name_rows"] = order.astype(np.int64)
+    return write_dataset(
+        path,
+        "scouting",
+        arrays,
+        {"players": index.players.names, "clubs": index.clubs},
+        {"leagues": index.leagues.names, "rows": len(index)},
+    )
+
+
+def open_scouting_index(path: str | Path) -> ScoutingIndex:
+    dataset = _open(path, "scouting")
+    players = MappedNameIndex(
+        dataset.strings("players"), dataset.array("name_keys"), dataset.array("name_rows")
+    )
+    return ScoutingIndex.from_arrays(
+        players,
+        dataset.strings("clubs"),
+        dataset.attrs["leagues"],
+        {name: dataset.array(name) for name in ScoutingIndex.ARRAYS},
+    )
+
+
+def _open(path: str | Path, kind: str) -> Dataset:
+    dataset = Dataset(path)
+    if dataset.kind != kind:
+        raise ValueError(f"{path} es un dataset de tipo {dataset.kind!r}, no {kind!r}")
+    return dataset
+
+
+def build_dataset(kind: str, source: str | Path, output: str | Path) -> Path:
+    """Convert a CSV export of ``kind`` (`KINDS`) into a dataset directory."""
+    if kind == "scouting":
+        return save_scouting_index(ScoutingIndex.from_csv(source), output)
+    if kind == "stats":
+        return save_squad_stats(SquadStats.from_csv(source), output)
+    raise ValueError(f"Tipo de dataset desconocido: {kind!r} ({', '.join(KINDS)})")
@@ -0,0 +1,332 @@
+"""Fuzzy resolution of player and club names in user messages.
+
+Users write "Lewa", "Frenkie", "de jong" or "Lewandoski"; resolving those
+mentions locally spares the agents a clarification turn and tells the
+router whether a player is ours or external. The index holds the players of
+the squad statistics (ours), the players and clubs of the scouting database
+(external) and an optional alias table. Every name is keyed by its
+normalized full form, each suffix of its words ("de jong", "jong") and its
+first word, and a mention is looked up:
+
+1. exactly among the aliases and keys (dict lookups),
+2. as the prefix of keys that all name one entity ("lewa" → "lewandowski"),
+   by binary search over the sorted keys,
+3. by trigram similarity for typos: NumPy posting lists of the one-word
+   keys' character trigrams; candidates come from the rarest lists only.
+
+Each lookup takes microseconds over 100k+ names. Keys naming several
+entities ("martinez") resolve only when exactly one of them is ours.
+
+The alias CSV (ENTITY_ALIASES_PATH) has ``alias`` and ``name`` columns,
+plus optional ``kind`` (``player`` / ``club``) and ``ours`` (``true`` /
+``false``) used when ``name`` is not in any store::
+
+    alias,name,kind,ours
+    Lewa,Robert Lewandowski,,
+    Barça,FC Barcelona,club,true
+"""
+
+import csv
+import functools
+import math
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from football_club.data.scouting import load_scouting_index
+from football_club.data.stats import load_squad_stats
+from football_club.graph.router import VOCABULARY, tokenize
+from football_club.state import ResolvedEntity
+
+PLAYER = "player"
+CLUB = "club"
+
+# Longest mention tried, in words ("marc andre ter stegen")
+MAX_MENTION_WORDS = 4
+
+# Shortest word tried as a prefix or with trigrams
+MIN_FUZZY_LENGTH = 4
+
+# Minimum trigram (Dice) similarity of a misspelled mention
+FUZZY_THRESHOLD = 0.6
+
+# Name particles that are never keys on their own
+_PARTICLES = frozenset("da de del der di do dos du el la le los van von ter ten y".split())
+
+# Chat words outside the router's vocabulary that must not match a name
+_COMMON_WORDS = frozenset(
+    "hola buenas gracias vale dime dame dinos quiero quien quienes sabes puedes hay hoy ayer "
+    "manana semana mes ano jugador jugadora jugadores partido partidos mejor mejores peor "
+    "bien mal mucho muy poco todo todos nada algo ahora antes despues siempre nunca entre "
+    "sobre desde hasta contra cada otra otras ultimos ultima primera primero segundo "
+    "please thanks player players match best worst".split()
+)
+
+
+@dataclass(frozen=True)
+class Entity:
+    """A player or club known to the index."""
+
+    id: str
+    name: str
+    kind: str
+    ours: bool
+    club: str = ""
+
+
+def entity_id(kind: str, name: str) -> str:
+    """Stable id of a name: ``player:robert-lewandowski``."""
+    return f"{kind}:{'-'.join(tokenize(name))}"
+
+
+def name_keys(name: str) -> list[str]:
+    """Normalized full name, each suffix of its words and its first word."""
+    words = tokenize(name)
+    keys = [" ".join(words[i:]) for i in range(len(words))]
+    if len(words) > 1:
+        keys.append(words[0])
+    return [key for key in keys if len(key) > 2 and key not in _PARTICLES]
+
+
+def _trigrams(key: str) -> set[int]:
+    padded = f" {key} ".encode()
+    return {padded[i] << 16 | padded[i + 1] << 8 | padded[i + 2] for i in range(len(padded) - 2)}
+
+
+class EntityIndex:
+    """Players and clubs keyed by normalized name, alias, prefix and trigram.
+
+    Args:
+        entities: Known players and clubs (a repeated id keeps the first)
+        aliases: Alias → entity id, looked up before the names
+    """
+
+    def __init__(
+        self, entities: Iterable[Entity], aliases: Mapping[str, str] | None = None
+    ) -> None:
+        self.entities: list[Entity] = []
+        ids: dict[str, int] = {}
+        for entity in entities:
+            if entity.id not in ids:
+                ids[entity.id] = len(self.entities)
+                self.entities.append(entity)
+        self._aliases = {
+            " ".join(tokenize(alias)): ids[target]
+            for alias, target in (aliases or {}).items()
+            if target in ids and tokenize(alias)
+        }
+        # Name key → entity positions, and the keys in sorted order
+        self._exact: dict[str, list[int]] = {}
+        for i, entity in enumerate(self.entities):
+            for key in name_keys(entity.name):
+                self._exact.setdefault(key, []).append(i)
+        keys = sorted(self._exact)
+        self._owners = [self._exact[key] for key in keys]
+        self._keys = np.array([key.encode() for key in keys], dtype=np.bytes_)
+        self._build_trigrams(keys)
+
+    def _build_trigrams(self, keys: Sequence[str]) -> None:
+        """Posting lists of the one-word keys: key positions per distinct trigram.
+
+        Trigram-matched mentions are single words, so longer keys are left
+        out. Postings are grouped by trigram and sorted by key position.
+        """
+        words = np.array([k for k, key in enumerate(keys) if " " not in key], dtype=np.int64)
+        padded = np.array([f" {keys[k]} ".encode() for k in words.tolist()], dtype=np.bytes_)
+        width = padded.dtype.itemsize if len(padded) else 3
+        raw = padded.view(np.uint8).reshape(len(padded), width).astype(np.int32)
+        grams = raw[:, :-2] << 16 | raw[:, 1:-1] << 8 | raw[:, 2:]
+        valid = np.arange(width - 2) < (np.strings.str_len(padded) - 2)[:, None]
+        rows = np.broadcast_to(words[:, None], grams.shape)
+        # Distinct (key, trigram) pairs, then regrouped by trigram
+        pairs = np.unique(rows[valid] << 24 | grams[valid])
+        owners, codes = pairs >> 24, (pairs & 0xFFFFFF).astype(np.int32)
+        order = np.argsort(codes, kind="stable")
+        self._grams, starts = np.unique(codes[order], return_index=True)
+        self._gram_offsets = np.append(starts, len(codes)).astype(np.int64)
+        self._postings = owners[order].astype(np.int32)
+        self._gram_counts = np.bincount(owners, minlength=len(keys)).astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    # --- Lookups ---
+
+    def _pick(self, candidates: Iterable[int]) -> Entity | None:
+        """The only candidate, else the only one of ours."""
+        found = set(candidates)
+        if len(found) == 1:
+            return self.entities[found.pop()]
+        ours = [i for i in found if self.entities[i].ours]
+        return self.entities[ours[0]] if len(ours) == 1 else None
+
+    def exact(self, key: str) -> Entity | None:
+        """Entity of an alias or name key (``key`` normalized)."""
+        if key in self._aliases:
+            return self.entities[self._aliases[key]]
+        owners = self._exact.get(key)
+        return None if owners is None else self._pick(owners)
+
+    def prefix(self, key: str, limit: int = 16) -> Entity | None:
+        """Entity whose keys start with ``key`` ("lewa"), when they name one only."""
+        encoded = key.encode()
+        if len(encoded) >= self._keys.dtype.itemsize:
+            return None  # no longer key to complete
+        first = int(np.searchsorted(self._keys, encoded))
+        last = int(np.searchsorted(self._keys, encoded + b"\xff"))
+        if first == last or last - first > limit:
+            return None
+        return self._pick(i for k in range(first, last) for i in self._owners[k])
+
+    def fuzzy(self, key: str, threshold: float = FUZZY_THRESHOLD) -> tuple[Entity, float] | None:
+        """Most trigram-similar entity of a misspelled one-word ``key`` and its Dice score."""
+        query = np.array(sorted(_trigrams(key)), dtype=np.int32)
+        slots = np.searchsorted(self._grams, query)
+        known = slots < len(self._grams)
+        known[known] = self._grams[slots[known]] == query[known]
+        # Dice = 2c / (n + nk) ≥ t with c ≤ nk needs c ≥ t·n / (2 - t) shared trigrams
+        need = threshold * len(query) / (2 - threshold)
+        if known.sum() < need:
+            return None
+        offsets = self._gram_offsets
+        lists = sorted(
+            (self._postings[offsets[s] : offsets[s + 1]] for s in slots[known].tolist()), key=len
+        )
+        # A key sharing `need` trigrams is in one of the rarest len - need + 1 lists
+        rare = len(lists) - math.ceil(need) + 1
+        rare_postings = sum(map(len, lists[:rare]))
+        candidates: npt.NDArray[np.signedinteger[Any]]
+        if 16 * rare_postings * (len(lists) - rare) < len(self._keys):
+            # Few candidates: count them in the rare lists, probe the common ones
+            candidates, shared = np.unique(np.concatenate(lists[:rare]), return_counts=True)
+            for postings in lists[rare:]:
+                found = np.minimum(np.searchsorted(postings, candidates), len(postings) - 1)
+                shared += postings[found] == candidates
+        else:
+            counts = np.bincount(np.concatenate(lists))
+            candidates = np.flatnonzero(counts >= need)
+            shared = counts[candidates]
+        if not len(candidates):
+            return None
+        scores = 2 * shared / (len(query) + self._gram_counts[candidates])
+        best = int(np.argmax(scores))
+        if scores[best] < threshold:
+            return None
+        entity = self._pick(self._owners[int(candidates[best])])
+        return None if entity is None else (entity, float(scores[best]))
+
+    def resolve(self, text: str) -> list[ResolvedEntity]:
+        """Players and clubs mentioned in ``text``, longest mentions first.
+
+        Every run of up to `MAX_MENTION_WORDS` words is tried as an alias or
+        name; single unknown words are then tried as a prefix and by trigram
+        similarity. Router vocabulary and common chat words are skipped.
+        """
+        words = tokenize(text)
+        found: dict[str, ResolvedEntity] = {}
+        i = 0
+        while i < len(words):
+            size, match = self._match(words, i)
+            if match is not None and match["id"] not in found:
+                found[match["id"]] = match
+            i += size
+        return list(found.values())
+
+    def _match(self, words: Sequence[str], start: int) -> tuple[int, ResolvedEntity | None]:
+        """Longest mention starting at ``words[start]`` and the words it spans."""
+        for size in range(min(MAX_MENTION_WORDS, len(words) - start), 0, -1):
+            mention = " ".join(words[start : start + size])
+            if mention in self._aliases:
+                return size, _resolved(self.entities[self._aliases[mention]], mention, "alias")
+            if size == 1 and (mention in VOCABULARY or mention in _COMMON_WORDS):
+                return 1, None
+            entity = self.exact(mention)
+            if entity is not None:
+                return size, _resolved(entity, mention, "exact")
+        word = words[start]
+        if len(word) < MIN_FUZZY_LENGTH or word in self._exact:
+            return 1, None  # too short, or an ambiguous name ("pedro") rather than a typo
+        entity = self.prefix(word)
+        if entity is not None:
+            return 1, _resolved(entity, word, "prefix")
+        scored = self.fuzzy(word)
+        if scored is not None:
+            return 1, _resolved(scored[0], word, "fuzzy", scored[1])
+        return 1, None
+
+
+def _resolved(entity: Entity, mention: str, match: str, score: float = 1.0) -> ResolvedEntity:
+    return {
+        "id": entity.id,
+        "name": entity.name,
+        "kind": entity.kind,
+        "ours": entity.ours,
+        "club": entity.club,
+        "mention": mention,
+        "match": match,
+        "score": round(score, 3),
+    }
+
+
+def squad_entities(players: Iterable[str]) -> list[Entity]:
+    return [Entity(entity_id(PLAYER, name), name, PLAYER, True) for name in players]
+
+
+def scouting_entities(players: Sequence[str], clubs: Sequence[str]) -> list[Entity]:
+    """External players (with their club) and the distinct clubs."""
+    found = [
+        Entity(entity_id(PLAYER, name), name, PLAYER, False, club)
+        for name, club in zip(players, clubs, strict=True)
+    ]
+    found.extend(Entity(entity_id(CLUB, club), club, CLUB, False) for club in dict.fromkeys(clubs))
+    return found
+
+
+def read_aliases(path: str | Path, known: Sequence[Entity]) -> tuple[list[Entity], dict[str, str]]:
+    """Entities new to ``known`` and alias → entity id from an alias CSV."""
+    by_name = {" ".join(tokenize(entity.name)): entity for entity in known}
+    added: list[Entity] = []
+    aliases: dict[str, str] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = (row.get("name") or "").strip()
+            alias = (row.get("alias") or "").strip()
+            if not name or not alias:
+                continue
+            entity = by_name.get(" ".join(tokenize(name)))
+            if entity is None:
+                kind = (row.get("kind") or "").strip().lower() or PLAYER
+                if kind not in (PLAYER, CLUB):
+                    raise ValueError(f"Tipo de entidad no válido en {path}: {kind!r}")
+                ours = (row.get("ours") or "").strip().lower() in ("true", "1", "si", "sí")
+                entity = Entity(entity_id(kind, name), name, kind, ours)
+                by_name[" ".join(tokenize(name))] = entity
+                added.append(entity)
+            aliases[alias] = entity.id
+    return added, aliases
+
+
+@functools.cache
+def load_entity_index(
+    squad_stats_path: str = "", scouting_index_path: str = "", aliases_path: str = ""
+) -> EntityIndex:
+    """Process-wide index over the configured stores (SQUAD_STATS_PATH,
+    SCOUTING_INDEX_PATH) and alias table (ENTITY_ALIASES_PATH).
+
+    Our players come first, so a name in both stores resolves as ours.
+    """
+    entities: list[Entity] = []
+    if squad_stats_path:
+        entities.extend(squad_entities(load_squad_stats(squad_stats_path).players.names))
+    if scouting_index_path:
+        index = load_scouting_index(scouting_index_path)
+        entities.extend(scouting_entities(index.players.names, index.clubs))
+    aliases: dict[str, str] = {}
+    if aliases_path:
+        added, aliases = read_aliases(aliases_path, entities)
+        entities.extend(added)
+    return EntityIndex(entities, aliases)
@@ -0,0 +1,474 @@
+"""Match event feeds folded into per-player aggregates for the analyst's tools.
+
+Event files are read as a stream and never loaded whole: JSON Lines (one
+event per line) or one JSON array of events, decoded element by element
+from fixed-size chunks. Each event is folded into its match's per-player
+counters (`EVENT_METRICS`) as it is read, so memory stays proportional to
+the players of a match, not to the feed.
+
+Events may be flat::
+
+    {"match_id": "m1", "date": "2024-08-18", "team": "FC Barcelona",
+     "player": "Pedri", "type": "pass", "location": [60, 40],
+     "end_location": [90, 35], "outcome": "complete", "key_pass": true}
+
+or nested the StatsBomb way (``{"type": {"name": "Pass"}, "pass":
+{"end_location": ..., "outcome": ...}}``, ``shot.statsbomb_xg``), with the
+match id taken from the file name when events carry none. Coordinates
+are on a 120 x 80 pitch attacking towards x = 120. A pass or carry is
+progressive when it ends at most `PROGRESSIVE_RATIO` of its starting
+distance from the goal.
+
+Matches are keyed by id: re-ingesting a match replaces it, so feeds can
+be re-sent safely. `MatchEventStore.refresh` folds new and modified files
+of a directory in a process pool, one file per task. Queries run on a
+columnar table (one row per player and match) rebuilt on the first query
+after a change.
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from football_club.data.stats import NameIndex
+from football_club.graph.router import normalize_text
+
+# Column → Spanish label, in matrix order
+EVENT_METRICS: dict[str, str] = {
+    "passes": "pases",
+    "passes_completed": "pases completados",
+    "progressive_passes": "pases progresivos",
+    "key_passes": "pases clave",
+    "assists": "asistencias",
+    "carries": "conducciones",
+    "progressive_carries": "conducciones progresivas",
+    "dribbles": "regates completados",
+    "shots": "tiros",
+    "goals": "goles",
+    "xg": "goles esperados (xG)",
+    "recoveries": "recuperaciones",
+}
+
+_METRIC = {metric: i for i, metric in enumerate(EVENT_METRICS)}
+
+EVENT_SUFFIXES = (".json", ".jsonl", ".ndjson")
+
+# Goal centre on a 120 x 80 pitch
+_GOAL = (120.0, 40.0)
+PROGRESSIVE_RATIO = 0.75
+# Shorter moves are never progressive
+_MIN_PROGRESS = 5.0
+
+_COMPLETE = {"complete", "completed", "successful", "success", "true", "goal"}
+
+_CHUNK_SIZE = 1 << 16
+
+
+# --- Streaming parser ---
+
+
+def iter_events(path: str | Path, chunk_size: int = _CHUNK_SIZE) -> Iterator[dict[str, Any]]:
+    """Events of a JSON Lines file or of a JSON array file, one at a time."""
+    decoder = json.JSONDecoder()
+    with Path(path).open(encoding="utf-8") as f:
+        buffer = f.read(chunk_size)
+        position = len(buffer) - len(buffer.lstrip())
+        if not buffer.startswith("[", position):
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        position += 1
+        while True:
+            # Skip separators; stop at the closing bracket
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position == len(buffer):
+                buffer, position = f.read(chunk_size), 0
+                if not buffer:
+                    raise ValueError(f"JSON incompleto en {path}")
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                event, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                end = -1
+            if end in (-1, len(buffer)):
+                # Possibly cut by the chunk boundary: read more and retry
+                more = f.read(chunk_size)
+                if more:
+                    buffer, position = buffer[position:] + more, 0
+                    continue
+                if end == -1:
+                    raise ValueError(f"JSON incompleto o no válido en {path}")
+            position = end
+            yield event
+
+
+# --- Folding ---
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalized(text: str) -> str:
+    return normalize_text(text).replace("_", " ").strip()
+
+
+def _name(value: Any) -> str:
+    if isinstance(value, dict):
+        return str(value.get("name") or "")
+    return "" if value is None else str(value)
+
+
+def _point(value: Any) -> tuple[float, float] | None:
+    if isinstance(value, (list, tuple)) and len(value) >= 2:
+        return float(value[0]), float(value[1])
+    return None
+
+
+def _progressive(start: tuple[float, float] | None, end: tuple[float, float] | None) -> bool:
+    if start is None or end is None:
+        return False
+    before = math.dist(start, _GOAL)
+    after = math.dist(end, _GOAL)
+    return before - after >= _MIN_PROGRESS and after <= PROGRESSIVE_RATIO * before
+
+
+@dataclass(frozen=True)
+class MatchAggregates:
+    """Per-player counters of one match, rows in ``players`` order."""
+
+    match_id: str
+    date: str
+    players: list[tuple[str, str]]
+    values: npt.NDArray[np.float64]
+
+
+class _MatchFold:
+    """Counters of one match being folded."""
+
+    def __init__(self, match_id: str, date: str) -> None:
+        self.match_id = match_id
+        self.date = date
+        self.rows: dict[tuple[str, str], list[float]] = {}
+
+    def add(self, event: dict[str, Any]) -> None:
+        player = _name(event.get("player"))
+        if not player:
+            return
+        kind = _normalized(_name(event.get("type")))
+        # Nested details (StatsBomb) or the flat event itself
+        detail = event.get(kind.replace(" ", "_"))
+        if not isinstance(detail, dict):
+            detail = event
+        key = (player, _name(event.get("team")))
+        row = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = [0.0] * len(EVENT_METRICS)
+        outcome = detail.get("outcome")
+        succeeded = outcome is None or _normalized(_name(outcome)) in _COMPLETE
+        start = _point(event.get("location"))
+        end = _point(detail.get("end_location"))
+        if kind == "pass":
+            row[_METRIC["passes"]] += 1
+            if succeeded:
+                row[_METRIC["passes_completed"]] += 1
+                row[_METRIC["progressive_passes"]] += _progressive(start, end)
+            assist = bool(detail.get("goal_assist") or detail.get("assist"))
+            row[_METRIC["key_passes"]] += bool(
+                assist or detail.get("shot_assist") or detail.get("key_pass")
+            )
+            row[_METRIC["assists"]] += assist
+        elif kind == "carry":
+            row[_METRIC["carries"]] += 1
+            row[_METRIC["progressive_carries"]] += _progressive(start, end)
+        elif kind == "dribble":
+            row[_METRIC["dribbles"]] += outcome is not None and succeeded
+        elif kind == "shot":
+            row[_METRIC["shots"]] += 1
+            row[_METRIC["goals"]] += _normalized(_name(outcome)) == "goal"
+            row[_METRIC["xg"]] += float(detail.get("statsbomb_xg") or detail.get("xg") or 0)
+        elif kind in ("ball recovery", "recovery"):
+            row[_METRIC["recoveries"]] += 1
+
+    def result(self) -> MatchAggregates:
+        players = list(self.rows)
+        values = np.array([self.rows[key] for key in players], dtype=np.float64)
+        return MatchAggregates(
+            self.match_id, self.date, players, values.reshape(-1, len(EVENT_METRICS))
+        )
+
+
+def fold_events(events: Iterator[dict[str, Any]], default_match: str = "") -> list[MatchAggregates]:
+    """Fold a stream of events into per-match aggregates, in order of appearance."""
+    matches: dict[str, _MatchFold] = {}
+    for event in events:
+        match_id = str(event.get("match_id") or default_match)
+        fold = matches.get(match_id)
+        if fold is None:
+            date = str(event.get("match_date") or event.get("date") or "")[:10]
+            fold = matches[match_id] = _MatchFold(match_id, date)
+        fold.add(event)
+    return [fold.result() for fold in matches.values()]
+
+
+def fold_file(path: str | Path) -> list[MatchAggregates]:
+    """Aggregates of every match in an event file (match id defaults to its name)."""
+    return fold_events(iter_events(path), Path(path).stem)
+
+
+def fold_files(paths: Sequence[str | Path], workers: int = 0) -> list[list[MatchAggregates]]:
+    """`fold_file` of each path, in a process pool when there are several (0 = one per CPU)."""
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        return [fold_file(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fold_file, paths))
+
+
+# --- Store ---
+
+
+@dataclass(frozen=True)
+class EventTotals:
+    """Aggregates of one player (or team) over a selection of matches."""
+
+    name: str
+    matches: int
+    values: dict[str, float]
+
+    def per_match(self, metric: str) -> float:
+        return self.values[metric] / self.matches if self.matches else 0.0
+
+
+@dataclass(frozen=True)
+class _Table:
+    """Player-match rows sorted by (player, date, match id)."""
+
+    players: NameIndex
+    teams: NameIndex
+    player: npt.NDArray[np.int32]
+    team: npt.NDArray[np.int32]
+    match: npt.NDArray[np.intp]
+    values: npt.NDArray[np.float64]
+    offsets: npt.NDArray[np.intp]
+    # Per match code, in date order
+    match_ids: list[str]
+    dates: list[str]
+
+
+def metric_column(metric: str) -> int:
+    """Column of ``metric`` (name or Spanish label)."""
+    text = normalize_text(metric).strip()
+    if text.replace(" ", "_") in _METRIC:
+        return _METRIC[text.replace(" ", "_")]
+    labels = {normalize_text(label): name for name, label in EVENT_METRICS.items()}
+    if text in labels:
+        return _METRIC[labels[text]]
+    prefixed = [name for label, name in labels.items() if text and label.startswith(text)]
+    if len(prefixed) == 1:
+        return _METRIC[prefixed[0]]
+    raise ValueError(f"Métrica desconocida: {metric!r}. Disponibles: {', '.join(EVENT_METRICS)}")
+
+
+class MatchEventStore:
+    """Per-player and per-team aggregates of the ingested matches.
+
+    Args:
+        path: Event file or directory followed by `refresh` (None = in-memory only)
+        workers: Processes folding files in `refresh` (0 = one per CPU)
+    """
+
+    def __init__(self, path: str | Path | None = None, workers: int = 0) -> None:
+        self.path = Path(path) if path else None
+        self.workers = workers
+        self._lock = threading.RLock()
+        self._matches: dict[str, MatchAggregates] = {}
+        # (size, mtime) and match ids of each followed file
+        self._files: dict[str, tuple[tuple[int, int], list[str]]] = {}
+        self._table: _Table | None = None
+
+    def __len__(self) -> int:
+        """Matches ingested."""
+        return len(self._matches)
+
+    # --- Updates ---
+
+    def add(self, matches: Sequence[MatchAggregates]) -> None:
+        """Merge matches, replacing any already ingested with the same id."""
+        with self._lock:
+            for match in matches:
+                self._matches[match.match_id] = match
+            self._table = None
+
+    def ingest(self, paths: Sequence[str | Path]) -> int:
+        """Fold and merge event files. Returns matches merged."""
+        folded = fold_files(paths, self.workers)
+        self.add([match for matches in folded for match in matches])
+        return sum(len(matches) for matches in folded)
+
+    def refresh(self) -> int:
+        """Ingest new or modified files under ``path``; drop deleted ones. Returns matches merged."""
+        if self.path is None:
+            return 0
+        if self.path.is_dir():
+            files = sorted(p for p in self.path.iterdir() if p.suffix.lower() in EVENT_SUFFIXES)
+        else:
+            files = [self.path] if self.path.exists() else []
+        with self._lock:
+            signatures = {}
+            for file in files:
+                stat = file.stat()
+                signatures[str(file)] = (stat.st_size, stat.st_mtime_ns)
+            for source in [source for source in self._files if source not in signatures]:
+                for match_id in self._files.pop(source)[1]:
+                    self._matches.pop(match_id, None)
+                self._table = None
+            changed = [
+                source
+                for source, signature in signatures.items()
+                if self._files.get(source, ((-1, -1), []))[0] != signature
+            ]
+            if not changed:
+                return 0
+            folded = fold_files(changed, self.workers)
+            for source, matches in zip(changed, folded, strict=True):
+                self._files[source] = (signatures[source], [m.match_id for m in matches])
+            self.add([match for matches in folded for match in matches])
+            return sum(len(matches) for matches in folded)
+
+    # --- Queries ---
+
+    def table(self) -> _Table:
+        with self._lock:
+            if self._table is None:
+                self._table = self._build()
+            return self._table
+
+    def _build(self) -> _Table:
+        matches = sorted(self._matches.values(), key=lambda m: (m.date, m.match_id))
+        players: dict[str, int] = {}
+        teams: dict[str, int] = {}
+        player_codes: list[int] = []
+        team_codes: list[int] = []
+        match_rows: list[int] = []
+        for i, match in enumerate(matches):
+            for player, team in match.players:
+                player_codes.append(players.setdefault(player, len(players)))
+                team_codes.append(teams.setdefault(team, len(teams)))
+                match_rows.append(i)
+        player_array = np.array(player_codes, dtype=np.int32)
+        # Stable: keeps date order within each player
+        order = np.argsort(player_array, kind="stable")
+        values = (
+            np.concatenate([match.values for match in matches])
+            if matches
+            else np.zeros((0, len(EVENT_METRICS)))
+        )
+        return _Table(
+            NameIndex(list(players)),
+            NameIndex(list(teams)),
+            player_array[order],
+            np.array(team_codes, dtype=np.int32)[order],
+            np.array(match_rows, dtype=np.intp)[order],
+            values[order],
+            np.searchsorted(player_array[order], np.arange(len(players) + 1)),
+            [match.match_id for match in matches],
+            [match.date for match in matches],
+        )
+
+    def player(self, player: str, last: int = 0) -> EventTotals:
+        """``player``'s totals over all matches, or the last ``last``."""
+        table = self.table()
+        code = table.players.resolve(player)
+        rows = slice(int(table.offsets[code]), int(table.offsets[code + 1]))
+        values = table.values[rows][-last:] if last else table.values[rows]
+        totals = values.sum(axis=0)
+        return EventTotals(
+            table.players.names[code],
+            len(values),
+            {metric: float(totals[i]) for metric, i in _METRIC.items()},
+        )
+
+    def top(
+        self, metric: str, n: int = 5, team: str | None = None, per_match: bool = False
+    ) -> list[tuple[str, float, int]]:
+        """Best ``n`` players by ``metric`` as (player, value, matches), best first."""
+        table = self.table()
+        column = metric_column(metric)
+        keep = np.ones(len(table.player), dtype=bool)
+        if team:
+            keep = table.team == table.teams.resolve(team)
+        size = len(table.players.names)
+        totals = np.bincount(table.player[keep], table.values[keep, column], minlength=size)
+        matches = np.bincount(table.player[keep], minlength=size)
+        score = totals
+        if per_match:
+            score = np.divide(totals, matches, out=np.zeros_like(totals), where=matches > 0)
+        candidates = np.flatnonzero(matches)
+        n = min(n, len(candidates))
+        if n <= 0:
+            return []
+        best = candidates[np.argpartition(-score[candidates], n - 1)[:n]]
+        best = best[np.argsort(-score[best], kind="stable")]
+        return [(table.players.names[i], float(score[i]), int(matches[i])) for i in best]
+
+    def team(self, team: str) -> tuple[EventTotals, float]:
+        """``team``'s totals over its matches, and the xG it conceded in them."""
+        table = self.table()
+        code = table.teams.resolve(team)
+        rows = table.team == code
+        matches = np.unique(table.match[rows])
+        rivals = np.isin(table.match, matches) & ~rows
+        conceded = table.values[rivals, _METRIC["xg"]].sum()
+        totals = table.values[rows].sum(axis=0)
+        return (
+            EventTotals(
+                table.teams.names[code],
+                len(matches),
+                {metric: float(totals[i]) for metric, i in _METRIC.items()},
+            ),
+            float(conceded),
+        )
+
+    def form(
+        self, player: str, metric: str, window: int = 5, last: int = 10
+    ) -> list[tuple[str, str, float, float]]:
+        """Last ``last`` matches of ``player`` as (date, match, value, rolling mean)."""
+        table = self.table()
+        code = table.players.resolve(player)
+        first, end = int(table.offsets[code]), int(table.offsets[code + 1])
+        series = table.values[first:end, metric_column(metric)]
+        window = max(1, window)
+        sums = np.cumsum(series)
+        sums[window:] = sums[window:] - sums[:-window]
+        rolling = sums / np.minimum(np.arange(1, len(series) + 1), window)
+        matches = table.match[first:end]
+        return [
+            (
+                table.dates[matches[i]],
+                table.match_ids[matches[i]],
+                float(series[i]),
+                float(rolling[i]),
+            )
+            for i in range(max(len(series) - last, 0), len(series))
+        ]
+
+
+@functools.cache
+def load_match_events(path: str, workers: int = 0) -> MatchEventStore:
+    """Process-wide store following the event feeds at ``path`` (MATCH_EVENTS_PATH)."""
+    store = MatchEventStore(path, workers)
+    store.refresh()
+    return store
@@ -0,0 +1,379 @@
+"""Injury history with an interval index for the medical agent's tools.
+
+Each injury is an interval ``[start, end)``: ``end`` is the return date
+(the first day the player is available again), or open while no return
+date is known. Intervals are kept in NumPy arrays sorted by start, with
+the running maximum of ``end`` alongside:
+
+- Players out on day D: binary search for the injuries starting on or
+  before D, and for the first one whose running maximum end passes D.
+  Only the few intervals between both positions are checked. Open
+  injuries are left out of the running maximum (they would pin it to the
+  end of time) and checked apart; there are only a handful at any time
+- Days lost per player and season: intervals clipped to the season and
+  summed per player with one ``bincount``
+- Recurrences: the same injury again within a window after the return,
+  found by comparing neighbours in (player, injury, start) order
+
+The CSV export has a header row with ``player``, ``injury``, ``start``
+and ``end`` (ISO dates, ``end`` empty while open). New reports are
+appended to the file: `InjuryStore.refresh` parses only the bytes added
+since the last read and merges them. A row for an existing (player,
+start) pair replaces it, so re-sent or revised reports are idempotent.
+Merges build a new index and swap it in, so readers never see a partial
+update.
+"""
+
+import csv
+import datetime
+import functools
+import io
+import os
+import threading
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from football_club.data.stats import NameIndex
+from football_club.graph.router import normalize_text
+
+# End of injuries without a return date yet
+OPEN_END = np.datetime64("9999-12-31", "D")
+
+# Seasons start on July 1st (see football_club.data.stats)
+_SEASON_START = (7, 1)
+
+FIELDS = ("player", "injury", "start", "end")
+
+
+def parse_date(value: "str | datetime.date | None", default: datetime.date | None = None) -> Any:
+    """ISO date (``YYYY-MM-DD``) as ``datetime64[D]``; empty → ``default`` (today)."""
+    if isinstance(value, datetime.date):
+        return np.datetime64(value, "D")
+    if not value or not str(value).strip():
+        return np.datetime64(default or datetime.date.today(), "D")
+    try:
+        return np.datetime64(str(value).strip(), "D")
+    except ValueError:
+        raise ValueError(f"Fecha no válida: {value!r} (usa AAAA-MM-DD)") from None
+
+
+def season_bounds(start_year: int) -> tuple[np.datetime64, np.datetime64]:
+    month, day = _SEASON_START
+    return (
+        np.datetime64(datetime.date(start_year, month, day), "D"),
+        np.datetime64(datetime.date(start_year + 1, month, day), "D"),
+    )
+
+
+@dataclass(frozen=True)
+class Injury:
+    """One injury of a player (``end`` None while there is no return date)."""
+
+    player: str
+    injury: str
+    start: str
+    end: str | None
+
+
+@dataclass(frozen=True)
+class Recurrence:
+    """An injury that happened again ``gap_days`` after the player's return."""
+
+    player: str
+    injury: str
+    previous_end: str
+    start: str
+    gap_days: int
+
+
+@dataclass(frozen=True)
+class Fixture:
+    date: str
+    opponent: str
+    competition: str
+
+
+@dataclass(frozen=True)
+class _Intervals:
+    """Immutable snapshot of the index, swapped whole on every merge."""
+
+    player: npt.NDArray[np.int32]
+    injury: npt.NDArray[np.int32]
+    start: npt.NDArray[np.datetime64]
+    end: npt.NDArray[np.datetime64]
+    # Running maximum of the closed injuries' ends, and the open injuries
+    max_end: npt.NDArray[np.datetime64]
+    open: npt.NDArray[np.intp]
+
+    @classmethod
+    def build(
+        cls,
+        player: npt.NDArray[np.int32],
+        injury: npt.NDArray[np.int32],
+        start: npt.NDArray[np.datetime64],
+        end: npt.NDArray[np.datetime64],
+    ) -> "_Intervals":
+        """Keep the last row of each (player, start) and sort by start."""
+        key = player.astype(np.int64) << 32 | start.astype(np.int64) & 0xFFFFFFFF
+        _, last_reversed = np.unique(key[::-1], return_index=True)
+        keep = len(key) - 1 - last_reversed
+        keep = keep[np.argsort(start[keep], kind="stable")]
+        start, end = start[keep], end[keep]
+        is_open = end == OPEN_END
+        closed_end = np.where(is_open, start, end)
+        return cls(
+            player[keep],
+            injury[keep],
+            start,
+            end,
+            np.maximum.accumulate(closed_end) if len(end) else end,
+            np.flatnonzero(is_open),
+        )
+
+
+def _empty() -> _Intervals:
+    dates = np.array([], dtype="datetime64[D]")
+    codes = np.array([], dtype=np.int32)
+    return _Intervals(codes, codes, dates, dates, dates, np.array([], dtype=np.intp))
+
+
+def _dates(values: list[str]) -> npt.NDArray[np.datetime64]:
+    """Vectorized `parse_date` of non-empty ISO dates."""
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except ValueError:
+        # Report the offending value
+        return np.array([parse_date(value) for value in values], dtype="datetime64[D]")
+
+
+class InjuryStore:
+    """Injury intervals of our squad, queryable by day, season and player.
+
+    Args:
+        squad: Players to report as available when they have no open injury
+            (players with injury records are always included)
+        path: CSV file followed by `refresh` (None = in-memory only)
+    """
+
+    def __init__(self, squad: Sequence[str] = (), path: str | Path | None = None) -> None:
+        self.path = Path(path) if path else None
+        self._lock = threading.RLock()
+        self._squad = list(squad)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._offset = 0
+        self._signature: tuple[int, int] | None = None
+        self._players: list[str] = []
+        self._player_codes: dict[str, int] = {}
+        self._injuries: list[str] = []
+        self._injury_codes: dict[str, int] = {}
+        self._index = _empty()
+        for player in self._squad:
+            self._code(self._players, self._player_codes, player)
+
+    @staticmethod
+    def _code(names: list[str], codes: dict[str, int], name: str) -> int:
+        """Code of ``name``, matched case- and accent-insensitively."""
+        if name in codes:
+            return codes[name]
+        key = normalize_text(name).strip()
+        if key not in codes:
+            codes[key] = len(names)
+            names.append(name.strip())
+        # Reports repeat the same spelling: skip normalizing it next time
+        codes[name] = codes[key]
+        return codes[key]
+
+    def __len__(self) -> int:
+        return len(self._index.start)
+
+    @property
+    def players(self) -> NameIndex:
+        return NameIndex(self._players)
+
+    # --- Updates ---
+
+    def add(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        """Merge injury reports (``player``, ``injury``, ``start``, ``end``). Returns rows read."""
+        with self._lock:
+            players: list[int] = []
+            injuries: list[int] = []
+            starts: list[str] = []
+            ends: list[str] = []
+            for row in rows:
+                players.append(self._code(self._players, self._player_codes, str(row["player"])))
+                injuries.append(
+                    self._code(self._injuries, self._injury_codes, str(row.get("injury") or "?"))
+                )
+                starts.append(str(row["start"]).strip())
+                ends.append(str(row.get("end") or "").strip() or str(OPEN_END))
+            if not players:
+                return 0
+            index = self._index
+            self._index = _Intervals.build(
+                np.concatenate([index.player, np.array(players, dtype=np.int32)]),
+                np.concatenate([index.injury, np.array(injuries, dtype=np.int32)]),
+                np.concatenate([index.start, _dates(starts)]),
+                np.concatenate([index.end, _dates(ends)]),
+            )
+            return len(players)
+
+    def refresh(self) -> int:
+        """Merge the rows appended to ``path`` since the last read. Returns rows read."""
+        if self.path is None or not self.path.exists():
+            return 0
+        with self._lock:
+            stat = self.path.stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if signature == self._signature:
+                return 0
+            if stat.st_size < self._offset:
+                # Truncated or replaced: start over
+                self._reset()
+            with self.path.open("rb") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+            # Only complete lines; a report being written is picked up next time
+            complete = chunk[: chunk.rfind(b"\n") + 1]
+            text = complete.decode("utf-8")
+            if self._offset == 0:
+                rows: Iterable[Mapping[str, Any]] = csv.DictReader(io.StringIO(text))
+            else:
+                rows = csv.DictReader(io.StringIO(text), fieldnames=FIELDS)
+            read = self.add(rows)
+            self._offset += len(complete)
+            self._signature = signature if len(complete) == len(chunk) else None
+            return read
+
+    def record(self, player: str, injury: str, start: str, end: str | None = None) -> Injury:
+        """Append a report to ``path`` (or only to memory) and merge it."""
+        row = {"player": player, "injury": injury, "start": str(parse_date(start)), "end": ""}
+        if end:
+            row["end"] = str(parse_date(end))
+        if self.path is None:
+            self.add([row])
+        else:
+            new_file = not self.path.exists() or self.path.stat().st_size == 0
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDS)
+                if new_file:
+                    writer.writeheader()
+                writer.writerow(row)
+            self.refresh()
+        return Injury(row["player"], injury, row["start"], row["end"] or None)
+
+    # --- Queries ---
+
+    def _injury(self, index: _Intervals, i: int) -> Injury:
+        end = index.end[i]
+        return Injury(
+            self._players[index.player[i]],
+            self._injuries[index.injury[i]],
+            str(index.start[i]),
+            None if end == OPEN_END else str(end),
+        )
+
+    def out_on(self, day: "str | datetime.date | None" = None) -> list[Injury]:
+        """Injuries keeping a player out on ``day`` (default today)."""
+        on = parse_date(day)
+        index = self._index
+        hi = np.searchsorted(index.start, on, side="right")
+        lo = np.searchsorted(index.max_end, on, side="right")
+        rows = lo + np.flatnonzero(index.end[lo:hi] > on)
+        rows = np.union1d(rows, index.open[index.open < hi])
+        return [self._injury(index, int(i)) for i in rows]
+
+    def available_on(self, day: "str | datetime.date | None" = None) -> list[str]:
+        """Squad players without an injury on ``day``."""
+        out = {normalize_text(injury.player) for injury in self.out_on(day)}
+        return [p for p in self._players if normalize_text(p) not in out]
+
+    def history(self, player: str) -> list[Injury]:
+        code = self.players.resolve(player)
+        index = self._index
+        return [self._injury(index, int(i)) for i in np.flatnonzero(index.player == code)]
+
+    def days_lost(
+        self, season: int, as_of: "str | datetime.date | None" = None
+    ) -> list[tuple[str, int]]:
+        """Days each player was out during the season starting in ``season``, most first.
+
+        Open injuries count up to ``as_of`` (default today).
+        """
+        first, last = season_bounds(season)
+        until = min(last, parse_date(as_of))
+        index = self._index
+        starts = np.maximum(index.start, first)
+        ends = np.minimum(index.end, until)
+        days = np.maximum((ends - starts).astype(np.int64), 0)
+        totals = np.bincount(index.player, weights=days, minlength=len(self._players))
+        order = np.argsort(-totals, kind="stable")
+        return [(self._players[i], int(totals[i])) for i in order if totals[i] > 0]
+
+    def recurrences(self, player: str | None = None, window_days: int = 365) -> list[Recurrence]:
+        """Injuries of the same type suffered again within ``window_days`` of returning."""
+        index = self._index
+        order = np.lexsort((index.start, index.injury, index.player))
+        player_codes, injury_codes = index.player[order], index.injury[order]
+        starts, previous_end = index.start[order][1:], index.end[order][:-1]
+        gaps = (starts - previous_end).astype(np.int64)
+        hits = (
+            (player_codes[1:] == player_codes[:-1])
+            & (injury_codes[1:] == injury_codes[:-1])
+            & (previous_end != OPEN_END)
+            & (gaps <= window_days)
+        )
+        if player:
+            hits &= player_codes[1:] == self.players.resolve(player)
+        return [
+            Recurrence(
+                self._players[player_codes[i + 1]],
+                self._injuries[injury_codes[i + 1]],
+                str(previous_end[i]),
+                str(starts[i]),
+                int(gaps[i]),
+            )
+            for i in np.flatnonzero(hits).tolist()
+        ]
+
+
+def current_season(today: datetime.date | None = None) -> int:
+    today = today or datetime.date.today()
+    return today.year - ((today.month, today.day) < _SEASON_START)
+
+
+def load_fixtures(path: str | Path) -> list[Fixture]:
+    """Match calendar from a CSV with ``date``, ``opponent`` and ``competition``."""
+    with Path(path).open(newline="", encoding="utf-8") as f:
+        return [
+            Fixture(str(parse_date(row["date"])), row["opponent"], row.get("competition") or "")
+            for row in csv.DictReader(f)
+        ]
+
+
+def find_fixture(
+    fixtures: Sequence[Fixture], opponent: str, today: datetime.date | None = None
+) -> Fixture:
+    """Next match against ``opponent`` (the latest one if none is left)."""
+    index = NameIndex(sorted({fixture.opponent for fixture in fixtures}))
+    name = index.names[index.resolve(opponent)]
+    matches = sorted((f for f in fixtures if f.opponent == name), key=lambda f: f.date)
+    on = str(parse_date(today))
+    upcoming = [f for f in matches if f.date >= on]
+    return upcoming[0] if upcoming else matches[-1]
+
+
+@functools.cache
+def load_injury_store(path: str, squad: tuple[str, ...] = ()) -> InjuryStore:
+    """Process-wide store following the CSV at ``path`` (INJURIES_PATH)."""
+    store = InjuryStore(squad, path)
+    if os.path.exists(path):
+        store.refresh()
+    return store
@@ -0,0 +1,329 @@
+"""Player similarity index for the scout's tools.
+
+Every scouted player is one column of a compact float32 feature matrix:
+per-90 production (`FEATURES`), age, log-minutes and a one-hot position
+group, each feature standardized over the whole database. The matrix is
+stored feature-major (features x players), which halves the cost of the
+one vector-matrix product over all players that finds the nearest
+neighbours of a reference player:
+
+- ``cosine``: profile shape, independent of volume (norms precomputed)
+- ``mahalanobis``: distance under the inverse feature covariance, so
+  correlated stats (goals and xG, shots) do not count twice. Expanded as
+  ``x'Px - 2 x'(Pq) + q'Pq`` with ``x'Px`` precomputed per player, it
+  needs no second matrix
+
+Position, age, league and market value filters are boolean masks over
+the same players, so a filtered top-k over hundreds of thousands of players
+stays within a few milliseconds.
+
+The CSV export has a header row with ``player``, ``club``, ``league``,
+``position``, ``age``, ``market_value`` (millions of euros) and
+``minutes``, followed by any of the `FEATURES` columns (missing ones load
+as zeros).
+"""
+
+import csv
+import functools
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from football_club.data.stats import NameIndex
+from football_club.graph.router import normalize_text
+
+# Per-90 feature column → Spanish label
+FEATURES: dict[str, str] = {
+    "goals_p90": "goles/90",
+    "xg_p90": "xG/90",
+    "assists_p90": "asistencias/90",
+    "xa_p90": "xA/90",
+    "shots_p90": "tiros/90",
+    "key_passes_p90": "pases clave/90",
+    "progressive_passes_p90": "pases progresivos/90",
+    "dribbles_p90": "regates/90",
+    "tackles_p90": "entradas/90",
+    "interceptions_p90": "intercepciones/90",
+    "pass_accuracy": "% acierto en el pase",
+}
+
+POSITIONS = ("GK", "DF", "MF", "FW")
+
+POSITION_LABELS = {"GK": "portero", "DF": "defensa", "MF": "centrocampista", "FW": "delantero"}
+
+# Spellings of each position group (normalized), English and Spanish
+_POSITION_ALIASES = {
+    "GK": ("gk", "por", "portero", "goalkeeper", "arquero"),
+    "DF": ("df", "def", "defensa", "defender", "central", "lateral", "carrilero", "cb", "lb", "rb"),
+    "MF": (
+        "mf", "med", "medio", "centrocampista", "mediocentro", "pivote", "interior",
+        "midfielder", "cm", "dm", "am", "mediapunta",
+    ),
+    "FW": ("fw", "del", "delantero", "forward", "extremo", "punta", "striker", "st", "lw", "rw"),
+}  # fmt: skip
+
+# Weight of the position one-hot relative to one standardized feature
+_POSITION_WEIGHT = 1.5
+
+DISTANCES = ("cosine", "mahalanobis")
+
+
+def position_group(text: str) -> int:
+    """Index in `POSITIONS` of a position name ("Delantero", "CB", "extremo")."""
+    key = normalize_text(text).strip()
+    for i, group in enumerate(POSITIONS):
+        if key in _POSITION_ALIASES[group] or key.split(" ")[0] in _POSITION_ALIASES[group]:
+            return i
+    raise ValueError(
+        f"Posición desconocida: {text!r} (portero, defensa, centrocampista, delantero)"
+    )
+
+
+@dataclass(frozen=True)
+class ScoutedPlayer:
+    """One row of the index, with its similarity to the reference player."""
+
+    player: str
+    club: str
+    league: str
+    position: str
+    age: float
+    market_value: float
+    minutes: float
+    score: float = 0.0
+
+
+class ScoutingIndex:
+    """Similarity search over scouted players.
+
+    Args:
+        players: Player names, one per row
+        clubs: Club of each row
+        leagues: League names, indexed by the codes in ``league``
+        league: League code of each row
+        position: `POSITIONS` index of each row
+        age: Age of each row
+        market_value: Market value of each row (millions of euros)
+        minutes: Minutes played of each row
+        features: One column per `FEATURES` entry
+    """
+
+    # Arrays saved by `football_club.data.columnar`, derived ones included
+    ARRAYS = (
+        "league",
+        "position",
+        "age",
+        "market_value",
+        "minutes",
+        "raw",
+        "matrix",
+        "_inverse_norms",
+        "_precision",
+        "_quadratic",
+    )
+
+    def __init__(
+        self,
+        players: Sequence[str],
+        clubs: Sequence[str],
+        leagues: Sequence[str],
+        league: npt.ArrayLike,
+        position: npt.ArrayLike,
+        age: npt.ArrayLike,
+        market_value: npt.ArrayLike,
+        minutes: npt.ArrayLike,
+        features: npt.ArrayLike,
+    ) -> None:
+        self.players = NameIndex(players)
+        self.clubs: Sequence[str] = list(clubs)
+        self.leagues = NameIndex(leagues)
+        self.league = np.asarray(league, dtype=np.int16)
+        self.position = np.asarray(position, dtype=np.int8)
+        self.age = np.asarray(age, dtype=np.float32)
+        self.market_value = np.asarray(market_value, dtype=np.float32)
+        self.minutes = np.asarray(minutes, dtype=np.float32)
+        self.raw = np.asarray(features, dtype=np.float32).reshape(len(self.age), len(FEATURES))
+
+        columns = np.column_stack(
+            [self.raw, self.age, np.log1p(self.minutes)],
+        ).astype(np.float64)
+        mean = columns.mean(axis=0)
+        std = columns.std(axis=0)
+        std[std == 0] = 1.0
+        onehot = np.eye(len(POSITIONS))[self.position] * _POSITION_WEIGHT
+        # Features x players
+        self.matrix = np.ascontiguousarray(
+            np.column_stack([(columns - mean) / std, onehot]).T, dtype=np.float32
+        )
+        norms = np.linalg.norm(self.matrix, axis=0)
+        self._inverse_norms = (1 / np.where(norms == 0, 1.0, norms)).astype(np.float32)
+        # Inverse covariance of the standardized features, shrunk towards the
+        # identity when there are few players per dimension (Euclidean at worst)
+        dims = self.matrix.shape[0]
+        shrinkage = min(1.0, dims / max(len(self) - 1, 1))
+        covariance = np.eye(dims)
+        if shrinkage < 1:
+            covariance = (1 - shrinkage) * np.cov(self.matrix) + shrinkage * covariance
+        self._precision = np.linalg.inv(covariance + 1e-6 * np.eye(dims)).astype(np.float32)
+        self._quadratic = ((self._precision @ self.matrix) * self.matrix).sum(axis=0)
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+    # --- Loading ---
+
+    @classmethod
+    def from_arrays(
+        cls,
+        players: NameIndex,
+        clubs: Sequence[str],
+        leagues: Sequence[str],
+        arrays: Mapping[str, npt.NDArray[Any]],
+    ) -> "ScoutingIndex":
+        """Index over precomputed `ARRAYS` (e.g. memory-mapped), without recomputing them."""
+        index = cls.__new__(cls)
+        index.players = players
+        index.clubs = clubs
+        index.leagues = NameIndex(leagues)
+        for name in cls.ARRAYS:
+            setattr(index, name, arrays[name])
+        return index
+
+    @classmethod
+    def from_records(cls, rows: Iterable[Mapping[str, Any]]) -> "ScoutingIndex":
+        """Build the index from dict rows (see the module docstring for the columns)."""
+        leagues: dict[str, int] = {}
+        players: list[str] = []
+        clubs: list[str] = []
+        numbers: list[list[float]] = []
+        codes: list[tuple[int, int]] = []
+        for row in rows:
+            players.append(str(row["player"]))
+            clubs.append(str(row.get("club") or ""))
+            codes.append(
+                (
+                    leagues.setdefault(str(row.get("league") or ""), len(leagues)),
+                    position_group(str(row["position"])),
+                )
+            )
+            numbers.append(
+                [float(row.get(key) or 0) for key in ("age", "market_value", "minutes")]
+                + [float(row.get(feature) or 0) for feature in FEATURES]
+            )
+        table = np.array(numbers, dtype=np.float32).reshape(-1, 3 + len(FEATURES))
+        code_table = np.array(codes, dtype=np.int32).reshape(-1, 2)
+        return cls(
+            players,
+            clubs,
+            list(leagues),
+            code_table[:, 0],
+            code_table[:, 1],
+            table[:, 0],
+            table[:, 1],
+            table[:, 2],
+            table[:, 3:],
+        )
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "ScoutingIndex":
+        with Path(path).open(newline="", encoding="utf-8") as f:
+            return cls.from_records(csv.DictReader(f))
+
+    # --- Queries ---
+
+    def profile(self, player: str) -> ScoutedPlayer:
+        return self._row(self.players.resolve(player))
+
+    def features(self, player: str) -> dict[str, float]:
+        row = self.players.resolve(player)
+        return {feature: float(self.raw[row, i]) for i, feature in enumerate(FEATURES)}
+
+    def _row(self, i: int, score: float = 0.0) -> ScoutedPlayer:
+        return ScoutedPlayer(
+            self.players.names[i],
+            self.clubs[i],
+            self.leagues.names[self.league[i]],
+            POSITIONS[self.position[i]],
+            float(self.age[i]),
+            float(self.market_value[i]),
+            float(self.minutes[i]),
+            score,
+        )
+
+    def mask(
+        self,
+        position: str | None = None,
+        min_age: float | None = None,
+        max_age: float | None = None,
+        league: str | None = None,
+        max_value: float | None = None,
+        min_minutes: float | None = None,
+    ) -> npt.NDArray[np.bool_]:
+        """Rows passing every given filter."""
+        keep = np.ones(len(self), dtype=bool)
+        if position:
+            keep &= self.position == position_group(position)
+        if min_age is not None:
+            keep &= self.age >= min_age
+        if max_age is not None:
+            keep &= self.age <= max_age
+        if league:
+            keep &= self.league == self.leagues.resolve(league)
+        if max_value is not None:
+            keep &= self.market_value <= max_value
+        if min_minutes is not None:
+            keep &= self.minutes >= min_minutes
+        return keep
+
+    def similar(
+        self, player: str, k: int = 10, distance: str = "cosine", **filters: Any
+    ) -> list[ScoutedPlayer]:
+        """The ``k`` players most similar to ``player`` among those passing ``filters``.
+
+        ``filters`` are the keyword arguments of `mask`. Scores are cosine
+        similarities, or negated Mahalanobis distances (higher is closer).
+        """
+        if distance not in DISTANCES:
+            raise ValueError(f"Distancia desconocida: {distance!r} ({', '.join(DISTANCES)})")
+        ref = self.players.resolve(player)
+        query = self.matrix[:, ref]
+        if distance == "cosine":
+            scores = (query @ self.matrix) * self._inverse_norms
+            scores *= self._inverse_norms[ref]
+        else:
+            squared = self._quadratic - 2 * ((self._precision @ query) @ self.matrix)
+            squared += self._quadratic[ref]
+            scores = -np.sqrt(np.maximum(squared, 0))
+        scores[ref] = -np.inf
+        candidates: npt.NDArray[np.intp] | None = None
+        ranked = scores
+        if any(value is not None for value in filters.values()):
+            keep = self.mask(**filters)
+            keep[ref] = False
+            candidates = np.flatnonzero(keep)
+            ranked = scores[candidates]
+        k = min(k, len(ranked) if candidates is not None else len(ranked) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-ranked, k - 1)[:k]
+        top = top[np.argsort(-ranked[top], kind="stable")]
+        best = top if candidates is None else candidates[top]
+        return [self._row(int(i), float(scores[i])) for i in best]
+
+
+@functools.cache
+def load_scouting_index(path: str) -> ScoutingIndex:
+    """Process-wide index loaded from ``path`` (SCOUTING_INDEX_PATH).
+
+    ``path`` is a CSV export or a dataset built by ``football-club build``
+    (memory-mapped, see `football_club.data.columnar`).
+    """
+    from football_club.data.columnar import is_dataset, open_scouting_index
+
+    if is_dataset(path):
+        return open_scouting_index(path)
+    return ScoutingIndex.from_csv(path)
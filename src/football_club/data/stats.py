@@ -0,0 +1,338 @@
+"""Columnar per-match statistics of our squad for the analyst's tools.
+
+One row per player and match, held column-wise in NumPy arrays sorted by
+(player, date):
+
+- Player index: row offsets per player, so a player's matches are one
+  contiguous slice in date order
+- Aggregate cube: totals per (player, season, competition) precomputed at
+  load time, so season and competition rankings never scan the rows
+
+Top-N rankings, per-90 rates, comparisons and rolling form are vectorized
+over those arrays and take microseconds, so the analyst answers with
+computed figures instead of the model's memory.
+
+The CSV export has a header row with ``player``, ``date`` (ISO) and
+``competition`` followed by any of the `METRICS` columns; missing metric
+columns load as zeros.
+"""
+
+import csv
+import functools
+import re
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from football_club.graph.router import normalize_text
+
+# Column → Spanish label, in matrix order
+METRICS: dict[str, str] = {
+    "minutes": "minutos",
+    "goals": "goles",
+    "assists": "asistencias",
+    "shots": "tiros",
+    "shots_on_target": "tiros a puerta",
+    "xg": "goles esperados (xG)",
+    "xa": "asistencias esperadas (xA)",
+    "key_passes": "pases clave",
+    "passes": "pases",
+    "passes_completed": "pases completados",
+    "progressive_passes": "pases progresivos",
+    "dribbles": "regates completados",
+    "tackles": "entradas",
+    "interceptions": "intercepciones",
+    "saves": "paradas",
+}
+
+METRIC_INDEX = {metric: i for i, metric in enumerate(METRICS)}
+_MINUTES = METRIC_INDEX["minutes"]
+
+# Minutes below which per-90 rankings leave a player out by default
+MIN_PER90_MINUTES = 270
+
+# Seasons start in July: 2024-08-15 and 2025-05-20 are both "2024/25"
+_SEASON_START_MONTH = 7
+
+
+def season_of(dates: npt.NDArray[np.datetime64]) -> npt.NDArray[np.int16]:
+    """Start year of the season of each date."""
+    years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    return (years - (months < _SEASON_START_MONTH)).astype(np.int16)
+
+
+def season_label(start_year: int) -> str:
+    return f"{start_year}/{(start_year + 1) % 100:02d}"
+
+
+def parse_season(text: str) -> int:
+    """``"2024/25"``, ``"2024-25"``, ``"24/25"`` or ``"2024"`` → 2024."""
+    match = re.fullmatch(r"\s*(\d{2}|\d{4})(?:\s*[/-]\s*\d{2,4})?\s*", text)
+    if match is None:
+        raise ValueError(f"Temporada no válida: {text!r} (usa p. ej. 2024/25)")
+    year = int(match.group(1))
+    return year + 2000 if year < 100 else year
+
+
+def metric_index(metric: str) -> int:
+    """Matrix column of ``metric`` (column name or Spanish label)."""
+    text = normalize_text(metric).strip()
+    if text.replace(" ", "_") in METRIC_INDEX:
+        return METRIC_INDEX[text.replace(" ", "_")]
+    labels = {normalize_text(label): name for name, label in METRICS.items()}
+    if text in labels:
+        return METRIC_INDEX[labels[text]]
+    prefixed = [name for label, name in labels.items() if text and label.startswith(text)]
+    if len(prefixed) == 1:
+        return METRIC_INDEX[prefixed[0]]
+    raise ValueError(f"Métrica desconocida: {metric!r}. Disponibles: {', '.join(METRICS)}")
+
+
+@dataclass(frozen=True)
+class PlayerTotals:
+    """Aggregated statistics of one player over a selection of matches."""
+
+    player: str
+    matches: int
+    values: dict[str, float]
+
+    @property
+    def minutes(self) -> float:
+        return self.values["minutes"]
+
+    def per90(self, metric: str) -> float:
+        return self.values[metric] * 90 / self.minutes if self.minutes else 0.0
+
+
+@dataclass(frozen=True)
+class FormPoint:
+    """One match of a player's recent form with the rolling mean up to it."""
+
+    date: str
+    competition: str
+    value: float
+    rolling: float
+
+
+class NameIndex:
+    """Accent- and case-insensitive lookup of names ("Lewandowski", "lewandowski")."""
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names: Sequence[str] = list(names)
+        self._exact = {normalize_text(name): i for i, name in enumerate(self.names)}
+
+    def resolve(self, query: str) -> int:
+        """Position of ``query``: exact name, else the only name containing it."""
+        key = normalize_text(query).strip()
+        if key in self._exact:
+            return self._exact[key]
+        candidates = [i for name, i in self._exact.items() if key and key in name]
+        if len(candidates) == 1:
+            return candidates[0]
+        if candidates:
+            options = ", ".join(self.names[i] for i in candidates[:5])
+            raise ValueError(f"{query!r} es ambiguo: {options}")
+        raise ValueError(f"No encuentro a {query!r}")
+
+
+class SquadStats:
+    """Per-match statistics of our squad, indexed by player, season and competition.
+
+    Args:
+        players: Player names, indexed by the codes in ``player``
+        player: Player code of each row
+        date: Match date of each row
+        competitions: Competition names, indexed by the codes in ``competition``
+        competition: Competition code of each row
+        values: One column per metric in `METRICS` order
+    """
+
+    def __init__(
+        self,
+        players: Sequence[str],
+        player: npt.ArrayLike,
+        date: npt.ArrayLike,
+        competitions: Sequence[str],
+        competition: npt.ArrayLike,
+        values: npt.ArrayLike,
+    ) -> None:
+        player_codes = np.asarray(player, dtype=np.int32)
+        dates = np.asarray(date, dtype="datetime64[D]")
+        order = np.lexsort((dates, player_codes))
+        self.players = NameIndex(players)
+        self.competitions = NameIndex(competitions)
+        self.player = player_codes[order]
+        self.date = dates[order]
+        self.competition = np.asarray(competition, dtype=np.int16)[order]
+        self.values = np.ascontiguousarray(np.asarray(values, dtype=np.float32)[order])
+        self.season = season_of(self.date)
+        if self.values.shape != (len(self.player), len(METRICS)):
+            raise ValueError(f"Expected {len(METRICS)} metric columns, got {self.values.shape}")
+
+        self._offsets = np.searchsorted(self.player, np.arange(len(players) + 1))
+        self.seasons = np.unique(self.season)
+        season_codes = np.searchsorted(self.seasons, self.season)
+        shape = (len(players), len(self.seasons), len(competitions))
+        cell = np.ravel_multi_index((self.player, season_codes, self.competition), shape)
+        size = int(np.prod(shape))
+        self._cube_matches = np.bincount(cell, minlength=size).reshape(shape)
+        self._cube = np.stack(
+            [np.bincount(cell, weights=column, minlength=size) for column in self.values.T],
+            axis=-1,
+        ).reshape(*shape, len(METRICS))
+
+    def __len__(self) -> int:
+        return len(self.player)
+
+    # --- Loading ---
+
+    @classmethod
+    def from_records(cls, rows: Iterable[Mapping[str, Any]]) -> "SquadStats":
+        """Build the store from dict rows (``player``, ``date``, ``competition``, metrics)."""
+        players: dict[str, int] = {}
+        competitions: dict[str, int] = {}
+        player_codes: list[int] = []
+        competition_codes: list[int] = []
+        dates: list[str] = []
+        values: list[list[float]] = []
+        for row in rows:
+            player_codes.append(players.setdefault(str(row["player"]), len(players)))
+            competition_codes.append(
+                competitions.setdefault(str(row["competition"]), len(competitions))
+            )
+            dates.append(str(row["date"]))
+            values.append([float(row.get(metric) or 0) for metric in METRICS])
+        return cls(
+            list(players),
+            player_codes,
+            dates,
+            list(competitions),
+            competition_codes,
+            np.array(values, dtype=np.float32).reshape(-1, len(METRICS)),
+        )
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "SquadStats":
+        with Path(path).open(newline="", encoding="utf-8") as f:
+            return cls.from_records(csv.DictReader(f))
+
+    # --- Selections ---
+
+    def player_rows(self, player: str) -> slice:
+        """Rows of ``player``, in date order."""
+        code = self.players.resolve(player)
+        return slice(int(self._offsets[code]), int(self._offsets[code + 1]))
+
+    def _cells(self, season: str | None, competition: str | None) -> tuple[Any, Any]:
+        """Cube indexes selecting a season and a competition (None = all)."""
+        season_cells: Any = slice(None)
+        if season:
+            year = parse_season(season)
+            found = np.flatnonzero(self.seasons == year)
+            if not len(found):
+                raise ValueError(f"No hay datos de la temporada {season_label(year)}")
+            season_cells = found[:1]
+        competition_cells: Any = slice(None)
+        if competition:
+            competition_cells = [self.competitions.resolve(competition)]
+        return season_cells, competition_cells
+
+    def _group(
+        self, season: str | None, competition: str | None
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]:
+        """Totals (players x metrics) and matches per player of a selection."""
+        seasons, competitions = self._cells(season, competition)
+        totals = self._cube[:, seasons][:, :, competitions].sum(axis=(1, 2))
+        matches = self._cube_matches[:, seasons][:, :, competitions].sum(axis=(1, 2))
+        return totals, matches
+
+    # --- Queries ---
+
+    def totals(
+        self, player: str, season: str | None = None, competition: str | None = None
+    ) -> PlayerTotals:
+        code = self.players.resolve(player)
+        seasons, competitions = self._cells(season, competition)
+        cube = self._cube[code, seasons][:, competitions]
+        matches = self._cube_matches[code, seasons][:, competitions]
+        values = cube.sum(axis=(0, 1))
+        return PlayerTotals(
+            self.players.names[code],
+            int(matches.sum()),
+            {metric: float(values[i]) for metric, i in METRIC_INDEX.items()},
+        )
+
+    def compare(
+        self, players: Sequence[str], season: str | None = None, competition: str | None = None
+    ) -> list[PlayerTotals]:
+        return [self.totals(player, season, competition) for player in players]
+
+    def top(
+        self,
+        metric: str,
+        n: int = 5,
+        season: str | None = None,
+        competition: str | None = None,
+        per90: bool = False,
+        min_minutes: float | None = None,
+    ) -> list[tuple[str, float, float]]:
+        """Best ``n`` players by ``metric`` as (player, value, minutes), best first.
+
+        Per-90 rankings leave out players under `MIN_PER90_MINUTES` unless
+        ``min_minutes`` says otherwise.
+        """
+        column = metric_index(metric)
+        totals, _ = self._group(season, competition)
+        minutes = totals[:, _MINUTES]
+        score = totals[:, column]
+        floor = min_minutes if min_minutes is not None else (MIN_PER90_MINUTES if per90 else 0)
+        eligible = (minutes >= floor) & (minutes > 0)
+        if per90:
+            score = np.divide(score * 90, minutes, out=np.zeros_like(score), where=minutes > 0)
+        candidates = np.flatnonzero(eligible)
+        n = min(n, len(candidates))
+        if n <= 0:
+            return []
+        best = candidates[np.argpartition(-score[candidates], n - 1)[:n]]
+        best = best[np.argsort(-score[best], kind="stable")]
+        return [(self.players.names[i], float(score[i]), float(minutes[i])) for i in best]
+
+    def form(self, player: str, metric: str, window: int = 5, last: int = 10) -> list[FormPoint]:
+        """Last ``last`` matches of ``player`` with the ``window``-match rolling mean."""
+        rows = self.player_rows(player)
+        series = self.values[rows, metric_index(metric)].astype(np.float64)
+        window = max(1, window)
+        sums = np.cumsum(series)
+        sums[window:] = sums[window:] - sums[:-window]
+        counts = np.minimum(np.arange(1, len(series) + 1), window)
+        rolling = sums / counts
+        start = max(len(series) - last, 0)
+        dates = self.date[rows]
+        competitions = self.competition[rows]
+        return [
+            FormPoint(
+                str(dates[i]),
+                self.competitions.names[competitions[i]],
+                float(series[i]),
+                float(rolling[i]),
+            )
+            for i in range(start, len(series))
+        ]
+
+
+@functools.cache
+def load_squad_stats(path: str) -> SquadStats:
+    """Process-wide store loaded from ``path`` (SQUAD_STATS_PATH).
+
+    ``path`` is a CSV export or a dataset built by ``football-club build``.
+    """
+    from football_club.data.columnar import is_dataset, open_squad_stats
+
+    if is_dataset(path):
+        return open_squad_stats(path)
+    return SquadStats.from_csv(path)
@@ -0,0 +1,391 @@
+"""Per-player training load (GPS) time series for the medical agent's tools.
+
+Session exports (one row per player and session) are summed per day into
+a dense players x days matrix for each of the `LOAD_METRICS`. Workload
+indicators use the daily ``load`` (session RPE or the GPS provider's
+player load) and its cumulative sums along the day axis:
+
+- Acute load: mean daily load over the last `ACUTE_DAYS` days
+- Chronic load: mean daily load over the last `CHRONIC_DAYS` days
+- ACWR: acute / chronic load
+- Monotony: mean / standard deviation of the daily load over the acute
+  window (rest days count as zero)
+- Strain: acute window load x monotony
+
+Any window is the difference of two cumulative sums, so the indicators
+of the whole squad over a full season are a few vectorized operations
+over the matrix, and one day's are O(players). New sessions only
+re-accumulate the sums from the earliest day they touch.
+
+Exports are CSV files, or Parquet with the optional ``pyarrow``
+dependency (``football-club[parquet]``), with ``player`` and ``date``
+(ISO) columns followed by any of the `LOAD_METRICS` (common GPS export
+names such as ``player_load`` or ``total_distance`` are recognized).
+`TrainingLoad.refresh` follows one file or every export in a directory:
+new and rewritten files are merged, and a rewritten or deleted file
+first has its previous sessions subtracted, so re-exports never count
+twice.
+"""
+
+import csv
+import datetime
+import functools
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from football_club.data.injuries import parse_date
+from football_club.data.stats import NameIndex
+from football_club.graph.router import normalize_text
+
+# Column → Spanish label, in matrix order (``load`` drives the indicators)
+LOAD_METRICS: dict[str, str] = {
+    "load": "carga (UA)",
+    "duration": "minutos",
+    "distance": "distancia total (m)",
+    "hsr": "distancia a alta velocidad (m)",
+    "sprints": "sprints",
+    "accelerations": "aceleraciones",
+}
+
+# Export column names (normalized) of other providers → our columns
+_COLUMN_ALIASES = {
+    "player name": "player",
+    "athlete": "player",
+    "name": "player",
+    "session date": "date",
+    "player load": "load",
+    "srpe": "load",
+    "rpe load": "load",
+    "minutes": "duration",
+    "total distance": "distance",
+    "hsr distance": "hsr",
+    "high speed running": "hsr",
+    "sprint efforts": "sprints",
+    "acc": "accelerations",
+}
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+
+# Risk thresholds
+ACWR_HIGH = 1.5
+ACWR_LOW = 0.8
+MONOTONY_HIGH = 2.0
+
+EXPORT_SUFFIXES = (".csv", ".parquet")
+
+
+@dataclass(frozen=True)
+class Indicators:
+    """Workload indicators of every player (rows) over a range of days (columns).
+
+    ``acwr`` and ``monotony`` are NaN where undefined (no chronic load, no
+    variation); ``ready`` is False until a player has `CHRONIC_DAYS` of history.
+    """
+
+    players: list[str]
+    dates: npt.NDArray[np.datetime64]
+    acute: npt.NDArray[np.float64]
+    chronic: npt.NDArray[np.float64]
+    acwr: npt.NDArray[np.float64]
+    monotony: npt.NDArray[np.float64]
+    strain: npt.NDArray[np.float64]
+    ready: npt.NDArray[np.bool_]
+
+
+@dataclass(frozen=True)
+class Workload:
+    """One player's workload on one day, with the risk flags it raises."""
+
+    player: str
+    date: str
+    acute: float
+    chronic: float
+    acwr: float
+    monotony: float
+    strain: float
+    ready: bool
+    flags: tuple[str, ...]
+
+
+def risk_flags(acwr: float, monotony: float) -> tuple[str, ...]:
+    """Spanish risk flags of an ACWR / monotony pair (NaN never flags)."""
+    flags = []
+    if acwr > ACWR_HIGH:
+        flags.append(f"pico de carga (ACWR {acwr:.2f} > {ACWR_HIGH})")
+    elif acwr < ACWR_LOW:
+        flags.append(f"infracarga (ACWR {acwr:.2f} < {ACWR_LOW})")
+    if monotony > MONOTONY_HIGH:
+        flags.append(f"monotonía alta ({monotony:.2f} > {MONOTONY_HIGH})")
+    return tuple(flags)
+
+
+def _column(name: str) -> str:
+    key = normalize_text(name).replace("_", " ").strip()
+    return _COLUMN_ALIASES.get(key, key.replace(" ", "_"))
+
+
+def read_export(path: str | Path) -> list[dict[str, Any]]:
+    """Rows of a CSV or Parquet export, with columns renamed to ours."""
+    path = Path(path)
+    if path.suffix.lower() == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Reading Parquet exports needs pyarrow: pip install 'football-club[parquet]'"
+            ) from None
+        rows: list[dict[str, Any]] = pq.read_table(path).to_pylist()
+    else:
+        with path.open(newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    return [{_column(key): value for key, value in row.items()} for row in rows]
+
+
+class TrainingLoad:
+    """Daily training load per player with rolling workload indicators.
+
+    Args:
+        path: Export file or directory followed by `refresh` (None = in-memory only)
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path else None
+        self._lock = threading.RLock()
+        self._players: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._origin: Any = None
+        # Metrics x players x days, and cumulative sums of load and load²
+        self._daily = np.zeros((len(LOAD_METRICS), 0, 0))
+        self._cum = np.zeros((0, 1))
+        self._cum_sq = np.zeros((0, 1))
+        self._first_day = np.zeros(0, dtype=np.int64)
+        # Sessions merged per source, and (size, mtime) of the followed files
+        self._sources: dict[str, tuple[Any, Any, Any]] = {}
+        self._files: dict[str, tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        """Days covered, from the first session to the last."""
+        return int(self._daily.shape[2])
+
+    @property
+    def players(self) -> NameIndex:
+        return NameIndex(self._players)
+
+    @property
+    def last_date(self) -> str | None:
+        return None if self._origin is None else str(self._date(len(self) - 1))
+
+    def _date(self, index: int) -> Any:
+        return self._origin + np.timedelta64(index, "D")
+
+    def _code(self, name: str) -> int:
+        if name in self._codes:
+            return self._codes[name]
+        key = normalize_text(name).strip()
+        if key not in self._codes:
+            self._codes[key] = len(self._players)
+            self._players.append(name.strip())
+        self._codes[name] = self._codes[key]
+        return self._codes[key]
+
+    # --- Updates ---
+
+    def add(self, rows: Iterable[Mapping[str, Any]], source: str | None = None) -> int:
+        """Merge session rows. Returns rows read.
+
+        Rows merged before under the same ``source`` (an export file) are
+        subtracted first, so a re-exported file replaces its old sessions.
+        """
+        with self._lock:
+            codes: list[int] = []
+            dates: list[str] = []
+            values: list[list[float]] = []
+            for row in rows:
+                codes.append(self._code(str(row["player"])))
+                dates.append(str(row["date"]).strip()[:10])
+                values.append([float(row.get(metric) or 0) for metric in LOAD_METRICS])
+            player = np.array(codes, dtype=np.int64)
+            try:
+                day = np.array(dates, dtype="datetime64[D]")
+            except ValueError:
+                day = np.array([parse_date(value) for value in dates], dtype="datetime64[D]")
+            table = np.array(values, dtype=np.float64).reshape(-1, len(LOAD_METRICS))
+            previous = self._sources.pop(source, None) if source else None
+            if previous is not None:
+                self._apply(*previous, sign=-1.0)
+            self._apply(player, day, table)
+            if source:
+                self._sources[source] = (player, day, table)
+            return len(codes)
+
+    def _apply(
+        self,
+        player: npt.NDArray[np.int64],
+        day: npt.NDArray[np.datetime64],
+        table: npt.NDArray[np.float64],
+        sign: float = 1.0,
+    ) -> None:
+        """Add (or subtract) sessions into the daily matrix and re-accumulate the sums."""
+        if not len(player):
+            return
+        first, last = np.min(day), np.max(day)
+        shift = 0
+        if self._origin is None:
+            self._origin = first
+        elif first < self._origin:
+            shift = int((self._origin - first).astype(np.int64))
+            self._origin = first
+        days = max(len(self) + shift, int((last - self._origin).astype(np.int64)) + 1)
+        players = len(self._players)
+        if shift or days > len(self) or players > self._daily.shape[1]:
+            grown = np.zeros((len(LOAD_METRICS), players, days))
+            grown[:, : self._daily.shape[1], shift : shift + len(self)] = self._daily
+            self._daily = grown
+            self._first_day = np.concatenate(
+                [
+                    self._first_day + shift,
+                    np.full(players - len(self._first_day), np.iinfo(np.int64).max),
+                ]
+            )
+            self._cum = np.zeros((players, days + 1))
+            self._cum_sq = np.zeros((players, days + 1))
+            start = 0
+        else:
+            start = int((first - self._origin).astype(np.int64))
+        index = (day - self._origin).astype(np.int64)
+        cells = player * days + index
+        for m in range(len(LOAD_METRICS)):
+            self._daily[m] += sign * np.bincount(
+                cells, weights=table[:, m], minlength=players * days
+            ).reshape(players, days)
+        if sign > 0:
+            np.minimum.at(self._first_day, player, index)
+        else:
+            active = (np.abs(self._daily) > 1e-9).any(axis=0)
+            self._first_day = np.where(
+                active.any(axis=1), active.argmax(axis=1), np.iinfo(np.int64).max
+            )
+        load = self._daily[0, :, start:]
+        self._cum[:, start + 1 :] = self._cum[:, start : start + 1] + np.cumsum(load, axis=1)
+        self._cum_sq[:, start + 1 :] = self._cum_sq[:, start : start + 1] + np.cumsum(
+            load * load, axis=1
+        )
+
+    def refresh(self) -> int:
+        """Merge new or rewritten exports under ``path``; forget deleted ones. Returns rows read."""
+        if self.path is None:
+            return 0
+        if self.path.is_dir():
+            files = sorted(p for p in self.path.iterdir() if p.suffix.lower() in EXPORT_SUFFIXES)
+        else:
+            files = [self.path] if self.path.exists() else []
+        read = 0
+        with self._lock:
+            present = {str(file) for file in files}
+            for source in [source for source in self._files if source not in present]:
+                del self._files[source]
+                self._apply(*self._sources.pop(source), sign=-1.0)
+            for file in files:
+                stat = file.stat()
+                signature = (stat.st_size, stat.st_mtime_ns)
+                if self._files.get(str(file)) == signature:
+                    continue
+                read += self.add(read_export(file), source=str(file))
+                self._files[str(file)] = signature
+        return read
+
+    # --- Queries ---
+
+    def _windows(
+        self, cum: npt.NDArray[np.float64], ends: npt.NDArray[np.int64], days: int
+    ) -> npt.NDArray[np.float64]:
+        """Sums over the ``days`` days ending on each day index in ``ends`` (inclusive)."""
+        hi = np.clip(ends + 1, 0, len(self))
+        lo = np.clip(ends + 1 - days, 0, len(self))
+        return cum[:, hi] - cum[:, lo]
+
+    def indicators(
+        self,
+        first: "str | datetime.date | None" = None,
+        last: "str | datetime.date | None" = None,
+    ) -> Indicators:
+        """Indicators of every player from ``first`` to ``last`` (default: all days)."""
+        with self._lock:
+            if self._origin is None:
+                raise ValueError("No hay datos de carga de entrenamiento")
+            lo = parse_date(first) if first else self._origin
+            hi = parse_date(last) if last else self._date(len(self) - 1)
+            ends = np.arange(
+                int((lo - self._origin).astype(np.int64)),
+                int((hi - self._origin).astype(np.int64)) + 1,
+            )
+            acute_sum = self._windows(self._cum, ends, ACUTE_DAYS)
+            acute = acute_sum / ACUTE_DAYS
+            chronic = self._windows(self._cum, ends, CHRONIC_DAYS) / CHRONIC_DAYS
+            variance = self._windows(self._cum_sq, ends, ACUTE_DAYS) / ACUTE_DAYS - acute**2
+            std = np.sqrt(np.maximum(variance, 0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                acwr = np.where(chronic > 0, acute / chronic, np.nan)
+                monotony = np.where(std > 1e-9, acute / std, np.nan)
+            return Indicators(
+                list(self._players),
+                self._origin + ends,
+                acute,
+                chronic,
+                acwr,
+                monotony,
+                acute_sum * np.nan_to_num(monotony),
+                ends[None, :] - self._first_day[:, None] + 1 >= CHRONIC_DAYS,
+            )
+
+    def workload(self, day: "str | datetime.date | None" = None) -> list[Workload]:
+        """Every player's workload on ``day`` (default today)."""
+        on = parse_date(day)
+        table = self.indicators(on, on)
+        return [
+            Workload(
+                player,
+                str(on),
+                float(table.acute[i, 0]),
+                float(table.chronic[i, 0]),
+                float(table.acwr[i, 0]),
+                float(table.monotony[i, 0]),
+                float(table.strain[i, 0]),
+                bool(table.ready[i, 0]),
+                risk_flags(table.acwr[i, 0], table.monotony[i, 0]) if table.ready[i, 0] else (),
+            )
+            for i, player in enumerate(table.players)
+        ]
+
+    def daily(
+        self, player: str, last: "str | datetime.date | None" = None, days: int = ACUTE_DAYS
+    ) -> list[tuple[str, dict[str, float]]]:
+        """``player``'s daily totals over the ``days`` days up to ``last`` (default today)."""
+        with self._lock:
+            code = self.players.resolve(player)
+            end = int((parse_date(last) - self._origin).astype(np.int64))
+            return [
+                (
+                    str(self._date(d)),
+                    {
+                        metric: float(self._daily[m, code, d]) if 0 <= d < len(self) else 0.0
+                        for m, metric in enumerate(LOAD_METRICS)
+                    },
+                )
+                for d in range(end - days + 1, end + 1)
+            ]
+
+
+@functools.cache
+def load_training_load(path: str) -> TrainingLoad:
+    """Process-wide store following the export(s) at ``path`` (TRAINING_LOAD_PATH)."""
+    store = TrainingLoad(path)
+    store.refresh()
+    return store
@@ -0,0 +1,137 @@
+"""Parallel fan-out of compound questions to several domain agents.
+
+"How is Pedri performing and when is he back from injury?" needs the
+analyst and the medic. Through the hub alone that is a serial chain
+(orchestrator → analyst → orchestrator → medical). Instead, the
+orchestrator calls several transfer tools in one message. The handoff
+tools then set ``fanout`` and `FanoutEdge` sends one `FANOUT_NODE` task per
+agent, so all of them run in the same superstep. Each agent answers only
+its part (transfer tools stripped, see `ForceAnswerMiddleware`), and
+`merge_fanout` joins the parts into a single reply. A compound turn costs
+two serial LLM calls, orchestrator plus the slowest agent.
+
+Fan-out tokens are not streamed (they would interleave); the merged answer
+arrives as one update.
+"""
+
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.constants import TAG_NOSTREAM
+from langgraph.types import Overwrite, Send
+
+from football_club.graph.guard import HandoffGuard
+from football_club.metrics import AGENT_METADATA_KEY
+from football_club.state import (
+    AGENT_ANALYST,
+    AGENT_MEDICAL,
+    AGENT_ORCHESTRATOR,
+    AGENT_SCOUT,
+    AgentState,
+    FanoutResult,
+)
+
+if TYPE_CHECKING:
+    from football_club.graph.workflow import LazyAgentNode
+
+FANOUT_NODE = "fanout"
+MERGE_NODE = "merge"
+
+# Section headings of the merged answer
+FANOUT_HEADINGS = {
+    AGENT_SCOUT: "Scouting",
+    AGENT_ANALYST: "Rendimiento",
+    AGENT_MEDICAL: "Parte médico",
+}
+
+
+class FanoutTask(TypedDict):
+    """`Send` payload of one fan-out agent."""
+
+    agent: str
+    messages: list[BaseMessage]
+    fanout: list[str]
+
+
+class FanoutEdge:
+    """Orchestrator edge: one `FANOUT_NODE` task per dispatched agent, else the guard."""
+
+    def __init__(self, guard: HandoffGuard) -> None:
+        self.guard = guard
+
+    def __call__(self, state: AgentState) -> str | list[Send]:
+        agents = state.get("fanout")
+        if not agents:
+            return self.guard(state)
+        return [
+            Send(FANOUT_NODE, FanoutTask(agent=agent, messages=state["messages"], fanout=agents))
+            for agent in agents
+        ]
+
+
+class FanoutNode:
+    """Run one domain agent on its part of a compound question.
+
+    The agent sees the whole conversation (including the orchestrator's
+    transfers) plus the ``fanout`` flag, and its answer is collected in
+    ``fanout_results`` rather than the transcript.
+    """
+
+    def __init__(self, agents: dict[str, "LazyAgentNode"]) -> None:
+        self.agents = agents
+
+    @staticmethod
+    def _config(agent: str, config: RunnableConfig) -> RunnableConfig:
+        return {
+            **config,
+            "tags": [*config.get("tags", []), TAG_NOSTREAM],
+            "metadata": {**config.get("metadata", {}), AGENT_METADATA_KEY: agent},
+        }
+
+    @staticmethod
+    def _result(agent: str, output: dict[str, Any]) -> dict[str, Any]:
+        answer = next(
+            (
+                m.text
+                for m in reversed(output.get("messages", []))
+                if isinstance(m, AIMessage) and not m.tool_calls and m.text
+            ),
+            "",
+        )
+        return {"fanout_results": [FanoutResult(agent=agent, answer=answer)]}
+
+    def invoke(self, task: FanoutTask, config: RunnableConfig) -> dict[str, Any]:
+        agent = task["agent"]
+        agent_input = {"messages": task["messages"], "fanout": task["fanout"]}
+        output = self.agents[agent].graph.invoke(agent_input, self._config(agent, config))
+        return self._result(agent, output)
+
+    async def ainvoke(self, task: FanoutTask, config: RunnableConfig) -> dict[str, Any]:
+        agent = task["agent"]
+        agent_input = {"messages": task["messages"], "fanout": task["fanout"]}
+        output = await self.agents[agent].graph.ainvoke(agent_input, self._config(agent, config))
+        return self._result(agent, output)
+
+    def as_node(self) -> RunnableLambda[FanoutTask, dict[str, Any]]:
+        return RunnableLambda(self.invoke, afunc=self.ainvoke, name=FANOUT_NODE)
+
+
+def merge_fanout(state: AgentState) -> dict[str, Any]:
+    """Join the partial answers (in dispatch order) into one orchestrator reply.
+
+    The orchestrator keeps the conversation afterwards: a follow-up may
+    concern any of the merged domains.
+    """
+    answers = {r["agent"]: r["answer"] for r in state.get("fanout_results", [])}
+    sections = [
+        f"**{FANOUT_HEADINGS.get(agent, agent)}:** {answers[agent]}"
+        for agent in state.get("fanout", [])
+        if answers.get(agent)
+    ]
+    return {
+        "messages": [AIMessage(content="\n\n".join(sections), name=AGENT_ORCHESTRATOR)],
+        "active_agent": AGENT_ORCHESTRATOR,
+        "fanout": [],
+        "fanout_results": Overwrite([]),
+    }
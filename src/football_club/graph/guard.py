@@ -0,0 +1,183 @@
+"""Handoff hop budget and ping-pong detection.
+
+Every handoff is another paid LLM call, and nothing stops two agents from
+transferring a question back and forth until the recursion limit. The
+router node starts each turn with ``handoff_path = [first agent]`` and each
+handoff tool appends its target, so the routing layer always knows the
+agents visited in the current turn. `HandoffGuard` replaces the plain
+after-agent edge and diverts the turn to a resolve node when:
+
+- the turn has used more than ``max_hops`` handoffs, or
+- the same transfer (A → B) happens a second time (ping-pong)
+
+`ResolveNode` then picks one agent and flags ``force_answer`` so it runs
+with no tools and must reply; worst-case cost per turn is therefore
+``max_hops + 2`` agent calls. Strategies:
+
+- ``best_agent``: the domain agent the local router scores highest for the
+  question (falling back to the last domain agent visited)
+- ``orchestrator``: the orchestrator answers directly
+"""
+
+import logging
+import threading
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from langchain_core.messages import HumanMessage
+from langgraph.graph import END
+
+from football_club.graph.router import DOMAIN_AGENTS, FastRouter
+from football_club.state import AGENT_ORCHESTRATOR, AgentState, message_entities
+
+logger = logging.getLogger("football_club")
+
+RESOLVE_NODE = "resolve"
+RESOLUTION_STRATEGIES = ("best_agent", "orchestrator")
+
+
+@dataclass(frozen=True)
+class LoopStats:
+    """Process-wide handoff counters (see `loop_stats`)."""
+
+    handoffs: int = 0
+    # Domain → domain transfers; each one saved an orchestrator hop
+    lateral_handoffs: int = 0
+    hop_limit_hits: int = 0
+    ping_pongs: int = 0
+    max_hops_seen: int = 0
+    resolved_by: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def forced_resolutions(self) -> int:
+        return self.hop_limit_hits + self.ping_pongs
+
+
+class _LoopCounters:
+    """Thread-safe accumulator behind `loop_stats`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = LoopStats()
+
+    def record_handoff(self, hops: int, reason: str | None, lateral: bool = False) -> None:
+        with self._lock:
+            stats = self._stats
+            self._stats = replace(
+                stats,
+                handoffs=stats.handoffs + 1,
+                lateral_handoffs=stats.lateral_handoffs + lateral,
+                max_hops_seen=max(stats.max_hops_seen, hops),
+                hop_limit_hits=stats.hop_limit_hits + (reason == "hop_limit"),
+                ping_pongs=stats.ping_pongs + (reason == "ping_pong"),
+            )
+
+    def record_resolution(self, agent: str) -> None:
+        with self._lock:
+            resolved_by = dict(self._stats.resolved_by)
+            resolved_by[agent] = resolved_by.get(agent, 0) + 1
+            self._stats = replace(self._stats, resolved_by=resolved_by)
+
+    def snapshot(self) -> LoopStats:
+        with self._lock:
+            return replace(self._stats, resolved_by=dict(self._stats.resolved_by))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = LoopStats()
+
+
+_counters = _LoopCounters()
+
+
+def loop_stats() -> LoopStats:
+    """Snapshot of the handoff loop counters since start (or last reset)."""
+    return _counters.snapshot()
+
+
+def reset_loop_stats() -> None:
+    _counters.reset()
+
+
+def turn_hops(state: AgentState) -> int:
+    """Handoffs made so far in the current turn."""
+    return max(len(state.get("handoff_path", [])) - 1, 0)
+
+
+def is_lateral(path: list[str]) -> bool:
+    """Whether the last handoff of ``path`` went straight from one domain agent to another."""
+    return len(path) >= 2 and path[-2] in DOMAIN_AGENTS and path[-1] in DOMAIN_AGENTS
+
+
+def find_loop(path: list[str], max_hops: int) -> str | None:
+    """Return why ``path`` must be cut short (``hop_limit``/``ping_pong``), or None."""
+    if len(path) - 1 > max_hops:
+        return "hop_limit"
+    transfers = Counter(zip(path, path[1:], strict=False))
+    if any(count >= 2 for count in transfers.values()):
+        return "ping_pong"
+    return None
+
+
+class HandoffGuard:
+    """After-agent edge: END, the next agent, or the resolve node.
+
+    Args:
+        route: The unguarded after-agent edge (END or the active agent)
+        max_hops: Handoffs allowed per turn before forcing an answer
+    """
+
+    def __init__(self, route: Callable[[AgentState], str], max_hops: int = 3) -> None:
+        self.route = route
+        self.max_hops = max_hops
+
+    def __call__(self, state: AgentState) -> str:
+        target = self.route(state)
+        if target == END:
+            return END
+        if state.get("force_answer"):
+            # A forced agent has no tools; never route it again
+            return END
+
+        path = state.get("handoff_path", [])
+        reason = find_loop(path, self.max_hops)
+        _counters.record_handoff(len(path) - 1, reason, is_lateral(path))
+        if reason is None:
+            return target
+        logger.warning(f"Handoff {reason} after {' → '.join(path)}; forcing an answer")
+        return RESOLVE_NODE
+
+
+class ResolveNode:
+    """Pick the agent that must answer a turn cut short by `HandoffGuard`."""
+
+    def __init__(self, strategy: str = "best_agent", router: FastRouter | None = None) -> None:
+        if strategy not in RESOLUTION_STRATEGIES:
+            raise ValueError(
+                f"Unknown handoff resolution {strategy!r}, expected one of {RESOLUTION_STRATEGIES}"
+            )
+        self.strategy = strategy
+        self.router = router or FastRouter()
+
+    def choose(self, state: AgentState) -> str:
+        if self.strategy == "orchestrator":
+            return AGENT_ORCHESTRATOR
+        question = next(
+            (m for m in reversed(state.get("messages", [])) if m.type == "human"),
+            HumanMessage(content=""),
+        )
+        decision = self.router.classify(str(question.content), message_entities(question))
+        if decision.agent is not None:
+            return decision.agent
+        scores = decision.scores
+        if any(scores.values()):
+            return max(DOMAIN_AGENTS, key=lambda agent: scores.get(agent, 0.0))
+        visited = [a for a in state.get("handoff_path", []) if a in DOMAIN_AGENTS]
+        return visited[-1] if visited else AGENT_ORCHESTRATOR
+
+    def __call__(self, state: AgentState) -> dict[str, Any]:
+        agent = self.choose(state)
+        _counters.record_resolution(agent)
+        return {"active_agent": agent, "force_answer": True, "handoff_path": [agent]}
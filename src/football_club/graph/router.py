@@ -0,0 +1,422 @@
+"""Local zero-LLM fast-path router.
+
+Classifies the user's message into a domain agent before the graph pays for
+an orchestrator round-trip:
+
+1. Weighted keyword lexicon (Spanish + English, accent-insensitive), plus
+   the players the entity index resolved in the message when no other
+   domain has evidence: an external one points to the scout, one of ours
+   to the analyst
+2. Compact multinomial Naive Bayes trained at import time on a seed corpus,
+   used only when the lexicon does not carry enough evidence
+
+A decision is only emitted when its confidence reaches the threshold;
+ambiguous queries (greetings, "sí", unknown player names...) and compound
+ones (evidence for several domains) return ``agent=None`` so the LLM
+orchestrator keeps handling them.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+from football_club.state import AGENT_ANALYST, AGENT_MEDICAL, AGENT_SCOUT, ResolvedEntity
+
+DOMAIN_AGENTS = (AGENT_SCOUT, AGENT_ANALYST, AGENT_MEDICAL)
+
+# Lexicon evidence needed for full confidence (sum of matched weights)
+_FULL_EVIDENCE = 3.0
+
+# Minimum number of known tokens before trusting the Naive Bayes fallback
+_MIN_MODEL_TOKENS = 2
+
+# Lexicon evidence that makes a domain part of a compound (multi-domain) question
+COMPOUND_EVIDENCE = 1.0
+
+# Evidence of each resolved player, only when no other domain has lexicon
+# evidence: an external one for the scout, one of ours for the analyst (every
+# agent also talks about players). Clubs add none: rivals are as much the
+# analyst's and the medical agent's subject as the scout's
+ENTITY_EVIDENCE = 2.0
+
+# Terms that lean toward a domain without being its subject ("nuestro
+# portero", "minutos tras la lesión", "partido de vuelta"): they only count
+# when no other domain has evidence, so they never make a question compound
+CONTEXT_TERMS = frozenset(
+    {
+        "nuestro",
+        "nuestra",
+        "nuestros",
+        "nuestras",
+        "our",
+        "minutos",
+        "vuelta",
+        "llega",
+        "disponible",
+    }
+)
+
+# term → weight per domain. Multi-word terms are matched as phrases, longest
+# first, and their words are not matched again ("baja de forma" is about form,
+# not an injury "baja"). Terms are stored normalized (lowercase, no accents).
+LEXICON: dict[str, dict[str, float]] = {
+    AGENT_SCOUT: {
+        "fichaje": 3.0,
+        "fichajes": 3.0,
+        "fichar": 3.0,
+        "ficharias": 3.0,
+        "fichamos": 3.0,
+        "ficharlo": 3.0,
+        "traer": 2.5,
+        "suena": 2.0,
+        "venir": 1.0,
+        "reforzar": 2.5,
+        "alternativas": 1.5,
+        "barato": 1.5,
+        "barata": 1.5,
+        "baratos": 1.5,
+        "baratas": 1.5,
+        "mercado": 2.5,
+        "ojeador": 3.0,
+        "scouting": 3.0,
+        "scout": 2.0,
+        "cedido": 1.5,
+        "clausula": 3.0,
+        "traspaso": 3.0,
+        "refuerzo": 2.0,
+        "refuerzos": 2.0,
+        "cantera rival": 2.0,
+        "otro equipo": 3.0,
+        "otros equipos": 3.0,
+        "otro club": 3.0,
+        "premier league": 2.5,
+        "premier": 2.0,
+        "serie a": 2.5,
+        "bundesliga": 2.5,
+        "ligue 1": 2.5,
+        "eredivisie": 2.5,
+        "talento": 2.0,
+        "promesa": 1.0,
+        "transfer": 2.5,
+        "signing": 3.0,
+        "sign": 2.0,
+    },
+    AGENT_ANALYST: {
+        "nuestro": 1.5,
+        "nuestra": 1.5,
+        "nuestros": 1.5,
+        "nuestras": 1.5,
+        "barca": 2.0,
+        "barcelona": 2.0,
+        "plantilla": 2.5,
+        "estadisticas": 2.0,
+        "estadistica": 2.0,
+        "rendimiento": 1.0,
+        "rinde": 1.0,
+        "rindiendo": 1.0,
+        "tactica": 2.5,
+        "tacticas": 2.5,
+        "tactico": 2.5,
+        "formacion": 2.5,
+        "alineacion": 2.5,
+        # "once" alone is also English: only the Spanish line-up phrases count
+        "el once": 2.5,
+        "un once": 2.5,
+        "que once": 2.5,
+        "mejor once": 2.5,
+        "once titular": 2.5,
+        "goles": 2.0,
+        "asistencias": 2.5,
+        "posesion": 2.5,
+        "ocasiones": 2.0,
+        "defensas cerradas": 2.0,
+        "salimos jugando": 3.0,
+        "salida de balon": 3.0,
+        "doble pivote": 3.0,
+        "fuera de casa": 1.0,
+        "presion": 1.5,
+        "xg": 2.0,
+        "minutos": 1.0,
+        "once inicial": 2.5,
+        "baja forma": 3.0,
+        "baja de forma": 3.0,
+        "4-3-3": 3.0,
+        "patron de juego": 3.0,
+        "squad": 2.5,
+        "lineup": 2.5,
+        "stats": 2.0,
+        "clean sheets": 3.0,
+        "tactics": 2.5,
+        "our": 1.5,
+    },
+    AGENT_MEDICAL: {
+        "lesion": 3.0,
+        "lesiones": 3.0,
+        "lesionado": 3.0,
+        "lesionada": 3.0,
+        "recuperacion": 3.0,
+        "recuperarse": 3.0,
+        "rehabilitacion": 3.0,
+        "rehab": 3.0,
+        "baja": 2.5,
+        "bajas": 2.5,
+        "volvera": 1.5,
+        "vuelve": 1.5,
+        "volver a jugar": 3.0,
+        "al 100": 2.5,
+        "llega": 1.0,
+        "disponible": 1.5,
+        "vuelta": 1.0,
+        "estado fisico": 3.0,
+        "medico": 3.0,
+        "medica": 3.0,
+        "fisioterapia": 3.0,
+        "rotura": 3.0,
+        "esguince": 3.0,
+        "ligamento": 3.0,
+        "menisco": 3.0,
+        "isquiotibial": 3.0,
+        "isquiotibiales": 3.0,
+        "tobillo": 2.0,
+        "gemelo": 2.5,
+        "isquios": 3.0,
+        "cruzado": 2.5,
+        "operacion": 2.5,
+        "recaer": 2.5,
+        "recaida": 2.5,
+        "edema": 3.0,
+        "pubalgia": 3.0,
+        "conmocion": 3.0,
+        "curarse": 2.5,
+        "cojeando": 2.5,
+        "rodilla": 2.0,
+        "muscular": 2.0,
+        "molestias": 2.5,
+        "fatiga": 2.0,
+        "carga": 1.0,
+        "prevencion": 2.0,
+        "injury": 3.0,
+        "injured": 3.0,
+        "recovery": 3.0,
+        "sprain": 3.0,
+        "ankle": 2.0,
+    },
+}
+
+# (agent, term, weight), phrases with the most words first
+_TERMS = sorted(
+    ((agent, term, weight) for agent, terms in LEXICON.items() for term, weight in terms.items()),
+    key=lambda entry: -entry[1].count(" "),
+)
+
+# Seed corpus for the Naive Bayes fallback
+_TRAINING_EXAMPLES: list[tuple[str, str]] = [
+    ("qué delanteros jóvenes de la liga portuguesa podríamos fichar", AGENT_SCOUT),
+    ("compara a Haaland con Osimhen", AGENT_SCOUT),
+    ("busca un lateral izquierdo en el mercado con buen centro", AGENT_SCOUT),
+    ("qué tal juega el extremo del Benfica", AGENT_SCOUT),
+    ("recomiéndame un mediocentro defensivo barato", AGENT_SCOUT),
+    ("cuánto cuesta el central del Leverkusen", AGENT_SCOUT),
+    ("jugadores sub 21 con proyección en otros clubes", AGENT_SCOUT),
+    ("who should we sign as a striker", AGENT_SCOUT),
+    ("qué jugadores acaban contrato en junio y podrían salir libres", AGENT_SCOUT),
+    ("cuánto pediría el Sporting por su central zurdo", AGENT_SCOUT),
+    ("cómo está rindiendo nuestro centro del campo", AGENT_ANALYST),
+    ("cuántos goles lleva Lewandowski esta temporada", AGENT_ANALYST),
+    ("analiza la presión alta del equipo en el último partido", AGENT_ANALYST),
+    ("qué formación nos conviene contra el Madrid", AGENT_ANALYST),
+    ("compara las asistencias de Pedri y Gavi", AGENT_ANALYST),
+    ("por qué encajamos tantos goles a balón parado", AGENT_ANALYST),
+    ("qué jugadores de la plantilla tienen más minutos", AGENT_ANALYST),
+    ("how is our team performing this season", AGENT_ANALYST),
+    ("cómo defendemos las transiciones rápidas del rival", AGENT_ANALYST),
+    ("quién tiene mejor porcentaje de pases en la plantilla", AGENT_ANALYST),
+    ("cuándo vuelve Pedri de su lesión", AGENT_MEDICAL),
+    ("cuánto tiempo de baja tiene por una rotura de fibras", AGENT_MEDICAL),
+    ("cómo se previenen las lesiones de isquiotibiales", AGENT_MEDICAL),
+    ("está recuperado del esguince de tobillo", AGENT_MEDICAL),
+    ("qué ejercicios de rehabilitación necesita tras la operación", AGENT_MEDICAL),
+    ("riesgo de recaída por sobrecarga muscular", AGENT_MEDICAL),
+    ("qué tal va la recuperación del portero", AGENT_MEDICAL),
+    ("when will he be back from injury", AGENT_MEDICAL),
+    ("cuándo recibe el alta para entrenar con el grupo", AGENT_MEDICAL),
+    ("tiene una sobrecarga en el aductor, ¿debe descansar?", AGENT_MEDICAL),
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+# Function words carry no domain signal and would inflate model confidence
+_STOPWORDS = frozenset(
+    "a al como con cual cuando cuanto cuantos cuantas de del el en es esta este esto la las "
+    "le lo los mas me mi no nos o para pero por que qu se si su sus te tal tu un una y ya "
+    "the an and be for from he his how in is it of on our she that this to we what when "
+    "who will with".split()
+)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents so lexicon matching is accent-insensitive."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> list[str]:
+    """Normalized words of ``text`` (hyphenated words such as "4-3-3" stay whole)."""
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+def _features(tokens: list[str]) -> list[str]:
+    """Unigrams plus 5-char stems, which absorb most Spanish inflection."""
+    words = [tok for tok in tokens if tok not in _STOPWORDS]
+    return words + [f"{tok[:5]}~" for tok in words if len(tok) > 5]
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """Result of a fast-path classification.
+
+    ``agent`` is None when the router is not confident enough and the
+    LLM orchestrator must decide.
+    """
+
+    agent: str | None
+    confidence: float
+    source: str
+    scores: dict[str, float] = field(default_factory=dict)
+
+
+class NaiveBayesClassifier:
+    """Tiny multinomial Naive Bayes with Laplace smoothing."""
+
+    def __init__(self, examples: list[tuple[str, str]]) -> None:
+        self._labels = sorted({label for _, label in examples})
+        self._counts: dict[str, Counter[str]] = {label: Counter() for label in self._labels}
+        docs: Counter[str] = Counter()
+        for text, label in examples:
+            self._counts[label].update(_features(tokenize(text)))
+            docs[label] += 1
+        self._vocab = set().union(*self._counts.values())
+        self._totals = {label: sum(c.values()) for label, c in self._counts.items()}
+        self._log_priors = {label: math.log(docs[label] / len(examples)) for label in self._labels}
+
+    def known_tokens(self, tokens: list[str]) -> int:
+        """Count content tokens (not stems) seen during training."""
+        return sum(1 for tok in tokens if tok in self._vocab and tok not in _STOPWORDS)
+
+    def predict_proba(self, tokens: list[str]) -> dict[str, float]:
+        """Posterior probability per label (softmax of log-likelihoods)."""
+        feats = [f for f in _features(tokens) if f in self._vocab]
+        vocab_size = len(self._vocab)
+        log_probs = {}
+        for label in self._labels:
+            counts = self._counts[label]
+            denom = self._totals[label] + vocab_size
+            log_probs[label] = self._log_priors[label] + sum(
+                math.log((counts[f] + 1) / denom) for f in feats
+            )
+        top = max(log_probs.values())
+        exp = {label: math.exp(lp - top) for label, lp in log_probs.items()}
+        total = sum(exp.values())
+        return {label: value / total for label, value in exp.items()}
+
+
+# Words the router knows (capitalized names of the seed corpus aside): they
+# are never taken for player or club mentions
+VOCABULARY = frozenset(
+    _STOPWORDS.union(
+        *(tokenize(term) for terms in LEXICON.values() for term in terms),
+        *(
+            tokenize(" ".join(word for word in text.split() if not word[0].isupper()))
+            for text, _ in _TRAINING_EXAMPLES
+        ),
+    )
+)
+
+
+class FastRouter:
+    """Lexicon + Naive Bayes router with a confidence threshold."""
+
+    def __init__(self, threshold: float = 0.75) -> None:
+        self.threshold = threshold
+        self._model = NaiveBayesClassifier(_TRAINING_EXAMPLES)
+
+    def lexicon_scores(self, text: str) -> dict[str, float]:
+        """Sum matched lexicon weights per domain agent (see `CONTEXT_TERMS`)."""
+        padded = f" {' '.join(tokenize(text))} "
+        scores = dict.fromkeys(DOMAIN_AGENTS, 0.0)
+        context = dict.fromkeys(DOMAIN_AGENTS, 0.0)
+        for agent, term, weight in _TERMS:
+            if f" {term} " in padded:
+                (context if term in CONTEXT_TERMS else scores)[agent] += weight
+                while f" {term} " in padded:
+                    padded = padded.replace(f" {term} ", " | ")
+        found = {agent for agent, score in scores.items() if score >= COMPOUND_EVIDENCE}
+        for agent, weight in context.items():
+            if not found - {agent}:
+                scores[agent] += weight
+        return scores
+
+    @staticmethod
+    def add_entity_evidence(
+        scores: dict[str, float], entities: Sequence[ResolvedEntity]
+    ) -> dict[str, float]:
+        """Add `ENTITY_EVIDENCE` per distinct resolved player to ``scores``."""
+        found = {agent for agent, score in scores.items() if score >= COMPOUND_EVIDENCE}
+        for entity in {entity["id"]: entity for entity in entities}.values():
+            if entity["kind"] != "player":
+                continue
+            agent = AGENT_ANALYST if entity["ours"] else AGENT_SCOUT
+            if not found - {agent}:
+                scores[agent] += ENTITY_EVIDENCE
+        return scores
+
+    def domains(self, text: str) -> list[str]:
+        """Domain agents with real lexicon evidence in ``text``, strongest first."""
+        scores = self.lexicon_scores(text)
+        found = [agent for agent, score in scores.items() if score >= COMPOUND_EVIDENCE]
+        return sorted(found, key=lambda agent: -scores[agent])
+
+    def classify(self, text: str, entities: Sequence[ResolvedEntity] = ()) -> RouteDecision:
+        """Return the confident domain agent for ``text``, or ``agent=None``.
+
+        ``entities`` are the players and clubs resolved in ``text``; players
+        add lexicon-level evidence (`add_entity_evidence`).
+        """
+        scores = self.add_entity_evidence(self.lexicon_scores(text), entities)
+        if sum(score >= COMPOUND_EVIDENCE for score in scores.values()) > 1:
+            # Compound question: the orchestrator may fan it out to several agents
+            return RouteDecision(None, 0.0, "compound", scores)
+        total = sum(scores.values())
+        lexicon_best = max(scores, key=scores.__getitem__) if total > 0 else None
+        if lexicon_best is not None:
+            best = lexicon_best
+            share = scores[best] / total
+            confidence = share * min(1.0, total / _FULL_EVIDENCE)
+            if confidence >= self.threshold:
+                return RouteDecision(best, confidence, "lexicon", scores)
+
+        tokens = tokenize(text)
+        if self._model.known_tokens(tokens) >= _MIN_MODEL_TOKENS:
+            proba = self._model.predict_proba(tokens)
+            best = max(proba, key=proba.__getitem__)
+            # The model never overrules the domain the lexicon leans to
+            if proba[best] >= self.threshold and lexicon_best in (None, best):
+                return RouteDecision(best, proba[best], "model", proba)
+
+        return RouteDecision(None, 0.0, "none", scores)
+
+    def best_guess(self, text: str) -> str | None:
+        """Most likely domain agent for ``text`` regardless of the threshold, if any."""
+        scores = self.lexicon_scores(text)
+        if any(scores.values()):
+            return max(scores, key=scores.__getitem__)
+        tokens = tokenize(text)
+        if self._model.known_tokens(tokens) >= _MIN_MODEL_TOKENS:
+            proba = self._model.predict_proba(tokens)
+            return max(proba, key=proba.__getitem__)
+        return None
@@ -0,0 +1,338 @@
+"""Speculative execution of the predicted domain agent.
+
+A turn that reaches the orchestrator pays two serial LLM hops: the
+orchestrator picks a domain agent, then that agent answers. With
+SPECULATIVE_ROUTING on, the orchestrator node predicts the agent it will
+pick and starts it in the background while the orchestrator runs. The
+prediction comes from the local router's best guess for the question
+(even below its threshold), else from the agent that answered the
+previous turn.
+
+- Hit: the orchestrator transfers to the predicted agent. The node commits
+  the speculative answer together with the orchestrator's transfer, and the
+  turn ends after roughly ``max(orchestrator, agent)`` instead of their sum
+- Miss: the orchestrator answers itself or transfers elsewhere. The
+  speculative run is cancelled (async) or abandoned (sync), and the turn
+  continues exactly as without speculation
+
+The speculative run is an isolated root run: no checkpointer, no parent
+callbacks, so nothing it does is streamed or persisted unless it is
+committed. Agents visited earlier in the turn are never predicted. Hit
+rate, saved time and wasted tokens are exposed through
+`speculation_stats()`.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.runnables.config import var_child_runnable_config
+from langgraph.errors import ParentCommand
+from langgraph.types import Command
+
+from football_club.agents.tools import HANDOFF_TOOL_PREFIX, TRANSFER_MESSAGES
+from football_club.graph.router import DOMAIN_AGENTS, FastRouter
+from football_club.metrics import LLMCall, current_turn
+from football_club.state import AGENT_ORCHESTRATOR, AgentState
+
+if TYPE_CHECKING:
+    from football_club.graph.workflow import LazyAgentNode
+
+logger = logging.getLogger("football_club")
+
+
+@dataclass(frozen=True)
+class SpeculationStats:
+    """Process-wide speculation counters (see `speculation_stats`)."""
+
+    launched: int = 0
+    hits: int = 0
+    misses: int = 0
+    failures: int = 0
+    committed_tokens: int = 0
+    wasted_tokens: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        decided = self.hits + self.misses + self.failures
+        return self.hits / decided if decided else 0.0
+
+
+class _SpeculationCounters:
+    """Thread-safe accumulator behind `speculation_stats`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = SpeculationStats()
+
+    def add(self, **increments: float) -> None:
+        with self._lock:
+            stats = self._stats
+            self._stats = replace(
+                stats, **{key: getattr(stats, key) + value for key, value in increments.items()}
+            )
+
+    def snapshot(self) -> SpeculationStats:
+        with self._lock:
+            return self._stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = SpeculationStats()
+
+
+_counters = _SpeculationCounters()
+
+
+def speculation_stats() -> SpeculationStats:
+    """Snapshot of the speculation counters since start (or last reset)."""
+    return _counters.snapshot()
+
+
+def reset_speculation_stats() -> None:
+    _counters.reset()
+
+
+def _last_human_index(messages: Sequence[BaseMessage]) -> int:
+    return max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=-1)
+
+
+def previous_agent(messages: Sequence[BaseMessage]) -> str | None:
+    """Domain agent that handled the conversation before the latest question."""
+    for msg in reversed(messages[: max(_last_human_index(messages), 0)]):
+        if not isinstance(msg, AIMessage):
+            continue
+        if msg.name in DOMAIN_AGENTS:
+            return str(msg.name)
+        for tc in reversed(msg.tool_calls):
+            target = str(tc["name"]).removeprefix(HANDOFF_TOOL_PREFIX)
+            if target in DOMAIN_AGENTS:
+                return target
+    return None
+
+
+def _tokens(messages: Sequence[BaseMessage]) -> int:
+    return sum(
+        m.usage_metadata["total_tokens"]
+        for m in messages
+        if isinstance(m, AIMessage) and m.usage_metadata
+    )
+
+
+def _isolated_context() -> contextvars.Context:
+    """Copy of the current context without the node's runnable config.
+
+    The turn metrics context survives, but the speculative run does not
+    inherit the parent's checkpointer, namespace or stream callbacks.
+    """
+    context = contextvars.copy_context()
+    context.run(var_child_runnable_config.set, None)
+    return context
+
+
+@dataclass
+class _Speculation:
+    """Answer produced by a speculative agent run."""
+
+    messages: list[BaseMessage]
+    seconds: float
+
+
+class SpeculativeOrchestratorNode:
+    """Orchestrator node that runs the predicted domain agent concurrently.
+
+    Args:
+        orchestrator: The orchestrator's lazy node
+        agents: Lazy nodes of the domain agents that may be speculated
+        router: Local router used for the prediction
+        workers: Threads available to speculative runs of sync invocations
+    """
+
+    def __init__(
+        self,
+        orchestrator: "LazyAgentNode",
+        agents: dict[str, "LazyAgentNode"],
+        router: FastRouter | None = None,
+        workers: int = 4,
+    ) -> None:
+        self.orchestrator = orchestrator
+        self.agents = agents
+        self.router = router or FastRouter()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="speculate"
+        )
+
+    def predict(self, state: AgentState) -> str | None:
+        """Domain agent the orchestrator will most likely transfer to, if any."""
+        if state.get("force_answer"):
+            return None
+        messages = state.get("messages", [])
+        last_human = _last_human_index(messages)
+        question = messages[last_human].text if last_human >= 0 else ""
+        visited = set(state.get("handoff_path", []))
+        candidates = (self.router.best_guess(question), previous_agent(messages))
+        return next(
+            (a for a in candidates if a in self.agents and a not in visited),
+            None,
+        )
+
+    # --- Speculative run ---
+
+    @staticmethod
+    def _speculative_input(agent: str, state: AgentState) -> dict[str, Any]:
+        """State the agent would see after a transfer from the orchestrator."""
+        call_id = f"call_spec_{uuid.uuid4().hex[:16]}"
+        transfer = AIMessage(
+            content="",
+            tool_calls=[{"name": f"{HANDOFF_TOOL_PREFIX}{agent}", "args": {}, "id": call_id}],
+        )
+        ack = ToolMessage(content=TRANSFER_MESSAGES[agent], tool_call_id=call_id)
+        return {"messages": [*state.get("messages", []), transfer, ack], "force_answer": False}
+
+    def _speculate(self, agent: str, state: AgentState) -> _Speculation:
+        started = time.perf_counter()
+        agent_input = self._speculative_input(agent, state)
+        result = self.agents[agent].graph.invoke(agent_input)
+        return _Speculation(
+            result["messages"][len(agent_input["messages"]) :], time.perf_counter() - started
+        )
+
+    async def _aspeculate(self, agent: str, state: AgentState) -> _Speculation:
+        started = time.perf_counter()
+        agent_input = self._speculative_input(agent, state)
+        result = await self.agents[agent].graph.ainvoke(agent_input)
+        return _Speculation(
+            result["messages"][len(agent_input["messages"]) :], time.perf_counter() - started
+        )
+
+    # --- Outcome ---
+
+    @staticmethod
+    def _handoff_update(handoff: ParentCommand) -> dict[str, Any]:
+        """State update of the orchestrator's transfer (``active_agent``, messages...)."""
+        command = handoff.args[0]
+        if isinstance(command, Command) and isinstance(command.update, dict):
+            return command.update
+        return {}
+
+    def _commit(
+        self, agent: str, handoff: ParentCommand, speculation: _Speculation, orchestrator_s: float
+    ) -> dict[str, Any]:
+        """Turn the orchestrator's transfer plus the speculative answer into one update."""
+        answer = [
+            m.model_copy(update={"name": agent}) if isinstance(m, AIMessage) else m
+            for m in speculation.messages
+        ]
+        saved_s = min(orchestrator_s, speculation.seconds)
+        _counters.add(hits=1, committed_tokens=_tokens(answer), saved_seconds=saved_s)
+        turn = current_turn()
+        if turn is not None:
+            turn.speculation = "hit"
+            # The speculative run had no callbacks: account for its calls here
+            turn.llm_calls.extend(
+                LLMCall(
+                    agent=agent,
+                    model=m.response_metadata.get("model_name", "unknown"),
+                    prompt_tokens=m.usage_metadata["input_tokens"],
+                    completion_tokens=m.usage_metadata["output_tokens"],
+                )
+                for m in answer
+                if isinstance(m, AIMessage) and m.usage_metadata
+            )
+        logger.debug(f"Speculation hit: {agent} (saved {saved_s * 1000:.0f} ms)")
+        update = self._handoff_update(handoff)
+        return {**update, "messages": [*update.get("messages", []), *answer]}
+
+    @staticmethod
+    def _record_miss(agent: str, outcome: str) -> None:
+        _counters.add(**{"misses" if outcome == "miss" else "failures": 1})
+        turn = current_turn()
+        if turn is not None:
+            turn.speculation = outcome
+        logger.debug(f"Speculation {outcome}: {agent}")
+
+    @staticmethod
+    def _record_waste(speculation: "Future[_Speculation] | asyncio.Task[_Speculation]") -> None:
+        if speculation.cancelled() or speculation.exception() is not None:
+            return
+        _counters.add(wasted_tokens=_tokens(speculation.result().messages))
+
+    # --- Node ---
+
+    def invoke(self, state: AgentState, config: RunnableConfig) -> Any:
+        agent = self.predict(state)
+        if agent is None:
+            return self.orchestrator.invoke(state, config)
+
+        _counters.add(launched=1)
+        started = time.perf_counter()
+        future = self._executor.submit(_isolated_context().run, self._speculate, agent, state)
+        try:
+            result = self.orchestrator.invoke(state, config)
+        except ParentCommand as handoff:
+            if self._handoff_update(handoff).get("active_agent") == agent:
+                orchestrator_s = time.perf_counter() - started
+                try:
+                    speculation = future.result()
+                except Exception as e:
+                    logger.debug(f"Speculative {agent} run failed: {e!r}")
+                    self._record_miss(agent, "failed")
+                    raise handoff from None
+                return self._commit(agent, handoff, speculation, orchestrator_s)
+            self._abandon(agent, future)
+            raise
+        except BaseException:
+            self._abandon(agent, future)
+            raise
+        self._abandon(agent, future)
+        return result
+
+    async def ainvoke(self, state: AgentState, config: RunnableConfig) -> Any:
+        agent = self.predict(state)
+        if agent is None:
+            return await self.orchestrator.ainvoke(state, config)
+
+        _counters.add(launched=1)
+        started = time.perf_counter()
+        task = asyncio.create_task(self._aspeculate(agent, state), context=_isolated_context())
+        try:
+            result = await self.orchestrator.ainvoke(state, config)
+        except ParentCommand as handoff:
+            if self._handoff_update(handoff).get("active_agent") == agent:
+                orchestrator_s = time.perf_counter() - started
+                try:
+                    speculation = await task
+                except Exception as e:
+                    logger.debug(f"Speculative {agent} run failed: {e!r}")
+                    self._record_miss(agent, "failed")
+                    raise handoff from None
+                return self._commit(agent, handoff, speculation, orchestrator_s)
+            self._abandon(agent, task)
+            raise
+        except BaseException:
+            self._abandon(agent, task)
+            raise
+        self._abandon(agent, task)
+        return result
+
+    def _abandon(
+        self, agent: str, speculation: "Future[_Speculation] | asyncio.Task[_Speculation]"
+    ) -> None:
+        """Discard a mispredicted run: cancel it if possible, count its tokens otherwise."""
+        self._record_miss(agent, "miss")
+        # A sync run that already started cannot be interrupted; it finishes unseen
+        speculation.cancel()
+        speculation.add_done_callback(self._record_waste)
+
+    def as_node(self) -> RunnableLambda[AgentState, Any]:
+        return RunnableLambda(self.invoke, afunc=self.ainvoke, name=AGENT_ORCHESTRATOR)
@@ -2,33 +2,222 @@
 
 Follows the official LangChain Handoffs pattern (multiple agent subgraphs):
 - Each agent is a `create_agent` subgraph with handoff tools
+- A local fast-path router skips the orchestrator when the domain is obvious,
+  helped by the players and clubs resolved in the message
+- A hop guard bounds handoffs per turn and breaks ping-pong loops
+- A shared response cache serves repeated prompts without calling Groq
 - `active_agent` state tracks who handles the conversation
-- MemorySaver checkpointer persists state between turns
-- Hierarchical: domain agents only transfer back to orchestrator
+- A checkpointer (SQLite by default) persists state between turns
+- Hierarchical: domain agents transfer back to orchestrator (or, opt-in,
+  directly to a sibling when the target domain is unambiguous)
+- Compound questions fan out to several domain agents in parallel
+- Agent subgraphs (and their Groq clients) are built on first routing
+- Opt-in speculation runs the predicted domain agent alongside the orchestrator
 """
 
-from typing import Any
+import importlib
+import logging
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
-from langchain_core.messages import AIMessage
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
+from langgraph.types import Overwrite
 
-from football_club.agents.analyst import create_analyst_agent
-from football_club.agents.medical import create_medical_agent
-from football_club.agents.orchestrator import create_orchestrator_agent
-from football_club.agents.scout import create_scout_agent
+from football_club.cache import install_response_cache
+from football_club.checkpoint import create_checkpointer
+from football_club.config import Config
+from football_club.graph.fanout import (
+    FANOUT_NODE,
+    MERGE_NODE,
+    FanoutEdge,
+    FanoutNode,
+    merge_fanout,
+)
+from football_club.graph.guard import RESOLVE_NODE, HandoffGuard, ResolveNode
+from football_club.graph.router import FastRouter
+from football_club.metrics import InstrumentedCheckpointer
 from football_club.state import (
     AGENT_ANALYST,
     AGENT_MEDICAL,
     AGENT_ORCHESTRATOR,
     AGENT_SCOUT,
+    ENTITIES_KEY,
     AgentState,
+    ResolvedEntity,
+    message_entities,
 )
 
+if TYPE_CHECKING:
+    from football_club.data.entities import EntityIndex
+
 # All valid agent node names
 ALL_AGENTS = [AGENT_ORCHESTRATOR, AGENT_SCOUT, AGENT_ANALYST, AGENT_MEDICAL]
 
+# Entry node that runs the local fast-path router before any agent
+ROUTER_NODE = "router"
+
+# Builds the chat model of an agent from its name (None → ChatGroq)
+LLMFactory = Callable[[str], BaseChatModel]
+
+# `create_<agent>_agent(config, llm)` from football_club.agents.<agent>
+AgentFactory = Callable[
+    [Config | None, BaseChatModel | None], CompiledStateGraph[Any, Any, Any, Any]
+]
+
+logger = logging.getLogger("football_club")
+
+
+def _last_human(state: AgentState) -> HumanMessage | None:
+    """Return the latest HumanMessage, if any."""
+    for msg in reversed(state.get("messages", [])):
+        if isinstance(msg, HumanMessage):
+            return msg
+    return None
+
+
+class FastRouteNode:
+    """Entry node that pre-routes orchestrator turns locally.
+
+    Only turns that would start in the orchestrator are classified; sticky
+    domain agents keep handling their follow-ups. When the router is
+    confident, `active_agent` is set so route_initial dispatches straight
+    to the domain agent and the orchestrator LLM call is skipped.
+
+    With an entity index, every turn's HumanMessage is first annotated with
+    the players and clubs it mentions (``additional_kwargs["entities"]``):
+    the router weighs them and the agents see them in their prompt.
+
+    It also starts the turn's hop accounting: ``handoff_path`` is reset to
+    the first agent and any forced-answer or fan-out state from the last
+    turn is cleared.
+    """
+
+    def __init__(
+        self,
+        router: FastRouter | None,
+        entities: "Callable[[], EntityIndex] | None" = None,
+    ) -> None:
+        self.router = router
+        self.entities = entities
+
+    def _annotate(self, msg: HumanMessage | None, update: dict[str, Any]) -> list[ResolvedEntity]:
+        """Entities of ``msg``, resolving and annotating them on first sight."""
+        if msg is None or self.entities is None:
+            return []
+        if ENTITIES_KEY in msg.additional_kwargs:
+            return message_entities(msg)
+        resolved = self.entities().resolve(str(msg.content))
+        if resolved and msg.id is not None:
+            # Same id: add_messages replaces the message in place
+            kwargs = {**msg.additional_kwargs, ENTITIES_KEY: resolved}
+            update["messages"] = [msg.model_copy(update={"additional_kwargs": kwargs})]
+        return resolved
+
+    def __call__(self, state: AgentState) -> dict[str, Any]:
+        active = state.get("active_agent", AGENT_ORCHESTRATOR)
+        update: dict[str, Any] = {}
+        msg = _last_human(state)
+        entities = self._annotate(msg, update)
+        if self.router is not None and active == AGENT_ORCHESTRATOR:
+            decision = self.router.classify(str(msg.content) if msg else "", entities)
+            if decision.agent is not None:
+                active = decision.agent
+                update["active_agent"] = active
+        update["handoff_path"] = Overwrite([active])
+        update["force_answer"] = False
+        if state.get("fanout"):
+            # Left over by a fan-out turn that did not reach the merge node
+            update["fanout"] = []
+            update["fanout_results"] = Overwrite([])
+        return update
+
+
+def _entity_loader(config: Config) -> "Callable[[], EntityIndex] | None":
+    """Loader of the entity index over the configured name sources, if any."""
+    sources = (config.squad_stats_path, config.scouting_index_path, config.entity_aliases_path)
+    if not config.entity_resolution_enabled or not any(sources):
+        return None
+
+    def load() -> "EntityIndex":
+        # Imported on demand: the stores pull in NumPy; built once per process
+        from football_club.data.entities import load_entity_index
+
+        return load_entity_index(*sources)
+
+    return load
+
+
+def _import_agent_factory(agent: str) -> AgentFactory:
+    """Import ``football_club.agents.<agent>`` (LangChain, Groq) on demand."""
+    module = importlib.import_module(f"football_club.agents.{agent}")
+    factory: AgentFactory = getattr(module, f"create_{agent}_agent")
+    return factory
+
+
+class LazyAgentNode:
+    """Agent node whose `create_agent` subgraph is built on first routing.
+
+    Most turns touch one or two agents, so building every Groq client and
+    subgraph up front only delays startup. The first call builds the
+    subgraph (once, under a lock) and every later call reuses it; it runs
+    with the node's config, so checkpoints and subgraph streaming behave as
+    if the subgraph were the node itself.
+    """
+
+    def __init__(
+        self,
+        agent: str,
+        build: Callable[[], CompiledStateGraph[Any, Any, Any, Any]],
+    ) -> None:
+        self.agent = agent
+        self._build = build
+        self._graph: CompiledStateGraph[Any, Any, Any, Any] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def built(self) -> bool:
+        return self._graph is not None
+
+    @property
+    def graph(self) -> CompiledStateGraph[Any, Any, Any, Any]:
+        if self._graph is None:
+            with self._lock:
+                if self._graph is None:
+                    logger.debug(f"Building agent subgraph: {self.agent}")
+                    self._graph = self._build()
+        return self._graph
+
+    def warm(self) -> None:
+        """Build the subgraph now instead of on the first turn."""
+        _ = self.graph
+
+    def invoke(self, state: AgentState, config: RunnableConfig) -> Any:
+        return self.graph.invoke(state, config)
+
+    async def ainvoke(self, state: AgentState, config: RunnableConfig) -> Any:
+        return await self.graph.ainvoke(state, config)
+
+    def as_node(self) -> RunnableLambda[AgentState, Any]:
+        return RunnableLambda(self.invoke, afunc=self.ainvoke, name=self.agent)
+
+
+def _speculative_orchestrator(
+    nodes: dict[str, LazyAgentNode], router: FastRouter | None, config: Config
+) -> RunnableLambda[AgentState, Any]:
+    """Orchestrator node that runs the predicted domain agent concurrently."""
+    # Imported on demand: it pulls in the agent tools (LangChain)
+    from football_club.graph.speculation import SpeculativeOrchestratorNode
+
+    domain = {agent: node for agent, node in nodes.items() if agent != AGENT_ORCHESTRATOR}
+    return SpeculativeOrchestratorNode(
+        nodes[AGENT_ORCHESTRATOR], domain, router, config.speculation_workers
+    ).as_node()
+
 
 def route_initial(
     state: AgentState,
@@ -64,43 +253,78 @@ def route_after_agent(
     return AGENT_ORCHESTRATOR
 
 
-def create_workflow() -> CompiledStateGraph[Any, Any, Any, Any]:
+def create_workflow(
+    config: Config | None = None,
+    llm_factory: LLMFactory | None = None,
+) -> CompiledStateGraph[Any, Any, Any, Any]:
     """Create the multi-agent workflow with Handoffs pattern.
 
     Flow:
-        1. User message enters via START
+        1. User message enters via START into the fast-path router
         2. route_initial sends to the active agent (default: orchestrator)
         3. Agent responds directly OR uses a handoff tool to transfer
-        4. route_after_agent checks: finished (END) or handed off (next agent)
-        5. State persists via MemorySaver checkpointer between turns
+        4. route_after_agent checks: finished (END) or handed off (next agent,
+           a sibling domain agent directly with lateral handoffs);
+           the hop guard diverts looping turns to the resolve node, which
+           makes one agent answer without tools. Several transfers at once
+           fan out to those agents in parallel and their answers are merged
+        5. State persists via the configured checkpointer between turns
+
+    Args:
+        config: Application configuration (defaults to environment settings)
+        llm_factory: Builds each agent's chat model from its name instead of
+            ChatGroq (e.g. `football_club.testing.FakeModels` for offline runs)
 
     Returns:
         Compiled StateGraph with checkpointer
     """
-    # Create all agents
-    orchestrator = create_orchestrator_agent()
-    scout = create_scout_agent()
-    analyst = create_analyst_agent()
-    medical = create_medical_agent()
+    config = config or Config()
+    install_response_cache(config)
+    router = FastRouter(config.fast_router_threshold) if config.fast_router_enabled else None
+    guard = HandoffGuard(route_after_agent, max_hops=config.max_handoff_hops)
+    resolve = ResolveNode(config.handoff_resolution)
+
+    def agent_builder(agent: str) -> Callable[[], CompiledStateGraph[Any, Any, Any, Any]]:
+        def build() -> CompiledStateGraph[Any, Any, Any, Any]:
+            llm = llm_factory(agent) if llm_factory else None
+            return _import_agent_factory(agent)(config, llm)
+
+        return build
 
     # Build workflow
     builder = StateGraph(AgentState)
 
-    # Add agent nodes — each invokes its subgraph
-    builder.add_node(AGENT_ORCHESTRATOR, orchestrator)
-    builder.add_node(AGENT_SCOUT, scout)
-    builder.add_node(AGENT_ANALYST, analyst)
-    builder.add_node(AGENT_MEDICAL, medical)
+    # Add agent nodes — each invokes its subgraph, built on first use
+    nodes = {agent: LazyAgentNode(agent, agent_builder(agent)) for agent in ALL_AGENTS}
+    for node in nodes.values():
+        if not config.lazy_agents:
+            node.warm()
+        if node.agent == AGENT_ORCHESTRATOR and config.speculative_routing:
+            builder.add_node(node.agent, _speculative_orchestrator(nodes, router, config))
+        else:
+            builder.add_node(node.agent, node.as_node())
 
-    # START → active agent
-    builder.add_conditional_edges(START, route_initial, ALL_AGENTS)
+    # START → fast-path router → active agent
+    builder.add_node(ROUTER_NODE, FastRouteNode(router, _entity_loader(config)))
+    builder.add_edge(START, ROUTER_NODE)
+    builder.add_conditional_edges(ROUTER_NODE, route_initial, ALL_AGENTS)
 
-    # After each agent → END or handoff
+    # After each agent → END, handoff, or forced resolution of a loop
+    builder.add_node(RESOLVE_NODE, resolve)
+    builder.add_conditional_edges(RESOLVE_NODE, route_initial, ALL_AGENTS)
+    # An agent may also fan a compound question out → merge → END (domain
+    # agents only with lateral handoffs)
     for agent_name in ALL_AGENTS:
         builder.add_conditional_edges(
             agent_name,
-            route_after_agent,
-            [*ALL_AGENTS, END],
+            FanoutEdge(guard),
+            [*ALL_AGENTS, RESOLVE_NODE, FANOUT_NODE, END],
         )
+    domain_nodes = {agent: node for agent, node in nodes.items() if agent != AGENT_ORCHESTRATOR}
+    builder.add_node(FANOUT_NODE, FanoutNode(domain_nodes).as_node())
+    builder.add_node(MERGE_NODE, merge_fanout)
+    builder.add_edge(FANOUT_NODE, MERGE_NODE)
+    builder.add_edge(MERGE_NODE, END)
 
-    return builder.compile(checkpointer=MemorySaver())
+    # Checkpoint I/O is timed into the current turn when metrics are recorded
+    return builder.compile(checkpointer=InstrumentedCheckpointer(create_checkpointer(config)))
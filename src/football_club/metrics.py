@@ -0,0 +1,613 @@
+"""Per-turn timing, token and cost instrumentation.
+
+A `MetricsRecorder` hands out one `TurnMetrics` per conversation turn via
+`MetricsRecorder.turn()`. The turn's callback handler is passed in the run
+config, so nothing in the graph has to change to be measured:
+
+- Wall time of every top-level node registered in `create_workflow`
+  (router, agents, resolve), summed per node when it runs more than once
+- Per LLM call: agent, model, prompt/completion tokens, Groq queue time and
+  estimated cost
+- Tool calls by name (handoff tools counted as handoffs; domain → domain
+  transfers also as lateral handoffs, each saving an orchestrator hop)
+- Checkpoint I/O time, measured by `InstrumentedCheckpointer`
+- Time Groq calls waited in the client-side rate limiter, and retries
+
+Finished turns are appended to a JSON-lines trace and aggregated into a
+Prometheus text-format snapshot (`MetricsRecorder.prometheus()`).
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+
+from football_club.ratelimit import rate_limit_stats
+from football_club.state import AGENT_ANALYST, AGENT_MEDICAL, AGENT_SCOUT
+
+_DOMAIN_AGENTS = {AGENT_SCOUT, AGENT_ANALYST, AGENT_MEDICAL}
+
+# Run metadata naming the agent of runs whose graph node is not the agent (fan-out)
+AGENT_METADATA_KEY = "football_club_agent"
+
+# Groq list prices, USD per million (prompt, completion) tokens
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "openai/gpt-oss-120b": (0.15, 0.60),
+    "openai/gpt-oss-20b": (0.075, 0.30),
+}
+
+_current_turn: ContextVar["TurnMetrics | None"] = ContextVar("current_turn", default=None)
+
+
+def current_turn() -> "TurnMetrics | None":
+    """Turn being measured in this context, if any (see `MetricsRecorder.turn`)."""
+    return _current_turn.get()
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Cost in USD of one call (0 for models without a known price)."""
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+@dataclass
+class LLMCall:
+    """One chat model completion."""
+
+    agent: str
+    model: str
+    ms: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    queue_ms: float = 0.0
+
+    @property
+    def cost_usd(self) -> float:
+        return estimate_cost(self.model, self.prompt_tokens, self.completion_tokens)
+
+
+@dataclass
+class TurnMetrics:
+    """Everything measured during one turn."""
+
+    thread_id: str
+    turn_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    started_at: float = field(default_factory=time.time)
+    total_ms: float = 0.0
+    node_ms: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    node_runs: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    llm_calls: list[LLMCall] = field(default_factory=list)
+    tool_calls: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    tool_ms: float = 0.0
+    handoffs: int = 0
+    lateral_handoffs: int = 0
+    checkpoint_ms: float = 0.0
+    checkpoint_ops: int = 0
+    throttle_ms: float = 0.0
+    llm_retries: int = 0
+    # Outcome of speculative routing ("hit", "miss", "failed"), None if not attempted
+    speculation: str | None = None
+    error: str | None = None
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(call.prompt_tokens for call in self.llm_calls)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(call.completion_tokens for call in self.llm_calls)
+
+    @property
+    def queue_ms(self) -> float:
+        return sum(call.queue_ms for call in self.llm_calls)
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(call.cost_usd for call in self.llm_calls)
+
+    @property
+    def overhead_ms(self) -> float:
+        """Time outside nodes and checkpoint I/O (graph scheduling, streaming)."""
+        return max(self.total_ms - sum(self.node_ms.values()) - self.checkpoint_ms, 0.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "turn_id": self.turn_id,
+            "thread_id": self.thread_id,
+            "started_at": round(self.started_at, 3),
+            "total_ms": round(self.total_ms, 2),
+            "nodes_ms": {node: round(ms, 2) for node, ms in self.node_ms.items()},
+            "node_runs": dict(self.node_runs),
+            "llm_calls": [
+                {
+                    "agent": call.agent,
+                    "model": call.model,
+                    "ms": round(call.ms, 2),
+                    "prompt_tokens": call.prompt_tokens,
+                    "completion_tokens": call.completion_tokens,
+                    "queue_ms": round(call.queue_ms, 2),
+                    "cost_usd": round(call.cost_usd, 8),
+                }
+                for call in self.llm_calls
+            ],
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "queue_ms": round(self.queue_ms, 2),
+            "cost_usd": round(self.cost_usd, 8),
+            "tool_calls": dict(self.tool_calls),
+            "tool_ms": round(self.tool_ms, 2),
+            "handoffs": self.handoffs,
+            "lateral_handoffs": self.lateral_handoffs,
+            "checkpoint_ms": round(self.checkpoint_ms, 2),
+            "checkpoint_ops": self.checkpoint_ops,
+            "throttle_ms": round(self.throttle_ms, 2),
+            "llm_retries": self.llm_retries,
+            "speculation": self.speculation,
+            "overhead_ms": round(self.overhead_ms, 2),
+            "error": self.error,
+        }
+
+
+def _agent_from_metadata(metadata: dict[str, Any] | None) -> str:
+    metadata = metadata or {}
+    if metadata.get(AGENT_METADATA_KEY):
+        return str(metadata[AGENT_METADATA_KEY])
+    ns = str(metadata.get("langgraph_checkpoint_ns", ""))
+    return ns.split(":", 1)[0] or "unknown"
+
+
+def _usage(response: LLMResult) -> tuple[int, int, float]:
+    """Prompt tokens, completion tokens and queue time (ms) of a completion."""
+    for generations in response.generations:
+        for gen in generations:
+            if not isinstance(gen, ChatGeneration):
+                continue
+            message: Any = gen.message
+            usage = getattr(message, "usage_metadata", None) or {}
+            token_usage = message.response_metadata.get("token_usage") or {}
+            queue_s = token_usage.get("queue_time") or 0.0
+            return (
+                int(usage.get("input_tokens", token_usage.get("prompt_tokens", 0))),
+                int(usage.get("output_tokens", token_usage.get("completion_tokens", 0))),
+                float(queue_s) * 1000,
+            )
+    return 0, 0, 0.0
+
+
+class TurnCallbackHandler(BaseCallbackHandler):
+    """Collect node, LLM and tool timings of one turn into `TurnMetrics`."""
+
+    def __init__(self, turn: TurnMetrics) -> None:
+        self.turn = turn
+        self._root: uuid.UUID | None = None
+        self._started: dict[uuid.UUID, tuple[str, float]] = {}
+        self._llm: dict[uuid.UUID, tuple[LLMCall, float]] = {}
+        self._node_tasks: set[str] = set()
+        self._lock = threading.Lock()
+
+    # --- Nodes ---
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any] | None,
+        inputs: Any,
+        *,
+        run_id: uuid.UUID,
+        parent_run_id: uuid.UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        with self._lock:
+            if parent_run_id is None and self._root is None:
+                self._root = run_id
+                return
+            node = (metadata or {}).get("langgraph_node")
+            # Top-level nodes are direct children of the root graph run
+            if node and parent_run_id == self._root:
+                self._started[run_id] = (str(node), time.perf_counter())
+                # A handoff ends the task with a ParentCommand and reruns it
+                # (same checkpoint namespace) to apply the command
+                task = str((metadata or {}).get("langgraph_checkpoint_ns", run_id))
+                if task not in self._node_tasks:
+                    self._node_tasks.add(task)
+                    self.turn.node_runs[str(node)] += 1
+
+    def _end_node(self, run_id: uuid.UUID) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            if started is None:
+                return
+            node, t0 = started
+            self.turn.node_ms[node] += (time.perf_counter() - t0) * 1000
+
+    def on_chain_end(self, outputs: Any, *, run_id: uuid.UUID, **kwargs: Any) -> None:
+        self._end_node(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: uuid.UUID, **kwargs: Any) -> None:
+        # Handoffs leave a node through a ParentCommand, reported as an error
+        self._end_node(run_id)
+
+    # --- LLM calls ---
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: Any,
+        *,
+        run_id: uuid.UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        model = str((metadata or {}).get("ls_model_name") or serialized.get("name") or "unknown")
+        call = LLMCall(agent=_agent_from_metadata(metadata), model=model)
+        with self._lock:
+            self._llm[run_id] = (call, time.perf_counter())
+
+    def on_llm_end(self, response: LLMResult, *, run_id: uuid.UUID, **kwargs: Any) -> None:
+        with self._lock:
+            started = self._llm.pop(run_id, None)
+            if started is None:
+                return
+            call, t0 = started
+            call.ms = (time.perf_counter() - t0) * 1000
+            call.prompt_tokens, call.completion_tokens, call.queue_ms = _usage(response)
+            self.turn.llm_calls.append(call)
+
+    def on_llm_error(self, error: BaseException, *, run_id: uuid.UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._llm.pop(run_id, None)
+
+    # --- Tools ---
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: uuid.UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        # Imported here: the agents package imports this module (LLM call metrics)
+        from football_club.agents.tools import HANDOFF_TOOL_PREFIX
+
+        name = str(serialized.get("name") or kwargs.get("name") or "unknown")
+        with self._lock:
+            self.turn.tool_calls[name] += 1
+            if name.startswith(HANDOFF_TOOL_PREFIX):
+                self.turn.handoffs += 1
+                source = _agent_from_metadata(metadata)
+                target = name.removeprefix(HANDOFF_TOOL_PREFIX)
+                if {source, target} <= _DOMAIN_AGENTS:
+                    self.turn.lateral_handoffs += 1
+            self._started[run_id] = (f"tool:{name}", time.perf_counter())
+
+    def _end_tool(self, run_id: uuid.UUID) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+            if started is not None:
+                self.turn.tool_ms += (time.perf_counter() - started[1]) * 1000
+
+    def on_tool_end(self, output: Any, *, run_id: uuid.UUID, **kwargs: Any) -> None:
+        self._end_tool(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: uuid.UUID, **kwargs: Any) -> None:
+        self._end_tool(run_id)
+
+
+class InstrumentedCheckpointer(BaseCheckpointSaver[Any]):
+    """Delegating checkpointer that times I/O into the current turn."""
+
+    def __init__(self, inner: BaseCheckpointSaver[Any]) -> None:
+        super().__init__(serde=inner.serde)
+        self.inner = inner
+
+    @contextmanager
+    def _timed(self) -> Iterator[None]:
+        turn = _current_turn.get()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if turn is not None:
+                turn.checkpoint_ms += (time.perf_counter() - started) * 1000
+                turn.checkpoint_ops += 1
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        with self._timed():
+            return self.inner.get_tuple(config)
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        return self.inner.list(config, filter=filter, before=before, limit=limit)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._timed():
+            return self.inner.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._timed():
+            self.inner.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.inner.delete_thread(thread_id)
+
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        self.inner.prune(thread_ids, strategy=strategy)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        with self._timed():
+            return await self.inner.aget_tuple(config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        async for item in self.inner.alist(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        with self._timed():
+            return await self.inner.aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        with self._timed():
+            await self.inner.aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.inner.adelete_thread(thread_id)
+
+    async def aprune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        await self.inner.aprune(thread_ids, strategy=strategy)
+
+    def get_next_version(self, current: Any, channel: None) -> Any:
+        return self.inner.get_next_version(current, channel)
+
+
+def _labels(**labels: str) -> str:
+    inner = ",".join(
+        f'{key}="{value.replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in labels.items()
+    )
+    return "{" + inner + "}" if inner else ""
+
+
+class MetricsRecorder:
+    """Aggregate turn metrics, write the JSON-lines trace, render Prometheus.
+
+    Args:
+        trace_path: JSON-lines file each finished turn is appended to
+    """
+
+    def __init__(self, trace_path: str | Path | None = None) -> None:
+        self.trace_path = Path(trace_path) if trace_path else None
+        if self.trace_path is not None:
+            self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.errors = 0
+        self.turn_seconds = 0.0
+        self.node_seconds: dict[str, float] = defaultdict(float)
+        self.node_runs: dict[str, int] = defaultdict(int)
+        self.llm_calls: dict[tuple[str, str], int] = defaultdict(int)
+        self.llm_seconds: dict[tuple[str, str], float] = defaultdict(float)
+        self.tokens: dict[tuple[str, str, str], int] = defaultdict(int)
+        self.queue_seconds: dict[tuple[str, str], float] = defaultdict(float)
+        self.cost_usd: dict[tuple[str, str], float] = defaultdict(float)
+        self.tool_calls: dict[str, int] = defaultdict(int)
+        self.handoffs = 0
+        self.lateral_handoffs = 0
+        self.checkpoint_seconds = 0.0
+        self.checkpoint_ops = 0
+        self.speculations: dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def turn(self, thread_id: str) -> Iterator[TurnMetrics]:
+        """Measure one turn; pass `callbacks(turn)` in the run config."""
+        metrics = TurnMetrics(thread_id=thread_id)
+        token = _current_turn.set(metrics)
+        started = time.perf_counter()
+        try:
+            yield metrics
+        except Exception as e:
+            metrics.error = str(e)
+            raise
+        finally:
+            metrics.total_ms = (time.perf_counter() - started) * 1000
+            _current_turn.reset(token)
+            self.record(metrics)
+
+    @staticmethod
+    def callbacks(turn: TurnMetrics) -> list[BaseCallbackHandler]:
+        return [TurnCallbackHandler(turn)]
+
+    def record(self, turn: TurnMetrics) -> None:
+        """Aggregate a finished turn and append it to the trace."""
+        with self._lock:
+            self.turns += 1
+            self.errors += turn.error is not None
+            self.turn_seconds += turn.total_ms / 1000
+            for node, ms in turn.node_ms.items():
+                self.node_seconds[node] += ms / 1000
+                self.node_runs[node] += turn.node_runs[node]
+            for call in turn.llm_calls:
+                key = (call.agent, call.model)
+                self.llm_calls[key] += 1
+                self.llm_seconds[key] += call.ms / 1000
+                self.tokens[(*key, "prompt")] += call.prompt_tokens
+                self.tokens[(*key, "completion")] += call.completion_tokens
+                self.queue_seconds[key] += call.queue_ms / 1000
+                self.cost_usd[key] += call.cost_usd
+            for tool, count in turn.tool_calls.items():
+                self.tool_calls[tool] += count
+            self.handoffs += turn.handoffs
+            self.lateral_handoffs += turn.lateral_handoffs
+            self.checkpoint_seconds += turn.checkpoint_ms / 1000
+            self.checkpoint_ops += turn.checkpoint_ops
+            if turn.speculation is not None:
+                self.speculations[turn.speculation] += 1
+            if self.trace_path is not None:
+                with self.trace_path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(turn.to_dict(), ensure_ascii=False) + "\n")
+
+    def prometheus(self) -> str:
+        """Render the aggregated metrics in Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP football_club_{name} {help_text}")
+            lines.append(f"# TYPE football_club_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"football_club_{name}{labels} {value:g}")
+
+        with self._lock:
+            metric("turns_total", "counter", "Conversation turns.", [("", self.turns)])
+            metric("turn_errors_total", "counter", "Failed turns.", [("", self.errors)])
+            metric(
+                "turn_seconds_total", "counter", "Wall time of all turns.",
+                [("", self.turn_seconds)],
+            )  # fmt: skip
+            metric(
+                "node_seconds_total", "counter", "Wall time per graph node.",
+                [(_labels(node=n), s) for n, s in sorted(self.node_seconds.items())],
+            )  # fmt: skip
+            metric(
+                "node_runs_total", "counter", "Executions per graph node.",
+                [(_labels(node=n), c) for n, c in sorted(self.node_runs.items())],
+            )  # fmt: skip
+            metric(
+                "llm_calls_total", "counter", "Chat model completions.",
+                [(_labels(agent=a, model=m), c) for (a, m), c in sorted(self.llm_calls.items())],
+            )  # fmt: skip
+            metric(
+                "llm_seconds_total", "counter", "Chat model wall time.",
+                [(_labels(agent=a, model=m), s) for (a, m), s in sorted(self.llm_seconds.items())],
+            )  # fmt: skip
+            metric(
+                "llm_tokens_total", "counter", "Prompt and completion tokens.",
+                [
+                    (_labels(agent=a, model=m, kind=k), c)
+                    for (a, m, k), c in sorted(self.tokens.items())
+                ],
+            )  # fmt: skip
+            metric(
+                "llm_queue_seconds_total", "counter", "Time queued at the provider.",
+                [(_labels(agent=a, model=m), s) for (a, m), s in sorted(self.queue_seconds.items())],
+            )  # fmt: skip
+            metric(
+                "llm_cost_usd_total", "counter", "Estimated LLM cost in USD.",
+                [(_labels(agent=a, model=m), c) for (a, m), c in sorted(self.cost_usd.items())],
+            )  # fmt: skip
+            metric(
+                "tool_calls_total", "counter", "Tool calls by tool.",
+                [(_labels(tool=t), c) for t, c in sorted(self.tool_calls.items())],
+            )  # fmt: skip
+            metric("handoffs_total", "counter", "Agent handoffs.", [("", self.handoffs)])
+            metric(
+                "lateral_handoffs_total", "counter",
+                "Direct domain-to-domain handoffs (orchestrator hops saved).",
+                [("", self.lateral_handoffs)],
+            )  # fmt: skip
+            metric(
+                "checkpoint_seconds_total", "counter", "Checkpointer I/O time.",
+                [("", self.checkpoint_seconds)],
+            )  # fmt: skip
+            metric(
+                "checkpoint_ops_total", "counter", "Checkpointer reads and writes.",
+                [("", self.checkpoint_ops)],
+            )  # fmt: skip
+            metric(
+                "speculations_total", "counter", "Speculative agent runs by outcome.",
+                [(_labels(outcome=o), c) for o, c in sorted(self.speculations.items())],
+            )  # fmt: skip
+
+        limits = rate_limit_stats()
+        metric(
+            "llm_throttled_total", "counter", "Groq calls delayed by the client-side limiter.",
+            [("", limits.throttled)],
+        )  # fmt: skip
+        metric(
+            "llm_throttle_seconds_total", "counter", "Time Groq calls waited in the limiter.",
+            [("", limits.throttle_seconds)],
+        )  # fmt: skip
+        metric(
+            "llm_queue_depth", "gauge", "Groq calls currently waiting in the limiter.",
+            [("", limits.queue_depth)],
+        )  # fmt: skip
+        metric("llm_inflight", "gauge", "Groq calls in flight.", [("", limits.inflight)])
+        metric(
+            "llm_concurrency_limit", "gauge", "Adaptive Groq concurrency limit.",
+            [("", limits.concurrency_limit)],
+        )  # fmt: skip
+        metric("llm_retries_total", "counter", "Retried Groq calls.", [("", limits.retries)])
+        metric(
+            "llm_rate_limited_total", "counter", "Groq 429 responses.",
+            [("", limits.rate_limited)],
+        )  # fmt: skip
+        metric(
+            "llm_failures_total", "counter", "Groq calls that exhausted their retries.",
+            [("", limits.failures)],
+        )  # fmt: skip
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path) -> None:
+        """Write the snapshot atomically (for node_exporter's textfile collector)."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(target.suffix + ".tmp")
+        tmp.write_text(self.prometheus(), encoding="utf-8")
+        tmp.replace(target)
@@ -0,0 +1,360 @@
+"""Process-wide client-side rate limiting for Groq calls.
+
+Groq enforces requests-per-minute and tokens-per-minute limits per account,
+so the four agents draw from ONE budget. Without a client-side limit, load
+turns into 429s that surface as lost turns. `RateLimiter` combines:
+
+- Two token buckets (RPM and TPM) that refill continuously. A call
+  *reserves* its share up front and sleeps for the returned delay, so
+  waiting is first-come first-served and works for threads and asyncio alike
+- An adaptive (AIMD) concurrency limit: it grows by ``1/limit`` per fast
+  success and halves on 429/5xx or when latency exceeds the target
+- A global pause when Groq answers 429 with ``retry-after``, so every agent
+  backs off, not just the caller that was rejected
+
+A model call's budget is reserved when its request reaches the provider
+(`provider_call` / `reserve_provider_call`), not when the agent asks the
+model, so answers served from the response cache spend nothing.
+
+`retry_delay` computes the jittered exponential backoff used between
+retries. Counters (queue depth, throttle time, retries) are exposed through
+`rate_limit_stats()`. Stdlib only: the agent middleware lives in
+`football_club.agents.llm`.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Any
+
+from football_club.config import Config
+
+# How often a caller re-checks for a free concurrency slot
+_POLL_S = 0.02
+# Minimum time between two multiplicative decreases of the concurrency limit
+_DECREASE_COOLDOWN_S = 1.0
+
+
+@dataclass(frozen=True)
+class RateLimitStats:
+    """Snapshot of the limiter counters (see `rate_limit_stats`)."""
+
+    requests: int = 0
+    throttled: int = 0
+    throttle_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    inflight: int = 0
+    concurrency_limit: float = 0.0
+    retries: int = 0
+    rate_limited: int = 0
+    failures: int = 0
+
+
+class TokenBucket:
+    """Continuously refilled bucket of ``rate_per_minute`` units (0 = unlimited)."""
+
+    def __init__(self, rate_per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = rate_per_minute
+        self.tokens = rate_per_minute
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_minute / 60)
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` (possibly into debt); return seconds until it is covered."""
+        if self.rate_per_minute <= 0:
+            return 0.0
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens * 60 / self.rate_per_minute
+
+    def credit(self, amount: float) -> None:
+        """Return (or, if negative, charge) units after the real cost is known."""
+        if self.rate_per_minute <= 0:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+def retry_delay(
+    attempt: int,
+    retry_after: float | None = None,
+    base_s: float = 0.5,
+    max_s: float = 30.0,
+) -> float:
+    """Seconds to wait before retry number ``attempt`` (0-based).
+
+    Honors the server's ``retry-after`` when given; otherwise exponential
+    backoff capped at ``max_s`` with jitter in [50%, 100%] so concurrent
+    callers do not retry in lockstep.
+    """
+    if retry_after is not None:
+        return min(retry_after, max_s) * random.uniform(1.0, 1.1)
+    return min(max_s, base_s * 2.0**attempt) * random.uniform(0.5, 1.0)
+
+
+class RateLimiter:
+    """RPM/TPM token buckets plus an adaptive concurrency limit.
+
+    Args:
+        rpm: Requests per minute (0 = unlimited)
+        tpm: Tokens per minute, prompt + completion (0 = unlimited)
+        max_concurrency: Upper bound of the adaptive concurrency limit
+        latency_target_s: Calls slower than this shrink the limit (0 = off)
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        rpm: float = 30,
+        tpm: float = 12_000,
+        max_concurrency: int = 8,
+        latency_target_s: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.latency_target_s = latency_target_s
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests = TokenBucket(rpm, clock)
+        self._tokens = TokenBucket(tpm, clock)
+        self._limit = float(self.max_concurrency)
+        self._inflight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._stats = RateLimitStats(concurrency_limit=self._limit)
+
+    # --- Admission ---
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            delay = max(self._requests.reserve(1), self._tokens.reserve(tokens))
+            self._update(requests=self._stats.requests + 1)
+            return delay
+
+    def _try_enter(self) -> float:
+        """Take a concurrency slot; return 0.0, or how long to wait before trying again."""
+        with self._lock:
+            now = self._clock()
+            if self._paused_until > now:
+                return self._paused_until - now
+            if self._inflight < max(1, int(self._limit)):
+                self._inflight += 1
+                self._update(inflight=self._inflight)
+                return 0.0
+            return _POLL_S
+
+    @contextmanager
+    def _queued(self) -> Iterator[None]:
+        with self._lock:
+            depth = self._stats.queue_depth + 1
+            self._update(queue_depth=depth, max_queue_depth=max(depth, self._stats.max_queue_depth))
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._update(queue_depth=self._stats.queue_depth - 1)
+
+    def _record_wait(self, waited: float) -> None:
+        if waited <= 0:
+            return
+        with self._lock:
+            self._update(
+                throttled=self._stats.throttled + 1,
+                throttle_seconds=self._stats.throttle_seconds + waited,
+            )
+
+    def acquire(self, tokens: int) -> float:
+        """Block until a call of ~``tokens`` may start; return the seconds waited."""
+        started = self._clock()
+        delay = self._reserve(tokens)
+        throttled = False
+        with self._queued():
+            while True:
+                if delay > 0:
+                    throttled = True
+                    time.sleep(delay)
+                delay = self._try_enter()
+                if delay == 0:
+                    break
+        waited = self._clock() - started if throttled else 0.0
+        self._record_wait(waited)
+        return waited
+
+    async def aacquire(self, tokens: int) -> float:
+        """Async `acquire`: waits without blocking the event loop."""
+        started = self._clock()
+        delay = self._reserve(tokens)
+        throttled = False
+        with self._queued():
+            while True:
+                if delay > 0:
+                    throttled = True
+                    await asyncio.sleep(delay)
+                delay = self._try_enter()
+                if delay == 0:
+                    break
+        waited = self._clock() - started if throttled else 0.0
+        self._record_wait(waited)
+        return waited
+
+    # --- Feedback ---
+
+    def release(self, latency_s: float, success: bool = True) -> None:
+        """Free the slot taken by `acquire` and adapt the concurrency limit."""
+        with self._lock:
+            self._inflight -= 1
+            # Failures are handled by `throttle` (429/5xx) or are not load related
+            if success and self.latency_target_s and latency_s > self.latency_target_s:
+                self._decrease()
+            elif success:
+                self._limit = min(float(self.max_concurrency), self._limit + 1 / self._limit)
+            self._update(inflight=self._inflight, concurrency_limit=self._limit)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the TPM bucket once the real token usage is known."""
+        if actual_tokens <= 0:
+            return
+        with self._lock:
+            self._tokens.credit(estimated_tokens - actual_tokens)
+
+    def throttle(self, retry_after: float | None = None, rate_limited: bool = True) -> None:
+        """React to a 429/5xx: shrink the limit and pause everyone for ``retry_after``."""
+        with self._lock:
+            if retry_after:
+                self._paused_until = max(self._paused_until, self._clock() + retry_after)
+            self._decrease()
+            self._update(
+                concurrency_limit=self._limit,
+                rate_limited=self._stats.rate_limited + rate_limited,
+                retries=self._stats.retries + 1,
+            )
+
+    def record_failure(self) -> None:
+        """A call gave up after exhausting its retries."""
+        with self._lock:
+            self._update(failures=self._stats.failures + 1)
+
+    def _decrease(self) -> None:
+        now = self._clock()
+        if now - self._last_decrease >= _DECREASE_COOLDOWN_S:
+            self._limit = max(1.0, self._limit / 2)
+            self._last_decrease = now
+
+    def _update(self, **changes: Any) -> None:
+        self._stats = replace(self._stats, **changes)
+
+    def stats(self) -> RateLimitStats:
+        with self._lock:
+            return self._stats
+
+
+_limiter: RateLimiter | None = None
+_limiter_config: Config | None = None
+_limiter_lock = threading.Lock()
+
+# Settings the process-wide limiter is built from
+LIMITER_SETTINGS = (
+    "groq_rpm",
+    "groq_tpm",
+    "rate_limit_max_concurrency",
+    "rate_limit_latency_target",
+)
+
+
+def get_rate_limiter(config: Config | None = None) -> RateLimiter:
+    """Process-wide limiter shared by every agent, created from ``config`` on first use.
+
+    Raises:
+        ValueError: ``config`` sets other account limits than the limiter's
+            (one account has one budget: `reset_rate_limiter` first)
+    """
+    global _limiter, _limiter_config
+    with _limiter_lock:
+        if _limiter is None or _limiter_config is None:
+            _limiter_config = config or Config()
+            _limiter = RateLimiter(
+                rpm=_limiter_config.groq_rpm,
+                tpm=_limiter_config.groq_tpm,
+                max_concurrency=_limiter_config.rate_limit_max_concurrency,
+                latency_target_s=_limiter_config.rate_limit_latency_target,
+            )
+        elif config is not None and (
+            changed := _limiter_config.differing(config, LIMITER_SETTINGS)
+        ):
+            raise ValueError(
+                f"The rate limiter was built with other limits ({', '.join(changed)}); "
+                "call reset_rate_limiter() before using a new configuration"
+            )
+        return _limiter
+
+
+def reset_rate_limiter() -> None:
+    global _limiter, _limiter_config
+    with _limiter_lock:
+        _limiter = None
+        _limiter_config = None
+
+
+def rate_limit_stats() -> RateLimitStats:
+    """Counters of the process-wide limiter (all zero if no Groq call was made)."""
+    with _limiter_lock:
+        limiter = _limiter
+    return limiter.stats() if limiter is not None else RateLimitStats()
+
+
+@dataclass
+class ProviderCall:
+    """Budget of one model call attempt, reserved only when it reaches the provider."""
+
+    limiter: RateLimiter
+    tokens: int
+    waited: float = 0.0
+    # perf_counter() when the budget was reserved (None: the call never left the process)
+    started: float | None = None
+
+
+_provider_call: ContextVar[ProviderCall | None] = ContextVar(
+    "football_club_provider_call", default=None
+)
+
+
+@contextmanager
+def provider_call(limiter: RateLimiter, tokens: int) -> Iterator[ProviderCall]:
+    """Make ``limiter`` the budget of the provider request sent inside the block."""
+    call = ProviderCall(limiter, tokens)
+    token = _provider_call.set(call)
+    try:
+        yield call
+    finally:
+        _provider_call.reset(token)
+
+
+def reserve_provider_call() -> None:
+    """Reserve the current call's budget as its request is sent (once per attempt)."""
+    call = _provider_call.get()
+    if call is not None and call.started is None:
+        call.waited = call.limiter.acquire(call.tokens)
+        call.started = time.perf_counter()
+
+
+async def areserve_provider_call() -> None:
+    """Async `reserve_provider_call`: waits without blocking the event loop."""
+    call = _provider_call.get()
+    if call is not None and call.started is None:
+        call.waited = await call.limiter.aacquire(call.tokens)
+        call.started = time.perf_counter()
@@ -0,0 +1,461 @@
+"""Concurrent HTTP serving mode for the compiled workflow.
+
+A small asyncio HTTP/1.1 server (stdlib only) that shares ONE compiled graph
+from `create_workflow()` across many conversations:
+
+- Each session maps to the checkpointer thread of the same id, so the
+  in-memory `Session` is only a handle: idle ones, and those whose thread
+  the session store spilled to disk, are dropped and rebuilt on next use
+- Turns of the same session run one at a time (per-session lock)
+- At most ``max_inflight`` turns run concurrently; up to ``max_queue`` more
+  wait for a slot and anything beyond that is rejected with 503 + Retry-After
+- Answers stream back as Server-Sent Events using the same `TurnEvent`s
+  that drive the CLI logs
+
+Endpoints:
+    GET    /health                 → load, session, handoff, rate limit, speculation counters
+                                     (and session store memory with CHECKPOINT_BACKEND=session)
+    GET    /metrics                → Prometheus text snapshot of per-turn metrics
+    POST   /sessions               → create a session
+    DELETE /sessions/{session_id}  → forget a session and delete its checkpointer thread
+    POST   /chat                   → {"message": ..., "session_id"?: ...} → SSE stream
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any
+
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph.state import CompiledStateGraph
+
+from football_club.agents.llm import get_llm_registry
+from football_club.cli_colors import log_profile
+from football_club.config import Config
+from football_club.graph import create_workflow
+from football_club.graph.guard import loop_stats
+from football_club.graph.speculation import speculation_stats
+from football_club.metrics import MetricsRecorder
+from football_club.ratelimit import rate_limit_stats
+from football_club.session_store import ThreadUsage, find_session_saver
+from football_club.streaming import TurnEvent, TurnEventParser
+
+logger = logging.getLogger("football_club")
+
+# Reject request bodies above this size (a chat message is a few KB at most)
+MAX_BODY_BYTES = 64 * 1024
+
+
+class HTTPError(Exception):
+    """Error that maps directly to an HTTP status response."""
+
+    def __init__(self, status: HTTPStatus, message: str, retry_after: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+@dataclass
+class Request:
+    """Minimal parsed HTTP request."""
+
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> dict[str, Any]:
+        if not self.body:
+            return {}
+        try:
+            payload = json.loads(self.body)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid JSON body") from e
+        if not isinstance(payload, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "JSON body must be an object")
+        return payload
+
+
+@dataclass
+class Session:
+    """A conversation bound to a checkpointer thread."""
+
+    session_id: str
+    thread_id: str
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    created_at: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+    turns: int = 0
+    # Chat requests holding or waiting for this session (never dropped while > 0)
+    pending: int = 0
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request:
+    """Read a single HTTP/1.1 request from the stream."""
+    request_line = await reader.readline()
+    if not request_line:
+        raise ConnectionResetError("Client closed connection")
+    try:
+        method, path, _version = request_line.decode("latin-1").split()
+    except ValueError as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line") from e
+
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", "0") or 0)
+    except ValueError as e:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed Content-Length") from e
+    if length < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return Request(method.upper(), path.split("?", 1)[0], headers, body)
+
+
+def _response_head(status: HTTPStatus, content_type: str, extra: dict[str, str]) -> bytes:
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}"]
+    lines.extend(f"{name}: {value}" for name, value in extra.items())
+    lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def write_json(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus,
+    payload: dict[str, Any],
+    headers: dict[str, str] | None = None,
+) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    extra = {"Content-Length": str(len(body)), **(headers or {})}
+    writer.write(_response_head(status, "application/json; charset=utf-8", extra) + body)
+    await writer.drain()
+
+
+def format_sse(event: str, data: dict[str, Any]) -> bytes:
+    """Encode one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+
+def _event_payload(event: TurnEvent) -> dict[str, Any]:
+    payload: dict[str, Any] = {"agent": event.agent}
+    if event.text:
+        payload["text"] = event.text
+    if event.source:
+        payload["source"] = event.source
+    return payload
+
+
+class ChatServer:
+    """Serve many concurrent conversations from one compiled workflow."""
+
+    def __init__(
+        self,
+        workflow: CompiledStateGraph,  # type: ignore[type-arg]
+        max_inflight: int = 8,
+        max_queue: int = 64,
+        metrics: MetricsRecorder | None = None,
+        profile: bool = False,
+        prom_path: str | None = None,
+        session_idle_seconds: float = 900,
+    ) -> None:
+        self.workflow = workflow
+        self.metrics = metrics or MetricsRecorder()
+        # Print each turn's breakdown (as the CLI's --profile) / write a Prometheus snapshot
+        self.profile = profile
+        self.prom_path = prom_path
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.sessions: dict[str, Session] = {}
+        self.session_idle_seconds = session_idle_seconds
+        checkpointer = getattr(workflow, "checkpointer", None)
+        self.checkpointer = checkpointer if isinstance(checkpointer, BaseCheckpointSaver) else None
+        self.session_store = find_session_saver(checkpointer)
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._inflight = 0
+        self._queued = 0
+
+    # --- Session management ---
+
+    def create_session(self, session_id: str | None = None) -> Session:
+        """Open a session; a known ``session_id`` resumes its checkpointer thread."""
+        self.sweep_sessions()
+        session_id = session_id or uuid.uuid4().hex
+        session = Session(session_id=session_id, thread_id=session_id)
+        self.sessions[session_id] = session
+        return session
+
+    def sweep_sessions(self) -> None:
+        """Drop unused sessions that are idle or whose thread was spilled to disk.
+
+        Their conversation stays in the checkpointer: the session id resumes it.
+        """
+        cutoff = time.time() - self.session_idle_seconds
+        for session_id, session in list(self.sessions.items()):
+            if session.pending:
+                continue
+            idle = self.session_idle_seconds > 0 and session.last_seen < cutoff
+            usage = self._thread_usage(session.thread_id)
+            if idle or (usage is not None and not usage.in_memory):
+                del self.sessions[session_id]
+
+    async def _has_thread(self, thread_id: str) -> bool:
+        """Whether the checkpointer holds a conversation for ``thread_id``."""
+        if self.session_store is not None:
+            # Without rehydrating it if it was spilled
+            return self.session_store.thread_usage(thread_id) is not None
+        if self.checkpointer is None:
+            return False
+        config: RunnableConfig = {"configurable": {"thread_id": thread_id}}
+        return await self.checkpointer.aget_tuple(config) is not None
+
+    def _thread_usage(self, thread_id: str) -> ThreadUsage | None:
+        if self.session_store is None:
+            return None
+        return self.session_store.thread_usage(thread_id)
+
+    def get_or_create_session(self, session_id: str | None) -> Session:
+        if session_id and session_id in self.sessions:
+            session = self.sessions[session_id]
+            session.last_seen = time.time()
+            return session
+        return self.create_session(session_id)
+
+    # --- HTTP plumbing ---
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await read_request(reader)
+            await self.dispatch(request, writer)
+        except HTTPError as e:
+            headers = {"Retry-After": str(e.retry_after)} if e.retry_after else None
+            await write_json(writer, e.status, {"error": e.message}, headers)
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.exception("Unhandled server error")
+            await write_json(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+        finally:
+            writer.close()
+
+    async def dispatch(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        if request.method == "GET" and request.path == "/health":
+            await write_json(writer, HTTPStatus.OK, self.health())
+        elif request.method == "GET" and request.path == "/metrics":
+            text = self.metrics.prometheus()
+            if self.session_store is not None:
+                text += self.session_store.usage().prometheus()
+            body = text.encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+            extra = {"Content-Length": str(len(body))}
+            writer.write(_response_head(HTTPStatus.OK, content_type, extra) + body)
+            await writer.drain()
+        elif request.method == "POST" and request.path == "/sessions":
+            session = self.create_session()
+            await write_json(
+                writer,
+                HTTPStatus.CREATED,
+                {"session_id": session.session_id, "thread_id": session.thread_id},
+            )
+        elif request.method == "DELETE" and request.path.startswith("/sessions/"):
+            session_id = request.path.removeprefix("/sessions/")
+            forgotten = self.sessions.pop(session_id, None)
+            if forgotten is None and not await self._has_thread(session_id):
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Unknown session")
+            if self.checkpointer is not None:
+                await self.checkpointer.adelete_thread(session_id)
+            await write_json(writer, HTTPStatus.OK, {"session_id": session_id, "deleted": True})
+        elif request.method == "POST" and request.path == "/chat":
+            await self.handle_chat(request, writer)
+        else:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {request.method} {request.path}")
+
+    def health(self) -> dict[str, Any]:
+        loops = loop_stats()
+        limits = rate_limit_stats()
+        speculation = speculation_stats()
+        health: dict[str, Any] = {
+            "status": "ok",
+            "inflight": self._inflight,
+            "queued": self._queued,
+            "max_inflight": self.max_inflight,
+            "max_queue": self.max_queue,
+            "sessions": len(self.sessions),
+            "handoff_loops": {
+                "handoffs": loops.handoffs,
+                "lateral_handoffs": loops.lateral_handoffs,
+                "max_hops_seen": loops.max_hops_seen,
+                "hop_limit_hits": loops.hop_limit_hits,
+                "ping_pongs": loops.ping_pongs,
+                "resolved_by": loops.resolved_by,
+            },
+            "rate_limit": {
+                "queue_depth": limits.queue_depth,
+                "inflight": limits.inflight,
+                "concurrency_limit": round(limits.concurrency_limit, 2),
+                "throttled": limits.throttled,
+                "throttle_seconds": round(limits.throttle_seconds, 3),
+                "retries": limits.retries,
+                "rate_limited": limits.rate_limited,
+                "failures": limits.failures,
+            },
+            "speculation": {
+                "launched": speculation.launched,
+                "hits": speculation.hits,
+                "misses": speculation.misses,
+                "failures": speculation.failures,
+                "hit_rate": round(speculation.hit_rate, 3),
+                "saved_seconds": round(speculation.saved_seconds, 3),
+                "committed_tokens": speculation.committed_tokens,
+                "wasted_tokens": speculation.wasted_tokens,
+            },
+        }
+        if self.session_store is not None:
+            health["session_store"] = self.session_store.usage().as_dict()
+        return health
+
+    # --- Chat turns ---
+
+    async def handle_chat(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        payload = request.json()
+        message = str(payload.get("message", "")).strip()
+        if not message:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Field 'message' is required")
+
+        # Backpressure: refuse before committing to stream a response
+        if self._inflight + self._queued >= self.max_inflight + self.max_queue:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Server busy", retry_after=1)
+
+        self._queued += 1
+        session = self.get_or_create_session(payload.get("session_id"))
+        session.pending += 1
+        try:
+            writer.write(
+                _response_head(HTTPStatus.OK, "text/event-stream", {"Cache-Control": "no-cache"})
+            )
+            writer.write(format_sse("session", {"session_id": session.session_id}))
+            await writer.drain()
+            await session.lock.acquire()
+            try:
+                await self._slots.acquire()
+            except BaseException:
+                session.lock.release()
+                raise
+        except BaseException:
+            session.pending -= 1
+            raise
+        finally:
+            self._queued -= 1
+
+        self._inflight += 1
+        try:
+            await self._stream_turn(session, message, writer)
+        finally:
+            self._inflight -= 1
+            self._slots.release()
+            session.lock.release()
+            session.last_seen = time.time()
+            session.pending -= 1
+
+    async def _stream_turn(
+        self, session: Session, message: str, writer: asyncio.StreamWriter
+    ) -> None:
+        input_state = {"messages": [HumanMessage(content=message)]}
+        parser = TurnEventParser()
+        started = time.perf_counter()
+        with self.metrics.turn(session.thread_id) as turn:
+            config = {
+                "configurable": {"thread_id": session.thread_id},
+                "callbacks": self.metrics.callbacks(turn),
+            }
+            try:
+                async for item in self.workflow.astream(  # type: ignore[call-overload]
+                    input_state,
+                    config=config,
+                    stream_mode=["updates", "messages"],
+                    subgraphs=True,
+                ):
+                    for event in parser.feed(item):
+                        writer.write(format_sse(event.kind, _event_payload(event)))
+                    await writer.drain()
+            except (ConnectionResetError, BrokenPipeError):
+                logger.info("Client disconnected from session %s", session.session_id)
+                raise
+            except Exception as e:
+                logger.error(f"Error in session {session.session_id}: {e}")
+                turn.error = str(e)
+                writer.write(format_sse("error", {"error": str(e)}))
+        if self.profile:
+            log_profile(turn)
+        if self.prom_path:
+            self.metrics.write_prometheus(self.prom_path)
+        if turn.error is None:
+            session.turns += 1
+            writer.write(
+                format_sse(
+                    "done",
+                    {
+                        "agent": parser.responding_agent,
+                        "path": parser.path,
+                        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+                    },
+                )
+            )
+        await writer.drain()
+
+    async def serve(self, host: str, port: int) -> None:
+        """Listen until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logger.info(f"Serving on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def run_server(
+    host: str,
+    port: int,
+    max_inflight: int,
+    max_queue: int,
+    config: Config | None = None,
+    profile: bool = False,
+) -> None:
+    """Build the workflow once from ``config`` and serve it until interrupted."""
+    config = config or Config()
+    server = ChatServer(
+        create_workflow(config),
+        max_inflight=max_inflight,
+        max_queue=max_queue,
+        metrics=MetricsRecorder(config.metrics_trace_path or None),
+        profile=profile,
+        prom_path=config.metrics_prom_path or None,
+        session_idle_seconds=config.session_idle_seconds,
+    )
+
+    async def main() -> None:
+        # Open pooled Groq connections while waiting for the first requests
+        prewarm = asyncio.create_task(get_llm_registry(config).aprewarm())
+        try:
+            await server.serve(host, port)
+        finally:
+            prewarm.cancel()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
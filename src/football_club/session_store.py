@@ -0,0 +1,562 @@
+"""In-memory checkpointer with LRU eviction and spill-to-disk.
+
+`MemorySaver` never frees a thread: the CLI starts a new one on every
+``limpiar`` and the server one per session, so a long-running process
+grows with every conversation it has ever seen, and a long conversation
+keeps every checkpoint of its history. `SessionSaver` keeps the
+`InMemorySaver` layout and speed for active conversations and bounds
+the rest:
+
+- Threads are kept in least-recently-used order. A thread idle for
+  ``idle_seconds``, or the oldest ones once there are more than
+  ``max_threads`` or their payloads exceed ``max_bytes``, are spilled:
+  their serialized entries are zlib-compressed into one row of a local
+  SQLite file and dropped from memory
+- A spilled thread is rehydrated transparently on its next access
+- Every ``prune_every`` root checkpoints a thread keeps only its last
+  ``keep_last``, as in `SQLiteSaver`
+- `usage` reports the payload bytes per thread and in total, in memory
+  and on disk
+- The async API runs in a worker thread, as spills and rehydrations do
+  SQLite I/O
+
+The spill file is scoped to the process (it is cleared on start): use
+the ``sqlite`` backend for conversations that survive restarts.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterator, Mapping, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+# Bookkeeping bytes counted per stored entry (key tuple, value tuple, dict slot)
+ENTRY_OVERHEAD = 160
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    thread_id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    data BLOB NOT NULL,
+    bytes INTEGER NOT NULL,
+    spilled_at REAL NOT NULL
+);
+"""
+
+BlobKey = tuple[str, str, str, Any]
+WriteKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class ThreadUsage:
+    """Memory held by one thread."""
+
+    thread_id: str
+    bytes: int
+    in_memory: bool
+    idle_seconds: float
+
+
+@dataclass(frozen=True)
+class SessionUsage:
+    """Memory and disk held by the session store."""
+
+    threads_in_memory: int
+    bytes_in_memory: int
+    threads_on_disk: int
+    bytes_on_disk: int
+    spills: int
+    rehydrations: int
+    largest: tuple[ThreadUsage, ...]
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def prometheus(self) -> str:
+        """Render the totals in Prometheus text exposition format."""
+        lines: list[str] = []
+        gauges = [
+            ("threads", "Conversation threads held by the session store.",
+             self.threads_in_memory, self.threads_on_disk),
+            ("bytes", "Serialized bytes held by the session store.",
+             self.bytes_in_memory, self.bytes_on_disk),
+        ]  # fmt: skip
+        for name, help_text, memory, disk in gauges:
+            lines.append(f"# HELP football_club_session_{name} {help_text}")
+            lines.append(f"# TYPE football_club_session_{name} gauge")
+            lines.append(f'football_club_session_{name}{{state="memory"}} {memory}')
+            lines.append(f'football_club_session_{name}{{state="disk"}} {disk}')
+        counters = [
+            ("spills", "Threads spilled to disk.", self.spills),
+            ("rehydrations", "Threads loaded back from disk.", self.rehydrations),
+        ]
+        for name, help_text, value in counters:
+            lines.append(f"# HELP football_club_session_{name}_total {help_text}")
+            lines.append(f"# TYPE football_club_session_{name}_total counter")
+            lines.append(f"football_club_session_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _size(typed: tuple[str, bytes]) -> int:
+    return len(typed[1]) + ENTRY_OVERHEAD
+
+
+class SessionSaver(InMemorySaver):
+    """`InMemorySaver` that keeps memory bounded by spilling cold threads to disk.
+
+    Args:
+        spill_path: SQLite file for spilled threads (created with its parent
+            directory if missing, cleared on start)
+        max_threads: Threads kept in memory
+        max_bytes: Payload bytes kept in memory
+        idle_seconds: Threads idle this long are spilled (0 disables)
+        keep_last: Root checkpoints kept per thread by automatic pruning
+            (0 disables automatic pruning)
+        prune_every: Run automatic pruning after this many root checkpoints
+        serde: Serializer (defaults to the LangGraph msgpack serializer)
+    """
+
+    def __init__(
+        self,
+        spill_path: str | Path,
+        *,
+        max_threads: int = 256,
+        max_bytes: int = 256 * 1024 * 1024,
+        idle_seconds: float = 900,
+        keep_last: int = 20,
+        prune_every: int = 32,
+        serde: SerializerProtocol | None = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.spill_path = Path(spill_path)
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_threads = max(max_threads, 1)
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.keep_last = keep_last
+        self.prune_every = prune_every
+        self._conn = sqlite3.connect(self.spill_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute("DELETE FROM sessions")
+        self._conn.commit()
+        self._lock = threading.RLock()
+        # Hot threads, least recently used first → last access time
+        self._hot: OrderedDict[str, float] = OrderedDict()
+        self._bytes: dict[str, int] = {}
+        self._blob_keys: dict[str, set[BlobKey]] = {}
+        self._write_keys: dict[str, set[WriteKey]] = {}
+        # Spilled threads → (compressed bytes on disk, spill time)
+        self._spilled: dict[str, tuple[int, float]] = {}
+        self._puts_since_prune: dict[str, int] = {}
+        self.bytes_in_memory = 0
+        self.spills = 0
+        self.rehydrations = 0
+
+    # --- Residency ---
+
+    def _touch(self, thread_id: str) -> None:
+        """Mark a thread as used now, rehydrating it if it was spilled."""
+        if thread_id in self._spilled:
+            self._rehydrate(thread_id)
+        elif thread_id not in self._hot:
+            self._hot[thread_id] = time.time()
+            self._bytes[thread_id] = 0
+            self._blob_keys[thread_id] = set()
+            self._write_keys[thread_id] = set()
+            return
+        self._hot[thread_id] = time.time()
+        self._hot.move_to_end(thread_id)
+
+    def _release(self, thread_id: str) -> None:
+        """Forget a thread that a read registered but that stores nothing."""
+        if self._bytes.get(thread_id) == 0:
+            self._drop(thread_id)
+
+    def _add_bytes(self, thread_id: str, delta: int) -> None:
+        self._bytes[thread_id] += delta
+        self.bytes_in_memory += delta
+
+    def _export(self, thread_id: str) -> dict[str, list[list[Any]]]:
+        checkpoints = [
+            [ns, checkpoint_id, *checkpoint, *metadata, parent]
+            for ns, saved in self.storage.get(thread_id, {}).items()
+            for checkpoint_id, (checkpoint, metadata, parent) in saved.items()
+        ]
+        writes = [
+            [key[1], key[2], task_id, idx, channel, *typed, task_path]
+            for key in self._write_keys[thread_id]
+            for (task_id, idx), (_, channel, typed, task_path) in self.writes[key].items()
+        ]
+        blobs = [[key[1], key[2], key[3], *self.blobs[key]] for key in self._blob_keys[thread_id]]
+        return {"checkpoints": checkpoints, "writes": writes, "blobs": blobs}
+
+    def _import(self, thread_id: str, payload: Mapping[str, list[list[Any]]]) -> None:
+        size = 0
+        saved = self.storage[thread_id]
+        for ns, checkpoint_id, c_type, c_data, m_type, m_data, parent in payload["checkpoints"]:
+            saved[ns][checkpoint_id] = ((c_type, c_data), (m_type, m_data), parent)
+            size += _size((c_type, c_data)) + len(m_data)
+        write_keys = self._write_keys[thread_id]
+        for ns, checkpoint_id, task_id, idx, channel, type_, data, path in payload["writes"]:
+            key = (thread_id, ns, checkpoint_id)
+            self.writes[key][(task_id, idx)] = (task_id, channel, (type_, data), path)
+            write_keys.add(key)
+            size += _size((type_, data))
+        blob_keys = self._blob_keys[thread_id]
+        for ns, channel, version, type_, data in payload["blobs"]:
+            blob_key = (thread_id, ns, channel, version)
+            self.blobs[blob_key] = (type_, data)
+            blob_keys.add(blob_key)
+            size += _size((type_, data))
+        self._add_bytes(thread_id, size)
+
+    def _drop(self, thread_id: str) -> None:
+        """Remove a hot thread from memory."""
+        self.storage.pop(thread_id, None)
+        for write_key in self._write_keys.pop(thread_id, ()):
+            self.writes.pop(write_key, None)
+        for blob_key in self._blob_keys.pop(thread_id, ()):
+            self.blobs.pop(blob_key, None)
+        self.bytes_in_memory -= self._bytes.pop(thread_id, 0)
+        self._hot.pop(thread_id, None)
+
+    def _spill(self, thread_id: str) -> None:
+        if self._bytes.get(thread_id, 0) == 0:
+            self._drop(thread_id)
+            return
+        type_, data = self.serde.dumps_typed(self._export(thread_id))
+        compressed = zlib.compress(data)
+        spilled_at = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+            (thread_id, type_, compressed, self._bytes[thread_id], spilled_at),
+        )
+        self._conn.commit()
+        self._drop(thread_id)
+        self._spilled[thread_id] = (len(compressed), spilled_at)
+        self.spills += 1
+
+    def _rehydrate(self, thread_id: str) -> None:
+        row = self._conn.execute(
+            "SELECT type, data FROM sessions WHERE thread_id = ?", (thread_id,)
+        ).fetchone()
+        del self._spilled[thread_id]
+        self._hot[thread_id] = time.time()
+        self._bytes[thread_id] = 0
+        self._blob_keys[thread_id] = set()
+        self._write_keys[thread_id] = set()
+        if row is not None:
+            self._import(thread_id, self.serde.loads_typed((row[0], zlib.decompress(row[1]))))
+            self._conn.execute("DELETE FROM sessions WHERE thread_id = ?", (thread_id,))
+            self._conn.commit()
+        self.rehydrations += 1
+
+    def _evict(self) -> None:
+        """Spill idle threads, then the least recently used ones over the limits.
+
+        The most recently used thread always stays in memory.
+        """
+        if self.idle_seconds > 0:
+            cutoff = time.time() - self.idle_seconds
+            while len(self._hot) > 1:
+                thread_id, last_used = next(iter(self._hot.items()))
+                if last_used >= cutoff:
+                    break
+                self._spill(thread_id)
+        while len(self._hot) > 1 and (
+            len(self._hot) > self.max_threads or self.bytes_in_memory > self.max_bytes
+        ):
+            self._spill(next(iter(self._hot)))
+
+    def sweep(self) -> None:
+        """Spill the threads that are idle or over the limits now."""
+        with self._lock:
+            self._evict()
+
+    def evict(self, thread_id: str) -> None:
+        """Spill a thread now (e.g. when its conversation is closed)."""
+        with self._lock:
+            if thread_id in self._hot:
+                self._spill(thread_id)
+
+    # --- Reads ---
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Fetch a checkpoint (the latest one if no checkpoint_id is given)."""
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            self._touch(thread_id)
+            result = super().get_tuple(config)
+            self._release(thread_id)
+            return result
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints, newest first (all threads: only those in memory)."""
+        with self._lock:
+            if config:
+                self._touch(config["configurable"]["thread_id"])
+            items = list(super().list(config, filter=filter, before=before, limit=limit))
+            if config:
+                self._release(config["configurable"]["thread_id"])
+        yield from items
+
+    def get_delta_channel_history(
+        self, *, config: RunnableConfig, channels: Sequence[str]
+    ) -> Mapping[str, Any]:
+        with self._lock:
+            thread_id = config["configurable"]["thread_id"]
+            self._touch(thread_id)
+            history = super().get_delta_channel_history(config=config, channels=channels)
+            self._release(thread_id)
+            return history
+
+    # --- Writes ---
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint, then spill what no longer fits in memory."""
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"]["checkpoint_ns"]
+        with self._lock:
+            self._touch(thread_id)
+            blob_keys = self._blob_keys[thread_id]
+            size = 0
+            for channel, version in new_versions.items():
+                key = (thread_id, ns, channel, version)
+                if key in blob_keys:
+                    size -= _size(self.blobs[key])
+                blob_keys.add(key)
+            if previous := self.storage[thread_id][ns].get(checkpoint["id"]):
+                size -= _size(previous[0]) + len(previous[1][1])
+            result = super().put(config, checkpoint, metadata, new_versions)
+            saved = self.storage[thread_id][ns][checkpoint["id"]]
+            size += _size(saved[0]) + len(saved[1][1])
+            size += sum(_size(self.blobs[(thread_id, ns, c, v)]) for c, v in new_versions.items())
+            self._add_bytes(thread_id, size)
+            if ns == "":
+                self._maybe_prune(thread_id)
+            self._evict()
+        return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store intermediate writes linked to a checkpoint."""
+        thread_id = config["configurable"]["thread_id"]
+        key = (
+            thread_id,
+            config["configurable"].get("checkpoint_ns", ""),
+            config["configurable"]["checkpoint_id"],
+        )
+        with self._lock:
+            self._touch(thread_id)
+            before = sum(_size(w[2]) for w in self.writes.get(key, {}).values())
+            super().put_writes(config, writes, task_id, task_path)
+            if key in self.writes:
+                self._write_keys[thread_id].add(key)
+                after = sum(_size(w[2]) for w in self.writes[key].values())
+                self._add_bytes(thread_id, after - before)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete every checkpoint, write and blob of a thread, in memory or on disk."""
+        with self._lock:
+            if self._spilled.pop(thread_id, None) is not None:
+                self._conn.execute("DELETE FROM sessions WHERE thread_id = ?", (thread_id,))
+                self._conn.commit()
+            self._drop(thread_id)
+            self._puts_since_prune.pop(thread_id, None)
+
+    # --- Retention ---
+
+    def prune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        """Prune threads: ``keep_latest`` keeps only the newest root checkpoint."""
+        for thread_id in thread_ids:
+            if strategy == "delete":
+                self.delete_thread(thread_id)
+            else:
+                self.prune_thread(thread_id, keep_last=1)
+
+    def prune_thread(self, thread_id: str, keep_last: int) -> int:
+        """Keep the newest ``keep_last`` root checkpoints of a thread.
+
+        Older checkpoints in every namespace, their writes, and blobs no
+        longer referenced by a kept checkpoint are deleted.
+
+        Returns:
+            Number of checkpoints deleted
+        """
+        with self._lock:
+            self._touch(thread_id)
+            saved = self.storage[thread_id]
+            roots = sorted(saved.get("", {}), reverse=True)
+            if len(roots) <= keep_last:
+                self._release(thread_id)
+                return 0
+            cutoff = roots[max(keep_last, 1) - 1]
+            deleted = 0
+            live: set[BlobKey] = set()
+            for ns, checkpoints in saved.items():
+                for checkpoint_id in [c for c in checkpoints if c < cutoff]:
+                    del checkpoints[checkpoint_id]
+                    deleted += 1
+                for checkpoint, _, _ in checkpoints.values():
+                    versions = self.serde.loads_typed(checkpoint)["channel_versions"]
+                    live.update((thread_id, ns, c, v) for c, v in versions.items())
+            write_keys = self._write_keys[thread_id]
+            for key in [k for k in write_keys if k[2] < cutoff]:
+                write_keys.discard(key)
+                del self.writes[key]
+            blob_keys = self._blob_keys[thread_id]
+            for blob_key in blob_keys - live:
+                blob_keys.discard(blob_key)
+                del self.blobs[blob_key]
+            self._add_bytes(thread_id, self._measure(thread_id) - self._bytes[thread_id])
+            return deleted
+
+    def _measure(self, thread_id: str) -> int:
+        size = sum(
+            _size(checkpoint) + len(metadata[1])
+            for saved in self.storage.get(thread_id, {}).values()
+            for checkpoint, metadata, _ in saved.values()
+        )
+        size += sum(
+            _size(w[2]) for key in self._write_keys[thread_id] for w in self.writes[key].values()
+        )
+        return size + sum(_size(self.blobs[key]) for key in self._blob_keys[thread_id])
+
+    def _maybe_prune(self, thread_id: str) -> None:
+        if self.keep_last <= 0:
+            return
+        count = self._puts_since_prune.get(thread_id, 0) + 1
+        if count >= self.prune_every:
+            self.prune_thread(thread_id, self.keep_last)
+            count = 0
+        self._puts_since_prune[thread_id] = count
+
+    # --- Usage ---
+
+    def thread_usage(self, thread_id: str) -> ThreadUsage | None:
+        """Bytes held by a thread: its payloads in memory, compressed on disk."""
+        now = time.time()
+        with self._lock:
+            if thread_id in self._hot:
+                return ThreadUsage(
+                    thread_id, self._bytes[thread_id], True, now - self._hot[thread_id]
+                )
+            if thread_id in self._spilled:
+                size, spilled_at = self._spilled[thread_id]
+                return ThreadUsage(thread_id, size, False, now - spilled_at)
+        return None
+
+    def usage(self, top: int = 10) -> SessionUsage:
+        """Totals in memory and on disk, with the ``top`` largest threads in memory."""
+        now = time.time()
+        with self._lock:
+            largest = sorted(self._bytes.items(), key=lambda item: item[1], reverse=True)[:top]
+            return SessionUsage(
+                threads_in_memory=len(self._hot),
+                bytes_in_memory=self.bytes_in_memory,
+                threads_on_disk=len(self._spilled),
+                bytes_on_disk=sum(size for size, _ in self._spilled.values()),
+                spills=self.spills,
+                rehydrations=self.rehydrations,
+                largest=tuple(
+                    ThreadUsage(thread_id, size, True, now - self._hot[thread_id])
+                    for thread_id, size in largest
+                ),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- Async API (spills and rehydrations run in a worker thread) ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aget_delta_channel_history(
+        self, *, config: RunnableConfig, channels: Sequence[str]
+    ) -> Mapping[str, Any]:
+        return await asyncio.to_thread(
+            self.get_delta_channel_history, config=config, channels=channels
+        )
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def aprune(self, thread_ids: Sequence[str], *, strategy: str = "keep_latest") -> None:
+        await asyncio.to_thread(self.prune, thread_ids, strategy=strategy)
+
+
+def find_session_saver(checkpointer: Any) -> SessionSaver | None:
+    """Return the `SessionSaver` behind a (possibly instrumented) checkpointer."""
+    if isinstance(checkpointer, BaseCheckpointSaver):
+        checkpointer = getattr(checkpointer, "inner", checkpointer)
+    return checkpointer if isinstance(checkpointer, SessionSaver) else None
@@ -1,5 +1,6 @@
 """State management for the multi-agent system (Handoffs pattern)."""
 
+import operator
 from typing import Annotated, NotRequired, TypedDict
 
 from langchain_core.messages import BaseMessage
@@ -12,6 +13,37 @@ AGENT_MEDICAL = "medical"
 AGENT_ORCHESTRATOR = "orchestrator"
 
 
+class FanoutResult(TypedDict):
+    """Partial answer of one domain agent in a fan-out."""
+
+    agent: str
+    answer: str
+
+
+class ResolvedEntity(TypedDict):
+    """Player or club mentioned in a user message, as resolved by the entity index."""
+
+    id: str
+    name: str
+    kind: str
+    # Player of our squad (or our club) rather than an external one
+    ours: bool
+    club: str
+    mention: str
+    match: str
+    score: float
+
+
+# `HumanMessage.additional_kwargs` key holding the message's resolved entities
+ENTITIES_KEY = "entities"
+
+
+def message_entities(message: BaseMessage) -> list[ResolvedEntity]:
+    """Entities annotated on ``message`` by the router node (empty if none)."""
+    entities: list[ResolvedEntity] = message.additional_kwargs.get(ENTITIES_KEY, [])
+    return entities
+
+
 class AgentState(TypedDict):
     """State shared across all agents in the workflow.
 
@@ -25,5 +57,17 @@ class AgentState(TypedDict):
     # Currently active agent — persists across turns via checkpointer
     active_agent: NotRequired[str]
 
+    # Agents visited in the current turn: reset by the router node, extended
+    # by each handoff (hops = len - 1)
+    handoff_path: NotRequired[Annotated[list[str], operator.add]]
+
+    # Set by the hop guard: the active agent must answer without tools
+    force_answer: NotRequired[bool]
+
+    # Domain agents the orchestrator dispatched in parallel for a compound
+    # question, and their partial answers (merged into one reply, then cleared)
+    fanout: NotRequired[list[str]]
+    fanout_results: NotRequired[Annotated[list[FanoutResult], operator.add]]
+
     # Final response text
     final_answer: str
@@ -0,0 +1,158 @@
+"""Turn LangGraph stream output into display-agnostic turn events.
+
+The workflow is streamed with ``subgraphs=True`` and a list of stream modes,
+so every item is a ``(namespace, mode, chunk)`` tuple:
+
+- ``updates`` chunks carry node outputs (tool calls, handoffs, final answer)
+- ``messages`` chunks carry LLM tokens as they are generated
+
+`TurnEventParser` folds both into a flat sequence of `TurnEvent`s that the
+CLI renders with colors and other front-ends can forward as-is.
+"""
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from football_club.graph.fanout import FANOUT_NODE
+from football_club.state import (
+    AGENT_ANALYST,
+    AGENT_MEDICAL,
+    AGENT_ORCHESTRATOR,
+    AGENT_SCOUT,
+)
+
+AGENT_NODES = frozenset({AGENT_ORCHESTRATOR, AGENT_SCOUT, AGENT_ANALYST, AGENT_MEDICAL})
+
+EventKind = Literal["agent", "handoff", "tool", "token", "answer"]
+
+
+@dataclass(frozen=True)
+class TurnEvent:
+    """A single displayable event within one conversation turn.
+
+    - agent: ``agent`` became active (first agent of the turn)
+    - handoff: control moved from ``source`` to ``agent``
+    - tool: ``agent`` called the tool named in ``text``
+    - token: ``agent`` generated the answer fragment in ``text``
+    - answer: ``agent`` finished with the full answer in ``text``
+    """
+
+    kind: EventKind
+    agent: str
+    text: str = ""
+    source: str | None = None
+
+
+def _agent_from_namespace(namespace: tuple[str, ...]) -> str | None:
+    """Extract the agent node name from a subgraph namespace like ``('scout:<id>',)``."""
+    if not namespace:
+        return None
+    name = namespace[0].split(":", 1)[0]
+    return name if name in AGENT_NODES else None
+
+
+def _tool_call_name(tool_call: Any) -> str:
+    if isinstance(tool_call, dict):
+        return str(tool_call.get("name", "unknown"))
+    return str(getattr(tool_call, "name", "unknown"))
+
+
+def _tool_call_id(tool_call: Any) -> str | None:
+    if isinstance(tool_call, dict):
+        return tool_call.get("id")
+    return getattr(tool_call, "id", None)
+
+
+@dataclass
+class TurnEventParser:
+    """Stateful parser for the stream of a single turn."""
+
+    path: list[str] = field(default_factory=list)
+    final_answer: str = ""
+    responding_agent: str = AGENT_ORCHESTRATOR
+    streamed_agents: set[str] = field(default_factory=set)
+    _seen_tool_calls: set[str] = field(default_factory=set)
+
+    @property
+    def current_agent(self) -> str:
+        return self.path[-1] if self.path else AGENT_ORCHESTRATOR
+
+    def feed(self, item: Any) -> Iterator[TurnEvent]:
+        """Parse one raw stream item into zero or more events."""
+        if not isinstance(item, tuple) or len(item) != 3:
+            return
+        namespace, mode, chunk = item
+
+        agent = _agent_from_namespace(namespace)
+        if agent is not None:
+            yield from self._activate(agent)
+
+        if mode == "messages":
+            if namespace and namespace[0].split(":", 1)[0] == FANOUT_NODE:
+                # Parallel partial answers would interleave; the merged answer follows
+                return
+            yield from self._parse_message(agent, chunk)
+        elif mode == "updates" and isinstance(chunk, dict):
+            yield from self._parse_updates(namespace, chunk)
+
+    def _activate(self, agent: str) -> Iterator[TurnEvent]:
+        if self.path and self.path[-1] == agent:
+            return
+        if self.path:
+            yield TurnEvent("handoff", agent, source=self.path[-1])
+        else:
+            yield TurnEvent("agent", agent)
+        self.path.append(agent)
+
+    def _parse_message(self, agent: str | None, chunk: Any) -> Iterator[TurnEvent]:
+        if not isinstance(chunk, tuple) or not chunk:
+            return
+        msg = chunk[0]
+        # Only answer text: skip tool messages (handoff acks) and tool-call chunks
+        if not isinstance(msg, AIMessage):
+            return
+        if msg.tool_calls or (isinstance(msg, AIMessageChunk) and msg.tool_call_chunks):
+            return
+        if not isinstance(msg.content, str) or not msg.content:
+            return
+        speaker = agent or self.current_agent
+        self.streamed_agents.add(speaker)
+        yield TurnEvent("token", speaker, msg.content)
+
+    def _parse_updates(
+        self, namespace: tuple[str, ...], chunk: dict[str, Any]
+    ) -> Iterator[TurnEvent]:
+        for node_name, node_output in chunk.items():
+            if not namespace and node_name in AGENT_NODES:
+                yield from self._activate(node_name)
+            if not isinstance(node_output, dict):
+                continue
+            for msg in node_output.get("messages", []):
+                if not isinstance(msg, AIMessage):
+                    continue
+                if not namespace and msg.name in AGENT_NODES:
+                    # Committed speculative answer: it arrives in the orchestrator's update
+                    yield from self._activate(msg.name)
+                if msg.tool_calls:
+                    for tc in msg.tool_calls:
+                        call_id = _tool_call_id(tc)
+                        if call_id is not None and call_id in self._seen_tool_calls:
+                            continue
+                        if call_id is not None:
+                            self._seen_tool_calls.add(call_id)
+                        yield TurnEvent("tool", self.current_agent, _tool_call_name(tc))
+                elif msg.content and not namespace:
+                    # Parent-level update: the agent finished with an answer
+                    self.final_answer = str(msg.content)
+                    self.responding_agent = self.current_agent
+                    yield TurnEvent("answer", self.responding_agent, self.final_answer)
+
+
+def parse_stream(items: Iterable[Any]) -> Iterator[TurnEvent]:
+    """Convenience wrapper: parse a whole stream with a fresh parser."""
+    parser = TurnEventParser()
+    for item in items:
+        yield from parser.feed(item)
@@ -0,0 +1,278 @@
+"""Offline, deterministic chat model for tests and benchmarks.
+
+`FakeChatModel` stands in for ChatGroq so the whole graph (routing,
+handoffs, checkpointing, streaming) runs with no API key or network. It
+binds tools like a real provider and decides what to do from the bound
+transfer tools and the lexicon of the local router:
+
+- Orchestrator: transfers to the domain agent whose lexicon best matches
+  the question (to all of them at once for compound questions), or
+  answers a short greeting when nothing matches
+- Domain agent: answers questions of its own domain (or ones it was
+  explicitly transferred for) and hands back to the orchestrator otherwise
+
+Each call waits ``latency_s`` before the first token, so benchmarks can
+model provider latency, and reserves rate limit budget where a real
+request would be sent (responses served from the cache do not). A fixed
+``responses`` script overrides the policy.
+
+Usage:
+    models = FakeModels(latency_s=0.05)
+    workflow = create_workflow(config, llm_factory=models)
+    ...
+    models.calls()  # → {"orchestrator": 0, "medical": 1, ...}
+"""
+
+import asyncio
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from typing import Any
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    UsageMetadata,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable
+from langchain_core.tools import BaseTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+from football_club.graph.router import FastRouter
+from football_club.ratelimit import areserve_provider_call, reserve_provider_call
+from football_club.state import AGENT_ORCHESTRATOR
+
+_LEXICON = FastRouter()
+
+
+def _tool_names(tools: Sequence[dict[str, Any]]) -> set[str]:
+    return {tool["function"]["name"] for tool in tools if "function" in tool}
+
+
+class FakeChatModel(BaseChatModel):
+    """Scripted stand-in for a tool-calling chat model.
+
+    Attributes:
+        agent: Agent this model plays (decides the routing policy)
+        latency_s: Simulated time to first token of every call
+        answer_words: Length of generated answers (tokens streamed one per word)
+        responses: Fixed replies returned in order (cycled), bypassing the policy
+    """
+
+    agent: str = AGENT_ORCHESTRATOR
+    latency_s: float = 0.0
+    answer_words: int = 40
+    responses: list[AIMessage] = []
+
+    _calls: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"agent": self.agent, "answer_words": self.answer_words}
+
+    @property
+    def call_count(self) -> int:
+        """Number of completions generated so far."""
+        return self._calls
+
+    def bind_tools(
+        self,
+        tools: Sequence[dict[str, Any] | type | Callable[..., Any] | BaseTool],
+        *,
+        tool_choice: str | None = None,
+        **kwargs: Any,
+    ) -> Runnable[LanguageModelInput, AIMessage]:
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    # --- Policy ---
+
+    def respond(self, messages: Sequence[BaseMessage], tools: set[str]) -> AIMessage:
+        """Decide the reply to ``messages`` given the bound tool names."""
+        self._calls += 1
+        if self.responses:
+            scripted = self.responses[(self._calls - 1) % len(self.responses)]
+            if any(tc["name"] not in tools for tc in scripted.tool_calls):
+                # Like a real provider, never call a tool that is not bound
+                return AIMessage(content=scripted.text or f"[{self.agent}] respuesta directa")
+            return scripted.model_copy(update={"id": None})
+
+        last_human = max(
+            (i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=-1
+        )
+        question = messages[last_human].text if last_human >= 0 else ""
+        transfers_this_turn = {
+            tc["name"]
+            for m in messages[last_human + 1 :]
+            if isinstance(m, AIMessage)
+            for tc in m.tool_calls
+        }
+        scores = _LEXICON.lexicon_scores(question)
+        best = max(scores, key=lambda agent: scores[agent]) if any(scores.values()) else None
+
+        if self.agent == AGENT_ORCHESTRATOR:
+            # Compound questions transfer to every domain with evidence at once (fan-out)
+            targets = [
+                f"transfer_to_{agent}"
+                for agent in (_LEXICON.domains(question) or ([best] if best else []))
+            ]
+            targets = [t for t in targets if t in tools and t not in transfers_this_turn]
+            if targets:
+                return self._tool_call(*targets)
+            return AIMessage(content="Hola, puedo ayudarte con fichajes, rendimiento o lesiones.")
+
+        sent_here = f"transfer_to_{self.agent}" in transfers_this_turn
+        if best not in (None, self.agent) and not sent_here:
+            # Lateral handoff when bound and the question is only about the sibling's domain
+            lateral = f"transfer_to_{best}"
+            if _LEXICON.domains(question) == [best] and lateral in tools:
+                return self._tool_call(lateral)
+            if (
+                "transfer_to_orchestrator" in tools
+                and "transfer_to_orchestrator" not in transfers_this_turn
+            ):
+                return self._tool_call("transfer_to_orchestrator")
+        filler = " ".join(f"dato{i}" for i in range(self.answer_words))
+        return AIMessage(content=f"[{self.agent}] {question} — {filler}")
+
+    @staticmethod
+    def _tool_call(*names: str) -> AIMessage:
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {"name": name, "args": {}, "id": f"call_{uuid.uuid4().hex[:24]}"} for name in names
+            ],
+        )
+
+    @staticmethod
+    def _usage(messages: Sequence[BaseMessage], reply: AIMessage) -> UsageMetadata:
+        """Approximate token usage (~4 characters per token) for metrics."""
+        prompt = sum(len(m.text) for m in messages) // 4 + 1
+        completion = len(reply.text) // 4 + 1
+        return UsageMetadata(
+            input_tokens=prompt, output_tokens=completion, total_tokens=prompt + completion
+        )
+
+    @staticmethod
+    def _chunks(message: AIMessage) -> Iterator[ChatGenerationChunk]:
+        if message.tool_calls:
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {"name": tc["name"], "args": "{}", "id": tc["id"], "index": i}
+                        for i, tc in enumerate(message.tool_calls)
+                    ],
+                    usage_metadata=message.usage_metadata,
+                )
+            )
+            return
+        words = message.text.split(" ")
+        for i, word in enumerate(words):
+            last = i == len(words) - 1
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content=word if last else word + " ",
+                    # Like real providers, usage arrives with the last chunk
+                    usage_metadata=message.usage_metadata if last else None,
+                )
+            )
+
+    def _reply(self, messages: list[BaseMessage], kwargs: dict[str, Any]) -> AIMessage:
+        message = self.respond(messages, _tool_names(kwargs.get("tools", [])))
+        message.usage_metadata = self._usage(messages, message)
+        return message
+
+    # --- BaseChatModel hooks ---
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        reserve_provider_call()
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        message = self._reply(messages, kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await areserve_provider_call()
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        message = self._reply(messages, kwargs)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        reserve_provider_call()
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        message = self._reply(messages, kwargs)
+        for chunk in self._chunks(message):
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await areserve_provider_call()
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        message = self._reply(messages, kwargs)
+        for chunk in self._chunks(message):
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+class FakeModels:
+    """`llm_factory` for `create_workflow` that builds one fake per agent.
+
+    The models stay accessible by agent name so callers can inspect
+    ``call_count`` after a run.
+    """
+
+    def __init__(self, latency_s: float = 0.0, answer_words: int = 40) -> None:
+        self.latency_s = latency_s
+        self.answer_words = answer_words
+        self.models: dict[str, FakeChatModel] = {}
+
+    def __call__(self, agent: str) -> FakeChatModel:
+        model = FakeChatModel(agent=agent, latency_s=self.latency_s, answer_words=self.answer_words)
+        self.models[agent] = model
+        return model
+
+    def calls(self) -> dict[str, int]:
+        """Completions generated per agent."""
+        return {agent: model.call_count for agent, model in self.models.items()}
@@ -0,0 +1,65 @@
+"""Tests for the JSONL batch mode."""
+
+import asyncio
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from football_club.batch import run_batch
+from football_club.state import AgentState
+
+
+def _counting_workflow():
+    def medical(state: AgentState) -> dict:
+        questions = [m for m in state["messages"] if isinstance(m, HumanMessage)]
+        return {"messages": [AIMessage(content=f"{questions[-1].content} ({len(questions)})")]}
+
+    builder = StateGraph(AgentState)
+    builder.add_node("medical", medical)
+    builder.add_edge(START, "medical")
+    builder.add_edge("medical", END)
+    return builder.compile(checkpointer=MemorySaver())
+
+
+def _write_input(path, count):
+    lines = [json.dumps({"id": f"q{i}", "question": f"pregunta {i}"}) for i in range(count)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_ordered_batch_records_answers_and_resumes(tmp_path):
+    source, results = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_input(source, 6)
+    workflow = _counting_workflow()
+
+    summary = asyncio.run(run_batch(workflow, source, results, concurrency=3, ordered=True))
+    records = _read(results)
+
+    assert summary.succeeded == 6
+    assert [r["id"] for r in records] == [f"q{i}" for i in range(6)]
+    assert records[0]["answer"] == "pregunta 0 (1)"
+    assert records[0]["agent"] == "medical"
+    assert records[0]["path"] == ["medical"]
+    assert records[0]["latency_ms"] >= 0
+
+    _write_input(source, 8)
+    resumed = asyncio.run(run_batch(workflow, source, results, concurrency=3))
+    assert (resumed.skipped, resumed.succeeded) == (6, 2)
+    assert len(_read(results)) == 8
+
+
+def test_shared_thread_runs_items_sequentially(tmp_path):
+    source, results = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    _write_input(source, 4)
+
+    asyncio.run(
+        run_batch(_counting_workflow(), source, results, concurrency=4, shared_thread_id="t")
+    )
+
+    answers = sorted(r["answer"] for r in _read(results))
+    assert answers == [f"pregunta {i} ({i + 1})" for i in range(4)]
@@ -0,0 +1,131 @@
+"""Tests for the LLM response cache."""
+
+import sqlite3
+
+import pytest
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration
+
+from football_club.cache import ResponseCache, install_response_cache, make_cache_key
+from football_club.config import Config
+from football_club.graph import create_workflow
+from football_club.testing import FakeModels
+
+
+def _prompt(question: str, msg_id: str = "1") -> str:
+    return dumps(
+        [SystemMessage(content="Eres el analista"), HumanMessage(content=question, id=msg_id)]
+    )
+
+
+def _answer(text: str = "respuesta") -> list[ChatGeneration]:
+    return [ChatGeneration(message=AIMessage(content=text, id="run-1"))]
+
+
+def test_hit_ignores_ids_case_and_punctuation():
+    cache = ResponseCache()
+    cache.update(_prompt("¿Cómo está la plantilla?"), "groq", _answer())
+
+    hit = cache.lookup(_prompt("cómo está la plantilla", msg_id="2"), "groq")
+
+    assert hit is not None
+    assert hit[0].message.content == "respuesta"
+    assert hit[0].message.id is None
+    assert cache.lookup(_prompt("cómo está la plantilla"), "other-model") is None
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+
+
+def test_cached_tool_calls_get_fresh_ids():
+    cache = ResponseCache()
+    message = AIMessage(
+        content="", tool_calls=[{"name": "transfer_to_scout", "args": {}, "id": "c1"}]
+    )
+    cache.update(_prompt("fichajes"), "groq", [ChatGeneration(message=message)])
+
+    first = cache.lookup(_prompt("fichajes"), "groq")
+    second = cache.lookup(_prompt("fichajes"), "groq")
+
+    assert first[0].message.tool_calls[0]["name"] == "transfer_to_scout"
+    assert first[0].message.tool_calls[0]["id"] != second[0].message.tool_calls[0]["id"]
+
+
+def test_tool_call_ids_are_keyed_by_position():
+    def history(call_id: str) -> str:
+        call = {"name": "transfer_to_medical", "args": {}, "id": call_id}
+        return dumps(
+            [
+                HumanMessage(content="¿Cuándo vuelve Pedri?"),
+                AIMessage(content="", tool_calls=[call]),
+                ToolMessage(content="Transferido", tool_call_id=call_id),
+            ]
+        )
+
+    assert make_cache_key(history("call_a"), "groq") == make_cache_key(history("call_b"), "groq")
+
+
+def test_lru_eviction_and_ttl_expiry():
+    cache = ResponseCache(max_entries=2)
+    for question in ["a", "b", "c"]:
+        cache.update(_prompt(question), "groq", _answer(question))
+    assert cache.lookup(_prompt("a"), "groq") is None
+    assert cache.stats().evictions == 1
+
+    expired = ResponseCache(ttl_seconds=0)
+    expired.update(_prompt("a"), "groq", _answer())
+    assert expired.lookup(_prompt("a"), "groq") is None
+    assert expired.stats().expirations == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = tmp_path / "llm_cache.sqlite"
+    cache = ResponseCache(disk_path=path)
+    cache.update(_prompt("plantilla"), "groq", _answer("persistida"))
+    cache.close()
+
+    reopened = ResponseCache(disk_path=path)
+    hit = reopened.lookup(_prompt("plantilla"), "groq")
+    reopened.close()
+
+    assert hit[0].message.content == "persistida"
+    assert reopened.stats().disk_hits == 1
+
+
+def test_domain_agent_hits_after_a_handoff_in_another_thread():
+    config = Config(fast_router_enabled=False, checkpoint_backend="memory", llm_cache_path="")
+    models = FakeModels()
+    workflow = create_workflow(config, llm_factory=models)
+    cache = get_llm_cache()
+    question = {"messages": [HumanMessage(content="¿Cuándo vuelve Pedri de su lesión?")]}
+
+    try:
+        for thread_id in ("t1", "t2"):
+            state = workflow.invoke(question, {"configurable": {"thread_id": thread_id}})
+            assert state["messages"][-1].content.startswith("[medical]")
+        stats = cache.stats()
+    finally:
+        set_llm_cache(None)
+
+    # Handoff tool call ids differ per run; the medical agent still hits
+    assert models.calls() == {"orchestrator": 1, "medical": 1}
+    assert (stats.hits, stats.misses, stats.size) == (2, 2, 2)
+
+
+def test_install_reuses_a_matching_cache_and_closes_a_replaced_one(tmp_path):
+    config = Config(llm_cache_enabled=True, llm_cache_path=str(tmp_path / "llm.sqlite"))
+    try:
+        installed = install_response_cache(config)
+        assert install_response_cache(config) is installed
+        assert get_llm_cache() is installed
+
+        replacement = install_response_cache(Config(llm_cache_enabled=True, llm_cache_path=""))
+        assert replacement is not installed and get_llm_cache() is replacement
+        with pytest.raises(sqlite3.ProgrammingError):  # the replaced disk tier is closed
+            installed.lookup(_prompt("plantilla"), "groq")
+
+        assert install_response_cache(Config(llm_cache_enabled=False)) is None
+        assert get_llm_cache() is None
+    finally:
+        set_llm_cache(None)
@@ -0,0 +1,109 @@
+"""Tests for the persistent SQLite checkpointer."""
+
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+
+from football_club.checkpoint import SQLiteSaver, create_checkpointer
+from football_club.config import Config
+from football_club.state import AgentState
+
+
+def _echo_workflow(saver: SQLiteSaver):
+    def scout(state: AgentState) -> dict:
+        question = [m for m in state["messages"] if isinstance(m, HumanMessage)][-1].content
+        return {"messages": [AIMessage(content=f"eco: {question}")], "active_agent": "scout"}
+
+    builder = StateGraph(AgentState)
+    builder.add_node("scout", scout)
+    builder.add_edge(START, "scout")
+    builder.add_edge("scout", END)
+    return builder.compile(checkpointer=saver)
+
+
+def _ask(workflow, question: str, thread_id: str = "t1") -> dict:
+    config = {"configurable": {"thread_id": thread_id}}
+    return workflow.invoke({"messages": [HumanMessage(content=question)]}, config)
+
+
+def test_conversation_survives_restart_and_uses_list_deltas(tmp_path):
+    path = tmp_path / "checkpoints.sqlite"
+    saver = SQLiteSaver(path)
+    workflow = _echo_workflow(saver)
+    for i in range(5):
+        _ask(workflow, f"pregunta {i}")
+    saver.close()
+
+    saver = SQLiteSaver(path)
+    result = _ask(_echo_workflow(saver), "otra")
+
+    contents = [m.content for m in result["messages"]]
+    assert len(contents) == 12
+    assert contents[-2:] == ["otra", "eco: otra"]
+    assert result["active_agent"] == "scout"
+    kinds = dict(saver._conn.execute("SELECT kind, COUNT(*) FROM blobs GROUP BY kind").fetchall())
+    assert kinds["delta"] > 0
+    saver.close()
+
+
+def test_prune_keeps_last_checkpoints(tmp_path):
+    saver = SQLiteSaver(tmp_path / "checkpoints.sqlite", keep_last=0)
+    workflow = _echo_workflow(saver)
+    for i in range(6):
+        _ask(workflow, f"pregunta {i}")
+    config = {"configurable": {"thread_id": "t1"}}
+    before = workflow.get_state(config).values
+
+    deleted = saver.prune_thread("t1", keep_last=2)
+
+    assert deleted > 0
+    assert len(list(saver.list(config))) == 2
+    assert workflow.get_state(config).values == before
+    assert _ask(workflow, "más")["messages"][-1].content == "eco: más"
+    saver.close()
+
+
+def test_idle_conversations_are_deleted_on_start(tmp_path):
+    path = tmp_path / "checkpoints.sqlite"
+    saver = SQLiteSaver(path)
+    workflow = _echo_workflow(saver)
+    _ask(workflow, "antigua", "old")
+    _ask(workflow, "reciente", "new")
+    saver._conn.execute("UPDATE checkpoints SET created_at = 0 WHERE thread_id = 'old'")
+    saver._conn.commit()
+    saver.close()
+
+    reopened = create_checkpointer(Config(checkpoint_path=str(path), checkpoint_max_idle_days=30))
+
+    assert reopened.get_tuple({"configurable": {"thread_id": "old"}}) is None
+    assert reopened.get_tuple({"configurable": {"thread_id": "new"}}) is not None
+    reopened.close()
+
+
+def test_async_api_and_delete_thread(tmp_path):
+    saver = SQLiteSaver(tmp_path / "checkpoints.sqlite")
+    workflow = _echo_workflow(saver)
+
+    async def run():
+        config = {"configurable": {"thread_id": "a"}}
+        await workflow.ainvoke({"messages": [HumanMessage(content="hola")]}, config)
+        return [item async for item in saver.alist(config)]
+
+    assert asyncio.run(run())
+    saver.delete_thread("a")
+    assert saver.get_tuple({"configurable": {"thread_id": "a"}}) is None
+    saver.close()
+
+
+def test_list_cache_is_bounded(tmp_path):
+    saver = SQLiteSaver(tmp_path / "checkpoints.sqlite", max_cached_lists=1)
+    workflow = _echo_workflow(saver)
+    for i in range(3):
+        _ask(workflow, f"pregunta {i}", "a")
+        _ask(workflow, f"pregunta {i}", "b")
+
+    assert len(saver._last_lists) == 1
+    contents = [m.content for m in _ask(workflow, "fin", "a")["messages"]]
+    assert contents[-4:] == ["pregunta 2", "eco: pregunta 2", "fin", "eco: fin"]
+    saver.close()
@@ -0,0 +1,51 @@
+"""Tests for the command-line entry point."""
+
+import os
+import subprocess
+import sys
+
+from football_club import __version__
+from football_club.cli import print_banner
+
+
+def test_version_does_not_import_langchain():
+    script = (
+        "import sys\n"
+        "from football_club.cli import main\n"
+        "try:\n"
+        "    main(['--version'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted(m for m in sys.modules if m.startswith(('langchain', 'langgraph'))))\n"
+    )
+    done = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+
+    assert done.stdout.splitlines() == [f"football-club {__version__}", "[]"]
+
+
+def test_dotenv_loaded_after_import_applies_to_config(tmp_path):
+    (tmp_path / ".env").write_text("GROQ_MODEL=modelo-del-env\nGROQ_RPM=7\n")
+    script = (
+        "from dotenv import load_dotenv\n"
+        "from football_club.config import Config\n"
+        "load_dotenv()\n"
+        "config = Config()\n"
+        "print(config.groq_model, config.groq_rpm)\n"
+    )
+    env = {k: v for k, v in os.environ.items() if k not in ("GROQ_MODEL", "GROQ_RPM")}
+    done = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+        cwd=tmp_path, env=env,
+    )  # fmt: skip
+
+    assert done.stdout.split() == ["modelo-del-env", "7"]
+
+
+def test_banner_shows_the_resolved_models(capsys):
+    print_banner({"orchestrator": "llama-3.1-8b-instant", "scout": "big", "analyst": "big"})
+
+    banner = capsys.readouterr().out
+    assert "Modelo: big " in banner
+    assert "Router: llama-3.1-8b-instant" in banner
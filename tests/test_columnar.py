@@ -0,0 +1,81 @@
+"""Tests for the memory-mapped columnar datasets and the build command."""
+
+import numpy as np
+import pytest
+
+from football_club.cli import main
+from football_club.data.columnar import (
+    is_dataset,
+    open_scouting_index,
+    open_squad_stats,
+    save_scouting_index,
+    save_squad_stats,
+)
+from football_club.data.scouting import ScoutingIndex, load_scouting_index
+from football_club.data.stats import SquadStats
+
+SCOUTING_CSV = """player,club,league,position,age,market_value,minutes,goals_p90,xg_p90,shots_p90
+Lautaro Martínez,Inter,Serie A,FW,27,100,2800,0.7,0.6,3.5
+Young Striker,Club A,Serie A,FW,21,20,1500,0.6,0.55,3.2
+Old Striker,Club B,LaLiga,FW,33,5,2000,0.5,0.5,2.9
+Playmaker,Club A,Serie A,MF,22,40,2500,0.1,0.1,1.0
+Pedro Martín,Club A,LaLiga,MF,29,10,900,0.2,0.2,1.5
+"""
+
+
+@pytest.fixture
+def index(tmp_path) -> ScoutingIndex:
+    path = tmp_path / "scouting.csv"
+    path.write_text(SCOUTING_CSV)
+    return ScoutingIndex.from_csv(path)
+
+
+def test_scouting_dataset_matches_the_csv_index(index, tmp_path):
+    mapped = open_scouting_index(save_scouting_index(index, tmp_path / "scouting"))
+
+    assert isinstance(mapped.matrix, np.memmap)
+    for distance in ("cosine", "mahalanobis"):
+        assert mapped.similar("lautaro", 3, distance) == index.similar("lautaro", 3, distance)
+    assert mapped.similar("Lautaro", position="FW", league="serie a") == index.similar(
+        "Lautaro", position="FW", league="serie a"
+    )
+    assert mapped.profile("young striker") == index.profile("young striker")
+
+
+def test_mapped_name_lookup_keeps_the_matching_rules(index, tmp_path):
+    players = open_scouting_index(save_scouting_index(index, tmp_path / "scouting")).players
+
+    assert players.names[players.resolve("PEDRO MARTIN")] == "Pedro Martín"
+    assert players.names[players.resolve("playm")] == "Playmaker"
+    with pytest.raises(ValueError, match="ambiguo: Lautaro Martínez, Pedro Martín"):
+        players.resolve("mart")
+    with pytest.raises(ValueError, match="No encuentro"):
+        players.resolve("Messi")
+
+
+def test_squad_stats_dataset_round_trip(tmp_path):
+    rows = [
+        {"player": p, "date": d, "competition": c, "minutes": 90, "goals": g}
+        for p, d, c, g in [
+            ("Lewandowski", "2024-08-18", "LaLiga", 2),
+            ("Raphinha", "2024-08-18", "LaLiga", 1),
+            ("Lewandowski", "2024-09-18", "Champions", 1),
+        ]
+    ]
+    stats = SquadStats.from_records(rows)
+    mapped = open_squad_stats(save_squad_stats(stats, tmp_path / "stats"))
+
+    assert mapped.top("goals") == stats.top("goals")
+    assert mapped.totals("lewandowski", competition="Champions").values["goals"] == 1
+
+
+def test_build_command_replaces_the_dataset(tmp_path):
+    source = tmp_path / "scouting.csv"
+    source.write_text(SCOUTING_CSV)
+    output = tmp_path / "scouting"
+
+    assert main(["build", "scouting", str(source), str(output)]) == 0
+    assert main(["build", "scouting", str(source), str(output)]) == 0
+    assert is_dataset(output)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["scouting", "scouting.csv"]
+    assert len(load_scouting_index(str(output))) == 5
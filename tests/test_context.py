@@ -0,0 +1,86 @@
+"""Tests for the per-agent context budget."""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from football_club.agents.context import (
+    SUMMARY_HEADER,
+    compact_history,
+    create_context_middleware,
+    drop_handoff_pairs,
+)
+from football_club.config import Config
+
+
+def _handoff(call_id: str, target: str) -> list:
+    return [
+        AIMessage(content="", tool_calls=[{"name": target, "args": {}, "id": call_id}]),
+        ToolMessage(content="Transferido", tool_call_id=call_id),
+    ]
+
+
+def _history(turns: int) -> list:
+    messages: list = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"pregunta {i} " + "sobre el equipo " * 20))
+        messages.extend(_handoff(f"c{i}", "transfer_to_analyst"))
+        messages.append(AIMessage(content=f"respuesta {i} " + "con datos " * 40))
+    return messages
+
+
+def test_handoff_pairs_are_dropped_but_other_tools_kept():
+    messages = [
+        HumanMessage(content="hola"),
+        *_handoff("h1", "transfer_to_scout"),
+        AIMessage(content="", tool_calls=[{"name": "get_injuries", "args": {}, "id": "t1"}]),
+        ToolMessage(content="[]", tool_call_id="t1"),
+    ]
+
+    kept = drop_handoff_pairs(messages)
+
+    assert [type(m).__name__ for m in kept] == ["HumanMessage", "AIMessage", "ToolMessage"]
+    assert kept[-1].tool_call_id == "t1"
+
+
+def test_old_turns_are_summarized_and_current_turn_kept_verbatim():
+    messages = _history(8)
+
+    result = compact_history(messages, max_tokens=10_000, keep_turns=3, max_summary_tokens=400)
+
+    humans = [m.content for m in result.messages if isinstance(m, HumanMessage)]
+    assert [h.split()[1] for h in humans] == ["5", "6", "7"]
+    # Stale handoffs dropped, the current turn's handoff kept
+    assert sum(isinstance(m, ToolMessage) for m in result.messages) == 1
+    assert result.summary.startswith(SUMMARY_HEADER)
+    # The summary budget keeps the newest folded turns
+    assert "pregunta 4" in result.summary
+    assert "pregunta 0" not in result.summary
+    assert len(result.summary) <= 400 * 4
+    assert result.summarized_turns == 5
+    assert result.tokens_saved > 0
+
+
+def test_budget_sheds_verbatim_turns_and_short_history_is_untouched():
+    messages = _history(6)
+
+    tight = compact_history(messages, max_tokens=300, keep_turns=6, max_summary_tokens=50)
+    short = compact_history(messages[:4], max_tokens=300, keep_turns=6, max_summary_tokens=50)
+
+    assert len([m for m in tight.messages if isinstance(m, HumanMessage)]) == 1
+    assert len(tight.summary) <= 50 * 4
+    assert short.messages == messages[:4]
+    assert short.summary == ""
+    assert short.tokens_saved == 0
+
+
+def test_agent_budgets_override_the_default():
+    config = Config(
+        context_max_tokens=4000, context_agent_budgets="orchestrator=1500, medical=3000"
+    )
+
+    assert [create_context_middleware(config, a)[0].max_tokens for a in ("medical", "scout")] == [
+        3000,
+        4000,
+    ]
+    with pytest.raises(ValueError, match="'medical=mucho'"):
+        create_context_middleware(Config(context_agent_budgets="medical=mucho"), "medical")
@@ -0,0 +1,124 @@
+"""Tests for the player/club entity index and its use before routing."""
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from football_club.agents.context import entity_note
+from football_club.data.entities import (
+    EntityIndex,
+    load_entity_index,
+    scouting_entities,
+    squad_entities,
+)
+from football_club.graph.router import FastRouter
+from football_club.graph.workflow import FastRouteNode
+from football_club.state import message_entities
+
+SQUAD = ["Robert Lewandowski", "Pablo Martín Páez Gavira", "Frenkie de Jong", "Iñigo Martínez"]
+
+
+@pytest.fixture
+def index() -> EntityIndex:
+    entities = (
+        squad_entities(SQUAD)
+        + scouting_entities(
+            ["Erling Haaland", "Lautaro Martínez", "Luuk de Jong", "Victor Osimhen", "Pedro Neto"],
+            ["Manchester City", "Inter", "PSV", "Napoli", "Chelsea"],
+        )
+        + scouting_entities(["Julián Álvarez", "Viktor Tsygankov"], ["Atlético", "Girona"])
+    )
+    return EntityIndex(entities, {"Gavi": "player:pablo-martin-paez-gavira"})
+
+
+def _names(index, text):
+    return [(e["name"], e["ours"], e["match"]) for e in index.resolve(text)]
+
+
+def test_mentions_resolve_by_alias_prefix_and_trigrams(index):
+    assert _names(index, "¿Cuántos goles lleva Lewa?") == [("Robert Lewandowski", True, "prefix")]
+    assert _names(index, "qué tal Gavi y frenkie") == [
+        ("Pablo Martín Páez Gavira", True, "alias"),
+        ("Frenkie de Jong", True, "exact"),
+    ]
+    assert _names(index, "compara a Lewandoski con Osimen del Inter") == [
+        ("Robert Lewandowski", True, "fuzzy"),
+        ("Victor Osimhen", False, "fuzzy"),
+        ("Inter", False, "exact"),
+    ]
+    # Router vocabulary and chat words are never names
+    assert index.resolve("hola, ¿qué tal la plantilla?") == []
+
+
+def test_shared_names_prefer_our_player(index):
+    assert _names(index, "de jong")[0][0] == "Frenkie de Jong"
+    assert _names(index, "Martínez")[0][0] == "Iñigo Martínez"
+    assert _names(index, "Lautaro Martinez")[0][0] == "Lautaro Martínez"
+    without_ours = EntityIndex(scouting_entities(["Luuk de Jong", "Siem de Jong"], ["PSV", "X"]))
+    assert without_ours.resolve("de jong") == []
+
+
+def test_index_loads_stores_and_aliases(tmp_path):
+    stats = tmp_path / "stats.csv"
+    stats.write_text("player,date,competition,minutes\nRobert Lewandowski,2024-09-01,LaLiga,90\n")
+    scouting = tmp_path / "scouting.csv"
+    scouting.write_text(
+        "player,club,league,position,age,market_value,minutes\n"
+        "Robert Lewandowski,Other,LaLiga,FW,36,10,900\n"
+        "Erling Haaland,Manchester City,Premier League,FW,24,180,2500\n"
+    )
+    aliases = tmp_path / "aliases.csv"
+    aliases.write_text(
+        "alias,name,kind,ours\nBarça,FC Barcelona,club,true\nCity,Manchester City,,\n"
+    )
+
+    index = load_entity_index(str(stats), str(scouting), str(aliases))
+
+    # The squad comes first: a name in both stores is ours
+    assert _names(index, "lewandowski") == [("Robert Lewandowski", True, "exact")]
+    (barca, city) = index.resolve("el Barça contra el City")
+    assert (barca["id"], barca["kind"], barca["ours"]) == ("club:fc-barcelona", "club", True)
+    assert (city["name"], city["match"]) == ("Manchester City", "alias")
+
+
+def test_router_node_annotates_the_message_and_routes(index):
+    node = FastRouteNode(FastRouter(), lambda: index)
+    question = HumanMessage(content="¿Cómo está jugando Haaland?", id="m1")
+
+    update = node({"messages": [question]})
+
+    (annotated,) = update["messages"]
+    assert annotated.id == "m1"
+    assert [e["name"] for e in message_entities(annotated)] == ["Erling Haaland"]
+    # One external player is not enough evidence on its own, two are
+    assert "active_agent" not in update
+    assert node({"messages": [HumanMessage("Haaland o Osimhen", id="m2")]})["active_agent"] == (
+        "scout"
+    )
+    # Our player points to the analyst unless another domain has evidence
+    assert node({"messages": [HumanMessage("goles de Lewa", id="m3")]})["active_agent"] == (
+        "analyst"
+    )
+    assert node({"messages": [HumanMessage("lesión de Lewa", id="m4")]})["active_agent"] == (
+        "medical"
+    )
+    assert "Erling Haaland (jugador externo, Manchester City)" in entity_note(
+        message_entities(annotated)
+    )
+
+
+@pytest.mark.parametrize(
+    ("question", "agent"),
+    [
+        ("¿Cuál es nuestro xG contra el Atlético?", "analyst"),
+        ("Análisis táctico del Girona para el domingo", "analyst"),
+        ("¿Qué bajas tenemos para el partido contra el Napoli?", "medical"),
+        ("Pedro tiene molestias en el tobillo", "medical"),
+    ],
+)
+def test_rivals_and_external_names_do_not_pull_to_the_scout(index, question, agent):
+    router = FastRouter()
+    entities = index.resolve(question)
+
+    assert entities
+    assert router.add_entity_evidence(router.lexicon_scores(question), entities)["scout"] == 0
+    assert router.classify(question, entities).agent == agent
@@ -0,0 +1,105 @@
+"""Tests for the streaming match event ingestion and the analyst's event tools."""
+
+import json
+
+import pytest
+
+from football_club.agents.data_tools import create_event_tools
+from football_club.data.events import MatchEventStore, fold_file, iter_events
+
+
+def _statsbomb_match(passer="Pedri", team="FC Barcelona", rival="Girona"):
+    """A short StatsBomb-style match: a progressive key pass, a goal and a rival shot."""
+    return [
+        {"type": {"name": "Starting XI"}, "team": {"name": team}},
+        {
+            "type": {"name": "Pass"},
+            "player": {"name": passer},
+            "team": {"name": team},
+            "location": [50.0, 40.0],
+            "pass": {"end_location": [100.0, 38.0], "goal_assist": True},
+        },
+        {
+            "type": {"name": "Pass"},
+            "player": {"name": passer},
+            "team": {"name": team},
+            "location": [50.0, 40.0],
+            "pass": {"end_location": [40.0, 40.0], "outcome": {"name": "Incomplete"}},
+        },
+        {
+            "type": {"name": "Shot"},
+            "player": {"name": "Lewandowski"},
+            "team": {"name": team},
+            "shot": {"statsbomb_xg": 0.45, "outcome": {"name": "Goal"}},
+        },
+        {
+            "type": {"name": "Shot"},
+            "player": {"name": "Tsygankov"},
+            "team": {"name": rival},
+            "shot": {"statsbomb_xg": 0.1, "outcome": {"name": "Saved"}},
+        },
+    ]
+
+
+@pytest.fixture
+def feeds(tmp_path):
+    (tmp_path / "1001.json").write_text(json.dumps(_statsbomb_match(), indent=2))
+    flat = [
+        {"match_id": "1002", "date": "2024-08-25", "team": "FC Barcelona", "player": "Pedri",
+         "type": "carry", "location": [30, 40], "end_location": [70, 40]},
+        {"match_id": "1002", "date": "2024-08-25", "team": "FC Barcelona",
+         "player": "Lewandowski", "type": "shot", "xg": 0.2, "outcome": "goal"},
+    ]  # fmt: skip
+    (tmp_path / "1002.jsonl").write_text("\n".join(json.dumps(event) for event in flat))
+    return tmp_path
+
+
+def test_streaming_parser_matches_json_load(feeds):
+    path = feeds / "1001.json"
+    events = json.loads(path.read_text())
+
+    # Chunks smaller than one event exercise the boundary retries
+    assert list(iter_events(path, chunk_size=16)) == events
+    assert len(list(iter_events(feeds / "1002.jsonl"))) == 2
+
+    (feeds / "broken.json").write_text(path.read_text()[:-40])
+    with pytest.raises(ValueError, match="JSON incompleto"):
+        list(iter_events(feeds / "broken.json", chunk_size=16))
+
+
+def test_fold_counts_actions(feeds):
+    (match,) = fold_file(feeds / "1001.json")
+    rows = dict(zip(match.players, match.values.tolist(), strict=True))
+    pedri = rows[("Pedri", "FC Barcelona")]
+
+    assert match.match_id == "1001"
+    # passes, completed, progressive, key passes, assists
+    assert pedri[:5] == [2, 1, 1, 1, 1]
+    assert rows[("Lewandowski", "FC Barcelona")][8:11] == [1, 1, 0.45]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_refresh_is_idempotent(feeds, workers):
+    store = MatchEventStore(feeds, workers=workers)
+    assert store.refresh() == 2
+    assert store.refresh() == 0
+
+    # A re-sent feed replaces its match instead of adding to it
+    (feeds / "1001-resent.json").write_text(json.dumps(_statsbomb_match()))
+    (feeds / "1001.json").unlink()
+    store.refresh()
+    assert len(store) == 2  # "1001-resent" replaces the deleted "1001"
+    assert store.player("Lewandowski").values["goals"] == 2
+    assert store.top("xg", 1) == [("Lewandowski", pytest.approx(0.65), 2)]
+
+
+def test_event_tools(feeds):
+    store = MatchEventStore(feeds, workers=1)
+    top, player, team, form = create_event_tools(store)
+
+    assert top.invoke({"metric": "goles", "team": "barcelona"}).startswith("1. Lewandowski: 2")
+    assert "conducciones progresivas: 1" in player.invoke({"player": "pedri"})
+    assert "xG a favor 0.65, en contra 0.10" in team.invoke({"team": "FC Barcelona"})
+    assert form.invoke({"player": "Lewandowski", "metric": "xg", "window": 2}).endswith(
+        "2024-08-25: 0.20 · media 2 partidos 0.33"
+    )
@@ -0,0 +1,34 @@
+"""Tests for the parallel fan-out of compound questions."""
+
+from langchain_core.messages import HumanMessage
+
+from football_club.config import Config
+from football_club.graph import create_workflow
+from football_club.graph.router import FastRouter
+from football_club.testing import FakeModels
+
+COMPOUND = "¿Cuál es el rendimiento de Pedri y cuándo vuelve de su lesión?"
+
+
+def test_compound_question_is_not_fast_routed():
+    decision = FastRouter().classify(COMPOUND)
+
+    assert decision.agent is None
+    assert decision.source == "compound"
+
+
+def test_compound_question_merges_parallel_answers():
+    models = FakeModels()
+    config = Config(llm_cache_enabled=False, checkpoint_backend="memory")
+    workflow = create_workflow(config, llm_factory=models)
+    thread = {"configurable": {"thread_id": "t1"}}
+
+    state = workflow.invoke({"messages": [HumanMessage(content=COMPOUND)]}, thread)
+
+    answer = state["messages"][-1]
+    assert answer.name == "orchestrator"
+    assert "**Rendimiento:** [analyst]" in answer.content
+    assert "**Parte médico:** [medical]" in answer.content
+    assert state["active_agent"] == "orchestrator"
+    assert not state.get("fanout") and not state.get("fanout_results")
+    assert models.calls() == {"orchestrator": 1, "analyst": 1, "medical": 1}
@@ -0,0 +1,61 @@
+"""Tests for the handoff hop budget and ping-pong detection."""
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from football_club.config import Config
+from football_club.graph import create_workflow
+from football_club.graph.guard import find_loop, loop_stats, reset_loop_stats
+from football_club.testing import FakeChatModel
+
+
+def _transfer(target: str) -> AIMessage:
+    return AIMessage(content="", tool_calls=[{"name": target, "args": {}, "id": "x"}])
+
+
+def _looping_models(agent: str) -> FakeChatModel:
+    """Orchestrator always sends to scout; every domain agent always sends back."""
+    target = "transfer_to_scout" if agent == "orchestrator" else "transfer_to_orchestrator"
+    return FakeChatModel(agent=agent, responses=[_transfer(target)])
+
+
+def _run(question: str, **overrides):
+    settings = {
+        "llm_cache_enabled": False,
+        "checkpoint_backend": "memory",
+        "fast_router_enabled": False,
+        **overrides,
+    }
+    workflow = create_workflow(Config(**settings), llm_factory=_looping_models)
+    config = {"configurable": {"thread_id": "t1"}}
+    return workflow.invoke({"messages": [HumanMessage(content=question)]}, config)
+
+
+def test_find_loop():
+    assert find_loop(["orchestrator", "medical"], max_hops=3) is None
+    assert find_loop(["medical", "orchestrator", "analyst"], max_hops=3) is None
+    assert find_loop(["orchestrator", "scout", "orchestrator", "scout"], 3) == "ping_pong"
+    assert find_loop(["scout", "orchestrator", "analyst"], max_hops=1) == "hop_limit"
+
+
+def test_ping_pong_is_resolved_by_best_scoring_agent():
+    reset_loop_stats()
+
+    state = _run("¿Qué extremo deberíamos fichar de otro equipo?")
+
+    assert state["handoff_path"] == ["orchestrator", "scout", "orchestrator", "scout", "scout"]
+    assert state["force_answer"] is True
+    assert state["messages"][-1].content == "[scout] respuesta directa"
+    stats = loop_stats()
+    assert stats.ping_pongs == 1
+    assert stats.resolved_by == {"scout": 1}
+
+
+def test_hop_limit_with_orchestrator_resolution():
+    reset_loop_stats()
+
+    state = _run("hola", max_handoff_hops=1, handoff_resolution="orchestrator")
+
+    assert state["handoff_path"] == ["orchestrator", "scout", "orchestrator", "orchestrator"]
+    assert state["active_agent"] == "orchestrator"
+    assert state["messages"][-1].content == "[orchestrator] respuesta directa"
+    assert loop_stats().hop_limit_hits == 1
@@ -0,0 +1,71 @@
+"""Tests for the injury interval index and the medical agent's data tools."""
+
+import pytest
+
+from football_club.agents.data_tools import create_injury_tools
+from football_club.data.injuries import Fixture, InjuryStore
+
+REPORTS = [
+    {"player": "Pedri", "injury": "Rotura fibrilar", "start": "2024-09-01", "end": "2024-10-01"},
+    {"player": "Pedri", "injury": "rotura fibrilar", "start": "2025-01-10", "end": "2025-02-01"},
+    {"player": "Gavi", "injury": "Rodilla", "start": "2024-11-20", "end": ""},
+    {"player": "Lamine Yamal", "injury": "Tobillo", "start": "2024-09-15", "end": "2024-09-20"},
+]
+
+
+@pytest.fixture
+def store() -> InjuryStore:
+    store = InjuryStore(["Pedri", "Gavi", "Araujo"])
+    store.add(REPORTS)
+    return store
+
+
+def test_availability_by_day(store):
+    out = store.out_on("2024-09-16")
+
+    assert [injury.player for injury in out] == ["Pedri", "Lamine Yamal"]
+    assert store.available_on("2024-09-16") == ["Gavi", "Araujo"]
+    # The return date is the first day available again; open injuries never end
+    assert store.available_on("2024-12-01") == ["Pedri", "Araujo", "Lamine Yamal"]
+    assert [injury.player for injury in store.out_on("2030-01-01")] == ["Gavi"]
+
+
+def test_days_lost_and_recurrences(store):
+    assert store.days_lost(2024, as_of="2025-03-01") == [
+        ("Gavi", 101),
+        ("Pedri", 52),
+        ("Lamine Yamal", 5),
+    ]
+    (recurrence,) = store.recurrences()
+    assert (recurrence.player, recurrence.gap_days) == ("Pedri", 101)
+    assert store.recurrences(window_days=30) == []
+
+
+def test_reports_followed_from_csv(tmp_path):
+    path = tmp_path / "injuries.csv"
+    path.write_text("player,injury,start,end\nGavi,Rodilla,2024-11-20,\n")
+    store = InjuryStore(path=path)
+    assert store.refresh() == 1
+
+    store.record("Gavi", "Rodilla", "2024-11-20", "2025-06-01")
+    with path.open("a") as f:
+        f.write("Araujo,Isquiotibiales,2025-01-05,2025-01-25\n")
+
+    assert store.refresh() == 1
+    assert store.refresh() == 0
+    assert len(store) == 2
+    assert [injury.end for injury in store.history("gavi")] == ["2025-06-01"]
+
+
+def test_medical_tools(store):
+    fixtures = [Fixture("2024-09-16", "Girona", "LaLiga"), Fixture("2025-03-01", "Girona", "Copa")]
+    availability, history, days_lost, recurrences, record = create_injury_tools(store, fixtures)
+
+    # Both matches are past: the latest one is used
+    text = availability.invoke({"match": "girona"})
+    assert text.startswith("Partido contra Girona (Copa), 2025-03-01")
+    assert "Bajas (1):\n- Gavi: Rodilla (desde el 2024-11-20, sin fecha de alta)" in text
+    assert "Disponibles (2): Gavi, Araujo" in availability.invoke({"date": "2024-09-16"})
+    assert "vuelve el 2024-10-01" in history.invoke({"player": "pedri"})
+    assert days_lost.invoke({"season": "2024/25"}).startswith("1. Gavi:")
+    assert "Fecha no válida" in record.invoke({"player": "Gavi", "injury": "x", "start": "ayer"})
@@ -0,0 +1,115 @@
+"""Tests for the shared Groq client registry."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from football_club.agents.llm import (
+    LLMClientRegistry,
+    get_llm_registry,
+    parse_agent_settings,
+    reset_llm_registry,
+)
+from football_club.config import Config
+from football_club.ratelimit import (
+    RateLimiter,
+    get_rate_limiter,
+    provider_call,
+    reset_rate_limiter,
+)
+
+
+def test_agents_share_pools_and_apply_model_tiers():
+    registry = LLMClientRegistry(
+        Config(
+            groq_api_key="test",
+            groq_agent_models="orchestrator=llama-3.1-8b-instant",
+            groq_agent_max_tokens="orchestrator=256",
+            groq_agent_timeouts="orchestrator=10",
+        )
+    )
+
+    orchestrator = registry.chat_model("orchestrator")
+    medical = registry.chat_model("medical", temperature=0.3)
+
+    assert orchestrator.model_name == "llama-3.1-8b-instant"
+    assert (orchestrator.max_tokens, orchestrator.request_timeout) == (256, 10.0)
+    assert medical.model_name == Config().groq_model
+    assert (medical.max_tokens, medical.request_timeout) == (None, Config().groq_timeout)
+    assert medical.temperature == 0.3
+    for llm in (orchestrator, medical):
+        assert llm.client._client._client is registry.http_client
+        assert llm.async_client._client._client is registry.async_http_client
+    registry.close()
+
+
+def test_invalid_agent_settings_are_rejected():
+    assert parse_agent_settings(" orchestrator = 256 ,", int) == {"orchestrator": 256}
+    with pytest.raises(ValueError, match="orchestrator=fast"):
+        parse_agent_settings("orchestrator=fast", int)
+
+
+def test_singletons_reject_a_different_config():
+    config = Config(groq_api_key="test", groq_model="llama-3.3-70b-versatile", groq_rpm=30)
+    reset_llm_registry()
+    reset_rate_limiter()
+    try:
+        registry = get_llm_registry(config)
+        limiter = get_rate_limiter(config)
+        # Equal settings (and settings the singleton does not use) share it
+        assert get_llm_registry(Config(**{**vars(config), "debug": True})) is registry
+        assert get_rate_limiter(Config(**{**vars(config), "groq_model": "other"})) is limiter
+        assert get_llm_registry() is registry
+
+        with pytest.raises(ValueError, match="groq_model"):
+            get_llm_registry(Config(**{**vars(config), "groq_model": "other"}))
+        with pytest.raises(ValueError, match="groq_rpm"):
+            get_rate_limiter(Config(**{**vars(config), "groq_rpm": 60}))
+
+        reset_llm_registry()
+        assert get_llm_registry(Config(**{**vars(config), "groq_model": "other"})) is not registry
+    finally:
+        reset_llm_registry()
+        reset_rate_limiter()
+
+
+def test_prewarm_opens_connections_that_later_requests_reuse(monkeypatch):
+    connections: list[int] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            connections.append(1)
+
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("GROQ_API_BASE", f"http://127.0.0.1:{server.server_port}")
+    registry = LLMClientRegistry(Config(groq_api_key="test"))
+
+    registry.prewarm(connections=2, background=False)
+    for _ in range(3):
+        registry.http_client.get(registry.api_base + "/openai/v1/models")
+
+    assert len(connections) == 2
+    # Budget is reserved by the pool itself, once per call, when a request goes out
+    limiter = RateLimiter(rpm=0, tpm=0)
+    with provider_call(limiter, 10) as call:
+        registry.http_client.get(registry.api_base + "/openai/v1/models")
+        registry.http_client.get(registry.api_base + "/openai/v1/models")
+    assert call.started is not None
+    assert limiter.stats().requests == 1
+    registry.close()
+    server.shutdown()
+    server.server_close()
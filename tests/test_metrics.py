@@ -0,0 +1,47 @@
+"""Tests for per-turn timing, token and cost instrumentation."""
+
+import json
+
+from langchain_core.messages import HumanMessage
+
+from football_club.config import Config
+from football_club.graph import create_workflow
+from football_club.metrics import MetricsRecorder, estimate_cost
+from football_club.testing import FakeModels
+
+
+def test_turn_metrics_trace_and_prometheus(tmp_path):
+    recorder = MetricsRecorder(tmp_path / "trace.jsonl")
+    settings = Config(
+        llm_cache_enabled=False,
+        checkpoint_backend="memory",
+        fast_router_enabled=False,
+    )
+    workflow = create_workflow(settings, llm_factory=FakeModels())
+
+    with recorder.turn("t1") as turn:
+        config = {"configurable": {"thread_id": "t1"}, "callbacks": recorder.callbacks(turn)}
+        message = HumanMessage(content="¿Cuándo vuelve Pedri de su lesión?")
+        for _ in workflow.stream({"messages": [message]}, config, stream_mode="updates"):
+            pass
+
+    assert dict(turn.node_runs) == {"router": 1, "orchestrator": 1, "medical": 1}
+    assert [call.agent for call in turn.llm_calls] == ["orchestrator", "medical"]
+    assert turn.prompt_tokens > 0 and turn.completion_tokens > 0
+    assert turn.handoffs == 1
+    assert turn.tool_calls == {"transfer_to_medical": 1}
+    assert turn.checkpoint_ops > 0 and turn.checkpoint_ms > 0
+
+    trace = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+    assert trace[0]["thread_id"] == "t1"
+    assert set(trace[0]["nodes_ms"]) == {"router", "orchestrator", "medical"}
+
+    snapshot = recorder.prometheus()
+    assert "# TYPE football_club_turns_total counter" in snapshot
+    assert "football_club_turns_total 1" in snapshot
+    assert 'football_club_tool_calls_total{tool="transfer_to_medical"} 1' in snapshot
+
+
+def test_estimate_cost():
+    assert estimate_cost("llama-3.3-70b-versatile", 1_000_000, 1_000_000) == 0.59 + 0.79
+    assert estimate_cost("modelo-desconocido", 1000, 1000) == 0.0
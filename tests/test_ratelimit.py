@@ -0,0 +1,97 @@
+"""Tests for the process-wide Groq rate limiter and retry middleware."""
+
+import time
+
+import httpx
+from langchain.agents import create_agent
+from langchain_core.messages import HumanMessage
+
+from football_club.agents.llm import RateLimitMiddleware
+from football_club.cache import ResponseCache
+from football_club.ratelimit import RateLimiter, TokenBucket, retry_delay
+from football_club.testing import FakeChatModel
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RateLimited(Exception):
+    status_code = 429
+    response = httpx.Response(429, headers={"retry-after": "0.05"})
+
+
+class _FlakyModel(FakeChatModel):
+    """Rejects its first call with a 429, then answers normally."""
+
+    def respond(self, messages, tools):
+        if self.call_count == 0:
+            self._calls += 1
+            raise _RateLimited("rate limit reached")
+        return super().respond(messages, tools)
+
+
+def test_token_bucket_reserves_into_debt_and_refills():
+    clock = _Clock()
+    bucket = TokenBucket(rate_per_minute=2, clock=clock)
+
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == 30.0
+    clock.now = 30.0
+    assert bucket.reserve(1) == 30.0
+
+
+def test_adaptive_concurrency_and_backoff():
+    clock = _Clock()
+    limiter = RateLimiter(rpm=0, tpm=0, max_concurrency=8, latency_target_s=2.0, clock=clock)
+
+    limiter.acquire(100)
+    limiter.release(latency_s=5.0)
+    assert limiter.stats().concurrency_limit == 4.0
+    limiter.acquire(100)
+    limiter.release(latency_s=0.5)
+    assert limiter.stats().concurrency_limit == 4.25
+
+    assert 0.5 <= retry_delay(1, base_s=0.5) <= 1.0
+    assert retry_delay(10, base_s=0.5, max_s=30.0) <= 30.0
+    assert 3.0 <= retry_delay(0, retry_after=3.0) <= 3.3
+
+
+def test_middleware_retries_429_honoring_retry_after():
+    limiter = RateLimiter(rpm=0, tpm=0)
+    agent = create_agent(
+        model=_FlakyModel(agent="medical"),
+        tools=[],
+        middleware=[RateLimitMiddleware(limiter, backoff_base_s=0.01)],
+    )
+
+    result = agent.invoke({"messages": [HumanMessage(content="¿Cuándo vuelve Pedri?")]})
+
+    assert result["messages"][-1].content.startswith("[medical]")
+    stats = limiter.stats()
+    assert (stats.retries, stats.rate_limited, stats.failures) == (1, 1, 0)
+    assert stats.throttle_seconds >= 0.04  # the 0.05 s retry-after pause
+    assert stats.inflight == 0
+
+
+def test_cache_hits_do_not_consume_budget():
+    limiter = RateLimiter(rpm=1, tpm=0)
+    agent = create_agent(
+        model=FakeChatModel(agent="medical", cache=ResponseCache()),
+        tools=[],
+        middleware=[RateLimitMiddleware(limiter)],
+    )
+
+    started = time.perf_counter()
+    for _ in range(3):
+        result = agent.invoke({"messages": [HumanMessage(content="¿Cuándo vuelve Pedri?")]})
+
+    assert result["messages"][-1].content.startswith("[medical]")
+    assert time.perf_counter() - started < 5  # rpm=1: a second real call would wait 60 s
+    stats = limiter.stats()
+    assert (stats.requests, stats.throttle_seconds, stats.inflight) == (1, 0.0, 0)
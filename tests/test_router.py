@@ -0,0 +1,87 @@
+"""Tests for the local fast-path router."""
+
+import json
+from pathlib import Path
+
+from langchain_core.messages import HumanMessage
+
+from football_club.graph.router import FastRouter, normalize_text
+from football_club.graph.workflow import FastRouteNode
+
+
+def test_normalize_text_strips_accents():
+    assert normalize_text("¿Cuándo volverá de su LESIÓN?") == "¿cuando volvera de su lesion?"
+
+
+def test_confident_domain_queries_are_routed():
+    router = FastRouter()
+    assert router.classify("¿Cuándo volverá Pedri de su lesión?").agent == "medical"
+    assert router.classify("Qué central podríamos fichar de la Serie A").agent == "scout"
+    assert router.classify("Cómo juega el equipo con el 4-3-3").agent == "analyst"
+
+
+def test_ambiguous_queries_fall_back_to_orchestrator():
+    router = FastRouter()
+    for text in ["hola", "sí, dale", "¿Cómo está jugando Haaland?"]:
+        decision = router.classify(text)
+        assert decision.agent is None
+        assert decision.source == "none"
+
+
+def test_context_words_do_not_make_a_question_compound():
+    router = FastRouter()
+    for text in [
+        "¿Qué lesión tiene nuestro portero?",
+        "Our injury list",
+        "minutos de Pedri tras la lesión",
+    ]:
+        assert router.classify(text).agent == "medical"
+    # Alone, they still point to their domain; two real subjects stay compound
+    assert router.classify("¿Cómo rinde nuestro equipo?").agent == "analyst"
+    assert router.classify("goles y lesiones de la plantilla").source == "compound"
+
+
+def test_phrases_outrank_their_words():
+    router = FastRouter()
+    # "baja (de) forma" is poor form, not an injury
+    assert router.classify("el portero está en baja forma").agent == "analyst"
+    assert router.classify("tiene una baja de forma").agent == "analyst"
+    assert router.classify("¿Qué bajas tenemos para el domingo?").agent == "medical"
+    # English "once" is not the Spanish line-up
+    assert router.classify("once he is back from injury").agent == "medical"
+    assert router.classify("¿Qué once pondrías el sábado?").agent == "analyst"
+
+
+def test_benchmark_queries_fast_route_without_misroutes():
+    path = Path(__file__).parents[1] / "benchmarks" / "routing_queries.jsonl"
+    queries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    router = FastRouter()
+
+    decisions = [(q["agent"], router.classify(q["question"]).agent) for q in queries]
+
+    assert [(want, got) for want, got in decisions if got and got != want] == []
+    domain = [got for want, got in decisions if want != "orchestrator"]
+    assert sum(got is not None for got in domain) / len(domain) >= 0.75
+    assert router.classify("¿Llega Gavi al 100% para el partido de Champions?").agent == "medical"
+
+
+def test_threshold_controls_decisions():
+    text = "¿Cuál es el rendimiento de nuestro delantero?"
+    assert FastRouter(threshold=0.5).classify(text).agent == "analyst"
+    assert FastRouter(threshold=0.99).classify(text).agent is None
+
+
+def test_fast_route_only_applies_to_orchestrator_turns():
+    fast_route = FastRouteNode(FastRouter())
+    messages = [HumanMessage(content="¿Cuándo vuelve de la lesión?")]
+
+    routed = fast_route({"messages": messages})
+    sticky = fast_route({"messages": messages, "active_agent": "scout"})
+    disabled = FastRouteNode(None)({"messages": messages})
+
+    assert routed["active_agent"] == "medical"
+    assert routed["handoff_path"].value == ["medical"]
+    assert "active_agent" not in sticky
+    assert sticky["handoff_path"].value == ["scout"]
+    assert "active_agent" not in disabled
+    assert disabled["handoff_path"].value == ["orchestrator"]
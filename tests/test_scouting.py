@@ -0,0 +1,61 @@
+"""Tests for the scouting similarity index and the scout's data tools."""
+
+import pytest
+
+from football_club.agents.data_tools import create_scouting_tools
+from football_club.data.scouting import ScoutingIndex, position_group
+
+
+def _player(name, position, age, value, league="Serie A", **features):
+    return {
+        "player": name,
+        "club": f"{name} FC",
+        "league": league,
+        "position": position,
+        "age": age,
+        "market_value": value,
+        "minutes": 2000,
+        **features,
+    }
+
+
+@pytest.fixture
+def index() -> ScoutingIndex:
+    striker = {"goals_p90": 0.7, "xg_p90": 0.6, "shots_p90": 3.5, "tackles_p90": 0.3}
+    playmaker = {"assists_p90": 0.3, "key_passes_p90": 2.5, "progressive_passes_p90": 8.0}
+    return ScoutingIndex.from_records(
+        [
+            _player("Lautaro Martínez", "Delantero", 27, 100, **striker),
+            _player("Young Striker", "FW", 21, 20, **{**striker, "goals_p90": 0.6}),
+            _player("Old Striker", "delantero centro", 33, 5, "LaLiga", **striker),
+            _player("Playmaker", "centrocampista", 22, 40, **playmaker),
+            _player("Other Playmaker", "MF", 30, 25, **playmaker),
+        ]
+    )
+
+
+def test_position_aliases():
+    assert position_group("Extremo derecho") == position_group("FW") == 3
+    assert position_group("pivote") == 2
+    with pytest.raises(ValueError):
+        position_group("entrenador")
+
+
+@pytest.mark.parametrize("distance", ["cosine", "mahalanobis"])
+def test_similar_players_ranked_and_filtered(index, distance):
+    similar = index.similar("lautaro martinez", k=2, distance=distance)
+    young = index.similar("Lautaro", k=5, distance=distance, max_age=25, position="delantero")
+
+    assert {p.player for p in similar} == {"Young Striker", "Old Striker"}
+    assert similar[0].score >= similar[1].score
+    assert [p.player for p in young] == ["Young Striker"]
+    assert index.similar("Lautaro", league="LaLiga", max_value=1) == []
+
+
+def test_scout_tools(index):
+    similar, profile = create_scouting_tools(index)
+
+    text = similar.invoke({"player": "Playmaker", "k": 1, "position": "centrocampista"})
+    assert text.startswith("1. Other Playmaker (Other Playmaker FC, Serie A)")
+    assert "pases clave/90: 2.50" in profile.invoke({"player": "Playmaker"})
+    assert "Posición desconocida" in similar.invoke({"player": "Playmaker", "position": "x"})
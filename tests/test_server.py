@@ -0,0 +1,147 @@
+"""Tests for the HTTP serving mode."""
+
+import asyncio
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from football_club.server import ChatServer
+from football_club.session_store import SessionSaver
+from football_club.state import AgentState
+
+
+def _echo_workflow(checkpointer=None):
+    def analyst(state: AgentState) -> dict:
+        question = [m for m in state["messages"] if isinstance(m, HumanMessage)][-1].content
+        return {"messages": [AIMessage(content=f"eco: {question}")]}
+
+    builder = StateGraph(AgentState)
+    builder.add_node("analyst", analyst)
+    builder.add_edge(START, "analyst")
+    builder.add_edge("analyst", END)
+    return builder.compile(checkpointer=checkpointer or MemorySaver())
+
+
+async def _request(port: int, method: str, path: str, body: dict | None = None) -> str:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    raw = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(raw)}\r\n\r\n".encode() + raw)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response.decode()
+
+
+def _run(coro_factory, workflow=None, **kwargs):
+    async def runner():
+        server = ChatServer(workflow or _echo_workflow(), max_inflight=1, max_queue=0, **kwargs)
+        listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return await coro_factory(server, port)
+        finally:
+            listener.close()
+
+    return asyncio.run(runner())
+
+
+def test_chat_streams_sse_events_per_session():
+    async def scenario(server, port):
+        first = await _request(port, "POST", "/chat", {"message": "hola", "session_id": "s1"})
+        await _request(port, "POST", "/chat", {"message": "otra", "session_id": "s1"})
+        metrics = await _request(port, "GET", "/metrics")
+        return first, server, metrics
+
+    response, server, metrics = _run(scenario)
+
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert "event: answer" in response
+    assert '"text": "eco: hola"' in response
+    assert "event: done" in response
+    assert server.sessions["s1"].turns == 2
+    assert "football_club_turns_total 2" in metrics
+    assert 'football_club_node_runs_total{node="analyst"} 2' in metrics
+
+
+def test_backpressure_and_errors():
+    async def scenario(server, port):
+        responses = await asyncio.gather(
+            *[_request(port, "POST", "/chat", {"message": f"q{i}"}) for i in range(4)]
+        )
+        missing = await _request(port, "POST", "/chat", {})
+        unknown = await _request(port, "DELETE", "/sessions/nope")
+        return responses, missing, unknown
+
+    responses, missing, unknown = _run(scenario)
+
+    statuses = [r.split("\r\n", 1)[0] for r in responses]
+    assert "HTTP/1.1 200 OK" in statuses
+    assert any("503" in s for s in statuses)
+    assert all("Retry-After: 1" in r for r in responses if "503" in r.split("\r\n", 1)[0])
+    assert missing.startswith("HTTP/1.1 400")
+    assert unknown.startswith("HTTP/1.1 404")
+
+
+def test_profile_and_prometheus_snapshot_per_turn(tmp_path, capsys):
+    prom = tmp_path / "metrics.prom"
+
+    async def scenario(server, port):
+        await _request(port, "POST", "/chat", {"message": "hola"})
+
+    _run(scenario, profile=True, prom_path=str(prom))
+
+    assert "Turno" in capsys.readouterr().out
+    assert "football_club_turns_total 1" in prom.read_text()
+
+
+def test_unused_sessions_are_dropped_and_resumed_by_id(tmp_path):
+    saver = SessionSaver(tmp_path / "sessions.sqlite", max_threads=1)
+
+    async def scenario(server, port):
+        await _request(port, "POST", "/chat", {"message": "hola", "session_id": "s1"})
+        server.sessions["s1"].last_seen = 0  # idle
+        await _request(port, "POST", "/chat", {"message": "hola", "session_id": "s2"})
+        dropped_idle = "s1" not in server.sessions
+        # s2's thread is spilled to disk once s3 takes the store's only slot
+        await _request(port, "POST", "/chat", {"message": "hola", "session_id": "s3"})
+        await _request(port, "POST", "/chat", {"message": "sigo", "session_id": "s1"})
+        sessions = set(server.sessions)
+        deleted = await _request(port, "DELETE", "/sessions/s2")
+        return dropped_idle, sessions, deleted
+
+    dropped_idle, sessions, deleted = _run(scenario, _echo_workflow(saver), session_idle_seconds=60)
+
+    assert dropped_idle
+    assert sessions == {"s1", "s3"}  # s2 was dropped once its thread was spilled
+    # Resuming by id continues the stored conversation
+    state = saver.get_tuple({"configurable": {"thread_id": "s1"}}).checkpoint
+    assert [m.content for m in state["channel_values"]["messages"]][-2:] == ["sigo", "eco: sigo"]
+    assert len(state["channel_values"]["messages"]) == 4
+    assert deleted.startswith("HTTP/1.1 200")
+    assert saver.thread_usage("s2") is None
+    saver.close()
+
+
+def test_malformed_length_and_delete_without_session_store():
+    workflow = _echo_workflow()
+
+    async def scenario(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /chat HTTP/1.1\r\nContent-Length: abc\r\n\r\n")
+        await writer.drain()
+        malformed = (await reader.read()).decode()
+        writer.close()
+        await _request(port, "POST", "/chat", {"message": "hola", "session_id": "s1"})
+        server.sessions.clear()  # dropped as idle: the thread is still stored
+        deleted = await _request(port, "DELETE", "/sessions/s1")
+        again = await _request(port, "DELETE", "/sessions/s1")
+        return malformed, deleted, again
+
+    malformed, deleted, again = _run(scenario, workflow)
+
+    assert malformed.startswith("HTTP/1.1 400")
+    assert deleted.startswith("HTTP/1.1 200")
+    assert workflow.checkpointer.get_tuple({"configurable": {"thread_id": "s1"}}) is None
+    assert again.startswith("HTTP/1.1 404")
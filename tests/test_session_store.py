@@ -0,0 +1,120 @@
+"""Tests for the in-memory session store with eviction and spill-to-disk."""
+
+import asyncio
+import threading
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+
+from football_club.metrics import InstrumentedCheckpointer
+from football_club.session_store import SessionSaver, find_session_saver
+from football_club.state import AgentState
+
+
+def _echo_workflow(saver):
+    def scout(state: AgentState) -> dict:
+        question = [m for m in state["messages"] if isinstance(m, HumanMessage)][-1].content
+        return {"messages": [AIMessage(content=f"eco: {question}")], "active_agent": "scout"}
+
+    builder = StateGraph(AgentState)
+    builder.add_node("scout", scout)
+    builder.add_edge(START, "scout")
+    builder.add_edge("scout", END)
+    return builder.compile(checkpointer=saver)
+
+
+def _ask(workflow, question: str, thread_id: str) -> dict:
+    config = {"configurable": {"thread_id": thread_id}}
+    return workflow.invoke({"messages": [HumanMessage(content=question)]}, config)
+
+
+def test_least_recently_used_threads_spill_and_come_back(tmp_path):
+    saver = SessionSaver(tmp_path / "sessions.sqlite", max_threads=2)
+    workflow = _echo_workflow(saver)
+    for thread_id in ("a", "b", "c"):
+        _ask(workflow, f"hola {thread_id}", thread_id)
+
+    usage = saver.usage()
+    assert (usage.threads_in_memory, usage.threads_on_disk, usage.spills) == (2, 1, 1)
+    assert not saver.thread_usage("a").in_memory
+    assert not any(key[0] == "a" for key in saver.blobs)
+
+    result = _ask(workflow, "sigo", "a")
+
+    assert [m.content for m in result["messages"]] == ["hola a", "eco: hola a", "sigo", "eco: sigo"]
+    assert saver.thread_usage("a").in_memory
+    assert not saver.thread_usage("b").in_memory  # now the least recently used
+    assert saver.usage().rehydrations == 1
+    # Reading an unknown thread does not register it
+    assert saver.get_tuple({"configurable": {"thread_id": "nope"}}) is None
+    assert saver.thread_usage("nope") is None
+    saver.close()
+
+
+def test_async_api_spills_and_rehydrates_off_the_event_loop(tmp_path):
+    io_threads: set[int] = set()
+
+    class RecordingSaver(SessionSaver):
+        def _rehydrate(self, thread_id: str) -> None:
+            io_threads.add(threading.get_ident())
+            super()._rehydrate(thread_id)
+
+    saver = RecordingSaver(tmp_path / "sessions.sqlite", max_threads=1)
+    workflow = _echo_workflow(saver)
+
+    async def scenario():
+        for question, thread_id in [("hola", "a"), ("hola", "b"), ("sigo", "a")]:
+            config = {"configurable": {"thread_id": thread_id}}
+            result = await workflow.ainvoke({"messages": [HumanMessage(question)]}, config)
+        return threading.get_ident(), result
+
+    loop_thread, result = asyncio.run(scenario())
+
+    assert [m.content for m in result["messages"]][-2:] == ["sigo", "eco: sigo"]
+    assert len(result["messages"]) == 4
+    assert io_threads and loop_thread not in io_threads
+    saver.close()
+
+
+def test_byte_budget_idle_threads_and_delete(tmp_path):
+    saver = SessionSaver(tmp_path / "sessions.sqlite", max_bytes=0, idle_seconds=0)
+    workflow = _echo_workflow(saver)
+    _ask(workflow, "hola", "a")
+    _ask(workflow, "hola", "b")
+
+    # Over the budget only the current thread stays in memory
+    usage = saver.usage()
+    assert (usage.threads_in_memory, usage.threads_on_disk) == (1, 1)
+    assert usage.bytes_in_memory == saver._measure("b") == usage.largest[0].bytes > 0
+
+    saver.idle_seconds = 1e-9
+    saver.sweep()  # the most recent thread is kept even when idle
+    assert saver.usage().threads_in_memory == 1
+    saver.evict("b")
+    assert saver.usage().bytes_in_memory == 0
+
+    saver.delete_thread("a")
+    saver.delete_thread("b")
+    assert saver.usage().threads_on_disk == 0
+    assert saver._conn.execute("SELECT COUNT(*) FROM sessions").fetchone() == (0,)
+    saver.close()
+
+
+def test_prune_keeps_state_and_frees_memory(tmp_path):
+    saver = SessionSaver(tmp_path / "sessions.sqlite", keep_last=0)
+    workflow = _echo_workflow(saver)
+    for i in range(6):
+        _ask(workflow, f"pregunta {i}", "t1")
+    config = {"configurable": {"thread_id": "t1"}}
+    before = workflow.get_state(config).values
+    size = saver.thread_usage("t1").bytes
+
+    assert saver.prune_thread("t1", keep_last=2) > 0
+
+    assert len(list(saver.list(config))) == 2
+    assert workflow.get_state(config).values == before
+    assert saver.thread_usage("t1").bytes == saver._measure("t1") < size
+    # The session store is found behind the instrumented wrapper
+    assert find_session_saver(InstrumentedCheckpointer(saver)) is saver
+    assert 'football_club_session_threads{state="memory"} 1' in saver.usage().prometheus()
+    saver.close()
@@ -0,0 +1,62 @@
+"""Tests for speculative execution of the predicted domain agent."""
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from football_club.config import Config
+from football_club.graph import create_workflow
+from football_club.graph.speculation import reset_speculation_stats, speculation_stats
+from football_club.testing import FakeChatModel, FakeModels
+
+
+def _config() -> Config:
+    return Config(
+        llm_cache_enabled=False,
+        checkpoint_backend="memory",
+        fast_router_enabled=False,
+        speculative_routing=True,
+    )
+
+
+def _ask(workflow, question: str):
+    config = {"configurable": {"thread_id": "t1"}}
+    return workflow.invoke({"messages": [HumanMessage(content=question)]}, config)
+
+
+def test_hit_commits_the_speculative_answer():
+    reset_speculation_stats()
+    models = FakeModels()
+    workflow = create_workflow(_config(), llm_factory=models)
+
+    state = _ask(workflow, "¿Cuándo vuelve Pedri de su lesión?")
+
+    answer = state["messages"][-1]
+    assert answer.name == "medical"
+    assert answer.content.startswith("[medical]")
+    assert [m.type for m in state["messages"]] == ["human", "ai", "tool", "ai"]
+    assert state["active_agent"] == "medical"
+    assert models.calls() == {"orchestrator": 1, "medical": 1}
+    stats = speculation_stats()
+    assert (stats.launched, stats.hits, stats.misses) == (1, 1, 0)
+    assert stats.committed_tokens > 0
+
+
+def test_miss_falls_back_to_the_chosen_agent():
+    reset_speculation_stats()
+    models = FakeModels()
+
+    def factory(agent: str) -> FakeChatModel:
+        if agent == "orchestrator":
+            transfer = {"name": "transfer_to_analyst", "args": {}, "id": "call_1"}
+            return FakeChatModel(agent=agent, responses=[AIMessage("", tool_calls=[transfer])])
+        return models(agent)
+
+    workflow = create_workflow(_config(), llm_factory=factory)
+
+    # The router predicts medical, the orchestrator picks analyst
+    state = _ask(workflow, "¿Cuándo vuelve Pedri de su lesión?")
+
+    assert state["active_agent"] == "analyst"
+    assert state["messages"][-1].content.startswith("[analyst]")
+    assert all(m.name != "medical" for m in state["messages"])
+    stats = speculation_stats()
+    assert (stats.launched, stats.hits, stats.misses) == (1, 0, 1)
@@ -0,0 +1,60 @@
+"""Tests for the squad statistics store and the analyst's data tools."""
+
+import pytest
+
+from football_club.agents.data_tools import create_stats_tools
+from football_club.data.stats import SquadStats, parse_season
+
+
+def _row(player, date, competition="LaLiga", **metrics):
+    return {"player": player, "date": date, "competition": competition, "minutes": 90, **metrics}
+
+
+@pytest.fixture
+def stats() -> SquadStats:
+    return SquadStats.from_records(
+        [
+            _row("Robert Lewandowski", "2024-09-01", goals=2, shots=5),
+            _row("Robert Lewandowski", "2024-08-20", goals=1, shots=3),
+            _row("Robert Lewandowski", "2025-03-10", "Champions", goals=1, shots=2),
+            _row("Raphinha", "2024-09-01", goals=1, assists=2, shots=4),
+            _row("Raphinha", "2024-08-20", goals=0, assists=1, shots=1),
+            _row("Pedri", "2024-09-01", assists=1, passes=80, minutes=45),
+            _row("Robert Lewandowski", "2023-10-01", goals=3, shots=6),
+        ]
+    )
+
+
+def test_totals_by_season_and_competition(stats):
+    season = stats.totals("lewandowski", season="2024/25")
+    league = stats.totals("Lewandowski", season="2024-25", competition="laliga")
+
+    assert (season.matches, season.values["goals"]) == (3, 4)
+    assert (league.matches, league.values["goals"]) == (2, 3)
+    assert stats.totals("Lewandowski").values["goals"] == 7
+    assert league.per90("shots") == pytest.approx(4.0)
+
+
+def test_top_per90_and_minimum_minutes(stats):
+    assert [p for p, _, _ in stats.top("goles", n=2)] == ["Robert Lewandowski", "Raphinha"]
+    assert stats.top("assists", n=1, season="2024/25")[0][:2] == ("Raphinha", 3.0)
+    # Pedri played 45 minutes: out of per-90 rankings unless the floor is lowered
+    assert "Pedri" not in [p for p, _, _ in stats.top("passes", per90=True)]
+    assert stats.top("passes", n=1, per90=True, min_minutes=0)[0][:2] == ("Pedri", 160.0)
+
+
+def test_form_is_in_date_order_with_rolling_mean(stats):
+    points = stats.form("Lewandowski", "goals", window=2)
+
+    assert [p.date for p in points] == ["2023-10-01", "2024-08-20", "2024-09-01", "2025-03-10"]
+    assert [p.rolling for p in points] == [3.0, 2.0, 1.5, 1.5]
+
+
+def test_errors_are_reported_as_text(stats):
+    top, player_stats, _, _ = create_stats_tools(stats)
+
+    assert "Raphinha: 3" in top.invoke({"metric": "assists", "n": 1})
+    assert "ambiguo" not in player_stats.invoke({"player": "Pedri"})
+    assert "No encuentro" in player_stats.invoke({"player": "Messi"})
+    assert "Temporada no válida" in player_stats.invoke({"player": "Pedri", "season": "x"})
+    assert parse_season("24/25") == 2024
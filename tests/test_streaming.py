@@ -0,0 +1,59 @@
+"""Tests for stream event parsing."""
+
+from langchain_core.messages import AIMessage, AIMessageChunk, ToolMessage
+
+from football_club.streaming import TurnEventParser
+
+ORCH_NS = ("orchestrator:1",)
+MEDICAL_NS = ("medical:2",)
+
+
+def _handoff_items():
+    tool_call = {"name": "transfer_to_medical", "args": {}, "id": "call-1"}
+    call_msg = AIMessage(content="", tool_calls=[tool_call])
+    ack = ToolMessage(content="Transferido al agente Médico", tool_call_id="call-1")
+    return [
+        (
+            ORCH_NS,
+            "messages",
+            (
+                AIMessageChunk(
+                    content="", tool_call_chunks=[{**tool_call, "args": "{}", "index": 0}]
+                ),
+                {},
+            ),
+        ),
+        (ORCH_NS, "updates", {"model": {"messages": [call_msg]}}),
+        ((), "updates", {"orchestrator": {"messages": [call_msg, ack], "active_agent": "medical"}}),
+        (MEDICAL_NS, "messages", (ack, {})),
+        (MEDICAL_NS, "messages", (AIMessageChunk(content="Vuelve "), {})),
+        (MEDICAL_NS, "messages", (AIMessageChunk(content="en dos semanas"), {})),
+        ((), "updates", {"medical": {"messages": [AIMessage(content="Vuelve en dos semanas")]}}),
+    ]
+
+
+def test_parser_emits_logs_tokens_and_answer():
+    parser = TurnEventParser()
+    events = [event for item in _handoff_items() for event in parser.feed(item)]
+
+    assert [(e.kind, e.agent, e.text) for e in events] == [
+        ("agent", "orchestrator", ""),
+        ("tool", "orchestrator", "transfer_to_medical"),
+        ("handoff", "medical", ""),
+        ("token", "medical", "Vuelve "),
+        ("token", "medical", "en dos semanas"),
+        ("answer", "medical", "Vuelve en dos semanas"),
+    ]
+    assert events[2].source == "orchestrator"
+    assert parser.path == ["orchestrator", "medical"]
+    assert parser.responding_agent in parser.streamed_agents
+
+
+def test_parser_without_messages_mode_keeps_final_answer():
+    parser = TurnEventParser()
+    items = [item for item in _handoff_items() if item[1] == "updates"]
+    events = [event for item in items for event in parser.feed(item)]
+
+    assert "token" not in {e.kind for e in events}
+    assert parser.final_answer == "Vuelve en dos semanas"
+    assert parser.streamed_agents == set()
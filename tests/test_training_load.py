@@ -0,0 +1,83 @@
+"""Tests for the training load store and the medical agent's workload tools."""
+
+import numpy as np
+import pytest
+
+from football_club.agents.data_tools import create_training_load_tools
+from football_club.data.training_load import TrainingLoad
+
+
+def _sessions(player, first, loads):
+    start = np.datetime64(first, "D")
+    return [
+        {"player": player, "date": str(start + np.timedelta64(d, "D")), "load": load}
+        for d, load in enumerate(loads)
+        if load
+    ]
+
+
+@pytest.fixture
+def rows():
+    # Pedri rests one day a week; Gavi quadruples his load in the last week
+    pedri = _sessions("Pedri", "2024-08-01", [0 if d % 7 == 6 else 300 for d in range(40)])
+    gavi = _sessions("Gavi", "2024-08-01", [150] * 33 + [600] * 7)
+    return pedri + gavi
+
+
+def test_workload_indicators_and_flags(rows):
+    load = TrainingLoad()
+    load.add(rows)
+    pedri, gavi = load.workload("2024-09-09")
+
+    assert pedri.acwr == pytest.approx(1.0)
+    assert pedri.monotony == pytest.approx(6**0.5)
+    assert pedri.strain == pytest.approx(1800 * 6**0.5)
+    assert pedri.flags == ("monotonía alta (2.45 > 2.0)",)
+    assert gavi.acwr == pytest.approx(600 / ((21 * 150 + 7 * 600) / 28))
+    assert gavi.flags[0].startswith("pico de carga")
+    assert not load.workload("2024-08-20")[0].ready
+
+
+def test_incremental_updates_match_a_full_rebuild(rows):
+    full = TrainingLoad()
+    full.add(rows)
+    incremental = TrainingLoad()
+    # Later days first, then earlier ones (the day axis grows on both sides)
+    incremental.add(rows[40:])
+    incremental.add(rows[:40])
+
+    a, b = full.indicators(), incremental.indicators()
+    np.testing.assert_allclose(a.acute[[1, 0]], b.acute)
+    np.testing.assert_allclose(a.strain[[1, 0]], b.strain)
+
+
+def test_exports_followed_in_directory(tmp_path, rows):
+    (tmp_path / "week1.csv").write_text(
+        "Player Name,Session Date,Player Load,Total Distance\nPedri,2024-08-01,300,8000\n"
+    )
+    load = TrainingLoad(tmp_path)
+    assert load.refresh() == 1
+    assert load.refresh() == 0
+
+    # A re-export replaces the file's previous sessions instead of adding to them
+    (tmp_path / "week1.csv").write_text("player,date,load\nPedri,2024-08-01,350\n")
+    (tmp_path / "week2.csv").write_text("player,date,load\nPedri,2024-08-08,200\n")
+    assert load.refresh() == 2
+    ((day, values),) = load.daily("pedri", "2024-08-01", 1)
+    assert (day, values["load"], values["distance"]) == ("2024-08-01", 350, 0)
+
+    (tmp_path / "week2.csv").unlink()
+    load.refresh()
+    assert load.indicators("2024-08-07", "2024-08-08").acute[0].tolist() == [50, 0]
+
+
+def test_medical_load_tools(rows):
+    load = TrainingLoad()
+    load.add(rows)
+    risk, player = create_training_load_tools(load)
+
+    text = risk.invoke({"date": "2024-09-09"})
+    assert "Gavi: ACWR 2.29" in text
+    assert "pico de carga" in text
+    assert "- 2024-09-08: carga (UA) 600" in player.invoke({"player": "gavi", "date": "2024-09-09"})
+    assert "No encuentro" in player.invoke({"player": "Messi"})
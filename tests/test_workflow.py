@@ -0,0 +1,77 @@
+"""End-to-end tests of the compiled workflow with offline fake models."""
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from football_club.config import Config
+from football_club.graph import create_workflow
+from football_club.graph.guard import loop_stats, reset_loop_stats
+from football_club.streaming import TurnEventParser
+from football_club.testing import FakeChatModel, FakeModels
+
+
+def _workflow(models: FakeModels, **overrides):
+    settings = {"llm_cache_enabled": False, "checkpoint_backend": "memory", **overrides}
+    return create_workflow(Config(**settings), llm_factory=models)
+
+
+def _turn(workflow, question: str, thread_id: str = "t1") -> TurnEventParser:
+    parser = TurnEventParser()
+    config = {"configurable": {"thread_id": thread_id}}
+    for item in workflow.stream(
+        {"messages": [HumanMessage(content=question)]},
+        config,
+        stream_mode=["updates", "messages"],
+        subgraphs=True,
+    ):
+        list(parser.feed(item))
+    return parser
+
+
+def test_fast_router_skips_orchestrator_and_agent_stays_active():
+    models = FakeModels()
+    workflow = _workflow(models)
+
+    first = _turn(workflow, "¿Cuándo vuelve Pedri de su lesión?")
+    follow_up = _turn(workflow, "¿Y su recuperación muscular?")
+
+    assert first.path == ["medical"]
+    assert first.final_answer.startswith("[medical]")
+    assert follow_up.path == ["medical"]
+    # Agents are built on first routing: the orchestrator never was
+    assert set(models.calls()) == {"medical"}
+
+
+def test_orchestrator_handoff_and_hand_back():
+    models = FakeModels()
+    workflow = _workflow(models, fast_router_enabled=False)
+
+    first = _turn(workflow, "¿Cuándo vuelve Pedri de su lesión?")
+    second = _turn(workflow, "¿Cómo está el rendimiento del equipo en la liga?")
+
+    assert first.path == ["orchestrator", "medical"]
+    assert second.path == ["medical", "orchestrator", "analyst"]
+    assert second.responding_agent == "analyst"
+
+
+def test_lateral_handoff_skips_orchestrator():
+    reset_loop_stats()
+    models = FakeModels()
+    workflow = _workflow(models, fast_router_enabled=False, lateral_handoffs=True)
+
+    _turn(workflow, "¿Cuándo vuelve Pedri de su lesión?")
+    second = _turn(workflow, "¿Cómo está el rendimiento del equipo en la liga?")
+
+    assert second.path == ["medical", "analyst"]
+    assert second.responding_agent == "analyst"
+    assert models.calls() == {"orchestrator": 1, "medical": 2, "analyst": 1}
+    assert loop_stats().lateral_handoffs == 1
+
+
+def test_scripted_responses_and_token_streaming():
+    model = FakeChatModel(responses=[AIMessage(content="uno dos tres")])
+
+    chunks = [c.content for c in model.stream([HumanMessage(content="hola")]) if c.content]
+
+    assert chunks == ["uno ", "dos ", "tres"]
+    assert model.invoke([HumanMessage(content="hola")]).content == "uno dos tres"
+    assert model.call_count == 2